@@ -40,6 +40,35 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 horas
     SECURE_COOKIES: bool = False
+
+    # Hash de senhas
+    PASSWORD_HASH_SCHEME: str = os.getenv("PASSWORD_HASH_SCHEME", "bcrypt")  # bcrypt ou argon2
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    ARGON2_TIME_COST: int = int(os.getenv("ARGON2_TIME_COST", "3"))
+    ARGON2_MEMORY_COST: int = int(os.getenv("ARGON2_MEMORY_COST", "65536"))  # KiB
+    ARGON2_PARALLELISM: int = int(os.getenv("ARGON2_PARALLELISM", "2"))
+    PASSWORD_HASH_POOL: str = os.getenv("PASSWORD_HASH_POOL", "thread")  # thread ou process
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))  # acima disso, 503
+
+    # Login
+    LOGIN_NEGATIVE_CACHE_TTL: int = int(os.getenv("LOGIN_NEGATIVE_CACHE_TTL", "30"))  # segundos
+    LOGIN_NEGATIVE_CACHE_SIZE: int = int(os.getenv("LOGIN_NEGATIVE_CACHE_SIZE", "10000"))
+
+    # Snapshot de permissões por (usuário, empresa)
+    PERMISSOES_CACHE_SIZE: int = int(os.getenv("PERMISSOES_CACHE_SIZE", "10000"))
+    PERMISSOES_VERSAO_INTERVALO: int = int(os.getenv("PERMISSOES_VERSAO_INTERVALO", "5"))  # segundos entre conferências no Redis
+    PERMISSOES_CACHE_TTL: int = int(os.getenv("PERMISSOES_CACHE_TTL", "300"))  # idade máxima sem Redis
+    CASHFLOW_FORECAST_CACHE_SIZE: int = int(os.getenv("CASHFLOW_FORECAST_CACHE_SIZE", "1000"))
+    CASHFLOW_FORECAST_CACHE_TTL: int = int(os.getenv("CASHFLOW_FORECAST_CACHE_TTL", "60"))  # segundos
+    AGING_CACHE_SIZE: int = int(os.getenv("AGING_CACHE_SIZE", "2000"))
+    AGING_CACHE_TTL: int = int(os.getenv("AGING_CACHE_TTL", "900"))  # segundos; a chave já inclui o dia
+
+    # Encargos por atraso (regra padrão de multa e juros)
+    ENCARGOS_MULTA_PERCENTUAL: str = os.getenv("ENCARGOS_MULTA_PERCENTUAL", "2")
+    ENCARGOS_JUROS_MENSAL_PERCENTUAL: str = os.getenv("ENCARGOS_JUROS_MENSAL_PERCENTUAL", "1")
+    ENCARGOS_REGIME: str = os.getenv("ENCARGOS_REGIME", "simples")  # simples ou composto
+    ENCARGOS_DIAS_CARENCIA: int = int(os.getenv("ENCARGOS_DIAS_CARENCIA", "0"))
     
     # OAuth e Swagger UI
     CLIENT_ID: str = os.getenv("CLIENT_ID", "ccontrolm-webapp")
@@ -59,10 +88,44 @@ class Settings(BaseSettings):
     METRICS_USERNAME: str = os.getenv("METRICS_USERNAME", "prometheus")
     METRICS_PASSWORD: str = os.getenv("METRICS_PASSWORD", "ccontrolm")
     ENABLE_DB_METRICS: bool = os.getenv("ENABLE_DB_METRICS", "false").lower() == "true"
+    METRICS_SAMPLER_INTERVAL: float = float(os.getenv("METRICS_SAMPLER_INTERVAL", "5"))  # segundos
+    EVENT_LOOP_LAG_INTERVAL: float = float(os.getenv("EVENT_LOOP_LAG_INTERVAL", "0.25"))  # segundos
+    LOOP_BLOCK_DETECTOR_ENABLED: bool = os.getenv("LOOP_BLOCK_DETECTOR_ENABLED", "false").lower() == "true"
+    LOOP_BLOCK_THRESHOLD: float = float(os.getenv("LOOP_BLOCK_THRESHOLD", "0.1"))  # segundos
+    LOOP_BLOCK_STACK_DEPTH: int = int(os.getenv("LOOP_BLOCK_STACK_DEPTH", "30"))
+    LOOP_BLOCK_MAX_EVENTS: int = int(os.getenv("LOOP_BLOCK_MAX_EVENTS", "200"))
+
+    # Retenção de logs e auditoria
+    RETENTION_ENABLED: bool = os.getenv("RETENTION_ENABLED", "true").lower() == "true"
+    LOG_RETENTION_DAYS: int = int(os.getenv("LOG_RETENTION_DAYS", "90"))
+    AUDITORIA_RETENTION_DAYS: int = int(os.getenv("AUDITORIA_RETENTION_DAYS", "0"))  # 0 = manter sempre
+    RETENTION_BATCH_SIZE: int = int(os.getenv("RETENTION_BATCH_SIZE", "5000"))
+    RETENTION_BATCH_PAUSE_MS: int = int(os.getenv("RETENTION_BATCH_PAUSE_MS", "100"))
+    RETENTION_MAX_SECONDS: int = int(os.getenv("RETENTION_MAX_SECONDS", "600"))  # por execução
+    RETENTION_INTERVAL_SECONDS: int = int(os.getenv("RETENTION_INTERVAL_SECONDS", "21600"))  # 6 horas
+
+    # Agendador de tarefas (executado no event loop; tarefas distribuídas só no worker líder)
+    SCHEDULER_ENABLED: bool = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+    SCHEDULER_LEADER_TTL: int = int(os.getenv("SCHEDULER_LEADER_TTL", "30"))  # segundos
+    SCHEDULER_HISTORY_SIZE: int = int(os.getenv("SCHEDULER_HISTORY_SIZE", "20"))  # execuções por tarefa
+    BACKUP_SCHEDULE_ENABLED: bool = os.getenv("BACKUP_SCHEDULE_ENABLED", "false").lower() == "true"
+    BACKUP_CRON: str = os.getenv("BACKUP_CRON", "0 3 * * *")
+
+    # Particionamento mensal de logs e auditoria
+    PARTITION_MONTHS_AHEAD: int = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+    PARTITION_ARCHIVE_DIR: str = os.getenv("PARTITION_ARCHIVE_DIR", "")  # vazio = remover sem arquivar
+    PARTITION_INTERVAL_SECONDS: int = int(os.getenv("PARTITION_INTERVAL_SECONDS", "86400"))  # diário
     PROMETHEUS_NAMESPACE: str = os.getenv("PROMETHEUS_NAMESPACE", "ccontrolm")
 
+    # Indicadores mensais consolidados (recalcula só os meses marcados pelos gatilhos)
+    KPI_MENSAL_REFRESH_INTERVAL: int = int(os.getenv("KPI_MENSAL_REFRESH_INTERVAL", "60"))  # segundos
+    KPI_MENSAL_BATCH_SIZE: int = int(os.getenv("KPI_MENSAL_BATCH_SIZE", "500"))  # meses por transação
+
     # Cache
     CACHE_EXPIRY: int = int(os.getenv("CACHE_EXPIRATION", "300"))  # 5 minutos
+    PRODUTO_LOOKUP_MAX_EMPRESAS: int = int(os.getenv("PRODUTO_LOOKUP_MAX_EMPRESAS", "64"))
+    PRODUTO_LOOKUP_MAX_ITENS: int = int(os.getenv("PRODUTO_LOOKUP_MAX_ITENS", "50000"))  # por empresa
+    PRODUTO_LOOKUP_TTL: int = int(os.getenv("PRODUTO_LOOKUP_TTL", "300"))  # segundos
 
     # Paginação
     DEFAULT_PAGE_SIZE: int = 10
@@ -0,0 +1,482 @@
+"""
+Agendador de tarefas assíncrono, executado no event loop da aplicação.
+
+Substitui a thread de polling: as próximas execuções ficam em um min-heap e
+o loop dorme até a mais próxima (ou até uma nova tarefa ser registrada).
+Cada tarefa tem agenda por expressão cron ou intervalo fixo, jitter,
+limite de execuções simultâneas, timeout e histórico das últimas execuções.
+
+Com vários workers (gunicorn), as tarefas distribuídas só rodam no worker
+líder, eleito por um lock no Redis renovado periodicamente. Tarefas locais
+(ex.: amostragem de métricas do processo) rodam em todos os workers.
+Funções síncronas são executadas em thread (``asyncio.to_thread``).
+"""
+import asyncio
+import heapq
+import inspect
+import logging
+import random
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+AGENDADOR_EXECUCOES = Counter(
+    'scheduler_task_runs_total',
+    'Execuções de tarefas agendadas',
+    ['tarefa', 'resultado']
+)
+
+AGENDADOR_DURACAO = Histogram(
+    'scheduler_task_duration_seconds',
+    'Duração das execuções de tarefas agendadas',
+    ['tarefa'],
+    buckets=(0.1, 0.5, 1, 5, 15, 60, 300, 900, 3600)
+)
+
+AGENDADOR_EM_EXECUCAO = Gauge(
+    'scheduler_task_running',
+    'Execuções em andamento por tarefa',
+    ['tarefa']
+)
+
+AGENDADOR_ULTIMO_SUCESSO = Gauge(
+    'scheduler_task_last_success_timestamp',
+    'Instante (epoch) da última execução bem-sucedida',
+    ['tarefa']
+)
+
+AGENDADOR_LIDER = Gauge(
+    'scheduler_leader',
+    'Indica se este worker é o líder das tarefas distribuídas'
+)
+
+
+# ---------------------------------------------------------------------------
+# Expressões cron
+# ---------------------------------------------------------------------------
+
+_APELIDOS_CRON = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+}
+
+# (mínimo, máximo) de cada campo: minuto, hora, dia, mês, dia da semana
+_LIMITES_CRON = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+
+
+class ExpressaoCron:
+    """
+    Expressão cron de cinco campos (minuto, hora, dia, mês, dia da semana).
+
+    Aceita ``*``, listas (``1,15``), faixas (``1-5``), passos (``*/10``,
+    ``0-30/5``), ``7`` como domingo e os apelidos ``@hourly``, ``@daily``,
+    ``@weekly``, ``@monthly`` e ``@yearly``. Como no cron tradicional,
+    quando dia do mês e dia da semana são restritos, basta um coincidir.
+    """
+
+    def __init__(self, expressao: str):
+        self.expressao = expressao
+        campos = _APELIDOS_CRON.get(expressao.strip(), expressao).split()
+        if len(campos) != 5:
+            raise ValueError(f"Expressão cron inválida (esperados 5 campos): '{expressao}'")
+        conjuntos = [self._campo(c, *limites) for c, limites in zip(campos, _LIMITES_CRON)]
+        self.minutos, self.horas, self.dias, self.meses, dias_semana = conjuntos
+        self.dias_semana = {0 if d == 7 else d for d in dias_semana}
+        self._dia_restrito = campos[2] != "*"
+        self._semana_restrita = campos[4] != "*"
+
+    @staticmethod
+    def _campo(texto: str, minimo: int, maximo: int) -> Set[int]:
+        valores: Set[int] = set()
+        maximo_aceito = 7 if (minimo, maximo) == (0, 6) else maximo
+        for parte in texto.split(","):
+            faixa, _, passo = parte.partition("/")
+            if faixa == "*":
+                inicio, fim = minimo, maximo
+            elif "-" in faixa:
+                inicio, fim = (int(v) for v in faixa.split("-", 1))
+            else:
+                inicio = fim = int(faixa)
+                if passo:
+                    fim = maximo
+            incremento = int(passo) if passo else 1
+            if inicio < minimo or fim > maximo_aceito or inicio > fim or incremento < 1:
+                raise ValueError(f"Campo cron fora dos limites: '{parte}'")
+            valores.update(range(inicio, fim + 1, incremento))
+        return valores
+
+    def _dia_coincide(self, data: datetime) -> bool:
+        no_mes = data.day in self.dias
+        na_semana = (data.isoweekday() % 7) in self.dias_semana
+        if self._dia_restrito and self._semana_restrita:
+            return no_mes or na_semana
+        return no_mes and na_semana
+
+    def proxima(self, apos: datetime) -> datetime:
+        """Próximo instante (com precisão de minuto) estritamente após ``apos``."""
+        atual = apos.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limite = atual + timedelta(days=366 * 5)
+        while atual < limite:
+            if atual.month not in self.meses:
+                ano, mes = (atual.year + 1, 1) if atual.month == 12 else (atual.year, atual.month + 1)
+                atual = atual.replace(year=ano, month=mes, day=1, hour=0, minute=0)
+                continue
+            if not self._dia_coincide(atual):
+                atual = (atual + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if atual.hour not in self.horas:
+                atual = (atual + timedelta(hours=1)).replace(minute=0)
+                continue
+            if atual.minute not in self.minutos:
+                atual += timedelta(minutes=1)
+                continue
+            return atual
+        raise ValueError(f"Expressão cron sem ocorrências: '{self.expressao}'")
+
+
+# ---------------------------------------------------------------------------
+# Eleição de líder
+# ---------------------------------------------------------------------------
+
+_RENOVAR_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_LIBERAR_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+async def _cliente_redis():
+    from app.deps.redis_deps import get_redis
+    async for cliente in get_redis():
+        return cliente
+
+
+class EleicaoLider:
+    """
+    Lock de liderança no Redis (``SET NX PX`` + renovação condicional).
+
+    Sem Redis (fallback em memória), o processo se considera líder: em
+    implantações com um único worker o comportamento é o mesmo de antes.
+    """
+
+    def __init__(
+        self,
+        chave: str = "agendador:lider",
+        ttl_segundos: float = 30,
+        obter_redis: Callable[[], Awaitable[Any]] = _cliente_redis
+    ):
+        self.chave = chave
+        self.ttl_ms = int(ttl_segundos * 1000)
+        self.token = f"{uuid.uuid4()}"
+        self.lider = False
+        self._obter_redis = obter_redis
+
+    async def renovar(self) -> bool:
+        """Adquire ou renova a liderança; retorna se este processo é o líder."""
+        try:
+            cliente = await self._obter_redis()
+            if not hasattr(cliente, "eval"):
+                lider = True
+            elif self.lider:
+                lider = bool(await cliente.eval(_RENOVAR_LOCK, 1, self.chave, self.token, self.ttl_ms))
+                if not lider:
+                    lider = bool(await cliente.set(self.chave, self.token, nx=True, px=self.ttl_ms))
+            else:
+                lider = bool(await cliente.set(self.chave, self.token, nx=True, px=self.ttl_ms))
+        except Exception as e:
+            logger.warning(f"Agendador: falha ao renovar liderança: {str(e)}")
+            lider = False
+
+        if lider != self.lider:
+            logger.info(f"Agendador: {'assumiu' if lider else 'perdeu'} a liderança")
+        self.lider = lider
+        AGENDADOR_LIDER.set(1 if lider else 0)
+        return lider
+
+    async def liberar(self) -> None:
+        """Libera o lock, se for o dono."""
+        if not self.lider:
+            return
+        try:
+            cliente = await self._obter_redis()
+            if hasattr(cliente, "eval"):
+                await cliente.eval(_LIBERAR_LOCK, 1, self.chave, self.token)
+        except Exception as e:
+            logger.warning(f"Agendador: falha ao liberar liderança: {str(e)}")
+        self.lider = False
+        AGENDADOR_LIDER.set(0)
+
+
+# ---------------------------------------------------------------------------
+# Tarefas e agendador
+# ---------------------------------------------------------------------------
+
+class TarefaAgendada:
+    """Tarefa registrada no agendador, com sua agenda e estado de execução."""
+
+    def __init__(
+        self,
+        nome: str,
+        funcao: Callable[[], Any],
+        cron: Optional[str] = None,
+        intervalo_segundos: Optional[float] = None,
+        jitter_segundos: float = 0,
+        max_concorrencia: int = 1,
+        distribuida: bool = True,
+        timeout_segundos: Optional[float] = None,
+        executar_ao_iniciar: bool = False,
+        descricao: str = "",
+        tamanho_historico: int = 20
+    ):
+        """
+        Inicializa a tarefa.
+
+        Args:
+            nome: Nome único da tarefa
+            funcao: Função assíncrona ou síncrona (executada em thread)
+            cron: Expressão cron (exclusiva com ``intervalo_segundos``)
+            intervalo_segundos: Intervalo fixo entre execuções
+            jitter_segundos: Atraso aleatório máximo somado a cada execução
+            max_concorrencia: Execuções simultâneas permitidas (excedentes são ignoradas)
+            distribuida: Executa apenas no worker líder
+            timeout_segundos: Tempo máximo de execução (apenas funções assíncronas)
+            executar_ao_iniciar: Primeira execução logo após o início
+            descricao: Descrição da tarefa
+            tamanho_historico: Quantidade de execuções mantidas no histórico
+        """
+        if bool(cron) == bool(intervalo_segundos):
+            raise ValueError(f"Tarefa '{nome}': informe cron ou intervalo_segundos")
+        self.nome = nome
+        self.funcao = funcao
+        self.cron = ExpressaoCron(cron) if cron else None
+        self.intervalo_segundos = intervalo_segundos
+        self.jitter_segundos = jitter_segundos
+        self.max_concorrencia = max(1, max_concorrencia)
+        self.distribuida = distribuida
+        self.timeout_segundos = timeout_segundos
+        self.executar_ao_iniciar = executar_ao_iniciar
+        self.descricao = descricao
+        self.habilitada = True
+        self.assincrona = inspect.iscoroutinefunction(funcao)
+
+        self.proxima_execucao: Optional[datetime] = None
+        self.ultima_execucao: Optional[datetime] = None
+        self.em_execucao = 0
+        self.sucessos = 0
+        self.falhas = 0
+        self.ignoradas = 0
+        self.historico: Deque[Dict[str, Any]] = deque(maxlen=tamanho_historico)
+
+    def calcular_proxima(self, apos: datetime) -> datetime:
+        """Próxima execução após ``apos``, com jitter."""
+        if self.cron:
+            proxima = self.cron.proxima(apos)
+        else:
+            proxima = apos + timedelta(seconds=self.intervalo_segundos)
+        if self.jitter_segundos:
+            proxima += timedelta(seconds=random.uniform(0, self.jitter_segundos))
+        return proxima
+
+    def status(self) -> Dict[str, Any]:
+        """Estado da tarefa para monitoramento."""
+        return {
+            "name": self.nome,
+            "description": self.descricao,
+            "enabled": self.habilitada,
+            "cron": self.cron.expressao if self.cron else None,
+            "interval_seconds": self.intervalo_segundos,
+            "distributed": self.distribuida,
+            "max_concurrency": self.max_concorrencia,
+            "last_run": self.ultima_execucao.isoformat() if self.ultima_execucao else None,
+            "next_run": self.proxima_execucao.isoformat() if self.proxima_execucao else None,
+            "running": self.em_execucao,
+            "success_count": self.sucessos,
+            "error_count": self.falhas,
+            "skipped_count": self.ignoradas,
+            "history": list(self.historico),
+        }
+
+
+class Agendador:
+    """Agendador assíncrono com min-heap de próximas execuções."""
+
+    def __init__(
+        self,
+        eleicao: Optional[EleicaoLider] = None,
+        relogio: Callable[[], datetime] = datetime.now
+    ):
+        self.tarefas: Dict[str, TarefaAgendada] = {}
+        self.eleicao = eleicao or EleicaoLider(ttl_segundos=settings.SCHEDULER_LEADER_TTL)
+        self._relogio = relogio
+        self._heap: List[Tuple[datetime, int, str]] = []
+        self._sequencia = 0
+        self._acordar = asyncio.Event()
+        self._loop_task: Optional[asyncio.Task] = None
+        self._lider_task: Optional[asyncio.Task] = None
+        self._execucoes: Set[asyncio.Task] = set()
+
+    @property
+    def em_execucao(self) -> bool:
+        return self._loop_task is not None and not self._loop_task.done()
+
+    def _agendar(self, tarefa: TarefaAgendada, quando: datetime) -> None:
+        tarefa.proxima_execucao = quando
+        self._sequencia += 1
+        heapq.heappush(self._heap, (quando, self._sequencia, tarefa.nome))
+        self._acordar.set()
+
+    def registrar(self, nome: str, funcao: Callable[[], Any], **opcoes: Any) -> TarefaAgendada:
+        """
+        Registra (ou substitui) uma tarefa; ver ``TarefaAgendada`` para as opções.
+
+        Returns:
+            A tarefa registrada
+        """
+        opcoes.setdefault("tamanho_historico", settings.SCHEDULER_HISTORY_SIZE)
+        tarefa = TarefaAgendada(nome, funcao, **opcoes)
+        self.tarefas[nome] = tarefa
+        agora = self._relogio()
+        self._agendar(tarefa, agora if tarefa.executar_ao_iniciar else tarefa.calcular_proxima(agora))
+        logger.info(f"Tarefa '{nome}' registrada (próxima execução: {tarefa.proxima_execucao:%Y-%m-%d %H:%M:%S})")
+        return tarefa
+
+    async def iniciar(self) -> None:
+        """Inicia o loop do agendador e a renovação de liderança."""
+        if self.em_execucao:
+            return
+        await self.eleicao.renovar()
+        self._lider_task = asyncio.create_task(self._manter_lideranca(), name="agendador-lider")
+        self._loop_task = asyncio.create_task(self._loop(), name="agendador")
+        logger.info(f"Agendador iniciado com {len(self.tarefas)} tarefas")
+
+    async def parar(self, timeout: float = 30) -> None:
+        """Para o loop, aguarda as execuções em andamento e libera a liderança."""
+        for task in (self._loop_task, self._lider_task):
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(
+            *(t for t in (self._loop_task, self._lider_task) if t is not None),
+            return_exceptions=True
+        )
+        self._loop_task = self._lider_task = None
+
+        if self._execucoes:
+            _, pendentes = await asyncio.wait(self._execucoes, timeout=timeout)
+            for task in pendentes:
+                task.cancel()
+        await self.eleicao.liberar()
+        logger.info("Agendador encerrado")
+
+    async def _manter_lideranca(self) -> None:
+        intervalo = max(1.0, self.eleicao.ttl_ms / 1000 / 3)
+        while True:
+            await asyncio.sleep(intervalo)
+            await self.eleicao.renovar()
+
+    async def _loop(self) -> None:
+        while True:
+            self._acordar.clear()
+            if not self._heap:
+                await self._acordar.wait()
+                continue
+
+            quando, _, nome = self._heap[0]
+            espera = (quando - self._relogio()).total_seconds()
+            if espera > 0:
+                try:
+                    await asyncio.wait_for(self._acordar.wait(), timeout=espera)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            tarefa = self.tarefas.get(nome)
+            if tarefa is None or tarefa.proxima_execucao != quando:
+                continue  # tarefa removida ou reagendada
+            self._agendar(tarefa, tarefa.calcular_proxima(max(quando, self._relogio())))
+            self.disparar(tarefa, quando)
+
+    def disparar(self, tarefa: TarefaAgendada, agendada_para: Optional[datetime] = None) -> Optional[asyncio.Task]:
+        """
+        Inicia uma execução, respeitando habilitação, liderança e concorrência.
+
+        Returns:
+            A task da execução, ou None se ela foi ignorada
+        """
+        if not tarefa.habilitada or (tarefa.distribuida and not self.eleicao.lider):
+            return None
+        if tarefa.em_execucao >= tarefa.max_concorrencia:
+            tarefa.ignoradas += 1
+            AGENDADOR_EXECUCOES.labels(tarefa=tarefa.nome, resultado="ignorada").inc()
+            logger.warning(f"Tarefa '{tarefa.nome}' ignorada: execução anterior ainda em andamento")
+            return None
+
+        # Contabilizada já no disparo: disparos seguidos não podem exceder o limite
+        tarefa.em_execucao += 1
+        AGENDADOR_EM_EXECUCAO.labels(tarefa=tarefa.nome).inc()
+        task = asyncio.create_task(self._executar(tarefa, agendada_para or self._relogio()))
+        self._execucoes.add(task)
+        task.add_done_callback(self._execucoes.discard)
+        return task
+
+    async def _executar(self, tarefa: TarefaAgendada, agendada_para: datetime) -> None:
+        tarefa.ultima_execucao = self._relogio()
+        inicio = time.perf_counter()
+        resultado, erro = "sucesso", None
+        try:
+            if tarefa.assincrona:
+                await asyncio.wait_for(tarefa.funcao(), timeout=tarefa.timeout_segundos)
+            else:
+                await asyncio.to_thread(tarefa.funcao)
+            tarefa.sucessos += 1
+            AGENDADOR_ULTIMO_SUCESSO.labels(tarefa=tarefa.nome).set(time.time())
+        except asyncio.CancelledError:
+            resultado, erro = "cancelada", "cancelada"
+            raise
+        except Exception as e:
+            resultado, erro = "erro", str(e) or type(e).__name__
+            tarefa.falhas += 1
+            logger.error(f"Erro ao executar tarefa '{tarefa.nome}': {erro}")
+        finally:
+            duracao = time.perf_counter() - inicio
+            tarefa.em_execucao -= 1
+            AGENDADOR_EM_EXECUCAO.labels(tarefa=tarefa.nome).dec()
+            AGENDADOR_EXECUCOES.labels(tarefa=tarefa.nome, resultado=resultado).inc()
+            AGENDADOR_DURACAO.labels(tarefa=tarefa.nome).observe(duracao)
+            tarefa.historico.append({
+                "agendada_para": agendada_para.isoformat(),
+                "inicio": tarefa.ultima_execucao.isoformat(),
+                "duracao_segundos": round(duracao, 3),
+                "resultado": resultado,
+                "erro": erro,
+            })
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Estado de todas as tarefas."""
+        return [tarefa.status() for tarefa in self.tarefas.values()]
+
+
+# Instância compartilhada pelo processo
+agendador = Agendador()
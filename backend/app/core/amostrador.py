@@ -0,0 +1,200 @@
+"""
+Amostrador de recursos do processo e do sistema para o ``/metrics``.
+
+As leituras (psutil, pools de conexão, fila de threads) são feitas em
+segundo plano, em intervalo fixo, e gravadas em gauges pré-alocados: o
+scrape apenas serializa os valores já coletados, sem chamadas inline.
+
+Métricas coletadas:
+
+- RSS, descritores abertos, threads e CPU do processo; memória e CPU do sistema
+- Atraso do event loop (diferença entre o despertar esperado e o real de
+  um ``asyncio.sleep`` curto), último valor e máximo da janela
+- Pausas do coletor de lixo por geração (via ``gc.callbacks``)
+- Profundidade da fila do executor padrão do loop (a do pool de senhas já
+  é exposta por ``app.core.password_hasher``)
+- Conexões dos pools do SQLAlchemy (em uso, livres, overflow)
+"""
+import asyncio
+import gc
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+import psutil
+from prometheus_client import Gauge, Histogram
+
+from app.config.settings import settings
+from app.core.monitoring import SYSTEM_CPU, SYSTEM_MEMORY
+
+logger = logging.getLogger(__name__)
+
+
+PROCESSO_RSS = Gauge('app_process_rss_bytes', 'Memória residente do processo')
+PROCESSO_FDS = Gauge('app_process_open_fds', 'Descritores de arquivo abertos pelo processo')
+PROCESSO_THREADS = Gauge('app_process_threads', 'Threads do processo')
+PROCESSO_CPU = Gauge('app_process_cpu_percent', 'Uso de CPU do processo desde a amostra anterior')
+
+LOOP_ATRASO = Gauge('app_event_loop_lag_seconds', 'Atraso do event loop na última medição')
+LOOP_ATRASO_MAXIMO = Gauge(
+    'app_event_loop_lag_max_seconds',
+    'Maior atraso do event loop na última janela de amostragem'
+)
+LOOP_ATRASO_HISTOGRAMA = Histogram(
+    'app_event_loop_lag_distribution_seconds',
+    'Distribuição do atraso do event loop',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+
+GC_PAUSA = Histogram(
+    'app_gc_pause_seconds',
+    'Duração das coletas do coletor de lixo',
+    ['geracao'],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+)
+
+FILA_THREADS = Gauge(
+    'app_threadpool_queue_depth',
+    'Tarefas aguardando worker no pool de threads',
+    ['pool']
+)
+
+POOL_BANCO = Gauge(
+    'app_db_pool_connections',
+    'Conexões do pool do banco por estado',
+    ['engine', 'estado']
+)
+
+_ESTADOS_POOL = ("em_uso", "livres", "overflow", "tamanho")
+
+
+class AmostradorSistema:
+    """Coleta periódica de recursos em gauges pré-alocados."""
+
+    def __init__(
+        self,
+        intervalo_segundos: Optional[float] = None,
+        intervalo_atraso: Optional[float] = None
+    ):
+        """
+        Inicializa o amostrador.
+
+        Args:
+            intervalo_segundos: Intervalo entre amostras de recursos
+                                (padrão: ``METRICS_SAMPLER_INTERVAL``)
+            intervalo_atraso: Intervalo entre medições do atraso do loop
+                              (padrão: ``EVENT_LOOP_LAG_INTERVAL``)
+        """
+        self.intervalo_segundos = intervalo_segundos or settings.METRICS_SAMPLER_INTERVAL
+        self.intervalo_atraso = intervalo_atraso or settings.EVENT_LOOP_LAG_INTERVAL
+        self._processo: Optional[psutil.Process] = None
+        self._atraso_maximo = 0.0
+        self._inicio_gc: Optional[float] = None
+        self._tasks: list = []
+
+        # Pré-alocar as séries com rótulos fixos
+        self._gc_geracoes = [GC_PAUSA.labels(geracao=str(g)) for g in range(3)]
+        self._fila_padrao = FILA_THREADS.labels(pool="default")
+        self._pool_series = {
+            (engine, estado): POOL_BANCO.labels(engine=engine, estado=estado)
+            for engine in ("sync", "async")
+            for estado in _ESTADOS_POOL
+        }
+
+    # -- coleta de lixo -----------------------------------------------------
+
+    def _callback_gc(self, fase: str, info: Dict[str, Any]) -> None:
+        if fase == "start":
+            self._inicio_gc = time.perf_counter()
+        elif self._inicio_gc is not None:
+            self._gc_geracoes[info.get("generation", 0)].observe(time.perf_counter() - self._inicio_gc)
+            self._inicio_gc = None
+
+    # -- leituras -----------------------------------------------------------
+
+    def amostrar_recursos(self) -> None:
+        """Lê processo e sistema via psutil (executado fora do event loop)."""
+        with self._processo.oneshot():
+            PROCESSO_RSS.set(self._processo.memory_info().rss)
+            PROCESSO_THREADS.set(self._processo.num_threads())
+            PROCESSO_CPU.set(self._processo.cpu_percent(interval=None))
+            if hasattr(self._processo, "num_fds"):
+                PROCESSO_FDS.set(self._processo.num_fds())
+        SYSTEM_MEMORY.set(psutil.virtual_memory().used)
+        SYSTEM_CPU.set(psutil.cpu_percent(interval=None))
+
+    def amostrar_pools(self) -> None:
+        """Lê a fila do executor padrão e o estado dos pools do banco."""
+        executor = getattr(asyncio.get_running_loop(), "_default_executor", None)
+        fila = getattr(executor, "_work_queue", None)
+        self._fila_padrao.set(fila.qsize() if fila is not None else 0)
+
+        try:
+            from app.database import async_engine, engine
+        except Exception:
+            return
+        for nome, eng in (("sync", engine), ("async", getattr(async_engine, "sync_engine", None))):
+            pool = getattr(eng, "pool", None)
+            if pool is None or not hasattr(pool, "checkedout"):
+                continue
+            valores = {
+                "em_uso": pool.checkedout(),
+                "livres": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+                "tamanho": pool.size(),
+            }
+            for estado, valor in valores.items():
+                self._pool_series[(nome, estado)].set(valor)
+
+    # -- tarefas ------------------------------------------------------------
+
+    async def _medir_atraso(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            esperado = loop.time() + self.intervalo_atraso
+            await asyncio.sleep(self.intervalo_atraso)
+            atraso = max(0.0, loop.time() - esperado)
+            LOOP_ATRASO.set(atraso)
+            LOOP_ATRASO_HISTOGRAMA.observe(atraso)
+            self._atraso_maximo = max(self._atraso_maximo, atraso)
+
+    async def _amostrar(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.amostrar_recursos)
+                self.amostrar_pools()
+            except Exception as e:
+                logger.warning(f"Falha na amostragem de recursos: {str(e)}")
+            LOOP_ATRASO_MAXIMO.set(self._atraso_maximo)
+            self._atraso_maximo = 0.0
+            await asyncio.sleep(self.intervalo_segundos)
+
+    def iniciar(self) -> None:
+        """Inicia a amostragem no event loop atual."""
+        if self._tasks:
+            return
+        # Criado aqui (e não na importação) para pegar o PID do worker após o fork
+        self._processo = psutil.Process(os.getpid())
+        # Primeira leitura de CPU apenas estabelece a referência
+        self._processo.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None)
+        gc.callbacks.append(self._callback_gc)
+        self._tasks = [
+            asyncio.create_task(self._medir_atraso(), name="amostrador-atraso-loop"),
+            asyncio.create_task(self._amostrar(), name="amostrador-recursos"),
+        ]
+        logger.info(f"Amostrador de recursos iniciado (intervalo {self.intervalo_segundos}s)")
+
+    async def parar(self) -> None:
+        """Interrompe a amostragem."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._callback_gc in gc.callbacks:
+            gc.callbacks.remove(self._callback_gc)
+
+
+# Instância compartilhada pelo processo
+amostrador = AmostradorSistema()
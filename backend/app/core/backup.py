@@ -3,21 +3,24 @@ Sistema de backup automático para CCONTROL-M.
 
 Este módulo implementa rotinas de backup para o banco de dados e arquivos
 do sistema, com suporte a compressão, criptografia e armazenamento externo.
+Os pacotes são gravados em fluxo (ver ``app.core.backup_stream``), com
+memória constante independentemente do tamanho do backup.
 """
 import os
 import sys
+import json
 import shutil
 import datetime
+import functools
 import subprocess
 import tarfile
 import zipfile
-import gzip
 import logging
 import asyncio
 import aiofiles
 import aioboto3
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Any, Union
+from typing import List, Dict, Optional, Tuple, Any, Union, BinaryIO, Callable
 from cryptography.fernet import Fernet
 import aiosmtplib
 from email.mime.multipart import MIMEMultipart
@@ -25,6 +28,21 @@ from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
 
 from app.core.config import settings
+from app.core.backup_stream import (
+    MAGICO,
+    SUFIXO_MANIFESTO,
+    EscritorCifrado,
+    LeitorCifrado,
+    carregar_manifesto,
+    comparar_com_manifesto,
+    copiar_arquivo,
+    derivar_chave,
+    extrair_tar,
+    gravar_em_fluxo,
+    salvar_manifesto,
+    tar_em_fluxo,
+    verificar_integridade,
+)
 from app.utils.logging_config import get_logger
 
 # Configurar logger
@@ -113,6 +131,8 @@ class BackupManager:
             self._save_encryption_key(key_path)
         
         self.cipher_suite = Fernet(self.encryption_key)
+        # Chave AES-GCM dos backups em fluxo, derivada da mesma chave mestra
+        self.stream_key = derivar_chave(self.encryption_key)
     
     def _save_encryption_key(self, key_path: str) -> None:
         """Salva a chave de criptografia em arquivo seguro."""
@@ -127,24 +147,25 @@ class BackupManager:
         except Exception as e:
             logger.error(f"Erro ao salvar chave de criptografia: {str(e)}")
     
-    async def run_backup_scheduler(self) -> None:
-        """Inicia o agendador de backups periódicos."""
-        logger.info(f"Iniciando agendador de backups a cada {self.backup_freq_hours} horas")
-        while True:
-            try:
-                await self.perform_full_backup()
-                await self.clean_old_backups()
-                
-                # Aguardar até o próximo backup
-                interval_seconds = self.backup_freq_hours * 3600
-                logger.info(f"Próximo backup programado em {self.backup_freq_hours} horas")
-                await asyncio.sleep(interval_seconds)
-            except Exception as e:
-                logger.error(f"Erro no agendador de backups: {str(e)}")
-                if self.alert_on_failure:
-                    await self.send_backup_alert(f"Erro no agendador de backups: {str(e)}")
-                # Aguardar um tempo menor para tentar novamente em caso de falha
-                await asyncio.sleep(3600)  # 1 hora
+    async def run_backup_cycle(self) -> bool:
+        """
+        Executa um ciclo de backup: backup completo e limpeza de antigos.
+        
+        A periodicidade fica a cargo do agendador da aplicação
+        (tarefa ``database_backup`` em ``app.scripts.schedule_monitors``).
+        
+        Returns:
+            True se o backup foi bem-sucedido, False caso contrário
+        """
+        try:
+            success = await self.perform_full_backup()
+            await self.clean_old_backups()
+            return success
+        except Exception as e:
+            logger.error(f"Erro no ciclo de backup: {str(e)}")
+            if self.alert_on_failure:
+                await self.send_backup_alert(f"Erro no ciclo de backup: {str(e)}")
+            return False
     
     async def perform_full_backup(self) -> bool:
         """
@@ -196,16 +217,19 @@ class BackupManager:
         """
         Realiza backup do banco de dados.
         
+        O ``pg_dump`` roda em formato diretório com ``-j`` workers (uma
+        tabela por worker) e sem compressão própria; o diretório é então
+        empacotado em fluxo (tar -> zstd -> criptografia) direto para o
+        arquivo final.
+        
         Args:
             backup_id: Identificador único do backup
             
         Returns:
             True se o backup do banco foi bem-sucedido, False caso contrário
         """
+        dump_dir = os.path.join(self.db_backup_dir, f"{backup_id}_database.dump")
         try:
-            db_filename = f"{backup_id}_database.sql"
-            db_filepath = os.path.join(self.db_backup_dir, db_filename)
-            
             # Determinar as credenciais do banco de dados a partir das configurações
             db_host = settings.POSTGRES_SERVER
             db_port = settings.POSTGRES_PORT
@@ -213,15 +237,17 @@ class BackupManager:
             db_user = settings.POSTGRES_USER
             db_password = settings.POSTGRES_PASSWORD
             
-            # Executar pg_dump para realizar o backup
+            # Executar pg_dump em paralelo (formato diretório)
             command = [
                 "pg_dump",
                 f"--host={db_host}",
                 f"--port={db_port}",
                 f"--username={db_user}",
                 f"--dbname={db_name}",
-                "--format=plain",
-                f"--file={db_filepath}"
+                "--format=directory",
+                f"--jobs={max(1, settings.BACKUP_DB_JOBS)}",
+                "--compress=0",
+                f"--file={dump_dir}"
             ]
             
             # Configurar variável de ambiente PGPASSWORD
@@ -232,21 +258,21 @@ class BackupManager:
             process = await asyncio.create_subprocess_exec(
                 *command,
                 env=env,
-                stdout=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
                 stderr=asyncio.subprocess.PIPE
             )
             
-            stdout, stderr = await process.communicate()
+            _, stderr = await process.communicate()
             
             if process.returncode != 0:
                 logger.error(f"Erro ao realizar backup do banco: {stderr.decode()}")
                 return False
             
-            backup_size = os.path.getsize(db_filepath)
-            logger.info(f"Backup do banco concluído: {db_filepath} ({backup_size} bytes)")
-            
-            # Comprimir e/ou criptografar o arquivo
-            processed_filepath = await self._process_backup_file(db_filepath)
+            processed_filepath = await self._write_stream(
+                os.path.join(self.db_backup_dir, f"{backup_id}_database.tar"),
+                tar_em_fluxo([(dump_dir, f"{backup_id}_database.dump")]),
+                {"backup_id": backup_id, "categoria": "database", "formato": "directory"}
+            )
             
             # Enviar para armazenamento externo se configurado
             if self.enable_s3_upload:
@@ -256,11 +282,20 @@ class BackupManager:
         except Exception as e:
             logger.error(f"Erro durante backup do banco de dados: {str(e)}")
             return False
+        finally:
+            shutil.rmtree(dump_dir, ignore_errors=True)
     
     async def backup_files(self, backup_id: str) -> bool:
         """
         Realiza backup dos arquivos da aplicação.
         
+        Com ``BACKUP_INCREMENTAL_FILES``, apenas arquivos novos ou com
+        conteúdo alterado desde o último backup entram no pacote, conforme o
+        manifesto (mtime, tamanho e SHA-256) guardado em ``manifest.json``.
+        Um backup completo é feito a cada ``BACKUP_FULL_EVERY`` execuções.
+        Cada pacote leva um ``MANIFESTO.json`` com a base, os arquivos
+        removidos e o estado completo, para a restauração em cadeia.
+        
         Args:
             backup_id: Identificador único do backup
             
@@ -268,32 +303,70 @@ class BackupManager:
             True se o backup dos arquivos foi bem-sucedido, False caso contrário
         """
         try:
-            files_filename = f"{backup_id}_files.tar"
-            files_filepath = os.path.join(self.files_backup_dir, files_filename)
-            
             # Diretórios a serem incluídos no backup
             source_dirs = [
                 "uploads",  # Arquivos enviados pelos usuários
                 "reports",  # Relatórios gerados
                 "static",   # Arquivos estáticos
             ]
+            raizes = {
+                directory: os.path.join(settings.PROJECT_ROOT, directory)
+                for directory in source_dirs
+            }
+            
+            manifest_path = os.path.join(self.files_backup_dir, "manifest.json")
+            previous = carregar_manifesto(manifest_path)
+            full = (
+                not settings.BACKUP_INCREMENTAL_FILES
+                or not previous
+                or previous.get("incrementais", 0) + 1 >= settings.BACKUP_FULL_EVERY
+            )
             
-            # Criar arquivo tar
-            with tarfile.open(files_filepath, "w") as tar:
-                for directory in source_dirs:
-                    dir_path = os.path.join(settings.PROJECT_ROOT, directory)
-                    if os.path.exists(dir_path):
-                        tar.add(
-                            dir_path, 
-                            arcname=os.path.basename(dir_path),
-                            filter=self._filter_backup_files
-                        )
+            loop = asyncio.get_running_loop()
+            arquivos, alterados, removidos = await loop.run_in_executor(
+                None,
+                comparar_com_manifesto,
+                raizes,
+                {} if full else previous.get("arquivos", {}),
+                self._excluded_from_backup
+            )
             
-            backup_size = os.path.getsize(files_filepath)
-            logger.info(f"Backup de arquivos concluído: {files_filepath} ({backup_size} bytes)")
+            if not full and not alterados and not removidos:
+                logger.info("Backup de arquivos: nenhuma alteração desde o último backup")
+                return True
+            
+            manifest = {
+                "backup_id": backup_id,
+                "tipo": "completo" if full else "incremental",
+                "base": None if full else previous.get("backup_id"),
+                "incrementais": 0 if full else previous.get("incrementais", 0) + 1,
+                "removidos": removidos,
+                "arquivos": arquivos,
+            }
+            
+            suffix = "files" if full else "files_incr"
+            processed_filepath = await self._write_stream(
+                os.path.join(self.files_backup_dir, f"{backup_id}_{suffix}.tar"),
+                tar_em_fluxo(
+                    alterados,
+                    filtro=self._filter_backup_files,
+                    extras={"MANIFESTO.json": json.dumps(manifest).encode("utf-8")}
+                ),
+                {
+                    "backup_id": backup_id,
+                    "categoria": "files",
+                    "tipo": manifest["tipo"],
+                    "base": manifest["base"],
+                    "removidos": removidos,
+                }
+            )
             
-            # Comprimir e/ou criptografar o arquivo
-            processed_filepath = await self._process_backup_file(files_filepath)
+            # O manifesto só avança depois que o pacote foi gravado por completo
+            salvar_manifesto(manifest_path, manifest)
+            logger.info(
+                f"Backup de arquivos ({manifest['tipo']}): {len(alterados)} alterados, "
+                f"{len(removidos)} removidos"
+            )
             
             # Enviar para armazenamento externo se configurado
             if self.enable_s3_upload:
@@ -304,6 +377,10 @@ class BackupManager:
             logger.error(f"Erro durante backup de arquivos: {str(e)}")
             return False
     
+    def _excluded_from_backup(self, name: str) -> bool:
+        """Indica se um caminho relativo deve ficar fora do backup de arquivos."""
+        return self._filter_backup_files(tarfile.TarInfo(name)) is None
+    
     def _filter_backup_files(self, tarinfo: tarfile.TarInfo) -> Optional[tarfile.TarInfo]:
         """
         Filtra arquivos a serem incluídos no backup.
@@ -354,9 +431,6 @@ class BackupManager:
             True se o backup dos logs foi bem-sucedido, False caso contrário
         """
         try:
-            logs_filename = f"{backup_id}_logs.tar"
-            logs_filepath = os.path.join(self.logs_backup_dir, logs_filename)
-            
             # Diretório de logs
             logs_dir = os.path.join(settings.PROJECT_ROOT, "logs")
             
@@ -364,15 +438,11 @@ class BackupManager:
                 logger.warning(f"Diretório de logs não encontrado: {logs_dir}")
                 return True  # Não falhar se o diretório não existir
             
-            # Criar arquivo tar
-            with tarfile.open(logs_filepath, "w") as tar:
-                tar.add(logs_dir, arcname=os.path.basename(logs_dir))
-            
-            backup_size = os.path.getsize(logs_filepath)
-            logger.info(f"Backup de logs concluído: {logs_filepath} ({backup_size} bytes)")
-            
-            # Comprimir e/ou criptografar o arquivo
-            processed_filepath = await self._process_backup_file(logs_filepath)
+            processed_filepath = await self._write_stream(
+                os.path.join(self.logs_backup_dir, f"{backup_id}_logs.tar"),
+                tar_em_fluxo([(logs_dir, os.path.basename(logs_dir))]),
+                {"backup_id": backup_id, "categoria": "logs"}
+            )
             
             # Enviar para armazenamento externo se configurado
             if self.enable_s3_upload:
@@ -383,125 +453,333 @@ class BackupManager:
             logger.error(f"Erro durante backup de logs: {str(e)}")
             return False
     
-    async def _process_backup_file(self, filepath: str) -> str:
+    async def _write_stream(
+        self,
+        base_path: str,
+        produce: Callable[[BinaryIO], None],
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
         """
-        Processa um arquivo de backup (compressão/criptografia).
+        Grava um backup pelo pipeline em fluxo (compressão + criptografia).
+        
+        O pipeline é síncrono e roda em uma thread para não bloquear o
+        event loop; a compressão zstd usa suas próprias threads.
         
         Args:
-            filepath: Caminho do arquivo a ser processado
+            base_path: Caminho base do arquivo (sem extensões)
+            produce: Função que escreve o conteúdo no stream
+            metadata: Metadados gravados no manifesto de integridade
             
         Returns:
-            Caminho do arquivo processado
+            Caminho do arquivo gravado
         """
-        processed_path = filepath
+        loop = asyncio.get_running_loop()
+        filepath = await loop.run_in_executor(
+            None,
+            functools.partial(
+                gravar_em_fluxo,
+                base_path,
+                produce,
+                comprimir=self.compress_backups,
+                chave=self.stream_key if self.encrypt_backups else None,
+                nivel=settings.BACKUP_COMPRESSION_LEVEL,
+                threads=settings.BACKUP_COMPRESSION_THREADS,
+                tamanho_frame=settings.BACKUP_FRAME_SIZE,
+                metadados=metadata
+            )
+        )
         
-        # Compressão
-        if self.compress_backups:
-            compressed_path = f"{filepath}.gz"
-            await self._compress_file(filepath, compressed_path)
-            processed_path = compressed_path
-            
-            # Remover arquivo original após compressão
-            os.remove(filepath)
+        self.last_backup_size = os.path.getsize(filepath)
+        logger.info(f"Backup gravado: {filepath} ({self.last_backup_size} bytes)")
+        return filepath
+    
+    async def _process_backup_file(self, filepath: str) -> str:
+        """
+        Processa um arquivo de backup já existente (compressão/criptografia).
         
-        # Criptografia
-        if self.encrypt_backups:
-            encrypted_path = f"{processed_path}.enc"
-            await self._encrypt_file(processed_path, encrypted_path)
-            processed_path = encrypted_path
+        Args:
+            filepath: Caminho do arquivo a ser processado
             
-            # Remover arquivo intermediário após criptografia
-            if processed_path != filepath:
-                os.remove(processed_path)
+        Returns:
+            Caminho do arquivo processado
+        """
+        if not self.compress_backups and not self.encrypt_backups:
+            return filepath
         
+        processed_path = await self._write_stream(
+            filepath,
+            copiar_arquivo(filepath),
+            {"categoria": os.path.basename(os.path.dirname(filepath))}
+        )
+        os.remove(filepath)
         return processed_path
     
-    async def _compress_file(self, source_path: str, target_path: str) -> None:
+    async def _encrypt_file(self, source_path: str, target_path: str) -> None:
         """
-        Comprime um arquivo usando gzip.
+        Criptografa um arquivo em frames, sem carregá-lo em memória.
         
         Args:
             source_path: Caminho do arquivo de origem
-            target_path: Caminho do arquivo comprimido
+            target_path: Caminho do arquivo criptografado
         """
         try:
-            # Usar asyncio para não bloquear durante a compressão
-            loop = asyncio.get_event_loop()
-            
-            # Compressão em segundo plano
-            await loop.run_in_executor(
-                None,
-                self._compress_file_sync,
-                source_path,
-                target_path
-            )
-            
-            logger.info(f"Arquivo comprimido: {target_path}")
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._encrypt_file_sync, source_path, target_path)
+            logger.info(f"Arquivo criptografado: {target_path}")
         except Exception as e:
-            logger.error(f"Erro ao comprimir arquivo {source_path}: {str(e)}")
+            logger.error(f"Erro ao criptografar arquivo {source_path}: {str(e)}")
             raise
     
-    def _compress_file_sync(self, source_path: str, target_path: str) -> None:
+    def _encrypt_file_sync(self, source_path: str, target_path: str) -> None:
+        """Versão síncrona de ``_encrypt_file`` para uso com run_in_executor."""
+        with open(source_path, "rb") as f_in, open(target_path, "wb") as f_out:
+            writer = EscritorCifrado(f_out, self.stream_key, settings.BACKUP_FRAME_SIZE)
+            shutil.copyfileobj(f_in, writer, settings.BACKUP_FRAME_SIZE)
+            writer.close()
+    
+    async def _decrypt_file(self, source_path: str, target_path: str) -> None:
         """
-        Versão síncrona da compressão de arquivo para uso com run_in_executor.
+        Descriptografa um arquivo frame a frame.
+        
+        Arquivos no formato antigo (Fernet, arquivo inteiro) continuam aceitos.
         
         Args:
-            source_path: Caminho do arquivo de origem
-            target_path: Caminho do arquivo comprimido
+            source_path: Caminho do arquivo criptografado
+            target_path: Caminho do arquivo descriptografado
         """
-        with open(source_path, 'rb') as f_in:
-            with gzip.open(target_path, 'wb') as f_out:
-                shutil.copyfileobj(f_in, f_out)
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._decrypt_file_sync, source_path, target_path)
+            logger.info(f"Arquivo descriptografado: {target_path}")
+        except Exception as e:
+            logger.error(f"Erro ao descriptografar arquivo {source_path}: {str(e)}")
+            raise
     
-    async def _encrypt_file(self, source_path: str, target_path: str) -> None:
+    def _decrypt_file_sync(self, source_path: str, target_path: str) -> None:
+        """Versão síncrona de ``_decrypt_file`` para uso com run_in_executor."""
+        with open(source_path, "rb") as f_in:
+            legacy = f_in.read(len(MAGICO)) != MAGICO
+            f_in.seek(0)
+            with open(target_path, "wb") as f_out:
+                if legacy:
+                    f_out.write(self.cipher_suite.decrypt(f_in.read()))
+                else:
+                    shutil.copyfileobj(LeitorCifrado(f_in, self.stream_key), f_out, settings.BACKUP_FRAME_SIZE)
+    
+    def list_backups(self, category: str = "database") -> List[Dict[str, Any]]:
         """
-        Criptografa um arquivo.
+        Lista os backups de uma categoria a partir dos manifestos de integridade.
         
         Args:
-            source_path: Caminho do arquivo de origem
-            target_path: Caminho do arquivo criptografado
+            category: database, files ou logs
+            
+        Returns:
+            Manifestos ordenados do mais antigo para o mais recente, com o
+            caminho do arquivo em ``caminho``
         """
-        try:
-            # Ler arquivo a ser criptografado
-            async with aiofiles.open(source_path, 'rb') as file:
-                data = await file.read()
+        directory = {
+            "database": self.db_backup_dir,
+            "files": self.files_backup_dir,
+            "logs": self.logs_backup_dir,
+        }[category]
+        
+        backups = []
+        for filename in os.listdir(directory):
+            if not filename.endswith(SUFIXO_MANIFESTO):
+                continue
+            manifest = carregar_manifesto(os.path.join(directory, filename))
+            filepath = os.path.join(directory, filename[:-len(SUFIXO_MANIFESTO)])
+            if manifest.get("categoria") == category and os.path.exists(filepath):
+                manifest["caminho"] = filepath
+                backups.append(manifest)
+        
+        return sorted(backups, key=lambda m: m["criado_em"])
+    
+    def select_backup(
+        self,
+        category: str = "database",
+        point_in_time: Optional[datetime.datetime] = None,
+        backup_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Seleciona um backup pelo ID ou pelo ponto no tempo.
+        
+        Args:
+            category: database, files ou logs
+            point_in_time: Backup mais recente criado até este instante
+            backup_id: ID exato do backup (tem precedência)
             
-            # Criptografar dados
-            encrypted_data = self.cipher_suite.encrypt(data)
+        Returns:
+            Manifesto do backup selecionado
             
-            # Escrever arquivo criptografado
-            async with aiofiles.open(target_path, 'wb') as file:
-                await file.write(encrypted_data)
+        Raises:
+            ValueError: Se nenhum backup atender ao critério
+        """
+        backups = self.list_backups(category)
+        if backup_id:
+            backups = [m for m in backups if m.get("backup_id") == backup_id]
+        elif point_in_time:
+            backups = [
+                m for m in backups
+                if datetime.datetime.fromisoformat(m["criado_em"]) <= point_in_time
+            ]
+        if not backups:
+            raise ValueError(f"Nenhum backup de {category} encontrado para o critério informado")
+        return backups[-1]
+    
+    async def verify_backup(self, manifest: Dict[str, Any]) -> None:
+        """
+        Confere os checksums por bloco de um backup antes de restaurá-lo.
+        
+        Raises:
+            BackupCorrompido: Se algum bloco divergir do manifesto
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, verificar_integridade, manifest["caminho"], manifest)
+        logger.info(f"Integridade verificada: {manifest['arquivo']} ({len(manifest['blocos'])} blocos)")
+    
+    async def _extract(self, manifest: Dict[str, Any], target_dir: str, skip: Tuple[str, ...] = ()) -> None:
+        """Extrai em fluxo (descriptografia + descompressão) um backup já verificado."""
+        key = self.stream_key if manifest.get("criptografado") else None
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, extrair_tar, manifest["caminho"], target_dir, key, skip)
+    
+    async def restore(
+        self,
+        point_in_time: Optional[datetime.datetime] = None,
+        backup_id: Optional[str] = None,
+        restore_database: bool = True,
+        restore_files: bool = False,
+        target_database: Optional[str] = None,
+        files_target_dir: Optional[str] = None,
+        jobs: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Restaura o banco e/ou os arquivos a partir dos backups armazenados.
+        
+        Cada arquivo de backup tem os checksums conferidos antes do uso; a
+        descriptografia e a descompressão são feitas em fluxo.
+        
+        Args:
+            point_in_time: Restaura o estado do backup mais recente até este instante
+            backup_id: Restaura um backup específico
+            restore_database: Restaura o banco de dados
+            restore_files: Restaura os arquivos da aplicação
+            target_database: Banco de destino (padrão: ``POSTGRES_DB``)
+            files_target_dir: Destino dos arquivos (padrão: ``PROJECT_ROOT``)
+            jobs: Workers do ``pg_restore`` (padrão: ``BACKUP_DB_JOBS``)
             
-            logger.info(f"Arquivo criptografado: {target_path}")
-        except Exception as e:
-            logger.error(f"Erro ao criptografar arquivo {source_path}: {str(e)}")
-            raise
+        Returns:
+            IDs dos backups aplicados por categoria
+        """
+        result: Dict[str, Any] = {}
+        
+        if restore_database:
+            manifest = self.select_backup("database", point_in_time, backup_id)
+            await self.restore_database(manifest, target_database, jobs)
+            result["database"] = manifest["backup_id"]
+        
+        if restore_files:
+            manifest = self.select_backup("files", point_in_time, backup_id)
+            result["files"] = await self.restore_files(
+                manifest,
+                files_target_dir or settings.PROJECT_ROOT
+            )
+        
+        logger.info(f"Restauração concluída: {result}")
+        return result
     
-    async def _decrypt_file(self, source_path: str, target_path: str) -> None:
+    async def restore_database(
+        self,
+        manifest: Dict[str, Any],
+        target_database: Optional[str] = None,
+        jobs: Optional[int] = None
+    ) -> None:
         """
-        Descriptografa um arquivo.
+        Restaura um backup do banco com ``pg_restore -j`` (formato diretório).
         
         Args:
-            source_path: Caminho do arquivo criptografado
-            target_path: Caminho do arquivo descriptografado
+            manifest: Manifesto do backup (ver ``select_backup``)
+            target_database: Banco de destino (padrão: ``POSTGRES_DB``)
+            jobs: Workers do ``pg_restore``
+            
+        Raises:
+            RuntimeError: Se o ``pg_restore`` falhar
         """
+        restore_dir = os.path.join(self.db_backup_dir, f"restore_{manifest['backup_id']}")
         try:
-            # Ler arquivo criptografado
-            async with aiofiles.open(source_path, 'rb') as file:
-                encrypted_data = await file.read()
+            await self.verify_backup(manifest)
+            await self._extract(manifest, restore_dir)
+            dump_dir = os.path.join(restore_dir, f"{manifest['backup_id']}_database.dump")
             
-            # Descriptografar dados
-            decrypted_data = self.cipher_suite.decrypt(encrypted_data)
+            command = [
+                "pg_restore",
+                f"--host={settings.POSTGRES_SERVER}",
+                f"--port={settings.POSTGRES_PORT}",
+                f"--username={settings.POSTGRES_USER}",
+                f"--dbname={target_database or settings.POSTGRES_DB}",
+                "--format=directory",
+                f"--jobs={max(1, jobs or settings.BACKUP_DB_JOBS)}",
+                "--clean",
+                "--if-exists",
+                "--no-owner",
+                dump_dir
+            ]
             
-            # Escrever arquivo descriptografado
-            async with aiofiles.open(target_path, 'wb') as file:
-                await file.write(decrypted_data)
+            env = os.environ.copy()
+            env["PGPASSWORD"] = settings.POSTGRES_PASSWORD
             
-            logger.info(f"Arquivo descriptografado: {target_path}")
-        except Exception as e:
-            logger.error(f"Erro ao descriptografar arquivo {source_path}: {str(e)}")
-            raise
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                env=env,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+            _, stderr = await process.communicate()
+            
+            if process.returncode != 0:
+                raise RuntimeError(f"Erro ao restaurar banco: {stderr.decode()}")
+            
+            logger.info(f"Banco restaurado a partir de {manifest['arquivo']}")
+        finally:
+            shutil.rmtree(restore_dir, ignore_errors=True)
+    
+    async def restore_files(self, manifest: Dict[str, Any], target_dir: str) -> List[str]:
+        """
+        Restaura os arquivos aplicando o backup completo e os incrementais
+        até o backup selecionado, em ordem.
+        
+        Args:
+            manifest: Manifesto do backup (ver ``select_backup``)
+            target_dir: Diretório de destino
+            
+        Returns:
+            IDs dos backups aplicados, do completo ao selecionado
+            
+        Raises:
+            ValueError: Se a cadeia de incrementais estiver incompleta
+        """
+        by_id = {m["backup_id"]: m for m in self.list_backups("files")}
+        chain = [manifest]
+        while chain[-1].get("tipo") == "incremental":
+            base = by_id.get(chain[-1].get("base"))
+            if base is None:
+                raise ValueError(f"Backup base {chain[-1].get('base')} ausente na cadeia de arquivos")
+            chain.append(base)
+        chain.reverse()
+        
+        # Verificar toda a cadeia antes de alterar o destino
+        for item in chain:
+            await self.verify_backup(item)
+        
+        for item in chain:
+            await self._extract(item, target_dir, skip=("MANIFESTO.json",))
+            for name in item.get("removidos", []):
+                path = os.path.join(target_dir, name)
+                if os.path.isfile(path):
+                    os.remove(path)
+        
+        return [item["backup_id"] for item in chain]
     
     async def _upload_to_s3(self, filepath: str, category: str) -> None:
         """
@@ -648,7 +926,7 @@ class BackupManager:
         Args:
             message: Mensagem de alerta
         """
-        if not settings.SMTP_SERVER or not settings.SMTP_PORT:
+        if not getattr(settings, "SMTP_SERVER", None) or not settings.SMTP_PORT:
             logger.warning("Servidor SMTP não configurado. Alerta de backup não enviado.")
             return
         
@@ -693,20 +971,24 @@ class BackupManager:
         except Exception as e:
             logger.error(f"Erro ao enviar alerta de backup: {str(e)}")
 
-# Função para iniciar o agendador de backups
-async def start_backup_scheduler() -> None:
-    """Inicia o agendador de backups automáticos."""
+# Função executada pelo agendador da aplicação
+async def perform_scheduled_backup() -> bool:
+    """
+    Realiza o backup agendado (backup completo e limpeza de antigos).
+    
+    Returns:
+        True se o backup foi bem-sucedido, False caso contrário
+    """
     backup_manager = BackupManager(
         backup_dir=os.path.join(settings.PROJECT_ROOT, "backups"),
         retention_days=settings.BACKUP_RETENTION_DAYS,
-        backup_freq_hours=settings.BACKUP_FREQUENCY_HOURS,
         encrypt_backups=settings.ENCRYPT_BACKUPS,
         compress_backups=True,
         enable_s3_upload=settings.ENABLE_S3_BACKUP,
         alert_on_failure=True
     )
     
-    await backup_manager.run_backup_scheduler()
+    return await backup_manager.run_backup_cycle()
 
 
 # Função para realizar um backup manual
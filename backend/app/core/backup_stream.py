@@ -0,0 +1,496 @@
+"""
+Pipeline de backup em fluxo: tar -> compressão -> criptografia -> arquivo.
+
+Os dados nunca são carregados inteiros em memória nem gravados em cópias
+intermediárias: cada camada recebe blocos da anterior e o consumo de memória
+fica limitado ao tamanho de um frame de criptografia.
+
+Compressão: zstd multithread quando ``zstandard`` está instalado; caso
+contrário, gzip.
+
+Criptografia: AES-256-GCM em frames de tamanho fixo. Formato::
+
+    cabeçalho : MAGICO (5 bytes) | prefixo do nonce (8 bytes)
+    frame     : tamanho (4 bytes, bit alto = último frame) | cifrado + tag
+
+O nonce de cada frame é o prefixo seguido do contador do frame, e o
+cabeçalho, o contador e a marca de último frame entram como dados
+autenticados: frames trocados de ordem, removidos ou truncados são
+detectados na leitura.
+
+Cada arquivo gravado tem um manifesto ao lado (``<arquivo>.manifest.json``)
+com metadados do backup e o SHA-256 de cada bloco armazenado, verificado
+antes de qualquer restauração.
+"""
+import base64
+import gzip
+import hashlib
+import io
+import json
+import os
+import struct
+import tarfile
+from datetime import datetime
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+try:
+    import zstandard
+    ZSTD_DISPONIVEL = True
+except ImportError:
+    ZSTD_DISPONIVEL = False
+
+
+MAGICO = b"CCBK1"
+TAMANHO_NONCE_PREFIXO = 8
+TAMANHO_TAG = 16
+ULTIMO_FRAME = 0x80000000
+TAMANHO_FRAME_PADRAO = 1024 * 1024
+TAMANHO_BLOCO_LEITURA = 1024 * 1024
+TAMANHO_BLOCO_CHECKSUM = 4 * 1024 * 1024
+SUFIXO_MANIFESTO = ".manifest.json"
+
+
+class BackupCorrompido(Exception):
+    """Arquivo de backup com formato inválido ou autenticação falha."""
+
+
+def derivar_chave(chave_mestra: bytes) -> bytes:
+    """
+    Deriva a chave AES-256 dos backups a partir da chave mestra.
+
+    Aceita a chave Fernet existente (base64) para que backups antigos e
+    novos compartilhem o mesmo arquivo ``.backup_key``.
+    """
+    try:
+        material = base64.urlsafe_b64decode(chave_mestra)
+    except (ValueError, TypeError):
+        material = chave_mestra
+    return HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=None,
+        info=b"ccontrol-backup-stream"
+    ).derive(material)
+
+
+class EscritorCifrado(io.RawIOBase):
+    """Stream de escrita que cifra os dados em frames AES-GCM."""
+
+    def __init__(self, destino: BinaryIO, chave: bytes, tamanho_frame: int = TAMANHO_FRAME_PADRAO):
+        """
+        Inicializa o escritor e grava o cabeçalho.
+
+        Args:
+            destino: Stream binário de saída (não é fechado pelo escritor)
+            chave: Chave AES de 32 bytes (ver ``derivar_chave``)
+            tamanho_frame: Bytes de texto claro por frame
+        """
+        super().__init__()
+        self._destino = destino
+        self._aead = AESGCM(chave)
+        self._tamanho_frame = tamanho_frame
+        self._buffer = bytearray()
+        self._contador = 0
+        self._cabecalho = MAGICO + os.urandom(TAMANHO_NONCE_PREFIXO)
+        destino.write(self._cabecalho)
+
+    def writable(self) -> bool:
+        return True
+
+    def _emitir(self, dados: bytes, ultimo: bool) -> None:
+        prefixo = self._cabecalho[len(MAGICO):]
+        nonce = prefixo + struct.pack(">I", self._contador)
+        aad = self._cabecalho + struct.pack(">I?", self._contador, ultimo)
+        cifrado = self._aead.encrypt(nonce, dados, aad)
+        self._destino.write(struct.pack(">I", len(cifrado) | (ULTIMO_FRAME if ultimo else 0)))
+        self._destino.write(cifrado)
+        self._contador += 1
+
+    def write(self, dados) -> int:
+        self._buffer += dados
+        while len(self._buffer) >= self._tamanho_frame:
+            self._emitir(bytes(self._buffer[:self._tamanho_frame]), False)
+            del self._buffer[:self._tamanho_frame]
+        return len(dados)
+
+    def close(self) -> None:
+        if not self.closed:
+            # O último frame (possivelmente vazio) marca o fim do fluxo
+            self._emitir(bytes(self._buffer), True)
+            self._buffer.clear()
+        super().close()
+
+
+class LeitorCifrado(io.RawIOBase):
+    """Stream de leitura que verifica e decifra frames de ``EscritorCifrado``."""
+
+    def __init__(self, origem: BinaryIO, chave: bytes):
+        super().__init__()
+        self._origem = origem
+        self._aead = AESGCM(chave)
+        self._cabecalho = origem.read(len(MAGICO) + TAMANHO_NONCE_PREFIXO)
+        if len(self._cabecalho) != len(MAGICO) + TAMANHO_NONCE_PREFIXO or not self._cabecalho.startswith(MAGICO):
+            raise BackupCorrompido("Cabeçalho de backup criptografado inválido")
+        self._contador = 0
+        self._pendente = b""
+        self._fim = False
+
+    def readable(self) -> bool:
+        return True
+
+    def _proximo_frame(self) -> bytes:
+        tamanho_bruto = self._origem.read(4)
+        if len(tamanho_bruto) != 4:
+            raise BackupCorrompido("Backup truncado: último frame ausente")
+        (valor,) = struct.unpack(">I", tamanho_bruto)
+        ultimo = bool(valor & ULTIMO_FRAME)
+        tamanho = valor & ~ULTIMO_FRAME
+        cifrado = self._origem.read(tamanho)
+        if len(cifrado) != tamanho or tamanho < TAMANHO_TAG:
+            raise BackupCorrompido("Backup truncado no meio de um frame")
+        prefixo = self._cabecalho[len(MAGICO):]
+        nonce = prefixo + struct.pack(">I", self._contador)
+        aad = self._cabecalho + struct.pack(">I?", self._contador, ultimo)
+        try:
+            dados = self._aead.decrypt(nonce, cifrado, aad)
+        except Exception as e:
+            raise BackupCorrompido(f"Falha de autenticação no frame {self._contador}") from e
+        self._contador += 1
+        self._fim = ultimo
+        return dados
+
+    def readinto(self, destino) -> int:
+        while not self._pendente and not self._fim:
+            self._pendente = self._proximo_frame()
+        n = min(len(destino), len(self._pendente))
+        destino[:n] = self._pendente[:n]
+        self._pendente = self._pendente[n:]
+        return n
+
+
+class EscritorComChecksum(io.RawIOBase):
+    """Repassa a escrita ao destino calculando SHA-256 total e por bloco."""
+
+    def __init__(self, destino: BinaryIO, tamanho_bloco: int = TAMANHO_BLOCO_CHECKSUM):
+        super().__init__()
+        self._destino = destino
+        self.tamanho_bloco = tamanho_bloco
+        self.tamanho = 0
+        self.blocos: List[str] = []
+        self._total = hashlib.sha256()
+        self._bloco = hashlib.sha256()
+        self._no_bloco = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, dados) -> int:
+        dados = memoryview(dados).cast("B")
+        escrito = len(dados)
+        self._destino.write(dados)
+        self._total.update(dados)
+        self.tamanho += escrito
+        while len(dados):
+            parte = dados[:self.tamanho_bloco - self._no_bloco]
+            self._bloco.update(parte)
+            self._no_bloco += len(parte)
+            dados = dados[len(parte):]
+            if self._no_bloco == self.tamanho_bloco:
+                self.blocos.append(self._bloco.hexdigest())
+                self._bloco = hashlib.sha256()
+                self._no_bloco = 0
+        return escrito
+
+    def resumo(self) -> Dict[str, Any]:
+        """Tamanho e checksums do que foi escrito."""
+        blocos = self.blocos + ([self._bloco.hexdigest()] if self._no_bloco else [])
+        return {
+            "tamanho": self.tamanho,
+            "sha256": self._total.hexdigest(),
+            "tamanho_bloco": self.tamanho_bloco,
+            "blocos": blocos,
+        }
+
+
+def sufixo_compressao() -> str:
+    """Extensão do formato de compressão disponível."""
+    return ".zst" if ZSTD_DISPONIVEL else ".gz"
+
+
+def abrir_compressor(destino: BinaryIO, nivel: int = 3, threads: int = 0) -> BinaryIO:
+    """
+    Stream de compressão sobre ``destino`` (que não é fechado junto).
+
+    Args:
+        destino: Stream de saída
+        nivel: Nível de compressão
+        threads: Threads do zstd (0 = todos os núcleos)
+    """
+    if ZSTD_DISPONIVEL:
+        compressor = zstandard.ZstdCompressor(level=nivel, threads=threads or -1)
+        return compressor.stream_writer(destino, closefd=False)
+    return gzip.GzipFile(fileobj=destino, mode="wb", compresslevel=min(max(nivel, 1), 9))
+
+
+def abrir_descompressor(origem: BinaryIO, caminho: str) -> BinaryIO:
+    """Stream de descompressão conforme a extensão do arquivo."""
+    if ".zst" in os.path.basename(caminho):
+        if not ZSTD_DISPONIVEL:
+            raise RuntimeError("Backup em zstd requer o pacote 'zstandard'")
+        return zstandard.ZstdDecompressor().stream_reader(origem, closefd=False)
+    if ".gz" in os.path.basename(caminho):
+        return gzip.GzipFile(fileobj=origem, mode="rb")
+    return origem
+
+
+def gravar_em_fluxo(
+    caminho: str,
+    produzir: Callable[[BinaryIO], None],
+    comprimir: bool = True,
+    chave: Optional[bytes] = None,
+    nivel: int = 3,
+    threads: int = 0,
+    tamanho_frame: int = TAMANHO_FRAME_PADRAO,
+    metadados: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Grava um backup passando o conteúdo por compressão e criptografia.
+
+    O arquivo é escrito como ``<caminho>.part`` e renomeado ao final, para
+    que um backup interrompido nunca pareça completo. O manifesto com os
+    checksums por bloco é gravado depois do arquivo.
+
+    Args:
+        caminho: Caminho base (as extensões de compressão/criptografia são acrescentadas)
+        produzir: Função que escreve o conteúdo no stream recebido
+        comprimir: Aplica compressão
+        chave: Chave AES (ver ``derivar_chave``); None grava sem criptografia
+        nivel: Nível de compressão
+        threads: Threads de compressão (0 = todos os núcleos)
+        tamanho_frame: Bytes por frame de criptografia
+        metadados: Dados adicionais do manifesto (ID do backup, categoria, ...)
+
+    Returns:
+        Caminho final do arquivo
+    """
+    final = caminho + (sufixo_compressao() if comprimir else "") + (".enc" if chave else "")
+    parcial = final + ".part"
+    try:
+        with open(parcial, "wb") as arquivo:
+            checksum = EscritorComChecksum(arquivo)
+            camadas: List[BinaryIO] = []
+            saida: BinaryIO = checksum
+            if chave:
+                saida = EscritorCifrado(saida, chave, tamanho_frame)
+                camadas.append(saida)
+            if comprimir:
+                saida = abrir_compressor(saida, nivel, threads)
+                camadas.append(saida)
+
+            produzir(saida)
+
+            # Fechar de fora para dentro: compressor antes da criptografia
+            for camada in reversed(camadas):
+                camada.close()
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(parcial, final)
+    except BaseException:
+        if os.path.exists(parcial):
+            os.remove(parcial)
+        raise
+
+    manifesto = {
+        **(metadados or {}),
+        "arquivo": os.path.basename(final),
+        "criado_em": datetime.now().isoformat(),
+        "compressao": (sufixo_compressao()[1:] if comprimir else None),
+        "criptografado": bool(chave),
+        **checksum.resumo(),
+    }
+    salvar_manifesto(final + SUFIXO_MANIFESTO, manifesto)
+    return final
+
+
+def verificar_integridade(caminho: str, manifesto: Dict[str, Any]) -> None:
+    """
+    Confere tamanho e checksums por bloco de um arquivo de backup.
+
+    Raises:
+        BackupCorrompido: Indicando o primeiro bloco divergente
+    """
+    tamanho_bloco = manifesto["tamanho_bloco"]
+    if os.path.getsize(caminho) != manifesto["tamanho"]:
+        raise BackupCorrompido(
+            f"{os.path.basename(caminho)}: tamanho {os.path.getsize(caminho)} "
+            f"difere do manifesto ({manifesto['tamanho']})"
+        )
+    total = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        for indice, esperado in enumerate(manifesto["blocos"]):
+            bloco = hashlib.sha256()
+            restante = tamanho_bloco
+            while restante and (dados := arquivo.read(min(restante, TAMANHO_BLOCO_LEITURA))):
+                bloco.update(dados)
+                total.update(dados)
+                restante -= len(dados)
+            if bloco.hexdigest() != esperado:
+                raise BackupCorrompido(f"{os.path.basename(caminho)}: bloco {indice} corrompido")
+    if total.hexdigest() != manifesto["sha256"]:
+        raise BackupCorrompido(f"{os.path.basename(caminho)}: checksum total divergente")
+
+
+def extrair_tar(caminho: str, destino: str, chave: Optional[bytes] = None, ignorar: Iterable[str] = ()) -> None:
+    """
+    Extrai em fluxo um tar gravado por ``gravar_em_fluxo``.
+
+    Usa o filtro ``data`` do ``tarfile`` (bloqueia caminhos absolutos,
+    ``..`` e links para fora do destino).
+
+    Args:
+        caminho: Arquivo de backup
+        destino: Diretório de extração
+        chave: Chave AES, se o backup for criptografado
+        ignorar: Nomes de membros a não extrair
+    """
+    ignorados = set(ignorar)
+    arquivo, conteudo = abrir_leitura(caminho, chave)
+    with arquivo, tarfile.open(fileobj=conteudo, mode="r|") as tar:
+        for membro in tar:
+            if membro.name not in ignorados:
+                tar.extract(membro, destino, filter="data")
+
+
+def abrir_leitura(caminho: str, chave: Optional[bytes] = None) -> Tuple[BinaryIO, BinaryIO]:
+    """
+    Abre um backup gerado por ``gravar_em_fluxo`` para leitura em fluxo.
+
+    Returns:
+        Tupla (arquivo bruto, stream de conteúdo); feche o arquivo bruto ao final
+    """
+    arquivo = open(caminho, "rb")
+    try:
+        origem: BinaryIO = arquivo
+        if caminho.endswith(".enc"):
+            if not chave:
+                raise ValueError("Backup criptografado exige a chave")
+            origem = io.BufferedReader(LeitorCifrado(origem, chave), TAMANHO_BLOCO_LEITURA)
+        return arquivo, abrir_descompressor(origem, caminho[:-4] if caminho.endswith(".enc") else caminho)
+    except BaseException:
+        arquivo.close()
+        raise
+
+
+def copiar_arquivo(origem: str) -> Callable[[BinaryIO], None]:
+    """Produtor que copia um arquivo existente em blocos."""
+    def produzir(saida: BinaryIO) -> None:
+        with open(origem, "rb") as entrada:
+            while bloco := entrada.read(TAMANHO_BLOCO_LEITURA):
+                saida.write(bloco)
+    return produzir
+
+
+def tar_em_fluxo(
+    entradas: Iterable[Tuple[str, str]],
+    filtro: Optional[Callable[[tarfile.TarInfo], Optional[tarfile.TarInfo]]] = None,
+    extras: Optional[Dict[str, bytes]] = None
+) -> Callable[[BinaryIO], None]:
+    """
+    Produtor que escreve um tar em modo stream (``w|``), sem seek.
+
+    Args:
+        entradas: Pares (caminho no disco, nome no arquivo)
+        filtro: Filtro do ``tarfile`` aplicado a cada entrada
+        extras: Arquivos adicionais gerados em memória (nome -> conteúdo)
+    """
+    def produzir(saida: BinaryIO) -> None:
+        with tarfile.open(fileobj=saida, mode="w|") as tar:
+            for caminho, nome in entradas:
+                tar.add(caminho, arcname=nome, filter=filtro)
+            for nome, conteudo in (extras or {}).items():
+                info = tarfile.TarInfo(nome)
+                info.size = len(conteudo)
+                info.mode = 0o644
+                tar.addfile(info, io.BytesIO(conteudo))
+    return produzir
+
+
+def hash_arquivo(caminho: str) -> str:
+    """SHA-256 de um arquivo lido em blocos."""
+    resumo = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        while bloco := arquivo.read(TAMANHO_BLOCO_LEITURA):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+
+def carregar_manifesto(caminho: str) -> Dict[str, Any]:
+    """Lê o manifesto de arquivos do último backup (vazio se inexistente)."""
+    try:
+        with open(caminho, "r", encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def salvar_manifesto(caminho: str, manifesto: Dict[str, Any]) -> None:
+    """Grava o manifesto de forma atômica."""
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(manifesto, arquivo)
+    os.replace(temporario, caminho)
+
+
+def comparar_com_manifesto(
+    raizes: Dict[str, str],
+    anterior: Dict[str, Dict[str, Any]],
+    ignorar: Optional[Callable[[str], bool]] = None
+) -> Tuple[Dict[str, Dict[str, Any]], List[Tuple[str, str]], List[str]]:
+    """
+    Compara os arquivos atuais com o manifesto anterior.
+
+    O hash só é recalculado quando ``mtime`` ou tamanho mudaram; um arquivo
+    apenas "tocado" (mesmo conteúdo) não entra no backup incremental.
+
+    Args:
+        raizes: Nome no arquivo -> diretório no disco
+        anterior: Manifesto anterior (nome -> {mtime_ns, tamanho, sha256})
+        ignorar: Função que recebe o nome no arquivo e indica se deve ser ignorado
+
+    Returns:
+        Tupla (novo manifesto, arquivos alterados (caminho, nome), nomes removidos)
+    """
+    atual: Dict[str, Dict[str, Any]] = {}
+    alterados: List[Tuple[str, str]] = []
+
+    for prefixo, raiz in raizes.items():
+        if not os.path.isdir(raiz):
+            continue
+        for diretorio, subdirs, arquivos in os.walk(raiz):
+            subdirs.sort()
+            for nome_arquivo in sorted(arquivos):
+                caminho = os.path.join(diretorio, nome_arquivo)
+                nome = os.path.join(prefixo, os.path.relpath(caminho, raiz)).replace(os.sep, "/")
+                if ignorar and ignorar(nome):
+                    continue
+                try:
+                    info = os.stat(caminho)
+                except FileNotFoundError:
+                    continue
+
+                registro = {"mtime_ns": info.st_mtime_ns, "tamanho": info.st_size}
+                antigo = anterior.get(nome)
+                if antigo and antigo.get("mtime_ns") == info.st_mtime_ns and antigo.get("tamanho") == info.st_size:
+                    registro["sha256"] = antigo.get("sha256")
+                else:
+                    registro["sha256"] = hash_arquivo(caminho)
+                    if not antigo or antigo.get("sha256") != registro["sha256"]:
+                        alterados.append((caminho, nome))
+                atual[nome] = registro
+
+    removidos = sorted(set(anterior) - set(atual))
+    return atual, alterados, removidos
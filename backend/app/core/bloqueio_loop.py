@@ -0,0 +1,277 @@
+"""
+Detector de bloqueios do event loop.
+
+Modo de instrumentação opcional (``LOOP_BLOCK_DETECTOR_ENABLED``) para
+encontrar código síncrono executado dentro de caminhos assíncronos.
+
+- Um callback de batimento é reagendado no loop a cada fração do limiar.
+- Uma thread vigia o último batimento; quando o atraso passa do limiar,
+  captura a pilha da thread do loop (``sys._current_frames``) enquanto o
+  bloqueio ainda está acontecendo.
+- Ao voltar, o batimento mede a duração total do bloqueio e o registra
+  junto com a pilha capturada e o template da rota da requisição ativa.
+
+As ocorrências são agregadas por (rota, origem) para o relatório top-N.
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from prometheus_client import Counter, Histogram
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Diretório do pacote ``app``: frames daqui são preferidos como origem do bloqueio
+_ESTE_ARQUIVO = os.path.abspath(__file__)
+_DIRETORIO_APP = os.path.dirname(os.path.dirname(_ESTE_ARQUIVO)) + os.sep
+
+LOOP_BLOQUEIOS = Counter(
+    'app_event_loop_blocks_total',
+    'Bloqueios do event loop acima do limiar',
+    ['rota']
+)
+LOOP_BLOQUEIO_DURACAO = Histogram(
+    'app_event_loop_block_seconds',
+    'Duração dos bloqueios do event loop acima do limiar',
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+ROTA_FORA_DE_REQUISICAO = "(fora de requisição)"
+
+
+def _rota_do_escopo(escopo: Dict[str, Any]) -> str:
+    """Template da rota (``GET /api/v1/contas-pagar/{id}``), nunca o path bruto."""
+    # O path bruto (com IDs) explodiria a cardinalidade do rótulo ``rota``
+    caminho = getattr(escopo.get("route"), "path", None) or "(sem rota)"
+    return f"{escopo.get('method', '')} {caminho}".strip()
+
+
+def _origem(pilha: List[traceback.FrameSummary]) -> str:
+    """Frame mais interno do código da aplicação (ou o mais interno da pilha)."""
+    for frame in reversed(pilha):
+        if frame.filename.startswith(_DIRETORIO_APP) and frame.filename != _ESTE_ARQUIVO:
+            caminho = frame.filename[len(_DIRETORIO_APP):]
+            return f"app/{caminho}:{frame.lineno} em {frame.name}"
+    if not pilha:
+        return "(desconhecida)"
+    frame = pilha[-1]
+    return f"{frame.filename}:{frame.lineno} em {frame.name}"
+
+
+class DetectorBloqueioLoop:
+    """Mede bloqueios do event loop e captura a pilha responsável."""
+
+    def __init__(
+        self,
+        limiar_segundos: Optional[float] = None,
+        profundidade_pilha: Optional[int] = None,
+        max_ocorrencias: Optional[int] = None
+    ):
+        """
+        Inicializa o detector.
+
+        Args:
+            limiar_segundos: Bloqueio mínimo registrado (padrão: ``LOOP_BLOCK_THRESHOLD``)
+            profundidade_pilha: Frames guardados por ocorrência (padrão: ``LOOP_BLOCK_STACK_DEPTH``)
+            max_ocorrencias: Ocorrências recentes mantidas (padrão: ``LOOP_BLOCK_MAX_EVENTS``)
+        """
+        self.limiar_segundos = limiar_segundos or settings.LOOP_BLOCK_THRESHOLD
+        self.profundidade_pilha = profundidade_pilha or settings.LOOP_BLOCK_STACK_DEPTH
+        self.intervalo_batimento = self.limiar_segundos / 4
+        self.recentes: deque = deque(maxlen=max_ocorrencias or settings.LOOP_BLOCK_MAX_EVENTS)
+        self.agregado: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._id_thread_loop: Optional[int] = None
+        self._ultimo_batimento = 0.0
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._thread: Optional[threading.Thread] = None
+        self._parar = threading.Event()
+        self._lock = threading.Lock()
+        self._captura: Optional[Dict[str, Any]] = None
+        # Tarefa asyncio -> escopo ASGI da requisição que ela atende
+        self._requisicoes: Dict[asyncio.Task, Dict[str, Any]] = {}
+
+    @property
+    def ativo(self) -> bool:
+        return self._thread is not None
+
+    # -- requisições --------------------------------------------------------
+
+    def entrar_requisicao(self, escopo: Dict[str, Any]) -> Optional[asyncio.Task]:
+        task = asyncio.current_task()
+        if task is not None:
+            self._requisicoes[task] = escopo
+        return task
+
+    def sair_requisicao(self, task: Optional[asyncio.Task]) -> None:
+        if task is not None:
+            self._requisicoes.pop(task, None)
+
+    # -- thread do loop -----------------------------------------------------
+
+    def _batimento(self) -> None:
+        agora = time.monotonic()
+        atraso = agora - self._ultimo_batimento - self.intervalo_batimento
+        self._ultimo_batimento = agora
+        with self._lock:
+            # Sempre descartada: uma captura sem bloqueio confirmado não vale para o próximo
+            captura, self._captura = self._captura, None
+        if atraso >= self.limiar_segundos:
+            self._registrar(atraso, captura)
+        self._handle = self._loop.call_later(self.intervalo_batimento, self._batimento)
+
+    def _registrar(self, duracao: float, captura: Optional[Dict[str, Any]]) -> None:
+        pilha = captura["pilha"] if captura else []
+        rota = captura["rota"] if captura else ROTA_FORA_DE_REQUISICAO
+        origem = _origem(pilha)
+        agora = datetime.now()
+
+        LOOP_BLOQUEIOS.labels(rota=rota).inc()
+        LOOP_BLOQUEIO_DURACAO.observe(duracao)
+
+        ocorrencia = {
+            "rota": rota,
+            "origem": origem,
+            "duracao_segundos": round(duracao, 4),
+            "ocorrido_em": agora.isoformat(),
+            "pilha": [f"{f.filename}:{f.lineno} em {f.name}" for f in pilha],
+        }
+        self.recentes.append(ocorrencia)
+
+        item = self.agregado.get((rota, origem))
+        if item is None:
+            item = self.agregado[(rota, origem)] = {
+                "rota": rota,
+                "origem": origem,
+                "ocorrencias": 0,
+                "total_segundos": 0.0,
+                "max_segundos": 0.0,
+            }
+        item["ocorrencias"] += 1
+        item["total_segundos"] += duracao
+        item["max_segundos"] = max(item["max_segundos"], duracao)
+        item["ultima_em"] = ocorrencia["ocorrido_em"]
+        item["pilha"] = ocorrencia["pilha"]
+
+        logger.warning(f"Event loop bloqueado por {duracao:.3f}s em {rota} ({origem})")
+
+    # -- thread vigia -------------------------------------------------------
+
+    def _capturar(self) -> Optional[Dict[str, Any]]:
+        frame = sys._current_frames().get(self._id_thread_loop)
+        if frame is None:
+            return None
+        pilha = traceback.extract_stack(frame)[-self.profundidade_pilha:]
+
+        task = asyncio.current_task(self._loop)
+        escopo = self._requisicoes.get(task) if task is not None else None
+        if escopo is not None:
+            rota = _rota_do_escopo(escopo)
+        elif task is not None:
+            # Nome da corrotina, e não da tarefa (``Task-123`` muda a cada execução)
+            rota = f"tarefa {getattr(task.get_coro(), '__qualname__', task.get_name())}"
+        else:
+            rota = ROTA_FORA_DE_REQUISICAO
+        return {"pilha": pilha, "rota": rota}
+
+    def _vigiar(self) -> None:
+        intervalo = self.limiar_segundos / 2
+        while not self._parar.wait(intervalo):
+            atraso = time.monotonic() - self._ultimo_batimento - self.intervalo_batimento
+            if atraso < self.limiar_segundos:
+                continue
+            with self._lock:
+                # Apenas a primeira amostra de cada bloqueio: é a que mostra onde ele começou
+                if self._captura is None:
+                    self._captura = self._capturar()
+
+    # -- ciclo de vida ------------------------------------------------------
+
+    def iniciar(self) -> None:
+        """Inicia o batimento no event loop atual e a thread vigia."""
+        if self.ativo:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._id_thread_loop = threading.get_ident()
+        self._ultimo_batimento = time.monotonic()
+        self._handle = self._loop.call_later(self.intervalo_batimento, self._batimento)
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._vigiar, name="detector-bloqueio-loop", daemon=True)
+        self._thread.start()
+        logger.info(f"Detector de bloqueios do event loop ativo (limiar {self.limiar_segundos * 1000:.0f}ms)")
+
+    def parar(self) -> None:
+        """Interrompe a detecção."""
+        if not self.ativo:
+            return
+        self._parar.set()
+        self._thread.join(timeout=1)
+        self._thread = None
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    # -- relatório ----------------------------------------------------------
+
+    def relatorio(self, limite: int = 20, ordenar_por: str = "total_segundos") -> Dict[str, Any]:
+        """
+        Retorna os maiores ofensores agregados por (rota, origem).
+
+        Args:
+            limite: Quantidade de itens no top-N
+            ordenar_por: ``total_segundos``, ``max_segundos`` ou ``ocorrencias``
+        """
+        itens = sorted(self.agregado.values(), key=lambda i: i[ordenar_por], reverse=True)[:limite]
+        return {
+            "ativo": self.ativo,
+            "limiar_segundos": self.limiar_segundos,
+            "total_ocorrencias": sum(i["ocorrencias"] for i in self.agregado.values()),
+            "top": [
+                {**i, "total_segundos": round(i["total_segundos"], 4), "max_segundos": round(i["max_segundos"], 4)}
+                for i in itens
+            ],
+            "recentes": list(self.recentes)[-limite:],
+        }
+
+    def limpar(self) -> None:
+        """Descarta as ocorrências acumuladas."""
+        self.recentes.clear()
+        self.agregado.clear()
+
+
+class BloqueioLoopMiddleware:
+    """
+    Middleware ASGI que associa a tarefa atual à requisição em andamento.
+
+    Deve ser o middleware mais interno: middlewares ``BaseHTTPMiddleware``
+    executam o restante da cadeia em outra tarefa, e o detector só
+    consegue atribuir o bloqueio à tarefa que de fato executa o endpoint.
+    """
+
+    def __init__(self, app, detector: Optional[DetectorBloqueioLoop] = None):
+        self.app = app
+        self.detector = detector or detector_bloqueio
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.detector.ativo:
+            await self.app(scope, receive, send)
+            return
+        task = self.detector.entrar_requisicao(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.detector.sair_requisicao(task)
+
+
+# Instância compartilhada pelo processo
+detector_bloqueio = DetectorBloqueioLoop()
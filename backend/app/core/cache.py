@@ -0,0 +1,122 @@
+"""
+Cache em memória (LRU com expiração opcional) para uso dentro do processo.
+
+Usado para índices e snapshots pequenos e muito acessados, onde uma ida ao
+Redis ou ao banco custaria mais do que o próprio cálculo. Cada worker mantém
+sua própria cópia; a invalidação entre workers deve ser feita pelo chamador
+(TTL curto ou carimbo de versão em armazenamento compartilhado).
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+
+_AUSENTE = object()
+
+
+class LRUCache:
+    """
+    Cache LRU limitado por quantidade de entradas, com TTL opcional.
+
+    As operações são O(1) e protegidas por lock, podendo ser usadas tanto
+    no event loop quanto em threads do pool.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """
+        Inicializa o cache.
+
+        Args:
+            maxsize: Quantidade máxima de entradas
+            ttl: Tempo de vida das entradas em segundos (None = sem expiração)
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize deve ser maior que zero")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._dados: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Obtém um valor, marcando-o como usado recentemente."""
+        with self._lock:
+            entrada = self._dados.get(key, _AUSENTE)
+            if entrada is _AUSENTE:
+                self.misses += 1
+                return default
+            valor, expira_em = entrada
+            if expira_em is not None and expira_em <= time.monotonic():
+                del self._dados[key]
+                self.misses += 1
+                return default
+            self._dados.move_to_end(key)
+            self.hits += 1
+            return valor
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Define um valor, removendo o menos usado se o limite for atingido."""
+        ttl = self.ttl if ttl is None else ttl
+        expira_em = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._dados[key] = (value, expira_em)
+            self._dados.move_to_end(key)
+            while len(self._dados) > self.maxsize:
+                self._dados.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Obtém o valor ou o calcula com ``factory`` e armazena."""
+        valor = self.get(key, _AUSENTE)
+        if valor is _AUSENTE:
+            valor = factory()
+            self.set(key, valor)
+        return valor
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove uma entrada e retorna seu valor."""
+        with self._lock:
+            entrada = self._dados.pop(key, _AUSENTE)
+        return default if entrada is _AUSENTE else entrada[0]
+
+    def pop_where(self, predicado: Callable[[Hashable], bool]) -> int:
+        """Remove todas as entradas cuja chave satisfaz o predicado."""
+        with self._lock:
+            chaves = [k for k in self._dados if predicado(k)]
+            for chave in chaves:
+                del self._dados[chave]
+        return len(chaves)
+
+    def clear(self) -> None:
+        """Remove todas as entradas."""
+        with self._lock:
+            self._dados.clear()
+
+    def keys(self) -> Iterator[Hashable]:
+        """Retorna uma cópia das chaves atuais."""
+        with self._lock:
+            return iter(list(self._dados.keys()))
+
+    def stats(self) -> Dict[str, Any]:
+        """Estatísticas de uso do cache."""
+        with self._lock:
+            tamanho = len(self._dados)
+        total = self.hits + self.misses
+        return {
+            "size": tamanho,
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits / total) if total else 0.0,
+        }
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _AUSENTE) is not _AUSENTE
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._dados)
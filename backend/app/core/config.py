@@ -1,4 +1,5 @@
 """Configurações do projeto."""
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 from pydantic import AnyHttpUrl, PostgresDsn, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -32,6 +33,7 @@ class Settings(BaseSettings):
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "postgres"
     POSTGRES_DB: str = "ccontrol"
+    POSTGRES_PORT: int = 5432
     SQLALCHEMY_DATABASE_URI: Optional[PostgresDsn] = None
     
     @model_validator(mode="before")
@@ -80,8 +82,17 @@ class Settings(BaseSettings):
         return values
     
     # Backup
+    PROJECT_ROOT: str = str(Path(__file__).resolve().parents[2])
     BACKUP_DIR: str = "backups"
     BACKUP_RETENTION_DAYS: int = 7
+    ENCRYPT_BACKUPS: bool = True
+    ENABLE_S3_BACKUP: bool = False
+    BACKUP_DB_JOBS: int = 4  # pg_dump -j (formato diretório)
+    BACKUP_COMPRESSION_LEVEL: int = 3
+    BACKUP_COMPRESSION_THREADS: int = 0  # 0 = todos os núcleos
+    BACKUP_FRAME_SIZE: int = 1024 * 1024  # bytes por frame de criptografia
+    BACKUP_INCREMENTAL_FILES: bool = True
+    BACKUP_FULL_EVERY: int = 7  # backup completo de arquivos a cada N execuções
     
     # Logs
     LOG_LEVEL: str = "INFO"
@@ -265,7 +265,12 @@ def register_sensitive_operation(user_id: int, resource_type: str, action: str)
 
 
 def monitor_system_resources() -> None:
-    """Atualiza métricas de recursos do sistema."""
+    """
+    Atualiza métricas de recursos do sistema (leitura avulsa, bloqueante).
+    
+    O ``/metrics`` não chama esta função: os valores são mantidos pelo
+    amostrador em segundo plano (``app.core.amostrador``).
+    """
     # Memória
     memory = psutil.virtual_memory()
     SYSTEM_MEMORY.set(memory.used)
@@ -282,8 +287,8 @@ async def metrics_endpoint() -> Response:
     Returns:
         Resposta com as métricas no formato Prometheus
     """
-    # Atualizar métricas de sistema antes de gerar resposta
-    monitor_system_resources()
+    # Recursos do sistema já foram coletados pelo amostrador em segundo plano;
+    # o scrape apenas serializa os valores atuais
     
     # Gerar métricas
     metrics = get_metrics_prometheus()
@@ -0,0 +1,120 @@
+"""
+Manutenção das tabelas particionadas por mês (``logs_sistema`` e ``auditoria``).
+
+As partições mensais seguem o padrão ``<tabela>_pAAAAMM`` e são criadas
+com antecedência pela função ``criar_particoes_mensais`` (ver migração
+``particionar_logs_auditoria``), de modo que a partição ``DEFAULT`` só
+receba linhas em situações excepcionais.
+
+Partições antigas podem ser desanexadas e arquivadas em CSV compactado
+(gzip) antes de serem removidas.
+"""
+import gzip
+import logging
+import os
+from datetime import date, datetime
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Tabelas particionadas por mês -> coluna de partição
+TABELAS_PARTICIONADAS: Dict[str, str] = {
+    "logs_sistema": "created_at",
+    "auditoria": "timestamp",
+}
+
+
+def nome_particao(tabela: str, mes: date) -> str:
+    """Nome da partição mensal de uma tabela (ex.: ``logs_sistema_p202510``)."""
+    return f"{tabela}_p{mes.year:04d}{mes.month:02d}"
+
+
+def tabela_particionada(session: Session, tabela: str) -> bool:
+    """Indica se a tabela existe e é particionada."""
+    return session.execute(
+        text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:tabela)"),
+        {"tabela": tabela}
+    ).scalar() is True
+
+
+def garantir_particoes_futuras(
+    session: Session,
+    meses_a_frente: Optional[int] = None,
+    hoje: Optional[date] = None
+) -> Dict[str, int]:
+    """
+    Cria as partições do mês atual e dos próximos meses, se ainda não existirem.
+
+    Args:
+        session: Sessão síncrona
+        meses_a_frente: Meses além do atual (padrão: ``PARTITION_MONTHS_AHEAD``)
+        hoje: Data de referência (padrão: hoje)
+
+    Returns:
+        Quantidade de partições criadas por tabela
+    """
+    meses = (meses_a_frente if meses_a_frente is not None else settings.PARTITION_MONTHS_AHEAD) + 1
+    inicio = (hoje or date.today()).replace(day=1)
+    criadas = {}
+    for tabela in TABELAS_PARTICIONADAS:
+        if not tabela_particionada(session, tabela):
+            continue
+        criadas[tabela] = session.execute(
+            text("SELECT criar_particoes_mensais(:tabela, :inicio, :meses)"),
+            {"tabela": tabela, "inicio": inicio, "meses": meses}
+        ).scalar() or 0
+        session.commit()
+        if criadas[tabela]:
+            logger.info(f"Particionamento: {criadas[tabela]} partições criadas em {tabela}")
+    return criadas
+
+
+def arquivar_particao(
+    session: Session,
+    tabela: str,
+    particao: str,
+    diretorio: Optional[str] = None
+) -> str:
+    """
+    Desanexa uma partição, exporta-a para CSV compactado e a remove.
+
+    O ``DETACH`` é confirmado antes da exportação para liberar a tabela mãe;
+    a partição só é removida depois que o arquivo foi gravado por completo.
+
+    Args:
+        session: Sessão síncrona (driver psycopg2)
+        tabela: Tabela particionada
+        particao: Partição a arquivar
+        diretorio: Destino dos arquivos (padrão: ``PARTITION_ARCHIVE_DIR``)
+
+    Returns:
+        Caminho do arquivo gerado
+    """
+    diretorio = diretorio or settings.PARTITION_ARCHIVE_DIR
+    if not diretorio:
+        raise ValueError("Diretório de arquivamento de partições não configurado")
+    os.makedirs(diretorio, exist_ok=True)
+    destino = os.path.join(diretorio, f"{particao}_{datetime.now():%Y%m%d%H%M%S}.csv.gz")
+
+    session.execute(text(f'ALTER TABLE "{tabela}" DETACH PARTITION "{particao}"'))
+    session.commit()
+
+    cursor = session.connection().connection.cursor()
+    try:
+        with gzip.open(destino, "wb") as arquivo:
+            cursor.copy_expert(f'COPY "{particao}" TO STDOUT WITH (FORMAT csv, HEADER)', arquivo)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+    finally:
+        cursor.close()
+
+    session.execute(text(f'DROP TABLE "{particao}"'))
+    session.commit()
+    logger.info(f"Particionamento: {particao} arquivada em {destino}")
+    return destino
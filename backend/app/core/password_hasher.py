@@ -0,0 +1,229 @@
+"""
+Hash e verificação de senhas fora do event loop.
+
+Cada hash bcrypt/argon2 consome centenas de milissegundos de CPU. Executá-lo
+diretamente em uma rota assíncrona congela todas as requisições do worker;
+por isso as operações são enviadas a um pool dedicado e limitado, com
+métricas de fila expostas ao Prometheus.
+
+O esquema padrão (bcrypt ou argon2id) e seus custos vêm das configurações.
+Hashes em esquema ou custo antigos continuam válidos e são regravados no
+próximo login bem-sucedido (``verify_and_update``).
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.config.settings import settings
+
+# logging padrão: app.utils importa este módulo via app.utils.security
+logger = logging.getLogger(__name__)
+
+try:
+    import argon2  # noqa: F401 - backend do passlib para argon2
+    ARGON2_DISPONIVEL = True
+except ImportError:
+    ARGON2_DISPONIVEL = False
+
+
+HASH_SENHA_PENDENTES = Gauge(
+    'password_hash_pending',
+    'Operações de hash de senha submetidas e ainda não concluídas'
+)
+
+HASH_SENHA_FILA = Gauge(
+    'password_hash_queue_depth',
+    'Operações de hash de senha aguardando um worker livre'
+)
+
+HASH_SENHA_DURACAO = Histogram(
+    'password_hash_duration_seconds',
+    'Tempo total (fila + CPU) das operações de hash de senha',
+    ['operacao'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10)
+)
+
+HASH_SENHA_REJEITADAS = Counter(
+    'password_hash_rejected_total',
+    'Operações de hash de senha rejeitadas por excesso de fila'
+)
+
+
+def criar_contexto_senhas(esquema: Optional[str] = None) -> CryptContext:
+    """
+    Cria o contexto do passlib conforme as configurações.
+
+    O esquema configurado é o padrão para novos hashes; os demais continuam
+    aceitos na verificação e são marcados como obsoletos (rehash no login).
+
+    Args:
+        esquema: ``bcrypt`` ou ``argon2`` (padrão: ``PASSWORD_HASH_SCHEME``)
+
+    Returns:
+        CryptContext configurado
+    """
+    esquema = (esquema or settings.PASSWORD_HASH_SCHEME).lower()
+    if esquema == "argon2" and not ARGON2_DISPONIVEL:
+        logger.warning("argon2-cffi não instalado; usando bcrypt para novos hashes de senha")
+        esquema = "bcrypt"
+
+    esquemas = ["bcrypt"]
+    if ARGON2_DISPONIVEL:
+        esquemas = ["argon2", "bcrypt"] if esquema == "argon2" else ["bcrypt", "argon2"]
+
+    opcoes: Dict[str, Any] = {
+        "bcrypt__default_rounds": settings.BCRYPT_ROUNDS,
+        "bcrypt__min_rounds": settings.BCRYPT_ROUNDS,
+    }
+    if ARGON2_DISPONIVEL:
+        opcoes.update({
+            "argon2__type": "ID",
+            "argon2__time_cost": settings.ARGON2_TIME_COST,
+            "argon2__memory_cost": settings.ARGON2_MEMORY_COST,
+            "argon2__parallelism": settings.ARGON2_PARALLELISM,
+        })
+
+    return CryptContext(schemes=esquemas, default=esquema, deprecated="auto", **opcoes)
+
+
+pwd_context = criar_contexto_senhas()
+
+
+def hash_senha(senha: str) -> str:
+    """Gera o hash de uma senha (bloqueante; prefira ``gerar_hash_senha_async``)."""
+    return pwd_context.hash(senha)
+
+
+def verificar_senha(senha: str, senha_hash: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica uma senha e indica se o hash precisa ser regravado (bloqueante).
+
+    Returns:
+        Tupla (senha válida, novo hash ou None se o atual estiver atualizado)
+    """
+    if not senha_hash:
+        return False, None
+    try:
+        return pwd_context.verify_and_update(senha, senha_hash)
+    except ValueError:
+        # Hash em formato desconhecido
+        return False, None
+
+
+class PoolSenhasSobrecarregado(Exception):
+    """Fila de hash de senhas acima do limite configurado."""
+
+
+class PoolHashSenhas:
+    """
+    Pool limitado para operações de hash de senha.
+
+    As operações rodam em threads (bcrypt e argon2 liberam o GIL) ou em
+    processos, conforme ``PASSWORD_HASH_POOL``. Quando há mais operações
+    pendentes do que ``max_pendentes``, novas chamadas são rejeitadas em vez
+    de formar uma fila sem limite.
+    """
+
+    def __init__(self, workers: int, max_pendentes: int, tipo: str = "thread"):
+        """
+        Inicializa o pool (o executor é criado na primeira operação).
+
+        Args:
+            workers: Quantidade de workers
+            max_pendentes: Máximo de operações em execução + em fila
+            tipo: ``thread`` ou ``process``
+        """
+        self.workers = max(1, workers)
+        self.max_pendentes = max(self.workers, max_pendentes)
+        self.tipo = tipo
+        self._executor: Optional[Executor] = None
+        self._pendentes = 0
+        self.rejeitadas = 0
+
+    def _obter_executor(self) -> Executor:
+        if self._executor is None:
+            if self.tipo == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="hash-senha"
+                )
+        return self._executor
+
+    def _atualizar_metricas(self) -> None:
+        HASH_SENHA_PENDENTES.set(self._pendentes)
+        HASH_SENHA_FILA.set(max(0, self._pendentes - self.workers))
+
+    async def _executar(self, operacao: str, funcao: Callable, *args) -> Any:
+        if self._pendentes >= self.max_pendentes:
+            self.rejeitadas += 1
+            HASH_SENHA_REJEITADAS.inc()
+            raise PoolSenhasSobrecarregado(
+                f"{self._pendentes} operações de senha pendentes (limite {self.max_pendentes})"
+            )
+
+        self._pendentes += 1
+        self._atualizar_metricas()
+        inicio = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._obter_executor(), funcao, *args)
+        finally:
+            self._pendentes -= 1
+            self._atualizar_metricas()
+            HASH_SENHA_DURACAO.labels(operacao=operacao).observe(time.perf_counter() - inicio)
+
+    async def hash(self, senha: str) -> str:
+        """Gera o hash de uma senha no pool."""
+        return await self._executar("hash", hash_senha, senha)
+
+    async def verificar(self, senha: str, senha_hash: str) -> Tuple[bool, Optional[str]]:
+        """Verifica uma senha no pool; ver ``verificar_senha``."""
+        return await self._executar("verificar", verificar_senha, senha, senha_hash)
+
+    def stats(self) -> Dict[str, Any]:
+        """Estado atual do pool para monitoramento."""
+        return {
+            "tipo": self.tipo,
+            "workers": self.workers,
+            "max_pendentes": self.max_pendentes,
+            "pendentes": self._pendentes,
+            "em_fila": max(0, self._pendentes - self.workers),
+            "rejeitadas": self.rejeitadas,
+            "esquema_padrao": pwd_context.default_scheme(),
+        }
+
+    def encerrar(self) -> None:
+        """Encerra o executor, aguardando operações em andamento."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+# Pool compartilhado pelo processo
+pool_senhas = PoolHashSenhas(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pendentes=settings.PASSWORD_HASH_MAX_PENDING,
+    tipo=settings.PASSWORD_HASH_POOL,
+)
+
+
+async def gerar_hash_senha_async(senha: str) -> str:
+    """Gera o hash de uma senha sem bloquear o event loop."""
+    return await pool_senhas.hash(senha)
+
+
+async def verificar_senha_async(senha: str, senha_hash: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica uma senha sem bloquear o event loop.
+
+    Returns:
+        Tupla (senha válida, novo hash a gravar ou None)
+    """
+    return await pool_senhas.verificar(senha, senha_hash)
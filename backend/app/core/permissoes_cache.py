@@ -0,0 +1,299 @@
+"""
+Snapshot compilado de permissões por (usuário, empresa).
+
+As permissões de um usuário em uma empresa são compiladas em um único
+inteiro usado como bitset de recurso × ação: cada recurso recebe uma faixa
+de ``MAX_ACOES`` bits e cada ação um deslocamento dentro da faixa. Verificar
+uma permissão é um teste de bit, sem ida ao banco.
+
+Os snapshots ficam em memória (LRU) em cada worker. Para invalidar entre
+workers, cada (usuário, empresa) tem um carimbo de versão no Redis,
+incrementado a cada alteração de permissão; o carimbo é conferido no máximo
+a cada ``PERMISSOES_VERSAO_INTERVALO`` segundos por snapshot. Sem Redis, os
+snapshots expiram após ``PERMISSOES_CACHE_TTL`` segundos.
+"""
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Mapping, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from app.config.settings import settings
+from app.core.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Ações com posição fixa no bitset; ações novas recebem as posições seguintes
+ACOES_PADRAO: Tuple[str, ...] = (
+    "listar", "visualizar", "criar", "editar", "excluir", "deletar",
+    "pagar", "cancelar", "dashboard", "exportar", "importar", "aprovar",
+)
+MAX_ACOES = 32
+ACAO_CURINGA = "*"
+
+# Versão de snapshots compilados a partir das claims do token (não do banco)
+VERSAO_CLAIMS = -1
+
+# Mapeamento dos campos booleanos do formato antigo de permissões
+_CAMPOS_BOOLEANOS = {
+    "pode_visualizar": "visualizar",
+    "pode_criar": "criar",
+    "pode_editar": "editar",
+    "pode_excluir": "excluir",
+}
+
+
+class IndicePermissoes:
+    """Atribui posições de bit a recursos e ações (por processo)."""
+
+    def __init__(self, acoes: Iterable[str] = ACOES_PADRAO):
+        self._recursos: Dict[str, int] = {}
+        self._acoes: Dict[str, int] = {acao: i for i, acao in enumerate(acoes)}
+        self._lock = threading.Lock()
+
+    def _registrar(self, tabela: Dict[str, int], chave: str, limite: Optional[int] = None) -> int:
+        with self._lock:
+            posicao = tabela.get(chave)
+            if posicao is None:
+                posicao = len(tabela)
+                if limite is not None and posicao >= limite:
+                    raise ValueError(f"Limite de {limite} ações distintas excedido ao registrar '{chave}'")
+                tabela[chave] = posicao
+            return posicao
+
+    def mascara_recurso(self, recurso: str) -> int:
+        """Máscara com todas as ações de um recurso (ação ``*``)."""
+        return ((1 << MAX_ACOES) - 1) << (self._registrar(self._recursos, recurso) * MAX_ACOES)
+
+    def bit(self, recurso: str, acao: str, registrar: bool = False) -> Optional[int]:
+        """
+        Posição do bit de um par recurso/ação.
+
+        Args:
+            recurso: Nome do recurso
+            acao: Nome da ação
+            registrar: Registra recurso/ação desconhecidos (compilação) em vez
+                       de retornar None (consulta)
+
+        Returns:
+            Posição do bit ou None se o par nunca foi registrado
+        """
+        if registrar:
+            r = self._registrar(self._recursos, recurso)
+            a = self._registrar(self._acoes, acao, MAX_ACOES)
+        else:
+            r = self._recursos.get(recurso)
+            a = self._acoes.get(acao)
+            if r is None or a is None:
+                return None
+        return r * MAX_ACOES + a
+
+
+indice_permissoes = IndicePermissoes()
+
+
+class SnapshotPermissoes(NamedTuple):
+    """Permissões compiladas de um usuário em uma empresa."""
+    bits: int
+    admin: bool
+    versao: int
+
+    def permite(self, recurso: str, acao: Optional[str] = None) -> bool:
+        """Indica se a ação (ou qualquer ação, se None) é permitida no recurso."""
+        if self.admin:
+            return True
+        if acao is None:
+            return bool(self.bits & indice_permissoes.mascara_recurso(recurso))
+        posicao = indice_permissoes.bit(recurso, acao)
+        return posicao is not None and bool((self.bits >> posicao) & 1)
+
+
+def compilar_permissoes(
+    pares: Iterable[Tuple[str, str]],
+    admin: bool = False,
+    versao: int = 0
+) -> SnapshotPermissoes:
+    """
+    Compila pares (recurso, ação) em um snapshot.
+
+    Args:
+        pares: Pares (recurso, ação); a ação ``*`` concede todas do recurso
+        admin: Se o usuário é administrador (acesso total)
+        versao: Carimbo de versão do qual o snapshot foi derivado
+
+    Returns:
+        SnapshotPermissoes
+    """
+    bits = 0
+    for recurso, acao in pares:
+        if acao == ACAO_CURINGA:
+            bits |= indice_permissoes.mascara_recurso(recurso)
+        else:
+            bits |= 1 << indice_permissoes.bit(recurso, acao, registrar=True)
+    return SnapshotPermissoes(bits=bits, admin=admin, versao=versao)
+
+
+def pares_de_permissoes(permissoes: Any) -> Iterable[Tuple[str, str]]:
+    """
+    Extrai pares (recurso, ação) dos formatos de permissão em uso.
+
+    Aceita as claims do token (``{recurso: [ações]}``), strings
+    ``"recurso:ação"``, objetos/dicts com ``recurso``/``acoes`` e o formato
+    antigo com ``modulo`` e ``pode_*``.
+    """
+    if not permissoes:
+        return
+    if isinstance(permissoes, Mapping):
+        for recurso, acoes in permissoes.items():
+            for acao in acoes or ():
+                yield recurso, acao
+        return
+    for perm in permissoes:
+        if isinstance(perm, str):
+            recurso, _, acao = perm.partition(":")
+            yield recurso, acao or ACAO_CURINGA
+            continue
+        obter = perm.get if isinstance(perm, Mapping) else lambda campo, _p=perm: getattr(_p, campo, None)
+        recurso = obter("recurso") or obter("modulo")
+        if not recurso:
+            continue
+        for acao in obter("acoes") or ():
+            yield recurso, acao
+        for campo, acao in _CAMPOS_BOOLEANOS.items():
+            if obter(campo):
+                yield recurso, acao
+
+
+async def _cliente_redis():
+    from app.deps.redis_deps import get_redis
+    async for cliente in get_redis():
+        return cliente
+
+
+class _Entrada(NamedTuple):
+    snapshot: SnapshotPermissoes
+    carregado_em: float
+    verificado_em: float
+
+
+Carregador = Callable[[], Awaitable[Tuple[bool, Iterable[Tuple[str, str]]]]]
+
+
+class PermissoesCache:
+    """Cache de snapshots por (usuário, empresa) com carimbo de versão no Redis."""
+
+    PREFIXO_VERSAO = "permissoes:versao"
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        intervalo_versao: float = 5,
+        ttl_sem_redis: float = 300,
+        obter_redis: Callable[[], Awaitable[Any]] = _cliente_redis
+    ):
+        """
+        Inicializa o cache.
+
+        Args:
+            maxsize: Quantidade máxima de snapshots em memória
+            intervalo_versao: Segundos entre conferências do carimbo no Redis
+            ttl_sem_redis: Idade máxima de um snapshot quando o Redis falha
+            obter_redis: Fábrica assíncrona do cliente Redis
+        """
+        self._snapshots = LRUCache(maxsize=maxsize)
+        self.intervalo_versao = intervalo_versao
+        self.ttl_sem_redis = ttl_sem_redis
+        self._obter_redis = obter_redis
+
+    def _chave_versao(self, id_usuario: UUID, id_empresa: UUID) -> str:
+        return f"{self.PREFIXO_VERSAO}:{id_empresa}:{id_usuario}"
+
+    async def _versao(self, id_usuario: UUID, id_empresa: UUID) -> Optional[int]:
+        """Carimbo atual no Redis (0 se nunca alterado; None se indisponível)."""
+        try:
+            cliente = await self._obter_redis()
+            valor = await cliente.get(self._chave_versao(id_usuario, id_empresa))
+            return int(valor or 0)
+        except Exception as e:
+            logger.warning(f"Carimbo de versão de permissões indisponível: {str(e)}")
+            return None
+
+    def snapshot_local(self, id_usuario: Any, id_empresa: Any) -> Optional[SnapshotPermissoes]:
+        """
+        Snapshot em memória, sem conferir versão (para verificações síncronas).
+
+        Snapshots mais antigos que ``ttl_sem_redis`` são ignorados.
+        """
+        entrada = self._snapshots.get((str(id_usuario), str(id_empresa)))
+        if entrada is None or time.monotonic() - entrada.carregado_em >= self.ttl_sem_redis:
+            return None
+        return entrada.snapshot
+
+    def armazenar(self, id_usuario: Any, id_empresa: Any, snapshot: SnapshotPermissoes) -> None:
+        """Guarda um snapshot já compilado."""
+        agora = time.monotonic()
+        self._snapshots.set((str(id_usuario), str(id_empresa)), _Entrada(snapshot, agora, agora))
+
+    async def obter(self, id_usuario: UUID, id_empresa: UUID, carregar: Carregador) -> SnapshotPermissoes:
+        """
+        Obtém o snapshot, recompilando-o se o carimbo de versão mudou.
+
+        Args:
+            id_usuario: ID do usuário
+            id_empresa: ID da empresa
+            carregar: Corrotina que retorna (admin, pares (recurso, ação)) do banco
+
+        Returns:
+            SnapshotPermissoes atualizado
+        """
+        chave = (str(id_usuario), str(id_empresa))
+        entrada: Optional[_Entrada] = self._snapshots.get(chave)
+        agora = time.monotonic()
+
+        if entrada and agora - entrada.verificado_em < self.intervalo_versao:
+            return entrada.snapshot
+
+        versao = await self._versao(id_usuario, id_empresa)
+        if entrada:
+            valido = (
+                entrada.snapshot.versao == versao
+                if versao is not None
+                else agora - entrada.carregado_em < self.ttl_sem_redis
+            )
+            if valido:
+                self._snapshots.set(chave, entrada._replace(verificado_em=agora))
+                return entrada.snapshot
+
+        admin, pares = await carregar()
+        snapshot = compilar_permissoes(pares, admin=admin, versao=versao if versao is not None else 0)
+        self._snapshots.set(chave, _Entrada(snapshot, agora, agora))
+        return snapshot
+
+    async def invalidar(self, id_usuario: UUID, id_empresa: UUID) -> None:
+        """
+        Incrementa o carimbo de versão e descarta o snapshot local.
+
+        Os demais workers recompilam na próxima conferência do carimbo.
+        """
+        self._snapshots.pop((str(id_usuario), str(id_empresa)))
+        try:
+            cliente = await self._obter_redis()
+            await cliente.incr(self._chave_versao(id_usuario, id_empresa))
+        except Exception as e:
+            logger.warning(f"Não foi possível incrementar a versão de permissões: {str(e)}")
+
+    def limpar(self) -> None:
+        """Descarta todos os snapshots locais."""
+        self._snapshots.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Estatísticas do cache para monitoramento."""
+        return self._snapshots.stats()
+
+
+# Instância compartilhada pelo processo
+permissoes_cache = PermissoesCache(
+    maxsize=settings.PERMISSOES_CACHE_SIZE,
+    intervalo_versao=settings.PERMISSOES_VERSAO_INTERVALO,
+    ttl_sem_redis=settings.PERMISSOES_CACHE_TTL,
+)
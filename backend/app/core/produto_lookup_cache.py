@@ -0,0 +1,130 @@
+"""
+Índice em memória de produtos por código e código de barras.
+
+Atende a leitura de itens no PDV: cada produto escaneado é resolvido pelo
+índice da empresa sem ida ao banco. O índice é aquecido na primeira consulta
+da empresa, atualizado pelas escritas do ``ProdutoRepository`` e limitado por
+LRU tanto na quantidade de empresas quanto na de produtos por empresa.
+"""
+from typing import Dict, Iterable, Optional
+from uuid import UUID
+
+from app.config.settings import settings
+from app.core.cache import LRUCache
+from app.schemas.produto import ProdutoResumo
+
+
+class _IndiceEmpresa:
+    """Índice de produtos de uma única empresa."""
+
+    __slots__ = ("por_id", "codigos")
+
+    def __init__(self, max_itens: int):
+        self.por_id = LRUCache(maxsize=max_itens)
+        self.codigos: Dict[str, UUID] = {}
+
+    def armazenar(self, resumo: ProdutoResumo) -> None:
+        self.remover(resumo.id_produto)
+        self.por_id.set(resumo.id_produto, resumo)
+        for codigo in (resumo.codigo, resumo.codigo_barras):
+            if codigo:
+                self.codigos[codigo] = resumo.id_produto
+
+    def remover(self, id_produto: UUID) -> None:
+        anterior = self.por_id.pop(id_produto)
+        if anterior is None:
+            return
+        for codigo in (anterior.codigo, anterior.codigo_barras):
+            if codigo and self.codigos.get(codigo) == id_produto:
+                del self.codigos[codigo]
+
+    def obter_por_codigo(self, codigo: str) -> Optional[ProdutoResumo]:
+        id_produto = self.codigos.get(codigo)
+        if id_produto is None:
+            return None
+        resumo = self.por_id.get(id_produto)
+        if resumo is None:
+            # Produto removido do LRU: descartar o código órfão
+            self.codigos.pop(codigo, None)
+        return resumo
+
+
+class ProdutoLookupCache:
+    """Índice por empresa de ``codigo``/``codigo_barras`` → ``ProdutoResumo``."""
+
+    def __init__(self, max_empresas: int = 64, max_itens: int = 50000, ttl: Optional[float] = 300):
+        """
+        Inicializa o índice.
+
+        Args:
+            max_empresas: Quantidade máxima de empresas mantidas em memória
+            max_itens: Quantidade máxima de produtos por empresa
+            ttl: Segundos até o índice de uma empresa ser reaquecido; limita a
+                 defasagem em relação a escritas feitas por outros workers
+        """
+        self.max_itens = max_itens
+        self._empresas = LRUCache(maxsize=max_empresas, ttl=ttl)
+
+    def aquecido(self, id_empresa: UUID) -> bool:
+        """Indica se o índice da empresa já foi carregado."""
+        return id_empresa in self._empresas
+
+    def aquecer(self, id_empresa: UUID, resumos: Iterable[ProdutoResumo]) -> int:
+        """
+        Substitui o índice da empresa pelos produtos informados.
+
+        Returns:
+            int: Quantidade de produtos indexados
+        """
+        indice = _IndiceEmpresa(self.max_itens)
+        for resumo in resumos:
+            indice.armazenar(resumo)
+        self._empresas.set(id_empresa, indice)
+        return len(indice.por_id)
+
+    def obter_por_codigo(self, id_empresa: UUID, codigo: str) -> Optional[ProdutoResumo]:
+        """Resolve um código ou código de barras; None indica ausência no índice."""
+        indice = self._empresas.get(id_empresa)
+        return indice.obter_por_codigo(codigo) if indice else None
+
+    def obter_por_id(self, id_empresa: UUID, id_produto: UUID) -> Optional[ProdutoResumo]:
+        """Obtém o resumo de um produto pelo ID; None indica ausência no índice."""
+        indice = self._empresas.get(id_empresa)
+        return indice.por_id.get(id_produto) if indice else None
+
+    def armazenar(self, resumo: ProdutoResumo) -> None:
+        """Insere ou substitui um produto no índice da empresa, se aquecido."""
+        indice = self._empresas.get(resumo.id_empresa)
+        if indice:
+            indice.armazenar(resumo)
+
+    def atualizar_estoque(self, id_empresa: UUID, id_produto: UUID, estoque_atual) -> None:
+        """Atualiza apenas o estoque de um produto indexado."""
+        resumo = self.obter_por_id(id_empresa, id_produto)
+        if resumo:
+            self.armazenar(resumo.model_copy(update={"estoque_atual": estoque_atual}))
+
+    def remover(self, id_empresa: UUID, id_produto: UUID) -> None:
+        """Remove um produto do índice da empresa."""
+        indice = self._empresas.get(id_empresa)
+        if indice:
+            indice.remover(id_produto)
+
+    def limpar(self, id_empresa: Optional[UUID] = None) -> None:
+        """Descarta o índice de uma empresa ou de todas."""
+        if id_empresa is None:
+            self._empresas.clear()
+        else:
+            self._empresas.pop(id_empresa)
+
+    def stats(self) -> Dict[str, object]:
+        """Estatísticas do índice para monitoramento."""
+        return {"empresas": self._empresas.stats()}
+
+
+# Instância compartilhada pelo processo
+produto_lookup_cache = ProdutoLookupCache(
+    max_empresas=settings.PRODUTO_LOOKUP_MAX_EMPRESAS,
+    max_itens=settings.PRODUTO_LOOKUP_MAX_ITENS,
+    ttl=settings.PRODUTO_LOOKUP_TTL,
+)
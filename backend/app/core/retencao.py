@@ -0,0 +1,281 @@
+"""
+Retenção de dados históricos (logs e auditoria) em lotes.
+
+Em vez de carregar as linhas expiradas para a memória e removê-las uma a
+uma, a remoção é feita no banco em lotes limitados::
+
+    DELETE FROM tabela
+    WHERE (tableoid, ctid) IN (SELECT tableoid, ctid FROM tabela WHERE ... LIMIT n)
+
+Cada lote é uma transação curta, com pausa entre lotes para não disputar
+I/O e locks com a aplicação, e um tempo máximo por execução (o restante
+fica para a próxima). Em tabelas particionadas por data, partições inteiras
+abaixo do limite são removidas com ``DROP TABLE``, sem varrer linhas (ou
+desanexadas e arquivadas, se ``PARTITION_ARCHIVE_DIR`` estiver definido).
+"""
+import logging
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+from uuid import UUID
+
+from prometheus_client import Counter
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.core.particionamento import arquivar_particao
+
+logger = logging.getLogger(__name__)
+
+
+RETENCAO_LINHAS_REMOVIDAS = Counter(
+    'retention_rows_deleted_total',
+    'Linhas removidas pela retenção de dados',
+    ['tabela']
+)
+
+RETENCAO_PARTICOES_REMOVIDAS = Counter(
+    'retention_partitions_dropped_total',
+    'Partições removidas pela retenção de dados',
+    ['tabela']
+)
+
+
+class PoliticaRetencao(NamedTuple):
+    """Política de retenção de uma tabela."""
+    tabela: str
+    coluna_data: str
+    coluna_empresa: str
+    dias: int
+
+
+def politicas_configuradas() -> List[PoliticaRetencao]:
+    """Políticas ativas conforme as configurações (dias <= 0 desativa)."""
+    politicas = [
+        PoliticaRetencao("logs_sistema", "created_at", "id_empresa", settings.LOG_RETENTION_DAYS),
+        PoliticaRetencao("auditoria", "timestamp", "empresa_id", settings.AUDITORIA_RETENTION_DAYS),
+    ]
+    return [p for p in politicas if p.dias > 0]
+
+
+def sql_excluir_lote(
+    tabela: str,
+    coluna_data: Optional[str] = None,
+    coluna_empresa: Optional[str] = None
+):
+    """
+    Monta o ``DELETE`` de um lote.
+
+    ``tableoid`` acompanha o ``ctid`` porque em tabelas particionadas o
+    ``ctid`` só é único dentro de cada partição.
+
+    Args:
+        tabela: Tabela alvo (nome confiável, vindo das políticas)
+        coluna_data: Se informada, remove apenas linhas com ``coluna < :limite``
+        coluna_empresa: Se informada, restringe a ``coluna = :id_empresa``
+
+    Returns:
+        Cláusula SQL com os parâmetros ``:lote``, ``:limite`` e ``:id_empresa``
+    """
+    condicoes = []
+    if coluna_data:
+        condicoes.append(f"{coluna_data} < :limite")
+    if coluna_empresa:
+        condicoes.append(f"{coluna_empresa} = :id_empresa")
+    where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+    return text(f"""
+        DELETE FROM {tabela}
+        WHERE (tableoid, ctid) IN (
+            SELECT tableoid, ctid FROM {tabela} {where} LIMIT :lote
+        )
+    """)
+
+
+SQL_PARTICOES = text("""
+    SELECT filha.relname AS particao,
+           pg_get_expr(filha.relpartbound, filha.oid) AS limites
+    FROM pg_inherits heranca
+    JOIN pg_class filha ON filha.oid = heranca.inhrelid
+    JOIN pg_class mae ON mae.oid = heranca.inhparent
+    WHERE mae.relname = :tabela
+""")
+
+_LIMITE_SUPERIOR = re.compile(r"TO \('([^']+)'\)")
+
+
+def limite_superior_particao(limites: Optional[str]) -> Optional[datetime]:
+    """Extrai o limite superior (exclusivo) de ``FOR VALUES FROM (...) TO (...)``."""
+    encontrado = _LIMITE_SUPERIOR.search(limites or "")
+    if not encontrado:
+        return None
+    try:
+        return datetime.fromisoformat(encontrado.group(1))
+    except ValueError:
+        return None
+
+
+async def excluir_em_lotes(
+    session: AsyncSession,
+    tabela: str,
+    coluna_data: Optional[str] = None,
+    limite: Optional[datetime] = None,
+    coluna_empresa: Optional[str] = None,
+    id_empresa: Optional[UUID] = None,
+    tamanho_lote: Optional[int] = None
+) -> int:
+    """
+    Remove linhas em lotes usando uma sessão assíncrona (uso em requisições).
+
+    Cada lote é confirmado separadamente.
+
+    Returns:
+        Quantidade de linhas removidas
+    """
+    tamanho_lote = tamanho_lote or settings.RETENTION_BATCH_SIZE
+    sql = sql_excluir_lote(
+        tabela,
+        coluna_data if limite is not None else None,
+        coluna_empresa if id_empresa is not None else None
+    )
+    parametros = {"lote": tamanho_lote, "limite": limite, "id_empresa": id_empresa}
+
+    total = 0
+    while True:
+        result = await session.execute(sql, parametros)
+        await session.commit()
+        removidas = result.rowcount or 0
+        total += removidas
+        RETENCAO_LINHAS_REMOVIDAS.labels(tabela=tabela).inc(removidas)
+        if removidas < tamanho_lote:
+            return total
+
+
+class MotorRetencao:
+    """
+    Executa as políticas de retenção com sessões síncronas.
+
+    Pensado para rodar fora do event loop (agendador em thread), com pausa
+    entre lotes e tempo máximo por execução.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        tamanho_lote: Optional[int] = None,
+        pausa_segundos: Optional[float] = None,
+        duracao_maxima: Optional[float] = None
+    ):
+        """
+        Inicializa o motor.
+
+        Args:
+            session_factory: Fábrica de sessões síncronas (padrão: ``SessionLocal``)
+            tamanho_lote: Linhas por lote (padrão: ``RETENTION_BATCH_SIZE``)
+            pausa_segundos: Pausa entre lotes (padrão: ``RETENTION_BATCH_PAUSE_MS``)
+            duracao_maxima: Segundos máximos por execução (padrão: ``RETENTION_MAX_SECONDS``)
+        """
+        if session_factory is None:
+            from app.database import SessionLocal
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+        self.tamanho_lote = tamanho_lote or settings.RETENTION_BATCH_SIZE
+        self.pausa_segundos = (
+            pausa_segundos if pausa_segundos is not None
+            else settings.RETENTION_BATCH_PAUSE_MS / 1000
+        )
+        self.duracao_maxima = duracao_maxima or settings.RETENTION_MAX_SECONDS
+        self.progresso: Dict[str, Dict[str, Any]] = {}
+
+    def _remover_particoes(self, session: Session, politica: PoliticaRetencao, limite: datetime) -> List[str]:
+        """
+        Remove partições cujo limite superior é anterior ao limite de retenção.
+
+        Com ``PARTITION_ARCHIVE_DIR`` definido, cada partição é arquivada em
+        CSV compactado antes de ser removida.
+        """
+        removidas = []
+        for linha in session.execute(SQL_PARTICOES, {"tabela": politica.tabela}).all():
+            superior = limite_superior_particao(linha.limites)
+            if superior is not None and superior <= limite:
+                if settings.PARTITION_ARCHIVE_DIR:
+                    arquivar_particao(session, politica.tabela, linha.particao)
+                else:
+                    session.execute(text(f'DROP TABLE IF EXISTS "{linha.particao}"'))
+                    session.commit()
+                removidas.append(linha.particao)
+                RETENCAO_PARTICOES_REMOVIDAS.labels(tabela=politica.tabela).inc()
+                logger.info(f"Retenção: partição {linha.particao} removida ({politica.tabela})")
+        return removidas
+
+    def executar_politica(self, politica: PoliticaRetencao, agora: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Aplica uma política: remove partições expiradas e, em seguida, as
+        linhas restantes em lotes.
+
+        Returns:
+            Progresso final (linhas, lotes, partições, duração, se foi interrompida)
+        """
+        inicio = time.monotonic()
+        limite = (agora or datetime.now()) - timedelta(days=politica.dias)
+        progresso = self.progresso[politica.tabela] = {
+            "tabela": politica.tabela,
+            "limite": limite.isoformat(),
+            "em_execucao": True,
+            "linhas_removidas": 0,
+            "lotes": 0,
+            "particoes_removidas": [],
+            "interrompida": False,
+            "duracao_segundos": 0.0,
+        }
+
+        sql = sql_excluir_lote(politica.tabela, politica.coluna_data)
+        parametros = {"lote": self.tamanho_lote, "limite": limite}
+
+        try:
+            with self.session_factory() as session:
+                progresso["particoes_removidas"] = self._remover_particoes(session, politica, limite)
+
+                while True:
+                    removidas = session.execute(sql, parametros).rowcount or 0
+                    session.commit()
+
+                    progresso["linhas_removidas"] += removidas
+                    progresso["lotes"] += 1
+                    RETENCAO_LINHAS_REMOVIDAS.labels(tabela=politica.tabela).inc(removidas)
+
+                    if progresso["lotes"] % 20 == 0:
+                        logger.info(
+                            f"Retenção {politica.tabela}: {progresso['linhas_removidas']} linhas "
+                            f"em {progresso['lotes']} lotes"
+                        )
+
+                    if removidas < self.tamanho_lote:
+                        break
+                    if time.monotonic() - inicio >= self.duracao_maxima:
+                        progresso["interrompida"] = True
+                        logger.info(f"Retenção {politica.tabela}: tempo máximo atingido, continua na próxima execução")
+                        break
+                    if self.pausa_segundos:
+                        time.sleep(self.pausa_segundos)
+        finally:
+            progresso["em_execucao"] = False
+            progresso["duracao_segundos"] = round(time.monotonic() - inicio, 3)
+
+        logger.info(
+            f"Retenção {politica.tabela} concluída: {progresso['linhas_removidas']} linhas, "
+            f"{len(progresso['particoes_removidas'])} partições, {progresso['duracao_segundos']}s"
+        )
+        return progresso
+
+    def executar(self, politicas: Optional[List[PoliticaRetencao]] = None) -> List[Dict[str, Any]]:
+        """Aplica todas as políticas (padrão: ``politicas_configuradas()``)."""
+        resultados = []
+        for politica in politicas if politicas is not None else politicas_configuradas():
+            try:
+                resultados.append(self.executar_politica(politica))
+            except Exception as e:
+                logger.error(f"Erro na retenção de {politica.tabela}: {str(e)}")
+        return resultados
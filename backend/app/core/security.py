@@ -4,13 +4,12 @@ from typing import Any, Dict, Optional, Union
 from fastapi import Depends, Request, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from pydantic import ValidationError
 
 from app.config.settings import settings
+from app.core.password_hasher import pwd_context
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
@@ -1,7 +1,8 @@
 """Dependências para injeção nas rotas do FastAPI."""
 from datetime import datetime, timedelta
-from typing import Optional, Union, Any, Dict, Callable
+from typing import Optional, Union, Any, Dict, Callable, List
 from functools import wraps
+import uuid
 
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
@@ -13,6 +14,7 @@ from app.config.settings import settings
 from app.database import db_async_session, get_db
 from app.schemas.token import TokenPayload
 from app.core.auth_helpers import OAuth2PasswordBearerWithExceptions
+from app.utils.permissions import verify_permission
 
 # Definir caminhos que não exigem autenticação
 PUBLIC_PATHS = [
@@ -83,8 +85,9 @@ async def get_current_user(
         # Retornar dados do usuário
         return {
             "id_usuario": token_data.sub,
-            "id_empresa": token_data.id_empresa,
+            "id_empresa": token_data.empresa_id,
             "tipo_usuario": token_data.tipo_usuario,
+            "permissoes": token_data.permissoes,
             "sub": token_data.sub,
             "exp": token_data.exp
         }
@@ -100,7 +103,8 @@ def create_access_token(
     subject: Union[str, Any],
     empresa_id: Union[str, Any],
     tipo_usuario: str,
-    expires_delta: Optional[timedelta] = None
+    expires_delta: Optional[timedelta] = None,
+    permissoes: Optional[Dict[str, List[str]]] = None
 ) -> str:
     """
     Cria um token JWT de acesso.
@@ -110,6 +114,8 @@ def create_access_token(
         empresa_id: ID da empresa do usuário
         tipo_usuario: Tipo de usuário
         expires_delta: Tempo de expiração personalizado
+        permissoes: Permissões na empresa (recurso -> ações), embutidas no
+                    token para que as rotas não precisem consultar o banco
         
     Returns:
         str: Token JWT gerado
@@ -123,11 +129,15 @@ def create_access_token(
     
     # Definir os dados do payload
     to_encode = {
-        "exp": expire.timestamp(),
+        "exp": int(expire.timestamp()),
         "sub": str(subject),
+        "empresa_id": str(empresa_id) if empresa_id else None,
         "id_empresa": str(empresa_id) if empresa_id else None,
-        "tipo_usuario": tipo_usuario
+        "tipo_usuario": tipo_usuario,
+        "jti": uuid.uuid4().hex
     }
+    if permissoes is not None:
+        to_encode["permissoes"] = permissoes
     
     # Codificar o token
     encoded_jwt = jwt.encode(
@@ -155,9 +165,18 @@ def check_permission(permission: str):
         if settings.is_development:
             return True
         
-        # Em produção, implementar a verificação de permissão adequada
-        # (Esta parte seria implementada conforme a lógica real de permissões)
-        return True
+        # Tokens antigos não trazem claims de permissão
+        if current_user.get("permissoes") is None:
+            return True
+        
+        if verify_permission(current_user, permission):
+            return True
+        
+        recurso, _, acao = permission.partition(":")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Sem permissão para {acao} em {recurso}"
+        )
     
     return dependency
 
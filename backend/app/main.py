@@ -69,9 +69,35 @@ async def lifespan(app: FastAPI):
     log_with_context(logger, "info", f"Iniciando aplicação {settings.APP_NAME} v{settings.APP_VERSION} no ambiente {settings.APP_ENV}", 
                 request_id=request_id)
     
+    # Amostragem de recursos em segundo plano para o /metrics
+    from app.core.amostrador import amostrador
+    if settings.ENABLE_METRICS:
+        amostrador.iniciar()
+    
+    # Detector de bloqueios do event loop (modo de instrumentação)
+    from app.core.bloqueio_loop import detector_bloqueio
+    if settings.LOOP_BLOCK_DETECTOR_ENABLED:
+        detector_bloqueio.iniciar()
+    
+    # Agendador de tarefas periódicas no próprio event loop
+    from app.core.agendador import agendador
+    scheduler_enabled = settings.SCHEDULER_ENABLED and not settings.is_testing
+    if scheduler_enabled:
+        from app.scripts.schedule_monitors import register_default_tasks
+        register_default_tasks(agendador)
+        await agendador.iniciar()
+    
     yield
     # Código de encerramento - executa quando o servidor é desligado
     log_with_context(logger, "info", "Encerrando aplicação", request_id="shutdown")
+    
+    if scheduler_enabled:
+        await agendador.parar()
+    await amostrador.parar()
+    detector_bloqueio.parar()
+
+    from app.core.password_hasher import pool_senhas
+    pool_senhas.encerrar()
 
 # Criar aplicação FastAPI
 app = FastAPI(
@@ -92,6 +118,12 @@ try:
 except Exception as e:
     logger.error(f"Erro ao montar diretório estático: {str(e)}", extra={"request_id": "startup"})
 
+# Detector de bloqueios do event loop (opcional). Registrado antes dos demais
+# para ser o middleware mais interno e rodar na mesma tarefa do endpoint
+if settings.LOOP_BLOCK_DETECTOR_ENABLED:
+    from app.core.bloqueio_loop import BloqueioLoopMiddleware
+    app.add_middleware(BloqueioLoopMiddleware)
+
 # Middleware para adicionar request_id às requisições
 @app.middleware("http")
 async def request_id_middleware(request: Request, call_next):
@@ -7,6 +7,7 @@ from app.models.cliente import Cliente
 from app.models.fornecedor import Fornecedor
 from app.models.categoria import Categoria
 from app.models.produto import Produto
+from app.models.movimentacao_estoque import MovimentacaoEstoque
 from app.models.compra import Compra, ItemCompra
 from app.models.venda import Venda, ItemVenda
 from app.models.parcela import Parcela, ParcelaCompra, ParcelaVenda
@@ -16,6 +17,8 @@ from app.models.permissao_usuario import PermissaoUsuario
 from app.models.lancamento import Lancamento
 from app.models.centro_custo import CentroCusto
 from app.models.conta_bancaria import ContaBancaria
+from app.models.movimentacao_conta import MovimentacaoConta
+from app.models.kpi_mensal import KpiMensal
 from app.models.forma_pagamento import FormaPagamento
 from app.models.enums import TipoLancamento, StatusLancamento, StatusVenda, StatusParcela
 from app.models.auditoria import Auditoria
@@ -30,6 +33,7 @@ __all__ = [
     "Fornecedor", 
     "Categoria",
     "Produto",
+    "MovimentacaoEstoque",
     "Compra", 
     "ItemCompra", 
     "Venda", 
@@ -43,6 +47,8 @@ __all__ = [
     "Lancamento",
     "CentroCusto",
     "ContaBancaria",
+    "MovimentacaoConta",
+    "KpiMensal",
     "FormaPagamento",
     "TipoLancamento",
     "StatusLancamento",
@@ -0,0 +1,35 @@
+"""Modelo para os indicadores mensais consolidados por empresa."""
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, Numeric, UUID
+
+from app.database import Base
+
+
+class KpiMensal(Base):
+    """
+    Indicadores de um mês de uma empresa, mantidos pelo refresh incremental.
+
+    Gatilhos em lançamentos, vendas, clientes e fornecedores marcam em
+    ``kpi_mensal_pendente`` os meses afetados por cada escrita; a tarefa
+    agendada recalcula apenas esses meses. As quantidades de clientes e
+    fornecedores são o total da empresa no último recálculo do mês.
+    """
+    __tablename__ = "kpi_mensal"
+
+    id_empresa = Column(UUID(as_uuid=True), ForeignKey("empresas.id_empresa", ondelete="CASCADE"), primary_key=True)
+    mes = Column(Date, primary_key=True)  # primeiro dia do mês
+    receitas = Column(Numeric(18, 2), nullable=False, default=0)
+    despesas = Column(Numeric(18, 2), nullable=False, default=0)
+    saldo = Column(Numeric(18, 2), nullable=False, default=0)
+    quantidade_lancamentos = Column(Integer, nullable=False, default=0)
+    quantidade_vendas = Column(Integer, nullable=False, default=0)
+    total_vendas = Column(Numeric(18, 2), nullable=False, default=0)
+    ticket_medio_vendas = Column(Numeric(18, 2), nullable=False, default=0)
+    quantidade_clientes = Column(Integer, nullable=False, default=0)
+    quantidade_fornecedores = Column(Integer, nullable=False, default=0)
+    atualizado_em = Column(DateTime, default=datetime.now, nullable=False)
+
+    def __repr__(self) -> str:
+        """Representação em string do indicador mensal."""
+        return f"<KpiMensal(empresa={self.id_empresa}, mes={self.mes}, saldo={self.saldo})>"
@@ -0,0 +1,38 @@
+"""Modelo para o diário de movimentações de contas bancárias."""
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Column, String, Float, ForeignKey, DateTime, UUID, Index
+
+from app.database import Base
+
+
+class MovimentacaoConta(Base):
+    """
+    Modelo de movimentação de conta bancária.
+    
+    Registro somente de inclusão com cada crédito, débito ou ajuste aplicado
+    ao ``saldo_atual`` de uma conta, incluindo o saldo resultante. Vale sempre
+    ``saldo_atual = saldo_inicial + soma(valor)``, o que permite conferir ou
+    reconstruir os saldos a partir do diário.
+    """
+    __tablename__ = "movimentacoes_conta"
+    
+    id_movimentacao = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id_empresa = Column(UUID(as_uuid=True), ForeignKey("empresas.id_empresa", ondelete="CASCADE"), nullable=False)
+    id_conta = Column(UUID(as_uuid=True), ForeignKey("contas_bancarias.id_conta", ondelete="CASCADE"), nullable=False)
+    id_lancamento = Column(UUID(as_uuid=True), ForeignKey("lancamentos.id_lancamento", ondelete="SET NULL"), nullable=True)
+    tipo = Column(String(20), nullable=False)
+    valor = Column(Float, nullable=False)
+    saldo_resultante = Column(Float, nullable=False)
+    observacao = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_movimentacoes_conta_conta_data", "id_conta", "created_at"),
+        Index("ix_movimentacoes_conta_empresa_data", "id_empresa", "created_at"),
+    )
+    
+    def __repr__(self) -> str:
+        """Representação em string da movimentação."""
+        return f"<MovimentacaoConta(conta={self.id_conta}, tipo='{self.tipo}', valor={self.valor})>"
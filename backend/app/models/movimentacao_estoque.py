@@ -0,0 +1,36 @@
+"""Modelo para movimentações de estoque de produtos."""
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Column, String, Float, ForeignKey, DateTime, UUID, Index
+
+from app.database import Base
+
+
+class MovimentacaoEstoque(Base):
+    """
+    Modelo de movimentação de estoque.
+    
+    Registro somente de inclusão com cada entrada, saída ou ajuste aplicado ao
+    ``estoque_atual`` de um produto, incluindo o saldo resultante.
+    """
+    __tablename__ = "movimentacoes_estoque"
+    
+    id_movimentacao = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id_empresa = Column(UUID(as_uuid=True), ForeignKey("empresas.id_empresa", ondelete="CASCADE"), nullable=False)
+    id_produto = Column(UUID(as_uuid=True), ForeignKey("produtos.id_produto", ondelete="CASCADE"), nullable=False)
+    id_venda = Column(UUID(as_uuid=True), ForeignKey("vendas.id_venda", ondelete="SET NULL"), nullable=True)
+    tipo = Column(String(20), nullable=False)
+    quantidade = Column(Float, nullable=False)
+    estoque_resultante = Column(Float, nullable=False)
+    observacao = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_movimentacoes_estoque_produto_data", "id_produto", "created_at"),
+        Index("ix_movimentacoes_estoque_empresa_data", "id_empresa", "created_at"),
+    )
+    
+    def __repr__(self) -> str:
+        """Representação em string da movimentação."""
+        return f"<MovimentacaoEstoque(produto={self.id_produto}, tipo='{self.tipo}', quantidade={self.quantidade})>"
@@ -1,7 +1,7 @@
 """Modelo de Usuário para o sistema CCONTROL-M."""
 import uuid
 from typing import Optional, List
-from sqlalchemy import String, Text, ForeignKey, JSON
+from sqlalchemy import String, Text, ForeignKey, JSON, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -39,4 +39,8 @@ class Usuario(Base, TimestampedModel):
     
     def __repr__(self) -> str:
         """Representação em string do usuário."""
-        return f"<Usuario(id={self.id_usuario}, nome='{self.nome}', email='{self.email}')>" 
\ No newline at end of file
+        return f"<Usuario(id={self.id_usuario}, nome='{self.nome}', email='{self.email}')>"
+
+
+# Login compara emails sem diferenciar maiúsculas/minúsculas
+Index("ix_usuarios_email_lower", func.lower(Usuario.__table__.c.email))
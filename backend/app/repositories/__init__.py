@@ -19,6 +19,8 @@ from .permissao_usuario_repository import PermissaoUsuarioRepository
 from .auditoria_repository import AuditoriaRepository
 from .conta_pagar_repository import ContaPagarRepository
 from .conta_receber_repository import ContaReceberRepository
+from .busca_repository import BuscaRepository
+from .estoque_repository import EstoqueRepository
 
 # Lista de repositórios exportados
 __all__ = [
@@ -41,4 +43,6 @@ __all__ = [
     'AuditoriaRepository',
     'ContaPagarRepository',
     'ContaReceberRepository',
+    'BuscaRepository',
+    'EstoqueRepository',
 ] 
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""Repositório do aging (distribuição por faixa de vencimento) de títulos em aberto."""
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+FONTE_PARCELAS = "parcelas"
+FONTE_CONTAS_RECEBER = "contas_receber"
+FONTE_CONTAS_PAGAR = "contas_pagar"
+
+FAIXAS_AGING = ("a_vencer", "0_30", "31_60", "61_90", "90_mais")
+
+# Títulos em aberto de cada fonte, com as colunas comuns:
+# id_contraparte, nome_contraparte, valor e data_vencimento.
+# Títulos sem cliente/fornecedor ficam agrupados na chave nula (UUID zero)
+# para que a paginação por chave não precise tratar NULL.
+_SEM_CONTRAPARTE = "00000000-0000-0000-0000-000000000000"
+FONTES_AGING: Dict[str, str] = {
+    FONTE_PARCELAS: f"""
+        SELECT COALESCE(l.id_cliente, CAST('{_SEM_CONTRAPARTE}' AS uuid)) AS id_contraparte,
+               c.nome AS nome_contraparte,
+               p.valor,
+               p.data_vencimento
+        FROM parcelas p
+        JOIN lancamentos l ON l.id_lancamento = p.id_lancamento
+        LEFT JOIN clientes c ON c.id_cliente = l.id_cliente
+        WHERE l.id_empresa = :id_empresa
+          AND l.tipo = 'entrada'
+          AND p.status = 'pendente'
+    """,
+    FONTE_CONTAS_RECEBER: f"""
+        SELECT COALESCE(cr.id_cliente, CAST('{_SEM_CONTRAPARTE}' AS uuid)) AS id_contraparte,
+               c.nome AS nome_contraparte,
+               cr.valor,
+               cr.data_vencimento
+        FROM contas_receber cr
+        LEFT JOIN clientes c ON c.id_cliente = cr.id_cliente
+        WHERE cr.id_empresa = :id_empresa
+          AND cr.status IN ('pendente', 'atrasado', 'parcial')
+    """,
+    FONTE_CONTAS_PAGAR: f"""
+        SELECT COALESCE(cp.fornecedor_id, CAST('{_SEM_CONTRAPARTE}' AS uuid)) AS id_contraparte,
+               f.nome AS nome_contraparte,
+               cp.valor,
+               cp.data_vencimento
+        FROM contas_pagar cp
+        LEFT JOIN fornecedores f ON f.id_fornecedor = cp.fornecedor_id
+        WHERE cp.empresa_id = :id_empresa
+          AND cp.status IN ('PENDENTE', 'VENCIDO')
+    """,
+}
+
+# Títulos da fonte com a faixa de cada um; vencendo hoje ainda conta como a vencer
+SQL_TITULOS_COM_FAIXA = """
+    SELECT t.*,
+           CASE
+               WHEN t.data_vencimento >= CAST(:hoje AS date) THEN 'a_vencer'
+               WHEN CAST(:hoje AS date) - t.data_vencimento <= 30 THEN '0_30'
+               WHEN CAST(:hoje AS date) - t.data_vencimento <= 60 THEN '31_60'
+               WHEN CAST(:hoje AS date) - t.data_vencimento <= 90 THEN '61_90'
+               ELSE '90_mais'
+           END AS faixa
+    FROM ({fonte}) AS t
+"""
+
+SQL_RESUMO_AGING = """
+    SELECT t.faixa, count(*) AS quantidade, sum(t.valor) AS total
+    FROM ({titulos}) AS t
+    GROUP BY t.faixa
+"""
+
+# Uma linha por contraparte com as faixas em colunas, ordenada por total
+# decrescente e paginada pela chave (total, id_contraparte) da última linha
+SQL_AGING_POR_CONTRAPARTE = """
+    SELECT g.*
+    FROM (
+        SELECT t.id_contraparte,
+               max(t.nome_contraparte) AS nome_contraparte,
+               count(*) AS quantidade,
+               sum(t.valor) AS total,
+               {colunas}
+        FROM ({titulos}) AS t
+        GROUP BY t.id_contraparte
+    ) AS g
+    WHERE CAST(:apos_total AS numeric) IS NULL
+       OR g.total < CAST(:apos_total AS numeric)
+       OR (g.total = CAST(:apos_total AS numeric) AND g.id_contraparte > CAST(:apos_id AS uuid))
+    ORDER BY g.total DESC, g.id_contraparte
+    LIMIT :limite
+"""
+
+
+def _titulos(fonte: str) -> str:
+    return SQL_TITULOS_COM_FAIXA.format(fonte=FONTES_AGING[fonte])
+
+
+def _sql_resumo(fonte: str) -> str:
+    return SQL_RESUMO_AGING.format(titulos=_titulos(fonte))
+
+
+def _sql_por_contraparte(fonte: str) -> str:
+    colunas = ",\n               ".join(
+        f"COALESCE(sum(t.valor) FILTER (WHERE t.faixa = '{faixa}'), 0) AS faixa_{faixa}"
+        for faixa in FAIXAS_AGING
+    )
+    return SQL_AGING_POR_CONTRAPARTE.format(colunas=colunas, titulos=_titulos(fonte))
+
+
+class AgingRepository:
+    """Consultas agrupadas por faixa de vencimento."""
+
+    def __init__(self, session: AsyncSession):
+        """Inicializar repositório com sessão."""
+        self.session = session
+
+    async def get_resumo(self, fonte: str, id_empresa: UUID, hoje: date) -> Dict[str, Dict[str, Any]]:
+        """
+        Quantidade e total de títulos em aberto por faixa, em uma única consulta.
+
+        Args:
+            fonte: ``parcelas``, ``contas_receber`` ou ``contas_pagar``
+            id_empresa: ID da empresa
+            hoje: Data de referência das faixas
+
+        Returns:
+            Dict faixa -> {quantidade, total}, com todas as faixas presentes
+        """
+        result = await self.session.execute(
+            text(_sql_resumo(fonte)),
+            {"id_empresa": id_empresa, "hoje": hoje}
+        )
+        resumo = {faixa: {"quantidade": 0, "total": 0.0} for faixa in FAIXAS_AGING}
+        for linha in result.mappings().all():
+            resumo[linha["faixa"]] = {
+                "quantidade": int(linha["quantidade"]),
+                "total": float(linha["total"] or 0),
+            }
+        return resumo
+
+    async def get_por_contraparte(
+        self,
+        fonte: str,
+        id_empresa: UUID,
+        hoje: date,
+        limite: int = 50,
+        apos: Optional[Tuple[Decimal, UUID]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Aging por cliente/fornecedor, paginado por chave.
+
+        Args:
+            fonte: ``parcelas``, ``contas_receber`` ou ``contas_pagar``
+            id_empresa: ID da empresa
+            hoje: Data de referência das faixas
+            limite: Quantidade de contrapartes na página
+            apos: Chave (total, id_contraparte) da última linha da página anterior
+
+        Returns:
+            Lista de dicts com a contraparte, a quantidade, o total e as faixas
+        """
+        apos_total, apos_id = apos if apos else (None, None)
+        result = await self.session.execute(
+            text(_sql_por_contraparte(fonte)),
+            {
+                "id_empresa": id_empresa,
+                "hoje": hoje,
+                "limite": limite,
+                "apos_total": apos_total,
+                "apos_id": str(apos_id) if apos_id else None,
+            }
+        )
+        linhas = []
+        for linha in result.mappings().all():
+            id_contraparte = linha["id_contraparte"]
+            linhas.append({
+                "id_contraparte": None if str(id_contraparte) == _SEM_CONTRAPARTE else id_contraparte,
+                "chave_contraparte": id_contraparte,
+                "nome_contraparte": linha["nome_contraparte"],
+                "quantidade": int(linha["quantidade"]),
+                "total": linha["total"],
+                "faixas": {faixa: float(linha[f"faixa_{faixa}"]) for faixa in FAIXAS_AGING},
+            })
+        return linhas
@@ -98,6 +98,11 @@ class AuditoriaRepository(BaseRepository):
         if "action_type" in filters:
             query = query.where(Auditoria.action_type == filters["action_type"])
             
+        if "empresa_id" in filters:
+            query = query.where(Auditoria.empresa_id == filters["empresa_id"])
+            
+        # Comparações diretas sobre timestamp: o PostgreSQL descarta as
+        # partições mensais fora do período
         if "timestamp_range" in filters:
             date_from, date_to = filters["timestamp_range"]
             if date_from:
@@ -1,26 +1,88 @@
 """Repositório base para todos os repositórios do sistema."""
-from typing import Generic, TypeVar, Type, Optional, List, Dict, Any
+import asyncio
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
 from uuid import UUID
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, and_, or_, asc, desc, func, inspect
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from sqlalchemy.sql.elements import ColumnElement
 from pydantic import BaseModel
 
 from app.models.base import Base
+from app.utils.periodos import condicoes_periodo, periodo_entre
 
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# Filtro declarativo: recebe o valor do parâmetro e devolve a condição
+# (ou None para não filtrar). Valores None e "" nunca chegam ao filtro.
+Filtro = Callable[[Any], Optional[ColumnElement]]
+
+# Como ``listar`` obtém o total de registros
+CONTAGEM_SEQUENCIAL = "sequencial"  # na mesma sessão, depois da página
+CONTAGEM_PARALELA = "paralela"      # em outra conexão, junto com a página
+CONTAGEM_NENHUMA = "nenhuma"        # total None
+
+
+def igual(coluna) -> Filtro:
+    """``coluna == valor``."""
+    return lambda valor: coluna == valor
+
+
+def contem(*colunas) -> Filtro:
+    """Busca parcial, sem diferenciar maiúsculas, em qualquer das colunas."""
+    def filtro(valor):
+        termo = f"%{valor}%"
+        return or_(*(coluna.ilike(termo) for coluna in colunas))
+    return filtro
+
+
+def desde(coluna) -> Filtro:
+    """``coluna >= valor`` (limite inicial de período)."""
+    return lambda valor: and_(*condicoes_periodo(coluna, periodo_entre(valor, None)))
+
+
+def ate(coluna) -> Filtro:
+    """Limite final inclusivo, aplicado como ``coluna < dia seguinte``."""
+    return lambda valor: and_(*condicoes_periodo(coluna, periodo_entre(None, valor)))
+
+
+def quando(condicao: ColumnElement) -> Filtro:
+    """Condição fixa aplicada quando o parâmetro é verdadeiro."""
+    return lambda valor: condicao if valor else None
+
+
+def campos_da_requisicao(fields: Optional[str]) -> Optional[List[str]]:
+    """Lista de campos de ``?fields=a,b`` (None quando ausente ou vazio)."""
+    if not fields:
+        return None
+    campos = [campo.strip() for campo in fields.split(",") if campo.strip()]
+    return campos or None
+
+
+def selecionar_campos(objetos: Iterable[Any], campos: Sequence[str]) -> List[Dict[str, Any]]:
+    """Dicts só com os campos pedidos (os mesmos carregados por ``load_only``)."""
+    return [{campo: getattr(objeto, campo) for campo in campos} for objeto in objetos]
+
 
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
     Repositório base com operações CRUD comuns.
     
+    Listagens declaram seus filtros em ``filtros`` (nome do parâmetro ->
+    ``Filtro``) e usam ``listar``: as condições são montadas uma vez e
+    servem tanto à página quanto à contagem.
+    
     Args:
         model: Classe do modelo SQLAlchemy
         session: Sessão assíncrona do SQLAlchemy
     """
+    
+    filtros: Dict[str, Filtro] = {}
+    ordenacao_padrao: Optional[str] = None
+    direcao_padrao: str = "asc"
 
     def __init__(self, model: Type[ModelType], session: AsyncSession):
         """Inicializa o repositório com o modelo e a sessão."""
@@ -153,6 +215,119 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    def colunas(self) -> Dict[str, Any]:
+        """Atributos de coluna do modelo (sem relacionamentos nem propriedades)."""
+        return {chave: getattr(self.model, chave) for chave in inspect(self.model).columns.keys()}
+
+    def compilar_filtros(self, tenant_id: Optional[UUID] = None, **valores) -> List[ColumnElement]:
+        """
+        Condições dos filtros declarados para os valores informados.
+        
+        Args:
+            tenant_id: ID da empresa (condição sobre ``id_empresa``)
+            **valores: Valores por nome de filtro; None, "" e nomes não
+                declarados em ``filtros`` são ignorados
+            
+        Returns:
+            Lista de condições para ``where``
+        """
+        condicoes = [self.model.id_empresa == tenant_id] if tenant_id else []
+        for nome, valor in valores.items():
+            filtro = self.filtros.get(nome)
+            if filtro is None or valor is None or valor == "":
+                continue
+            condicao = filtro(valor)
+            if condicao is not None:
+                condicoes.append(condicao)
+        return condicoes
+
+    def validar_campos(self, campos: Iterable[str], permitidos: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Confere os campos de um sparse fieldset.
+        
+        Args:
+            campos: Campos pedidos
+            permitidos: Campos aceitos (padrão: todas as colunas do modelo)
+            
+        Returns:
+            Campos na ordem pedida, sem repetições
+            
+        Raises:
+            ValueError: Se algum campo não for uma coluna permitida
+        """
+        colunas = self.colunas()
+        permitidos = set(permitidos) & colunas.keys() if permitidos is not None else colunas.keys()
+        invalidos = [campo for campo in campos if campo not in permitidos]
+        if invalidos:
+            raise ValueError(f"Campos inválidos: {', '.join(invalidos)}")
+        return list(dict.fromkeys(campos))
+
+    def _ordenacao(self, order_by: Optional[str], order_direction: Optional[str]) -> List[ColumnElement]:
+        """ORDER BY por uma coluna do modelo, com a chave primária como desempate."""
+        colunas = self.colunas()
+        nome = order_by if order_by in colunas else self.ordenacao_padrao
+        direcao = desc if (order_direction or self.direcao_padrao).lower() == "desc" else asc
+        ordenacao = [direcao(colunas[nome])] if nome else []
+        # Desempate estável: sem ele, offset/limit podem repetir ou pular linhas
+        ordenacao.extend(coluna for coluna in inspect(self.model).primary_key if coluna.key != nome)
+        return ordenacao
+
+    async def listar(
+        self,
+        condicoes: Sequence[ColumnElement],
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        order_by: Optional[str] = None,
+        order_direction: Optional[str] = None,
+        campos: Optional[Sequence[str]] = None,
+        opcoes: Sequence[Any] = (),
+        contagem: str = CONTAGEM_SEQUENCIAL
+    ) -> Tuple[List[ModelType], Optional[int]]:
+        """
+        Página de registros e total a partir das mesmas condições.
+        
+        Args:
+            condicoes: Condições (normalmente de ``compilar_filtros``)
+            skip: Número de registros para pular
+            limit: Número máximo de registros
+            order_by: Coluna de ordenação (colunas desconhecidas usam a padrão)
+            order_direction: ``asc`` ou ``desc``
+            campos: Sparse fieldset: só essas colunas são lidas (``load_only``);
+                    os demais atributos ficam sem carregar
+            opcoes: Opções adicionais da consulta (ex.: ``selectinload``)
+            contagem: ``sequencial``, ``paralela`` (outra conexão; não enxerga
+                      escritas ainda não confirmadas desta sessão) ou ``nenhuma``
+            
+        Returns:
+            Tupla com os registros da página e o total (None sem contagem)
+        """
+        query = select(self.model).where(*condicoes)
+        if campos:
+            query = query.options(load_only(*(getattr(self.model, campo) for campo in campos)))
+        if opcoes:
+            query = query.options(*opcoes)
+        query = query.order_by(*self._ordenacao(order_by, order_direction)).offset(skip).limit(limit)
+        count_query = select(func.count()).select_from(self.model).where(*condicoes)
+
+        if contagem == CONTAGEM_PARALELA and self.session.bind is not None:
+            async with AsyncSession(self.session.bind) as sessao_contagem:
+                result, count_result = await asyncio.gather(
+                    self.session.execute(query),
+                    sessao_contagem.execute(count_query)
+                )
+                return list(result.scalars().all()), count_result.scalar_one()
+
+        result = await self.session.execute(query)
+        itens = list(result.scalars().all())
+        if contagem == CONTAGEM_NENHUMA:
+            return itens, None
+        # Página incompleta (e não vazia, ou a primeira): o total já é conhecido
+        if len(itens) < limit and (itens or skip == 0):
+            return itens, skip + len(itens)
+        count_result = await self.session.execute(count_query)
+        return itens, count_result.scalar_one() or 0
+
     async def commit(self) -> None:
         """Comitar alterações na sessão."""
         await self.session.commit()
@@ -0,0 +1,166 @@
+"""Repositório para a busca unificada (full-text + trigram) de cadastros."""
+import re
+from typing import List, Optional, Dict, Any, Sequence
+from uuid import UUID
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils.logging_config import get_logger
+
+# Configurar logger
+logger = get_logger(__name__)
+
+# Quantidade máxima de termos considerados na consulta prefixada
+MAX_TERMOS_BUSCA = 8
+
+# Subconsultas por entidade. Cada uma usa o índice GIN de busca_vector,
+# o índice trigram sobre f_unaccent(lower(nome)) e a igualdade exata de
+# códigos, sempre restrita à empresa e limitada antes do UNION.
+SQL_FONTES_BUSCA = {
+    "produto": """
+        (SELECT 'produto' AS tipo, p.id_produto AS id, p.nome AS nome,
+                coalesce(p.codigo, p.codigo_barras) AS codigo, p.ativo AS ativo,
+                coalesce(ts_rank_cd(p.busca_vector, c.tsq), 0)
+                    + similarity(f_unaccent(lower(p.nome)), c.termo)
+                    + CASE WHEN p.codigo = :termo_exato OR p.codigo_barras = :termo_exato
+                           THEN 1.0 ELSE 0.0 END AS relevancia
+           FROM produtos p, consulta c
+          WHERE p.id_empresa = :id_empresa
+            {filtro_ativo_p}
+            AND (p.busca_vector @@ c.tsq
+                 OR f_unaccent(lower(p.nome)) % c.termo
+                 OR p.codigo = :termo_exato
+                 OR p.codigo_barras = :termo_exato)
+          ORDER BY relevancia DESC
+          LIMIT :limite)
+    """,
+    "cliente": """
+        (SELECT 'cliente' AS tipo, cl.id_cliente AS id, cl.nome AS nome,
+                cl.documento AS codigo, cl.ativo AS ativo,
+                coalesce(ts_rank_cd(cl.busca_vector, c.tsq), 0)
+                    + similarity(f_unaccent(lower(cl.nome)), c.termo)
+                    + CASE WHEN cl.documento = :termo_exato THEN 1.0 ELSE 0.0 END AS relevancia
+           FROM clientes cl, consulta c
+          WHERE cl.id_empresa = :id_empresa
+            {filtro_ativo_cl}
+            AND (cl.busca_vector @@ c.tsq
+                 OR f_unaccent(lower(cl.nome)) % c.termo
+                 OR cl.documento = :termo_exato)
+          ORDER BY relevancia DESC
+          LIMIT :limite)
+    """,
+    "fornecedor": """
+        (SELECT 'fornecedor' AS tipo, f.id_fornecedor AS id, f.nome AS nome,
+                f.cnpj AS codigo, f.ativo AS ativo,
+                coalesce(ts_rank_cd(f.busca_vector, c.tsq), 0)
+                    + similarity(f_unaccent(lower(f.nome)), c.termo)
+                    + CASE WHEN f.cnpj = :termo_exato THEN 1.0 ELSE 0.0 END AS relevancia
+           FROM fornecedores f, consulta c
+          WHERE f.id_empresa = :id_empresa
+            {filtro_ativo_f}
+            AND (f.busca_vector @@ c.tsq
+                 OR f_unaccent(lower(f.nome)) % c.termo
+                 OR f.cnpj = :termo_exato)
+          ORDER BY relevancia DESC
+          LIMIT :limite)
+    """,
+}
+
+TIPOS_BUSCA = tuple(SQL_FONTES_BUSCA.keys())
+
+
+def montar_tsquery_prefixo(termo: str) -> Optional[str]:
+    """
+    Converte o texto digitado em uma tsquery prefixada para type-ahead.
+
+    Cada palavra vira um lexema com ``:*`` combinado por ``&``. Caracteres
+    fora de ``\\w`` são descartados, de modo que operadores de tsquery
+    digitados pelo usuário não chegam ao banco.
+
+    Args:
+        termo: Texto digitado pelo usuário
+
+    Returns:
+        Expressão para ``to_tsquery`` ou None se não houver palavras válidas
+    """
+    palavras = [p for p in re.split(r"[^\w]+", termo or "") if p and p != "_"]
+    if not palavras:
+        return None
+    return " & ".join(f"{p.lower()}:*" for p in palavras[:MAX_TERMOS_BUSCA])
+
+
+class BuscaRepository:
+    """Repositório para a busca unificada em produtos, clientes e fornecedores."""
+
+    def __init__(self, session: AsyncSession):
+        """
+        Inicializa o repositório com a sessão.
+
+        Args:
+            session: Sessão assíncrona do SQLAlchemy
+        """
+        self.session = session
+
+    async def buscar(
+        self,
+        termo: str,
+        id_empresa: UUID,
+        tipos: Optional[Sequence[str]] = None,
+        apenas_ativos: bool = False,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Executa a busca ranqueada nas entidades selecionadas.
+
+        Args:
+            termo: Texto digitado pelo usuário
+            id_empresa: ID da empresa
+            tipos: Entidades a consultar (padrão: todas)
+            apenas_ativos: Se True, ignora registros inativos
+            limit: Quantidade máxima de resultados
+
+        Returns:
+            List[Dict[str, Any]]: Resultados ordenados por relevância
+        """
+        tsquery = montar_tsquery_prefixo(termo)
+        termo_limpo = (termo or "").strip()
+        if not tsquery and not termo_limpo:
+            return []
+
+        tipos_validos = [t for t in (tipos or TIPOS_BUSCA) if t in SQL_FONTES_BUSCA]
+        if not tipos_validos:
+            return []
+
+        filtro_ativo = "AND {alias}.ativo IS TRUE" if apenas_ativos else ""
+        subconsultas = [
+            SQL_FONTES_BUSCA[tipo].format(
+                filtro_ativo_p=filtro_ativo.format(alias="p"),
+                filtro_ativo_cl=filtro_ativo.format(alias="cl"),
+                filtro_ativo_f=filtro_ativo.format(alias="f"),
+            )
+            for tipo in tipos_validos
+        ]
+
+        # to_tsquery('') gera aviso e consulta vazia; nesse caso só o
+        # trigram e a igualdade de código participam
+        sql = text(
+            "WITH consulta AS ("
+            " SELECT CASE WHEN :tsquery = '' THEN NULL::tsquery"
+            " ELSE to_tsquery('portuguese_unaccent', :tsquery) END AS tsq,"
+            " f_unaccent(lower(:termo)) AS termo)"
+            f" SELECT * FROM ({' UNION ALL '.join(subconsultas)}) resultados"
+            " ORDER BY relevancia DESC, nome"
+            " LIMIT :limite"
+        )
+
+        result = await self.session.execute(
+            sql,
+            {
+                "tsquery": tsquery or "",
+                "termo": termo_limpo,
+                "termo_exato": termo_limpo,
+                "id_empresa": id_empresa,
+                "limite": limit,
+            }
+        )
+        return [dict(row) for row in result.mappings().all()]
@@ -9,6 +9,7 @@ from sqlalchemy.orm import selectinload
 from app.models.compra import Compra, ItemCompra
 from app.models.fornecedor import Fornecedor
 from app.models.produto import Produto
+from app.utils.periodos import condicoes_periodo, periodo_entre
 
 class CompraRepository:
     """Repositório para operações com compras."""
@@ -68,13 +69,9 @@ class CompraRepository:
         count_query = select(func.count()).select_from(Compra).where(Compra.id_empresa == id_empresa)
         
         # Aplicar filtros
-        if data_inicio:
-            query = query.where(Compra.data_compra >= data_inicio)
-            count_query = count_query.where(Compra.data_compra >= data_inicio)
-            
-        if data_fim:
-            query = query.where(Compra.data_compra <= data_fim)
-            count_query = count_query.where(Compra.data_compra <= data_fim)
+        for condicao in condicoes_periodo(Compra.data_compra, periodo_entre(data_inicio, data_fim)):
+            query = query.where(condicao)
+            count_query = count_query.where(condicao)
             
         if id_fornecedor:
             query = query.where(Compra.id_fornecedor == id_fornecedor)
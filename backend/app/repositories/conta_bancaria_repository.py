@@ -1,15 +1,125 @@
 """Repositório para operações com contas bancárias."""
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Sequence, Tuple
 from uuid import UUID
 from datetime import date, datetime
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, or_, case, cast, literal, null, union_all, text, Float, Integer
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
 from app.models.conta_bancaria import ContaBancaria
+from app.models.conta_pagar import ContaPagar
+from app.models.conta_receber import ContaReceber
+from app.models.forma_pagamento import FormaPagamento
 from app.models.lancamento import Lancamento
+from app.models.parcela import Parcela
+from app.schemas.conta_pagar import StatusContaPagar
+from app.schemas.conta_receber import StatusContaReceber
 from app.schemas.conta_bancaria import ContaBancariaCreate, ContaBancariaUpdate, AtualizacaoSaldo
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import BaseRepository, CONTAGEM_NENHUMA, contem, igual
+
+# Tipos de movimentação de saldo e o sinal aplicado ao valor informado
+SINAL_OPERACAO_SALDO = {
+    "credito": 1,
+    "debito": -1,
+}
+
+# Aplica créditos e débitos de várias contas em uma única instrução:
+#  - pedidos: uma linha por movimentação, na ordem informada
+#  - agregados: delta líquido por conta
+#  - bloqueadas: trava as contas em ordem de ID, para que lotes concorrentes
+#    sobre as mesmas contas não entrem em deadlock
+#  - aplicados: UPDATE relativo (saldo_atual + delta), sem leitura prévia
+#  - movimentos: diário com o saldo resultante de cada linha
+SQL_APLICAR_MOVIMENTOS_SALDO = """
+WITH pedidos AS (
+    SELECT m.id_conta, m.valor, m.tipo, m.id_lancamento, m.ordem
+    FROM unnest(
+        CAST(:ids_conta AS uuid[]),
+        CAST(:valores AS double precision[]),
+        CAST(:tipos AS text[]),
+        CAST(:ids_lancamento AS uuid[])
+    ) WITH ORDINALITY AS m(id_conta, valor, tipo, id_lancamento, ordem)
+),
+agregados AS (
+    SELECT id_conta, sum(valor) AS delta
+    FROM pedidos
+    GROUP BY id_conta
+),
+bloqueadas AS (
+    SELECT c.id_conta
+    FROM contas_bancarias AS c
+    WHERE c.id_conta IN (SELECT id_conta FROM agregados)
+      AND (CAST(:id_empresa AS uuid) IS NULL OR c.id_empresa = CAST(:id_empresa AS uuid))
+    ORDER BY c.id_conta
+    FOR UPDATE
+),
+aplicados AS (
+    UPDATE contas_bancarias AS c
+    SET saldo_atual = c.saldo_atual + a.delta,
+        updated_at = now()
+    FROM agregados AS a
+    JOIN bloqueadas AS b ON b.id_conta = a.id_conta
+    WHERE c.id_conta = a.id_conta
+    RETURNING c.id_conta, c.id_empresa, c.saldo_atual, a.delta
+),
+movimentos AS (
+    INSERT INTO movimentacoes_conta (
+        id_movimentacao, id_empresa, id_conta, id_lancamento, tipo,
+        valor, saldo_resultante, observacao, created_at
+    )
+    SELECT
+        uuid_generate_v4(), ap.id_empresa, pe.id_conta, pe.id_lancamento, pe.tipo,
+        pe.valor,
+        ap.saldo_atual - ap.delta
+            + sum(pe.valor) OVER (PARTITION BY pe.id_conta ORDER BY pe.ordem),
+        CAST(:observacao AS text), now()
+    FROM pedidos AS pe
+    JOIN aplicados AS ap ON ap.id_conta = pe.id_conta
+)
+SELECT id_conta, saldo_atual FROM aplicados
+"""
+
+# Ajuste para um saldo absoluto: o saldo anterior vem da linha já travada,
+# então o valor registrado no diário é exatamente a diferença aplicada
+SQL_AJUSTAR_SALDO = """
+WITH anterior AS (
+    SELECT c.id_conta, c.saldo_atual
+    FROM contas_bancarias AS c
+    WHERE c.id_conta = CAST(:id_conta AS uuid)
+      AND (CAST(:id_empresa AS uuid) IS NULL OR c.id_empresa = CAST(:id_empresa AS uuid))
+    FOR UPDATE
+),
+aplicado AS (
+    UPDATE contas_bancarias AS c
+    SET saldo_atual = CAST(:saldo AS double precision),
+        updated_at = now()
+    FROM anterior AS a
+    WHERE c.id_conta = a.id_conta
+    RETURNING c.id_conta, c.id_empresa, c.saldo_atual, a.saldo_atual AS saldo_anterior
+),
+movimento AS (
+    INSERT INTO movimentacoes_conta (
+        id_movimentacao, id_empresa, id_conta, tipo, valor, saldo_resultante, observacao, created_at
+    )
+    SELECT uuid_generate_v4(), id_empresa, id_conta, 'ajuste',
+           saldo_atual - saldo_anterior, saldo_atual, CAST(:observacao AS text), now()
+    FROM aplicado
+)
+SELECT id_conta, saldo_atual FROM aplicado
+"""
+
+# Contas cujo saldo diverge de saldo_inicial + soma do diário
+SQL_DIVERGENCIAS_SALDO = """
+SELECT c.id_conta, c.saldo_atual,
+       c.saldo_inicial + coalesce(sum(m.valor), 0) AS saldo_diario
+FROM contas_bancarias AS c
+LEFT JOIN movimentacoes_conta AS m ON m.id_conta = c.id_conta
+WHERE c.id_empresa = :id_empresa
+  AND (CAST(:id_conta AS uuid) IS NULL OR c.id_conta = CAST(:id_conta AS uuid))
+GROUP BY c.id_conta, c.saldo_atual, c.saldo_inicial
+HAVING abs(c.saldo_atual - (c.saldo_inicial + coalesce(sum(m.valor), 0))) >= :tolerancia
+"""
 
 # Funções auxiliares de consulta (anteriormente em conta_bancaria_queries.py)
 def build_conta_bancaria_filters(
@@ -67,20 +177,28 @@ def build_conta_bancaria_filters(
     return query
 
 
-async def compute_conta_dashboard(session: AsyncSession, id_empresa: UUID) -> Dict[str, Any]:
+async def compute_conta_dashboard(
+    session: AsyncSession,
+    id_empresa: UUID,
+    dias_previsao: int = 30
+) -> Dict[str, Any]:
     """
     Calcula dados para o dashboard de contas bancárias.
     
     Args:
         session: Sessão do banco de dados
         id_empresa: ID da empresa
+        dias_previsao: Horizonte da projeção de saldo em dias
         
     Returns:
         Dict: Dados do dashboard
     """
+    # Import local: o serviço de previsão depende deste módulo
+    from app.services.previsao_fluxo_caixa_service import projetar_fluxo_caixa
+    
     # Consultar contas que devem ser exibidas no dashboard
     query = select(ContaBancaria).where(
-        ContaBancaria.empresa_id == id_empresa,
+        ContaBancaria.id_empresa == id_empresa,
         ContaBancaria.ativa == True,
         ContaBancaria.mostrar_dashboard == True
     ).order_by(ContaBancaria.nome)
@@ -91,18 +209,22 @@ async def compute_conta_dashboard(session: AsyncSession, id_empresa: UUID) -> Di
     # Calcular saldo total
     saldo_total = sum(conta.saldo_atual for conta in contas)
     
-    # Calcular previsão futura
-    # TODO: Implementar cálculo de previsão futura baseado em lançamentos futuros
+    # Calcular previsão futura a partir dos lançamentos, parcelas e contas em aberto
+    previsao = await projetar_fluxo_caixa(session, id_empresa, dias_previsao)
+    projecao_por_conta = {item["id_conta"]: item for item in previsao["contas"]}
     
     # Montar objeto de resposta
     dashboard_data = {
         "saldo_total": saldo_total,
+        "saldo_previsto": previsao["total"]["saldo_final"],
+        "saldo_minimo_previsto": previsao["total"]["saldo_minimo"],
+        "data_saldo_minimo": previsao["total"]["data_saldo_minimo"],
+        "dias_previsao": dias_previsao,
         "contas": [{
-            "id": str(conta.id),
+            "id": str(conta.id_conta),
             "nome": conta.nome,
             "saldo_atual": conta.saldo_atual,
-            "cor": conta.cor,
-            "icone": conta.icone,
+            "saldo_previsto": projecao_por_conta[conta.id_conta]["saldo_final"],
             "banco": conta.banco,
             "tipo": conta.tipo
         } for conta in contas],
@@ -112,6 +234,99 @@ async def compute_conta_dashboard(session: AsyncSession, id_empresa: UUID) -> Di
     return dashboard_data
 
 
+async def get_itens_previsao(session: AsyncSession, id_empresa: UUID, ate: date) -> Dict[str, list]:
+    """
+    Itens em aberto que movimentam o caixa até ``ate``, em colunas.
+    
+    Uma única consulta (UNION ALL) com:
+    
+    - Lançamentos pendentes sem parcelas e parcelas pendentes de lançamentos
+      (conta bancária e forma de pagamento vêm do lançamento)
+    - Contas a pagar e a receber em aberto, sem conta bancária definida
+      (contas a receber geradas por um lançamento já entram por ele)
+    
+    Compensação e taxas da forma de pagamento só se aplicam a entradas.
+    
+    Args:
+        session: Sessão do banco de dados
+        id_empresa: ID da empresa
+        ate: Último vencimento considerado (vencidos também entram)
+        
+    Returns:
+        Dict com as listas ``id_conta``, ``vencimento``, ``valor``,
+        ``dias_compensacao``, ``taxa_percentual`` e ``taxa_fixa``
+    """
+    entrada = Lancamento.tipo == "entrada"
+
+    def _colunas_lancamento(valor, vencimento):
+        return (
+            Lancamento.id_conta.label("id_conta"),
+            vencimento.label("vencimento"),
+            cast(case((entrada, valor), else_=-valor), Float).label("valor"),
+            case((entrada, func.coalesce(FormaPagamento.dias_compensacao, 0)), else_=0).label("dias_compensacao"),
+            cast(case((entrada, func.coalesce(FormaPagamento.taxa_percentual, 0)), else_=0), Float).label("taxa_percentual"),
+            cast(case((entrada, func.coalesce(FormaPagamento.taxa_fixa, 0)), else_=0), Float).label("taxa_fixa"),
+        )
+
+    def _colunas_sem_conta(valor, vencimento):
+        return (
+            cast(null(), PGUUID(as_uuid=True)).label("id_conta"),
+            vencimento.label("vencimento"),
+            cast(valor, Float).label("valor"),
+            literal(0, Integer).label("dias_compensacao"),
+            literal(0.0, Float).label("taxa_percentual"),
+            literal(0.0, Float).label("taxa_fixa"),
+        )
+
+    tem_parcelas = select(Parcela.id_parcela).where(Parcela.id_lancamento == Lancamento.id_lancamento).exists()
+
+    lancamentos = (
+        select(*_colunas_lancamento(Lancamento.valor, Lancamento.data_vencimento))
+        .outerjoin(FormaPagamento, FormaPagamento.id_forma == Lancamento.id_forma_pagamento)
+        .where(
+            Lancamento.id_empresa == id_empresa,
+            Lancamento.status == "pendente",
+            Lancamento.data_vencimento <= ate,
+            ~tem_parcelas
+        )
+    )
+    parcelas = (
+        select(*_colunas_lancamento(Parcela.valor, Parcela.data_vencimento))
+        .join(Lancamento, Lancamento.id_lancamento == Parcela.id_lancamento)
+        .outerjoin(FormaPagamento, FormaPagamento.id_forma == Lancamento.id_forma_pagamento)
+        .where(
+            Lancamento.id_empresa == id_empresa,
+            Lancamento.status != "cancelado",
+            Parcela.status == "pendente",
+            Parcela.data_vencimento <= ate
+        )
+    )
+    contas_pagar = (
+        select(*_colunas_sem_conta(-ContaPagar.valor, ContaPagar.data_vencimento))
+        .where(
+            ContaPagar.empresa_id == id_empresa,
+            ContaPagar.status.in_([StatusContaPagar.PENDENTE, StatusContaPagar.VENCIDO]),
+            ContaPagar.data_vencimento <= ate
+        )
+    )
+    contas_receber = (
+        select(*_colunas_sem_conta(ContaReceber.valor, ContaReceber.data_vencimento))
+        .where(
+            ContaReceber.id_empresa == id_empresa,
+            ContaReceber.status.in_([
+                StatusContaReceber.pendente, StatusContaReceber.parcial, StatusContaReceber.atrasado
+            ]),
+            ContaReceber.id_lancamento.is_(None),
+            ContaReceber.data_vencimento <= ate
+        )
+    )
+
+    result = await session.execute(union_all(lancamentos, parcelas, contas_pagar, contas_receber))
+    colunas = ("id_conta", "vencimento", "valor", "dias_compensacao", "taxa_percentual", "taxa_fixa")
+    linhas = result.all()
+    return {nome: [linha[i] for linha in linhas] for i, nome in enumerate(colunas)}
+
+
 async def validate_conta_bancaria_exists(
     session: AsyncSession, 
     id_conta: UUID, 
@@ -178,10 +393,18 @@ async def validate_conta_bancaria_access(
 class ContaBancariaRepository(BaseRepository[ContaBancaria, ContaBancariaCreate, ContaBancariaUpdate]):
     """Repositório para operações com contas bancárias."""
     
+    filtros = {
+        "ativa": igual(ContaBancaria.ativa),
+        "mostrar_dashboard": igual(ContaBancaria.mostrar_dashboard),
+        "tipo": igual(ContaBancaria.tipo),
+        "nome": contem(ContaBancaria.nome),
+        "banco": contem(ContaBancaria.banco),
+    }
+    ordenacao_padrao = "nome"
+    
     def __init__(self, session: AsyncSession):
         """Inicializa o repositório com o modelo ContaBancaria."""
-        self.session = session
-        super().__init__(ContaBancaria)
+        super().__init__(ContaBancaria, session)
     
     async def get_by_id(self, id_conta: UUID, id_empresa: UUID = None) -> Optional[ContaBancaria]:
         """
@@ -355,6 +578,18 @@ class ContaBancariaRepository(BaseRepository[ContaBancaria, ContaBancariaCreate,
             "contas_maior_saldo": contas_maior_saldo
         }
     
+    def _condicoes(
+        self,
+        id_empresa: Optional[UUID],
+        ativa: Optional[bool],
+        mostrar_dashboard: Optional[bool],
+        tipo: Optional[str],
+        filters: Optional[Dict[str, Any]]
+    ) -> list:
+        """Condições compartilhadas por ``get_multi`` e ``get_count``."""
+        condicoes = self.compilar_filtros(id_empresa, ativa=ativa, mostrar_dashboard=mostrar_dashboard, tipo=tipo)
+        return condicoes + self.compilar_filtros(**(filters or {}))
+    
     async def get_multi(
         self,
         *,
@@ -364,7 +599,8 @@ class ContaBancariaRepository(BaseRepository[ContaBancaria, ContaBancariaCreate,
         ativa: Optional[bool] = None,
         mostrar_dashboard: Optional[bool] = None,
         tipo: Optional[str] = None,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        campos: Optional[List[str]] = None
     ) -> List[ContaBancaria]:
         """
         Obtém múltiplas contas bancárias com paginação e filtragem opcional.
@@ -376,51 +612,20 @@ class ContaBancariaRepository(BaseRepository[ContaBancaria, ContaBancariaCreate,
             ativa: Filtrar por status de ativação
             mostrar_dashboard: Filtrar por exibição no dashboard
             tipo: Filtrar por tipo de conta
-            filters: Filtros adicionais
+            filters: Filtros adicionais (nome, banco e demais filtros declarados)
+            campos: Colunas a carregar (padrão: todas)
             
         Returns:
             List[ContaBancaria]: Lista de contas bancárias
         """
-        query = select(ContaBancaria)
-        
-        # Aplicar filtros principais
-        if id_empresa:
-            query = query.where(ContaBancaria.id_empresa == id_empresa)
-            
-        if ativa is not None:
-            query = query.where(ContaBancaria.ativa == ativa)
-            
-        if mostrar_dashboard is not None:
-            query = query.where(ContaBancaria.mostrar_dashboard == mostrar_dashboard)
-            
-        if tipo:
-            query = query.where(ContaBancaria.tipo == tipo)
-        
-        # Filtros adicionais
-        if filters:
-            # Tratamento especial para busca por nome
-            if "nome" in filters and filters["nome"]:
-                termo_busca = f"%{filters['nome']}%"
-                query = query.where(ContaBancaria.nome.ilike(termo_busca))
-                
-            # Tratamento para busca por banco
-            if "banco" in filters and filters["banco"]:
-                termo_busca = f"%{filters['banco']}%"
-                query = query.where(ContaBancaria.banco.ilike(termo_busca))
-            
-            # Processamento dos demais filtros
-            for field, value in filters.items():
-                if value is not None and hasattr(ContaBancaria, field) and field not in ["nome", "banco"]:
-                    query = query.where(getattr(ContaBancaria, field) == value)
-        
-        # Ordenação padrão por nome
-        query = query.order_by(ContaBancaria.nome)
-        
-        # Aplicar paginação
-        query = query.offset(skip).limit(limit)
-        
-        result = await self.session.execute(query)
-        return list(result.scalars().all())
+        contas, _ = await self.listar(
+            self._condicoes(id_empresa, ativa, mostrar_dashboard, tipo, filters),
+            skip=skip,
+            limit=limit,
+            campos=campos,
+            contagem=CONTAGEM_NENHUMA
+        )
+        return contas
     
     async def get_count(
         self,
@@ -443,39 +648,8 @@ class ContaBancariaRepository(BaseRepository[ContaBancaria, ContaBancariaCreate,
         Returns:
             int: Contagem de contas bancárias
         """
-        query = select(func.count()).select_from(ContaBancaria)
-        
-        # Aplicar filtros principais
-        if id_empresa:
-            query = query.where(ContaBancaria.id_empresa == id_empresa)
-            
-        if ativa is not None:
-            query = query.where(ContaBancaria.ativa == ativa)
-            
-        if mostrar_dashboard is not None:
-            query = query.where(ContaBancaria.mostrar_dashboard == mostrar_dashboard)
-            
-        if tipo:
-            query = query.where(ContaBancaria.tipo == tipo)
-        
-        # Filtros adicionais
-        if filters:
-            # Tratamento especial para busca por nome
-            if "nome" in filters and filters["nome"]:
-                termo_busca = f"%{filters['nome']}%"
-                query = query.where(ContaBancaria.nome.ilike(termo_busca))
-                
-            # Tratamento para busca por banco
-            if "banco" in filters and filters["banco"]:
-                termo_busca = f"%{filters['banco']}%"
-                query = query.where(ContaBancaria.banco.ilike(termo_busca))
-            
-            # Processamento dos demais filtros
-            for field, value in filters.items():
-                if value is not None and hasattr(ContaBancaria, field) and field not in ["nome", "banco"]:
-                    query = query.where(getattr(ContaBancaria, field) == value)
-        
-        result = await self.session.execute(query)
+        condicoes = self._condicoes(id_empresa, ativa, mostrar_dashboard, tipo, filters)
+        result = await self.session.execute(select(func.count()).select_from(ContaBancaria).where(*condicoes))
         return result.scalar_one() or 0
     
     async def create(self, data: Dict[str, Any]) -> ContaBancaria:
@@ -524,14 +698,15 @@ class ContaBancariaRepository(BaseRepository[ContaBancaria, ContaBancariaCreate,
             # Guardar valores antigos para verificar mudanças
             saldo_inicial_antigo = conta.saldo_inicial
             
-            # Se houver mudança no saldo inicial, ajustar o saldo atual
+            # Se houver mudança no saldo inicial, ajustar o saldo atual no próprio
+            # UPDATE (relativo), sem sobrescrever movimentos concorrentes
             if "saldo_inicial" in data and data["saldo_inicial"] != saldo_inicial_antigo:
                 diferenca = data["saldo_inicial"] - saldo_inicial_antigo
-                conta.saldo_atual += diferenca
+                conta.saldo_atual = ContaBancaria.saldo_atual + diferenca
             
-            # Atualizar campos
+            # Atualizar campos (o saldo atual só muda por atualizar_saldo, que registra no diário)
             for field, value in data.items():
-                if hasattr(conta, field):
+                if hasattr(conta, field) and field != "saldo_atual":
                     setattr(conta, field, value)
             
             self.session.add(conta)
@@ -644,48 +819,162 @@ class ContaBancariaRepository(BaseRepository[ContaBancaria, ContaBancariaCreate,
             await self.session.rollback()
             raise e
     
+    async def aplicar_movimentos_saldo(
+        self,
+        movimentos: Sequence[Tuple[UUID, str, float]],
+        id_empresa: Optional[UUID] = None,
+        observacao: Optional[str] = None,
+        ids_lancamento: Optional[Sequence[Optional[UUID]]] = None,
+        commit: bool = True
+    ) -> Dict[UUID, float]:
+        """
+        Aplica créditos e débitos em várias contas em uma única ida ao banco.
+        
+        O saldo é alterado com ``saldo_atual = saldo_atual + delta`` (nunca
+        lido e regravado pela aplicação) e cada movimento é registrado no
+        diário ``movimentacoes_conta``. Movimentos da mesma conta no lote
+        viram um único UPDATE, o que reduz o tempo de trava em contas de alto
+        volume (ex.: conta do PDV).
+        
+        Args:
+            movimentos: Tuplas (id_conta, operação ``credito``/``debito``, valor positivo)
+            id_empresa: Restringe às contas da empresa (None = sem restrição)
+            observacao: Observação registrada nos movimentos
+            ids_lancamento: Lançamento de origem de cada movimento, se houver
+            commit: Confirma a transação ao final (mantém as travas pelo menor tempo)
+            
+        Returns:
+            Dict[UUID, float]: Novo saldo de cada conta atualizada; contas
+            inexistentes (ou de outra empresa) ficam de fora
+        """
+        if not movimentos:
+            return {}
+        
+        ids_conta, valores, tipos = [], [], []
+        for id_conta, operacao, valor in movimentos:
+            if operacao not in SINAL_OPERACAO_SALDO:
+                raise ValueError(f"Operação de saldo inválida: {operacao}")
+            ids_conta.append(id_conta)
+            valores.append(SINAL_OPERACAO_SALDO[operacao] * float(valor))
+            tipos.append(operacao)
+        
+        params = {
+            "id_empresa": id_empresa,
+            "observacao": observacao,
+            "ids_conta": ids_conta,
+            "valores": valores,
+            "tipos": tipos,
+            "ids_lancamento": list(ids_lancamento) if ids_lancamento else [None] * len(ids_conta),
+        }
+        try:
+            result = await self.session.execute(text(SQL_APLICAR_MOVIMENTOS_SALDO), params)
+            saldos = {linha.id_conta: linha.saldo_atual for linha in result}
+            if commit:
+                await self.session.commit()
+            return saldos
+        except Exception as e:
+            await self.session.rollback()
+            raise e
+    
     async def atualizar_saldo(
         self, 
         id_conta: UUID, 
         operacao: str,
-        valor: float
-    ) -> Optional[ContaBancaria]:
+        valor: float,
+        id_empresa: Optional[UUID] = None,
+        observacao: Optional[str] = None,
+        id_lancamento: Optional[UUID] = None,
+        commit: bool = True
+    ) -> Optional[float]:
         """
-        Atualiza o saldo de uma conta bancária.
+        Atualiza o saldo de uma conta bancária de forma atômica.
         
         Args:
             id_conta: ID da conta bancária
             operacao: Tipo de operação (credito, debito, ajuste)
-            valor: Valor da operação
+            valor: Valor da operação (no ajuste, o novo saldo)
+            id_empresa: Restringe à conta da empresa (None = sem restrição)
+            observacao: Observação registrada no diário
+            id_lancamento: Lançamento de origem, se houver
+            commit: Confirma a transação ao final
             
         Returns:
-            ContaBancaria: Conta bancária atualizada ou None se não encontrada
+            float: Novo saldo ou None se a conta não for encontrada
         """
+        if operacao != "ajuste":
+            saldos = await self.aplicar_movimentos_saldo(
+                [(id_conta, operacao, valor)],
+                id_empresa=id_empresa,
+                observacao=observacao,
+                ids_lancamento=[id_lancamento],
+                commit=commit
+            )
+            return saldos.get(id_conta)
+        
         try:
-            # Verificar se a conta existe
-            query = select(ContaBancaria).where(ContaBancaria.id == id_conta)
-            
-            result = await self.session.execute(query)
-            conta = result.scalar_one_or_none()
-            
-            if not conta:
-                return None
-            
-            # Aplicar operação
-            if operacao == "credito":
-                conta.saldo_atual += valor
-            elif operacao == "debito":
-                conta.saldo_atual -= valor
-            elif operacao == "ajuste":
-                conta.saldo_atual = valor
+            result = await self.session.execute(
+                text(SQL_AJUSTAR_SALDO),
+                {
+                    "id_conta": id_conta,
+                    "id_empresa": id_empresa,
+                    "saldo": float(valor),
+                    "observacao": observacao,
+                }
+            )
+            linha = result.first()
+            if commit:
+                await self.session.commit()
+            return linha.saldo_atual if linha else None
+        except Exception as e:
+            await self.session.rollback()
+            raise e
+    
+    async def verificar_saldos(
+        self,
+        id_empresa: UUID,
+        id_conta: Optional[UUID] = None,
+        tolerancia: float = 0.005
+    ) -> List[Dict[str, Any]]:
+        """
+        Confere ``saldo_atual`` contra o diário de movimentações.
+        
+        Args:
+            id_empresa: ID da empresa
+            id_conta: Restringe a uma conta
+            tolerancia: Diferença mínima considerada divergência
             
-            conta.updated_at = datetime.now()
+        Returns:
+            List[Dict[str, Any]]: Contas divergentes com saldo atual e saldo pelo diário
+        """
+        result = await self.session.execute(
+            text(SQL_DIVERGENCIAS_SALDO),
+            {"id_empresa": id_empresa, "id_conta": id_conta, "tolerancia": tolerancia}
+        )
+        return [dict(linha) for linha in result.mappings()]
+    
+    async def reconstruir_saldos(self, id_empresa: UUID, id_conta: Optional[UUID] = None) -> int:
+        """
+        Recalcula ``saldo_atual`` a partir do saldo inicial e do diário.
+        
+        Args:
+            id_empresa: ID da empresa
+            id_conta: Restringe a uma conta
             
-            self.session.add(conta)
+        Returns:
+            int: Quantidade de contas corrigidas
+        """
+        try:
+            result = await self.session.execute(
+                text(f"""
+                    UPDATE contas_bancarias AS c
+                    SET saldo_atual = d.saldo_diario, updated_at = now()
+                    FROM ({SQL_DIVERGENCIAS_SALDO}) AS d
+                    WHERE c.id_conta = d.id_conta
+                """),
+                {"id_empresa": id_empresa, "id_conta": id_conta, "tolerancia": 0.005}
+            )
             await self.session.commit()
-            await self.session.refresh(conta)
-            
-            return conta
+            return result.rowcount
         except Exception as e:
             await self.session.rollback()
-            raise e 
\ No newline at end of file
+            raise e
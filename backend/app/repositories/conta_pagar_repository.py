@@ -1,13 +1,15 @@
 """Repositório para acesso aos dados de contas a pagar."""
 from uuid import UUID
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict, Any
 from datetime import date
 
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, and_, or_, func, case, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.categoria import Categoria
 from app.models.conta_pagar import ContaPagar
 from app.schemas.conta_pagar import ContaPagarCreate, ContaPagarUpdate, StatusContaPagar
+from app.utils.periodos import Periodo, condicoes_periodo, periodo_entre
 
 
 class ContaPagarRepository:
@@ -141,11 +143,8 @@ class ContaPagarRepository:
         if status:
             query = query.where(ContaPagar.status == status)
             
-        if data_inicial:
-            query = query.where(ContaPagar.data_vencimento >= data_inicial)
-            
-        if data_final:
-            query = query.where(ContaPagar.data_vencimento <= data_final)
+        for condicao in condicoes_periodo(ContaPagar.data_vencimento, periodo_entre(data_inicial, data_final)):
+            query = query.where(condicao)
             
         if fornecedor_id:
             query = query.where(ContaPagar.fornecedor_id == fornecedor_id)
@@ -174,6 +173,196 @@ class ContaPagarRepository:
         
         return list(contas), total
 
+    def _filtros_relatorio(
+        self,
+        empresa_id: UUID,
+        data_inicial: Optional[date] = None,
+        data_final: Optional[date] = None,
+        status: Optional[StatusContaPagar] = None,
+        fornecedor_id: Optional[UUID] = None,
+        categoria_id: Optional[UUID] = None
+    ) -> list:
+        """Condições comuns ao resumo e ao detalhamento do relatório."""
+        condicoes = [ContaPagar.empresa_id == empresa_id]
+        condicoes.extend(condicoes_periodo(ContaPagar.data_vencimento, periodo_entre(data_inicial, data_final)))
+        if status:
+            condicoes.append(ContaPagar.status == status)
+        if fornecedor_id:
+            condicoes.append(ContaPagar.fornecedor_id == fornecedor_id)
+        if categoria_id:
+            condicoes.append(ContaPagar.categoria_id == categoria_id)
+        return condicoes
+
+    async def get_resumo_relatorio(
+        self,
+        empresa_id: UUID,
+        hoje: date,
+        data_inicial: Optional[date] = None,
+        data_final: Optional[date] = None,
+        status: Optional[StatusContaPagar] = None,
+        fornecedor_id: Optional[UUID] = None,
+        categoria_id: Optional[UUID] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Agregados do relatório em uma única consulta com GROUPING SETS.
+        
+        Cada linha pertence a um dos agrupamentos, identificado em
+        ``agrupamento``: ``status``, ``categoria``, ``faixa`` (vencida / a
+        vencer, só para contas em aberto) ou ``total``. Nenhuma conta é
+        carregada como objeto ORM.
+        
+        Args:
+            empresa_id: ID da empresa
+            hoje: Data de referência para separar vencidas de a vencer
+            data_inicial: Vencimento inicial
+            data_final: Vencimento final
+            status: Filtrar por status
+            fornecedor_id: Filtrar por fornecedor
+            categoria_id: Filtrar por categoria
+            
+        Returns:
+            Lista de linhas com agrupamento, chave, quantidade e valor
+        """
+        em_aberto = ContaPagar.status.in_([StatusContaPagar.PENDENTE, StatusContaPagar.VENCIDO])
+        # A faixa é calculada numa subconsulta: repetir o CASE (com parâmetros)
+        # no SELECT e no GROUP BY impediria o PostgreSQL de casar as expressões
+        base = (
+            select(
+                ContaPagar.status.label("status"),
+                ContaPagar.categoria_id.label("categoria_id"),
+                Categoria.descricao.label("categoria"),
+                case(
+                    (and_(em_aberto, ContaPagar.data_vencimento < hoje), "vencida"),
+                    (em_aberto, "a_vencer"),
+                ).label("faixa"),
+                ContaPagar.valor.label("valor"),
+            )
+            .outerjoin(Categoria, Categoria.id_categoria == ContaPagar.categoria_id)
+            .where(and_(*self._filtros_relatorio(
+                empresa_id, data_inicial, data_final, status, fornecedor_id, categoria_id
+            )))
+            .subquery()
+        )
+
+        query = (
+            select(
+                func.grouping(base.c.status, base.c.categoria_id, base.c.faixa).label("grupo"),
+                base.c.status,
+                base.c.categoria,
+                base.c.faixa,
+                func.count().label("quantidade"),
+                func.coalesce(func.sum(base.c.valor), 0).label("valor"),
+            )
+            .group_by(func.grouping_sets(
+                tuple_(base.c.status),
+                tuple_(base.c.categoria_id, base.c.categoria),
+                tuple_(base.c.faixa),
+                tuple_(),
+            ))
+        )
+        result = await self.session.execute(query)
+
+        # grouping() tem um bit por coluna (status, categoria, faixa), 1 = agregada
+        agrupamentos = {0b011: "status", 0b101: "categoria", 0b110: "faixa", 0b111: "total"}
+        linhas = []
+        for linha in result.mappings():
+            agrupamento = agrupamentos[linha["grupo"]]
+            chave = {
+                "status": linha["status"],
+                "categoria": linha["categoria"],
+                "faixa": linha["faixa"],
+                "total": None,
+            }[agrupamento]
+            linhas.append({
+                "agrupamento": agrupamento,
+                "chave": chave.value if isinstance(chave, StatusContaPagar) else chave,
+                "quantidade": linha["quantidade"],
+                "valor": linha["valor"],
+            })
+        return linhas
+
+    async def get_contas_para_relatorio(
+        self,
+        empresa_id: UUID,
+        data_inicial: Optional[date] = None,
+        data_final: Optional[date] = None,
+        status: Optional[StatusContaPagar] = None,
+        fornecedor_id: Optional[UUID] = None,
+        categoria_id: Optional[UUID] = None,
+        skip: int = 0,
+        limit: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """
+        Linhas de detalhe do relatório (colunas simples, sem hidratar ORM).
+        
+        Args:
+            empresa_id: ID da empresa
+            data_inicial: Vencimento inicial
+            data_final: Vencimento final
+            status: Filtrar por status
+            fornecedor_id: Filtrar por fornecedor
+            categoria_id: Filtrar por categoria
+            skip: Número de registros para pular
+            limit: Número máximo de registros
+            
+        Returns:
+            Lista de dicionários ordenada por vencimento
+        """
+        query = (
+            select(
+                ContaPagar.id_conta,
+                ContaPagar.descricao,
+                ContaPagar.valor,
+                ContaPagar.data_vencimento,
+                ContaPagar.data_pagamento,
+                ContaPagar.status,
+                ContaPagar.fornecedor_id,
+                Categoria.descricao.label("categoria"),
+            )
+            .outerjoin(Categoria, Categoria.id_categoria == ContaPagar.categoria_id)
+            .where(and_(*self._filtros_relatorio(
+                empresa_id, data_inicial, data_final, status, fornecedor_id, categoria_id
+            )))
+            .order_by(ContaPagar.data_vencimento, ContaPagar.id_conta)
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return [dict(linha) for linha in result.mappings()]
+
+    async def get_totais_pagos(self, empresa_id: UUID, periodo: Periodo) -> Dict[str, Any]:
+        """
+        Total e quantidade de contas pagas no período, também por categoria.
+        
+        Args:
+            empresa_id: ID da empresa
+            periodo: Intervalo ``[inicio, fim)`` da data de pagamento
+            
+        Returns:
+            Dict com total, quantidade e o total por categoria
+        """
+        query = (
+            select(
+                Categoria.descricao.label("categoria"),
+                func.count().label("quantidade"),
+                func.coalesce(func.sum(ContaPagar.valor), 0).label("valor"),
+            )
+            .outerjoin(Categoria, Categoria.id_categoria == ContaPagar.categoria_id)
+            .where(
+                ContaPagar.empresa_id == empresa_id,
+                ContaPagar.status == StatusContaPagar.PAGO,
+                *condicoes_periodo(ContaPagar.data_pagamento, periodo)
+            )
+            .group_by(Categoria.descricao)
+        )
+        result = await self.session.execute(query)
+        totais = {"total": 0.0, "quantidade": 0, "por_categoria": {}}
+        for linha in result.mappings():
+            totais["total"] = round(totais["total"] + float(linha["valor"]), 2)
+            totais["quantidade"] += linha["quantidade"]
+            totais["por_categoria"][linha["categoria"] or "Sem categoria"] = float(linha["valor"])
+        return totais
+
     async def commit(self) -> None:
         """Commit das alterações na sessão."""
         await self.session.commit()
@@ -9,6 +9,7 @@ from uuid import UUID
 from app.models.conta_receber import ContaReceber
 from app.schemas.conta_receber import ContaReceberCreate, ContaReceberUpdate, StatusContaReceber
 from app.repositories.base_repository import BaseRepository
+from app.utils.periodos import condicoes_periodo, periodo_entre
 
 
 class ContaReceberRepository(BaseRepository):
@@ -135,6 +136,7 @@ class ContaReceberRepository(BaseRepository):
         data_inicio: Optional[date] = None,
         data_fim: Optional[date] = None,
         apenas_vencidas: bool = False,
+        search: Optional[str] = None,
         ordenar_por: str = "data_vencimento",
         ordem: str = "asc"
     ) -> tuple[List[ContaReceber], int]:
@@ -151,6 +153,7 @@ class ContaReceberRepository(BaseRepository):
             data_inicio: Data inicial para filtro
             data_fim: Data final para filtro
             apenas_vencidas: Mostrar apenas contas vencidas
+            search: Termo buscado na descrição
             ordenar_por: Campo para ordenação
             ordem: Direção da ordenação (asc/desc)
             
@@ -170,11 +173,11 @@ class ContaReceberRepository(BaseRepository):
         if venda_id:
             query = query.where(ContaReceber.id_venda == venda_id)
             
-        if data_inicio:
-            query = query.where(ContaReceber.data_vencimento >= data_inicio)
+        for condicao in condicoes_periodo(ContaReceber.data_vencimento, periodo_entre(data_inicio, data_fim)):
+            query = query.where(condicao)
             
-        if data_fim:
-            query = query.where(ContaReceber.data_vencimento <= data_fim)
+        if search:
+            query = query.where(ContaReceber.descricao.ilike(f"%{search}%"))
             
         if apenas_vencidas:
             hoje = date.today()
@@ -0,0 +1,200 @@
+"""Repositório para movimentações de estoque em lote."""
+from typing import List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Tipos aceitos e o sinal aplicado à quantidade informada
+SINAL_TIPO_MOVIMENTACAO = {
+    "entrada": 1,
+    "saida": -1,
+    "ajuste": 1,
+}
+
+# Aplica todas as movimentações em uma única instrução:
+#  - pedidos: uma linha por movimentação recebida (fonte variável)
+#  - agregados: delta líquido por produto
+#  - aplicados: UPDATE condicional; produtos sem saldo suficiente ficam de fora
+#  - movimentos: diário das movimentações aplicadas, com o saldo resultante
+#    de cada linha na ordem em que foram informadas
+# O SELECT final devolve uma linha por produto, aplicada ou não; para as não
+# aplicadas, ``estoque_disponivel`` vem do snapshot anterior ao UPDATE.
+SQL_APLICAR_MOVIMENTACOES = """
+WITH pedidos AS (
+    {fonte}
+),
+agregados AS (
+    SELECT id_produto, sum(delta) AS delta
+    FROM pedidos
+    GROUP BY id_produto
+),
+aplicados AS (
+    UPDATE produtos AS p
+    SET estoque_atual = p.estoque_atual + a.delta
+    FROM agregados AS a
+    WHERE p.id_produto = a.id_produto
+      AND p.id_empresa = :id_empresa
+      AND p.estoque_atual + a.delta >= 0
+    RETURNING p.id_produto, p.estoque_atual, a.delta
+),
+movimentos AS (
+    INSERT INTO movimentacoes_estoque (
+        id_movimentacao, id_empresa, id_produto, id_venda, tipo,
+        quantidade, estoque_resultante, observacao, created_at
+    )
+    SELECT
+        uuid_generate_v4(), CAST(:id_empresa AS uuid), pe.id_produto,
+        CAST(:id_venda AS uuid), pe.tipo,
+        abs(pe.delta),
+        ap.estoque_atual - ap.delta
+            + sum(pe.delta) OVER (PARTITION BY pe.id_produto ORDER BY pe.ordem),
+        CAST(:observacao AS text), now()
+    FROM pedidos AS pe
+    JOIN aplicados AS ap ON ap.id_produto = pe.id_produto
+)
+SELECT
+    a.id_produto,
+    a.delta,
+    ap.estoque_atual,
+    p.estoque_atual AS estoque_disponivel,
+    ap.id_produto IS NOT NULL AS aplicado
+FROM agregados AS a
+LEFT JOIN aplicados AS ap ON ap.id_produto = a.id_produto
+LEFT JOIN produtos AS p ON p.id_produto = a.id_produto AND p.id_empresa = :id_empresa
+"""
+
+FONTE_LISTA = """
+    SELECT m.id_produto, m.delta, m.tipo, m.ordem
+    FROM unnest(
+        CAST(:ids_produto AS uuid[]),
+        CAST(:deltas AS double precision[]),
+        CAST(:tipos AS text[])
+    ) WITH ORDINALITY AS m(id_produto, delta, tipo, ordem)
+"""
+
+FONTE_ITENS_VENDA = """
+    SELECT i.id_produto, -i.quantidade AS delta, 'saida'::text AS tipo,
+           row_number() OVER (ORDER BY i.created_at, i.id_item_venda) AS ordem
+    FROM itens_venda AS i
+    JOIN vendas AS v ON v.id_venda = i.id_venda
+    WHERE i.id_venda = CAST(:id_venda AS uuid)
+      AND v.id_empresa = CAST(:id_empresa AS uuid)
+      AND i.id_produto IS NOT NULL
+"""
+
+
+class EstoqueRepository:
+    """Repositório para aplicar movimentações de estoque de forma atômica."""
+
+    def __init__(self, session: AsyncSession):
+        """Inicializar repositório com sessão."""
+        self.session = session
+
+    async def _executar(
+        self,
+        fonte: str,
+        params: dict,
+        tudo_ou_nada: bool
+    ) -> List[dict]:
+        """
+        Executa a instrução de movimentação dentro de um savepoint.
+
+        Args:
+            fonte: SELECT que produz (id_produto, delta, tipo, ordem)
+            params: Parâmetros da instrução
+            tudo_ou_nada: Desfaz o lote inteiro se algum produto não for aplicado
+
+        Returns:
+            Uma linha por produto com delta, estoque atual, disponível, se foi
+            aplicado e se faltou saldo (``falta``)
+        """
+        savepoint = await self.session.begin_nested()
+        try:
+            result = await self.session.execute(
+                text(SQL_APLICAR_MOVIMENTACOES.format(fonte=fonte)),
+                params
+            )
+            linhas = [dict(row) for row in result.mappings().all()]
+        except Exception:
+            await savepoint.rollback()
+            raise
+
+        for linha in linhas:
+            linha["falta"] = not linha["aplicado"]
+
+        if tudo_ou_nada and any(linha["falta"] for linha in linhas):
+            await savepoint.rollback()
+            for linha in linhas:
+                linha["aplicado"] = False
+                linha["estoque_atual"] = None
+        else:
+            await savepoint.commit()
+
+        return linhas
+
+    async def aplicar_movimentacoes(
+        self,
+        id_empresa: UUID,
+        movimentacoes: Sequence[Tuple[UUID, float, str]],
+        observacao: Optional[str] = None,
+        id_venda: Optional[UUID] = None,
+        tudo_ou_nada: bool = True
+    ) -> List[dict]:
+        """
+        Aplica várias movimentações de estoque em uma única ida ao banco.
+
+        Cada produto só é atualizado se o saldo resultante não ficar negativo;
+        o teste e a escrita acontecem no mesmo UPDATE, sem janela para corridas.
+
+        Args:
+            id_empresa: ID da empresa
+            movimentacoes: Tuplas (id_produto, delta assinado, tipo)
+            observacao: Observação registrada nas movimentações
+            id_venda: Venda de origem, se houver
+            tudo_ou_nada: Se True, nenhuma movimentação é aplicada quando
+                          algum produto não tiver saldo suficiente
+
+        Returns:
+            Uma linha por produto com delta, estoque atual, disponível e se foi aplicado
+        """
+        if not movimentacoes:
+            return []
+
+        ids, deltas, tipos = zip(*movimentacoes)
+        params = {
+            "id_empresa": id_empresa,
+            "id_venda": id_venda,
+            "observacao": observacao,
+            "ids_produto": list(ids),
+            "deltas": [float(d) for d in deltas],
+            "tipos": list(tipos),
+        }
+        return await self._executar(FONTE_LISTA, params, tudo_ou_nada)
+
+    async def baixar_itens_venda(
+        self,
+        id_venda: UUID,
+        id_empresa: UUID,
+        observacao: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Baixa do estoque todos os itens de uma venda em uma única instrução.
+
+        Os itens são lidos diretamente de ``itens_venda`` no banco; se algum
+        produto não tiver saldo suficiente, nenhuma baixa é aplicada.
+
+        Args:
+            id_venda: ID da venda
+            id_empresa: ID da empresa
+            observacao: Observação registrada nas movimentações
+
+        Returns:
+            Uma linha por produto com delta, estoque atual, disponível e se foi aplicado
+        """
+        params = {
+            "id_empresa": id_empresa,
+            "id_venda": id_venda,
+            "observacao": observacao or f"Baixa da venda {id_venda}",
+        }
+        return await self._executar(FONTE_ITENS_VENDA, params, tudo_ou_nada=True)
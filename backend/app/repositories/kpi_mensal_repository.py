@@ -0,0 +1,167 @@
+"""Repositório dos indicadores mensais consolidados (kpi_mensal)."""
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+COLUNAS_KPI = (
+    "receitas", "despesas", "saldo", "quantidade_lancamentos", "quantidade_vendas",
+    "total_vendas", "ticket_medio_vendas", "quantidade_clientes", "quantidade_fornecedores",
+)
+
+# Recalcula os pares (empresa, mês) informados e grava o resultado.
+# Os filtros de data são intervalos [mês, mês + 1) sobre as colunas
+# indexadas, sem extract() sobre a coluna, e cada subconsulta lê apenas
+# as linhas do mês da empresa.
+SQL_RECALCULAR_MESES = f"""
+    WITH alvo AS (
+        SELECT DISTINCT a.id_empresa, a.mes
+        FROM unnest(CAST(:empresas AS uuid[]), CAST(:meses AS date[])) AS a(id_empresa, mes)
+    ),
+    calculado AS (
+        SELECT a.id_empresa,
+               a.mes,
+               l.receitas,
+               l.despesas,
+               l.quantidade_lancamentos,
+               v.quantidade_vendas,
+               v.total_vendas,
+               (SELECT count(*) FROM clientes c WHERE c.id_empresa = a.id_empresa) AS quantidade_clientes,
+               (SELECT count(*) FROM fornecedores f WHERE f.id_empresa = a.id_empresa) AS quantidade_fornecedores
+        FROM alvo a
+        CROSS JOIN LATERAL (
+            SELECT COALESCE(sum(x.valor) FILTER (WHERE x.tipo = 'entrada'), 0) AS receitas,
+                   COALESCE(sum(x.valor) FILTER (WHERE x.tipo = 'saida'), 0) AS despesas,
+                   count(*) AS quantidade_lancamentos
+            FROM lancamentos x
+            WHERE x.id_empresa = a.id_empresa
+              AND x.data_lancamento >= a.mes
+              AND x.data_lancamento < CAST(a.mes + interval '1 month' AS date)
+        ) l
+        CROSS JOIN LATERAL (
+            SELECT count(*) AS quantidade_vendas,
+                   COALESCE(sum(x.valor_liquido), 0) AS total_vendas
+            FROM vendas x
+            WHERE x.id_empresa = a.id_empresa
+              AND x.data_venda >= a.mes
+              AND x.data_venda < CAST(a.mes + interval '1 month' AS date)
+              AND x.status <> 'cancelada'
+        ) v
+    )
+    INSERT INTO kpi_mensal (id_empresa, mes, {", ".join(COLUNAS_KPI)}, atualizado_em)
+    SELECT id_empresa,
+           mes,
+           receitas,
+           despesas,
+           receitas - despesas,
+           quantidade_lancamentos,
+           quantidade_vendas,
+           total_vendas,
+           CASE WHEN quantidade_vendas > 0 THEN round(CAST(total_vendas / quantidade_vendas AS numeric), 2) ELSE 0 END,
+           quantidade_clientes,
+           quantidade_fornecedores,
+           now()
+    FROM calculado
+    ON CONFLICT (id_empresa, mes) DO UPDATE SET
+        {", ".join(f"{coluna} = EXCLUDED.{coluna}" for coluna in COLUNAS_KPI)},
+        atualizado_em = EXCLUDED.atualizado_em
+    RETURNING id_empresa, mes, {", ".join(COLUNAS_KPI)}, atualizado_em
+"""
+
+# Retira da fila os meses marcados há mais tempo. Linhas travadas por uma
+# escrita em andamento ficam para a próxima execução; uma escrita que chegue
+# depois do DELETE marca o mês de novo, então nenhuma alteração se perde.
+SQL_RETIRAR_PENDENTES = """
+    DELETE FROM kpi_mensal_pendente p
+    USING (
+        SELECT id_empresa, mes
+        FROM kpi_mensal_pendente
+        ORDER BY marcado_em
+        LIMIT :limite
+        FOR UPDATE SKIP LOCKED
+    ) AS lote
+    WHERE p.id_empresa = lote.id_empresa
+      AND p.mes = lote.mes
+    RETURNING p.id_empresa, p.mes
+"""
+
+SQL_KPI_MES = f"""
+    SELECT id_empresa, mes, {", ".join(COLUNAS_KPI)}, atualizado_em
+    FROM kpi_mensal
+    WHERE id_empresa = :id_empresa
+      AND mes = :mes
+"""
+
+
+def inicio_mes(data: date) -> date:
+    """Primeiro dia do mês da data (chave de ``kpi_mensal``)."""
+    return data.replace(day=1)
+
+
+class KpiMensalRepository:
+    """Leitura e recálculo incremental de ``kpi_mensal``."""
+
+    def __init__(self, session: AsyncSession):
+        """Inicializar repositório com sessão."""
+        self.session = session
+
+    async def get_mes(self, id_empresa: UUID, mes: date) -> Optional[Dict[str, Any]]:
+        """
+        Indicadores consolidados de um mês.
+
+        Args:
+            id_empresa: ID da empresa
+            mes: Qualquer data do mês
+
+        Returns:
+            Dict com os indicadores ou None se o mês ainda não foi calculado
+        """
+        result = await self.session.execute(
+            text(SQL_KPI_MES),
+            {"id_empresa": id_empresa, "mes": inicio_mes(mes)}
+        )
+        linha = result.mappings().first()
+        return dict(linha) if linha else None
+
+    async def recalcular_meses(self, pares: Iterable[Tuple[UUID, date]]) -> List[Dict[str, Any]]:
+        """
+        Recalcula e grava os indicadores dos meses informados.
+
+        Args:
+            pares: Pares (id_empresa, data) — a data é reduzida ao mês
+
+        Returns:
+            Lista com os indicadores gravados
+        """
+        pares = list({(id_empresa, inicio_mes(mes)) for id_empresa, mes in pares})
+        if not pares:
+            return []
+        result = await self.session.execute(
+            text(SQL_RECALCULAR_MESES),
+            {
+                "empresas": [str(id_empresa) for id_empresa, _ in pares],
+                "meses": [mes for _, mes in pares],
+            }
+        )
+        return [dict(linha) for linha in result.mappings().all()]
+
+    async def recalcular_pendentes(self, limite: int = 500) -> int:
+        """
+        Retira um lote da fila de meses pendentes e recalcula esses meses.
+
+        A retirada e o recálculo acontecem na mesma transação: se o recálculo
+        falhar, o rollback devolve os meses à fila.
+
+        Args:
+            limite: Quantidade máxima de meses no lote
+
+        Returns:
+            Quantidade de meses recalculados
+        """
+        result = await self.session.execute(text(SQL_RETIRAR_PENDENTES), {"limite": limite})
+        pares = [(linha["id_empresa"], linha["mes"]) for linha in result.mappings().all()]
+        await self.recalcular_meses(pares)
+        return len(pares)
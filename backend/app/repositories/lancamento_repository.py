@@ -3,7 +3,7 @@ from uuid import UUID
 from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, date
 
-from sqlalchemy import select, func, and_, desc
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -12,14 +12,55 @@ from app.models.cliente import Cliente
 from app.models.fornecedor import Fornecedor
 from app.models.conta_bancaria import ContaBancaria
 from app.models.forma_pagamento import FormaPagamento
+from app.repositories.base_repository import BaseRepository, CONTAGEM_SEQUENCIAL, ate, desde, igual
+from app.schemas.lancamento import LancamentoCreate, LancamentoUpdate
 
 
-class LancamentoRepository:
+# Lançamentos pendentes de conciliação de uma conta, já com o valor assinado.
+# Filtra pelo mesmo predicado e expressão de data do índice parcial
+# ix_lancamentos_pendentes_conciliacao.
+SQL_PENDENTES_CONCILIACAO = """
+    SELECT id_lancamento,
+           CASE WHEN tipo = 'entrada' THEN valor ELSE -valor END AS valor,
+           COALESCE(data_pagamento, data_vencimento) AS data,
+           descricao
+    FROM lancamentos
+    WHERE id_conta = :id_conta
+      AND id_empresa = :id_empresa
+      AND conciliado = false
+      AND status <> 'cancelado'
+      AND COALESCE(data_pagamento, data_vencimento) BETWEEN :data_inicio AND :data_fim
+"""
+
+# Marca todos os pares de uma vez; ``conciliado = false`` evita conciliar
+# duas vezes o mesmo lançamento em importações concorrentes
+SQL_MARCAR_CONCILIADOS = """
+    UPDATE lancamentos
+    SET conciliado = true, updated_at = now()
+    WHERE id_lancamento = ANY(CAST(:ids AS uuid[]))
+      AND id_empresa = :id_empresa
+      AND conciliado = false
+    RETURNING id_lancamento
+"""
+
+
+class LancamentoRepository(BaseRepository[Lancamento, LancamentoCreate, LancamentoUpdate]):
     """Repositório para operações com lançamentos financeiros."""
 
+    filtros = {
+        "tipo": igual(Lancamento.tipo),
+        "data_inicio": desde(Lancamento.data_lancamento),
+        "data_fim": ate(Lancamento.data_lancamento),
+        "id_cliente": igual(Lancamento.id_cliente),
+        "id_conta": igual(Lancamento.id_conta),
+        "status": igual(Lancamento.status),
+    }
+    ordenacao_padrao = "data_lancamento"
+    direcao_padrao = "desc"
+
     def __init__(self, session: AsyncSession):
         """Inicializar repositório com sessão."""
-        self.session = session
+        super().__init__(Lancamento, session)
 
     async def get_by_id(self, id_lancamento: UUID, id_empresa: Optional[UUID] = None) -> Optional[Lancamento]:
         """
@@ -60,7 +101,9 @@ class LancamentoRepository:
         id_cliente: Optional[UUID] = None,
         id_fornecedor: Optional[UUID] = None,
         id_conta: Optional[UUID] = None,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        campos: Optional[List[str]] = None,
+        contagem: str = CONTAGEM_SEQUENCIAL
     ) -> Tuple[List[Lancamento], int]:
         """
         Listar lançamentos por empresa com filtros.
@@ -73,76 +116,40 @@ class LancamentoRepository:
             data_inicio: Filtrar por data inicial
             data_fim: Filtrar por data final
             id_cliente: Filtrar por cliente
-            id_fornecedor: Filtrar por fornecedor
+            id_fornecedor: Mantido por compatibilidade; lançamentos não têm
+                           fornecedor e o valor é ignorado
             id_conta: Filtrar por conta bancária
             status: Filtrar por status
+            campos: Colunas a carregar; com campos, os relacionamentos não
+                    são carregados
+            contagem: Modo de contagem do total (ver ``BaseRepository.listar``)
             
         Returns:
             Lista de lançamentos e contagem total
         """
-        # Consulta principal para lançamentos
-        query = (
-            select(Lancamento)
-            .options(
-                selectinload(Lancamento.cliente),
-                selectinload(Lancamento.fornecedor),
-                selectinload(Lancamento.conta),
-                selectinload(Lancamento.forma_pagamento)
-            )
-            .where(Lancamento.id_empresa == id_empresa)
+        condicoes = self.compilar_filtros(
+            id_empresa,
+            tipo=tipo,
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            id_cliente=id_cliente,
+            id_conta=id_conta,
+            status=status
         )
-        
-        # Consulta para contagem
-        count_query = (
-            select(func.count())
-            .select_from(Lancamento)
-            .where(Lancamento.id_empresa == id_empresa)
+        opcoes = () if campos else (
+            selectinload(Lancamento.cliente),
+            selectinload(Lancamento.conta_bancaria),
+            selectinload(Lancamento.forma_pagamento)
+        )
+        # Ordenação padrão: data mais recente primeiro
+        return await self.listar(
+            condicoes,
+            skip=skip,
+            limit=limit,
+            campos=campos,
+            opcoes=opcoes,
+            contagem=contagem
         )
-        
-        # Aplicar filtros
-        if tipo:
-            query = query.where(Lancamento.tipo == tipo)
-            count_query = count_query.where(Lancamento.tipo == tipo)
-            
-        if data_inicio:
-            query = query.where(Lancamento.data_lancamento >= data_inicio)
-            count_query = count_query.where(Lancamento.data_lancamento >= data_inicio)
-            
-        if data_fim:
-            query = query.where(Lancamento.data_lancamento <= data_fim)
-            count_query = count_query.where(Lancamento.data_lancamento <= data_fim)
-            
-        if id_cliente:
-            query = query.where(Lancamento.id_cliente == id_cliente)
-            count_query = count_query.where(Lancamento.id_cliente == id_cliente)
-            
-        if id_fornecedor:
-            query = query.where(Lancamento.id_fornecedor == id_fornecedor)
-            count_query = count_query.where(Lancamento.id_fornecedor == id_fornecedor)
-            
-        if id_conta:
-            query = query.where(Lancamento.id_conta == id_conta)
-            count_query = count_query.where(Lancamento.id_conta == id_conta)
-            
-        if status:
-            query = query.where(Lancamento.status == status)
-            count_query = count_query.where(Lancamento.status == status)
-        
-        # Ordenar por data mais recente
-        query = query.order_by(desc(Lancamento.data_lancamento))
-        
-        # Executar consulta de contagem
-        count_result = await self.session.execute(count_query)
-        total_count = count_result.scalar_one() or 0
-        
-        # Aplicar paginação
-        query = query.offset(skip).limit(limit)
-        
-        # Executar consulta principal
-        result = await self.session.execute(query)
-        lancamentos = result.scalars().all()
-        
-        return list(lancamentos), total_count
     
     async def get_by_venda(self, id_venda: UUID) -> List[Lancamento]:
         """
@@ -311,4 +318,59 @@ class LancamentoRepository:
         await self.session.commit()
         await self.session.refresh(lancamento)
         
-        return lancamento 
\ No newline at end of file
+        return lancamento
+
+    async def get_pendentes_conciliacao(
+        self,
+        id_conta: UUID,
+        id_empresa: UUID,
+        data_inicio: date,
+        data_fim: date
+    ) -> List[Dict[str, Any]]:
+        """
+        Lançamentos não conciliados da conta no período.
+
+        Args:
+            id_conta: ID da conta bancária
+            id_empresa: ID da empresa
+            data_inicio: Data inicial (pagamento ou, na falta, vencimento)
+            data_fim: Data final
+
+        Returns:
+            Lista de dicts com id_lancamento, valor com sinal, data e descrição
+        """
+        result = await self.session.execute(
+            text(SQL_PENDENTES_CONCILIACAO),
+            {
+                "id_conta": id_conta,
+                "id_empresa": id_empresa,
+                "data_inicio": data_inicio,
+                "data_fim": data_fim,
+            }
+        )
+        return [dict(linha) for linha in result.mappings().all()]
+
+    async def marcar_conciliados(self, ids_lancamento: List[UUID], id_empresa: UUID) -> List[UUID]:
+        """
+        Marca os lançamentos como conciliados em um único UPDATE.
+
+        Args:
+            ids_lancamento: IDs dos lançamentos
+            id_empresa: ID da empresa
+
+        Returns:
+            IDs efetivamente atualizados (os já conciliados ficam de fora)
+        """
+        if not ids_lancamento:
+            return []
+        try:
+            result = await self.session.execute(
+                text(SQL_MARCAR_CONCILIADOS),
+                {"ids": [str(i) for i in ids_lancamento], "id_empresa": id_empresa}
+            )
+            atualizados = list(result.scalars().all())
+            await self.session.commit()
+            return atualizados
+        except Exception:
+            await self.session.rollback()
+            raise
@@ -9,6 +9,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException, status
 
 from app.models.log_sistema import LogSistema
+from app.core.retencao import excluir_em_lotes
 
 
 logger = logging.getLogger(__name__)
@@ -93,11 +94,17 @@ class LogSistemaRepository:
         skip: int = 0,
         limit: int = 100,
         ordenar_por: str = "created_at",
-        ordem: str = "desc"
+        ordem: str = "desc",
+        data_inicio: Optional[datetime.datetime] = None,
+        data_fim: Optional[datetime.datetime] = None
     ) -> Tuple[List[LogSistema], int]:
         """
         Busca logs do sistema com filtros opcionais.
         
+        O período é aplicado diretamente sobre ``created_at`` (sem funções
+        sobre a coluna), para que o PostgreSQL descarte as partições mensais
+        fora do intervalo.
+        
         Args:
             id_empresa: Filtrar por empresa
             id_usuario: Filtrar por usuário
@@ -107,6 +114,8 @@ class LogSistemaRepository:
             limit: Limite de registros a retornar
             ordenar_por: Campo para ordenação
             ordem: Direção da ordenação (asc/desc)
+            data_inicio: Início do período (inclusivo)
+            data_fim: Fim do período (exclusivo)
             
         Returns:
             Tuple[List[LogSistema], int]: Lista de logs e contagem total
@@ -129,6 +138,12 @@ class LogSistemaRepository:
         if busca:
             filters.append(LogSistema.descricao.ilike(f"%{busca}%"))
         
+        if data_inicio:
+            filters.append(LogSistema.created_at >= data_inicio)
+            
+        if data_fim:
+            filters.append(LogSistema.created_at < data_fim)
+        
         # Aplicar todos os filtros nas queries
         if filters:
             for filter_condition in filters:
@@ -195,22 +210,16 @@ class LogSistemaRepository:
         try:
             data_limite = datetime.datetime.now() - datetime.timedelta(days=dias)
             
-            # Construir a query
-            query = select(LogSistema).where(LogSistema.created_at < data_limite)
-            
-            if id_empresa:
-                query = query.where(LogSistema.id_empresa == id_empresa)
-            
-            result = await self.session.execute(query)
-            logs_antigos = list(result.scalars().all())
-            
-            quantidade = len(logs_antigos)
-            
-            # Remover os logs
-            for log in logs_antigos:
-                self.session.delete(log)
+            # Remoção em lotes no próprio banco, sem carregar as linhas
+            quantidade = await excluir_em_lotes(
+                self.session,
+                LogSistema.__tablename__,
+                coluna_data="created_at",
+                limite=data_limite,
+                coluna_empresa="id_empresa",
+                id_empresa=id_empresa
+            )
             
-            await self.session.commit()
             logger.info(f"Removidos {quantidade} logs antigos (mais de {dias} dias)")
             return quantidade
         except SQLAlchemyError as e:
@@ -235,20 +244,13 @@ class LogSistemaRepository:
             HTTPException: Se ocorrer um erro ao remover os logs
         """
         try:
-            query = select(LogSistema)
-            
-            if id_empresa:
-                query = query.where(LogSistema.id_empresa == id_empresa)
-            
-            result = await self.session.execute(query)
-            logs = list(result.scalars().all())
-            
-            quantidade = len(logs)
-            
-            for log in logs:
-                self.session.delete(log)
+            quantidade = await excluir_em_lotes(
+                self.session,
+                LogSistema.__tablename__,
+                coluna_empresa="id_empresa",
+                id_empresa=id_empresa
+            )
             
-            await self.session.commit()
             logger.info(f"Removidos {quantidade} logs do sistema")
             return quantidade
         except SQLAlchemyError as e:
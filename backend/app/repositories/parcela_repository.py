@@ -3,14 +3,17 @@ from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
 from datetime import date, datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func, select
+from sqlalchemy import or_, and_, func, select, insert
 from fastapi import HTTPException, status
 
 from app.models.parcela import Parcela, ParcelaCompra, ParcelaVenda
 from app.models.lancamento import Lancamento
 from app.models.cliente import Cliente
+from app.models.empresa import Empresa
 from app.schemas.parcela import ParcelaCreate, ParcelaUpdate, StatusParcela
 from app.repositories.base_repository import BaseRepository
+from app.utils.calendario import AJUSTE_SEGUINTE, CalendarioDiasUteis, calendario_local
+from app.utils.parcelamento import gerar_cronograma
 
 
 class ParcelaRepository(BaseRepository[Parcela, ParcelaCreate, ParcelaUpdate]):
@@ -469,15 +472,27 @@ class ParcelaRepository(BaseRepository[Parcela, ParcelaCreate, ParcelaUpdate]):
         db: Session, 
         *, 
         lancamento: Lancamento, 
-        total_parcelas: int
+        total_parcelas: int,
+        intervalo_meses: int = 1,
+        convencao: str = AJUSTE_SEGUINTE,
+        calendario: Optional[CalendarioDiasUteis] = None
     ) -> List[Parcela]:
         """
         Cria múltiplas parcelas para um lançamento.
         
+        Os vencimentos são mensais a partir do vencimento do lançamento,
+        ajustados para dia útil, e os valores são calculados em centavos com
+        o resíduo na última parcela. Todas as parcelas são inseridas em um
+        único INSERT … RETURNING, com um único commit.
+        
         Args:
             db: Sessão do banco de dados
             lancamento: Objeto do lançamento
             total_parcelas: Número total de parcelas
+            intervalo_meses: Meses entre vencimentos
+            convencao: Ajuste de vencimentos em dia não útil
+            calendario: Calendário de dias úteis (padrão: feriados nacionais,
+                        do estado e do município da empresa)
             
         Returns:
             List[Parcela]: Lista de parcelas criadas
@@ -491,57 +506,69 @@ class ParcelaRepository(BaseRepository[Parcela, ParcelaCreate, ParcelaUpdate]):
                 detail="O número de parcelas deve ser maior que zero"
             )
         
-        valor_parcela = lancamento.valor / total_parcelas
-        parcelas_criadas = []
-        
         # Verificar se já existem parcelas
-        parcelas_existentes = db.query(Parcela).filter(
-            Parcela.id_lancamento == lancamento.id_lancamento
-        ).count()
+        ja_possui = db.execute(
+            select(Parcela.id_parcela)
+            .where(Parcela.id_lancamento == lancamento.id_lancamento)
+            .limit(1)
+        ).first()
         
-        if parcelas_existentes > 0:
+        if ja_possui:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Este lançamento já possui parcelas"
             )
         
-        # Criar parcelas
-        for i in range(1, total_parcelas + 1):
-            # Calcular data de vencimento (mês a mês)
-            dias_adicionais = (i - 1) * 30
-            data_vencimento = lancamento.data_vencimento + datetime.timedelta(days=dias_adicionais)
-            
-            parcela_data = {
+        if calendario is None:
+            local = db.execute(
+                select(Empresa.estado, Empresa.cidade).where(Empresa.id_empresa == lancamento.id_empresa)
+            ).first()
+            ultimo_ano = lancamento.data_vencimento.year + (total_parcelas * intervalo_meses) // 12 + 1
+            calendario = calendario_local(
+                local.estado if local else None,
+                local.cidade if local else None,
+                lancamento.data_vencimento.year,
+                ultimo_ano
+            )
+        
+        cronograma = gerar_cronograma(
+            valor_total=lancamento.valor,
+            total_parcelas=total_parcelas,
+            primeiro_vencimento=lancamento.data_vencimento,
+            intervalo_meses=intervalo_meses,
+            convencao=convencao,
+            calendario=calendario
+        )
+        
+        status_parcela = lancamento.status if lancamento.status in ["pendente", "pago", "cancelado"] else "pendente"
+        data_pagamento = lancamento.data_pagamento if lancamento.status == "pago" else None
+        
+        linhas = [
+            {
                 "id_lancamento": lancamento.id_lancamento,
-                "numero": i,
-                "valor": round(valor_parcela, 2),  # Arredondar para 2 casas decimais
-                "data_vencimento": data_vencimento,
-                "status": lancamento.status if lancamento.status in ["pendente", "pago", "cancelado"] else "pendente",
-                "data_pagamento": lancamento.data_pagamento if lancamento.status == "pago" else None
+                "numero_parcela": parcela.numero,
+                "valor": float(parcela.valor),
+                "data_vencimento": parcela.data_vencimento,
+                "status": status_parcela,
+                "data_pagamento": data_pagamento
             }
-            
-            if i == total_parcelas:
-                # Ajustar valor da última parcela para corrigir arredondamentos
-                total_demais_parcelas = round(valor_parcela * (total_parcelas - 1), 2)
-                parcela_data["valor"] = round(lancamento.valor - total_demais_parcelas, 2)
-            
-            # Criar objeto parcela
-            parcela = Parcela(**parcela_data)
-            db.add(parcela)
-            parcelas_criadas.append(parcela)
+            for parcela in cronograma
+        ]
         
-        db.commit()
+        parcelas_criadas = list(
+            db.scalars(insert(Parcela).returning(Parcela, sort_by_parameter_order=True), linhas)
+        )
+        
+        # As parcelas já vieram completas do RETURNING; desanexá-las evita
+        # que o commit as expire e force um SELECT por parcela depois
+        for parcela in parcelas_criadas:
+            db.expunge(parcela)
         
-        # Atualizar o lançamento
-        lancamento.parcelado = True
+        # Atualizar o lançamento na mesma transação
         lancamento.total_parcelas = total_parcelas
         db.add(lancamento)
         db.commit()
         
-        # Atualizar as parcelas criadas com refresh
-        for i, parcela in enumerate(parcelas_criadas):
-            db.refresh(parcela)
-        
         return parcelas_criadas
     
     def _verificar_status_lancamento(self, db: Session, lancamento: Lancamento) -> None:
@@ -1,7 +1,7 @@
 """Repositório para gerenciamento de permissões."""
 from uuid import UUID
 from typing import List, Optional, Dict, Any, Tuple
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, and_, or_, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.permissao import Permissao
@@ -9,6 +9,28 @@ from app.schemas.permissao import PermissaoCreate, PermissaoUpdate
 from app.repositories.base_repository import BaseRepository
 
 
+# Pares (recurso, ação) de um usuário na empresa, das duas tabelas de
+# permissões: ``permissoes`` (por empresa) e ``permissoes_usuario``
+# (válida na empresa do próprio usuário).
+SQL_ACOES_USUARIO = text("""
+    SELECT u.tipo_usuario, perm.recurso, perm.acao
+    FROM usuarios u
+    LEFT JOIN LATERAL (
+        SELECT p.recurso, a.acao
+        FROM permissoes p
+        CROSS JOIN LATERAL json_array_elements_text(p.acoes) AS a(acao)
+        WHERE p.id_usuario = u.id_usuario
+          AND p.id_empresa = :id_empresa
+        UNION
+        SELECT pu.recurso, unnest(pu.acoes) AS acao
+        FROM permissoes_usuario pu
+        WHERE pu.id_usuario = u.id_usuario
+          AND u.id_empresa = :id_empresa
+    ) perm ON true
+    WHERE u.id_usuario = :id_usuario
+""")
+
+
 class PermissaoRepository(BaseRepository[Permissao, PermissaoCreate, PermissaoUpdate]):
     """Repositório para operações com permissões."""
 
@@ -122,6 +144,33 @@ class PermissaoRepository(BaseRepository[Permissao, PermissaoCreate, PermissaoUp
         
         return acao in permissao.acoes
 
+    async def get_acoes_usuario(
+        self,
+        user_id: UUID,
+        tenant_id: UUID
+    ) -> Tuple[Optional[str], List[Tuple[str, str]]]:
+        """
+        Buscar todas as ações permitidas a um usuário em uma empresa.
+
+        Usado para compilar o snapshot de permissões em uma única consulta.
+
+        Args:
+            user_id: ID do usuário
+            tenant_id: ID da empresa
+
+        Returns:
+            Tupla (tipo do usuário ou None se não existir, pares (recurso, ação))
+        """
+        result = await self.session.execute(
+            SQL_ACOES_USUARIO, {"id_usuario": user_id, "id_empresa": tenant_id}
+        )
+        linhas = result.all()
+        if not linhas:
+            return None, []
+        return linhas[0].tipo_usuario, [
+            (linha.recurso, linha.acao) for linha in linhas if linha.recurso is not None
+        ]
+
     async def get_multi(
         self,
         tenant_id: UUID,
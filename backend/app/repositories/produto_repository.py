@@ -1,22 +1,44 @@
 from uuid import UUID
 from typing import List, Optional, Dict, Any, Tuple
-from sqlalchemy import select, func, or_, update, desc, asc
+from sqlalchemy import select, or_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from decimal import Decimal
 
 from app.models.produto import Produto
-from app.schemas.produto import ProdutoCreate, ProdutoUpdate, ProdutoList
+from app.schemas.produto import ProdutoCreate, ProdutoUpdate, ProdutoList, ProdutoResumo
+from app.core.produto_lookup_cache import produto_lookup_cache
 from app.utils.logging_config import get_logger
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import BaseRepository, CONTAGEM_SEQUENCIAL, contem, igual, quando
 from app.database import db_session
 
 # Configurar logger
 logger = get_logger(__name__)
 
+# Colunas carregadas para o índice de consulta rápida (sem hidratar o ORM)
+COLUNAS_RESUMO = (
+    Produto.id_produto,
+    Produto.id_empresa,
+    Produto.nome,
+    Produto.codigo,
+    Produto.codigo_barras,
+    Produto.valor_venda,
+    Produto.estoque_atual,
+    Produto.ativo,
+)
+
 class ProdutoRepository(BaseRepository[Produto, ProdutoCreate, ProdutoUpdate]):
     """Repositório para operações com produtos."""
     
+    filtros = {
+        "id_categoria": igual(Produto.id_categoria),
+        "ativo": igual(Produto.ativo),
+        "estoque_baixo": quando(Produto.estoque_atual <= Produto.estoque_minimo),
+        "nome": contem(Produto.nome),
+        "codigo": contem(Produto.codigo, Produto.codigo_barras),
+    }
+    ordenacao_padrao = "nome"
+    
     def __init__(self, session: AsyncSession):
         """
         Inicializa o repositório com o modelo Produto e a sessão.
@@ -25,7 +47,7 @@ class ProdutoRepository(BaseRepository[Produto, ProdutoCreate, ProdutoUpdate]):
             session: Sessão assíncrona do SQLAlchemy
         """
         self.session = session
-        super().__init__(Produto)
+        super().__init__(Produto, session)
     
     async def get_by_id(self, id_produto: UUID, id_empresa: Optional[UUID] = None) -> Optional[Produto]:
         """
@@ -96,6 +118,68 @@ class ProdutoRepository(BaseRepository[Produto, ProdutoCreate, ProdutoUpdate]):
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
     
+    async def get_resumo_by_codigo(self, codigo: str, id_empresa: UUID) -> Optional[ProdutoResumo]:
+        """
+        Obtém o resumo de um produto pelo código ou código de barras.
+        
+        Args:
+            codigo: Código ou código de barras do produto
+            id_empresa: ID da empresa
+            
+        Returns:
+            ProdutoResumo: Resumo do produto ou None
+        """
+        query = (
+            select(*COLUNAS_RESUMO)
+            .where(
+                Produto.id_empresa == id_empresa,
+                or_(Produto.codigo_barras == codigo, Produto.codigo == codigo)
+            )
+            .limit(1)
+        )
+        result = await self.session.execute(query)
+        row = result.mappings().first()
+        return ProdutoResumo(**row) if row else None
+    
+    async def get_resumo_by_id(self, id_produto: UUID, id_empresa: UUID) -> Optional[ProdutoResumo]:
+        """
+        Obtém o resumo de um produto pelo ID.
+        
+        Args:
+            id_produto: ID do produto
+            id_empresa: ID da empresa
+            
+        Returns:
+            ProdutoResumo: Resumo do produto ou None
+        """
+        query = select(*COLUNAS_RESUMO).where(
+            Produto.id_produto == id_produto,
+            Produto.id_empresa == id_empresa
+        )
+        result = await self.session.execute(query)
+        row = result.mappings().first()
+        return ProdutoResumo(**row) if row else None
+    
+    async def list_resumos(self, id_empresa: UUID, limit: int) -> List[ProdutoResumo]:
+        """
+        Lista os resumos dos produtos ativos de uma empresa para aquecer o índice.
+        
+        Args:
+            id_empresa: ID da empresa
+            limit: Quantidade máxima de produtos
+            
+        Returns:
+            List[ProdutoResumo]: Resumos dos produtos mais recentemente alterados
+        """
+        query = (
+            select(*COLUNAS_RESUMO)
+            .where(Produto.id_empresa == id_empresa, Produto.ativo.is_(True))
+            .order_by(Produto.updated_at.desc().nulls_last())
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return [ProdutoResumo(**row) for row in result.mappings().all()]
+    
     async def get_by_categoria(self, id_categoria: UUID) -> List[Produto]:
         """
         Obtém todos os produtos de uma categoria.
@@ -118,6 +202,8 @@ class ProdutoRepository(BaseRepository[Produto, ProdutoCreate, ProdutoUpdate]):
         id_categoria: Optional[UUID] = None,
         ativo: Optional[bool] = None,
         estoque_baixo: Optional[bool] = None,
+        campos: Optional[List[str]] = None,
+        contagem: str = CONTAGEM_SEQUENCIAL,
         **filters
     ) -> Tuple[List[Produto], int]:
         """
@@ -130,75 +216,30 @@ class ProdutoRepository(BaseRepository[Produto, ProdutoCreate, ProdutoUpdate]):
             id_categoria: Filtrar por categoria específica
             ativo: Filtrar por status (ativo/inativo)
             estoque_baixo: Filtrar produtos com estoque abaixo do mínimo
-            **filters: Filtros adicionais
+            campos: Colunas a carregar (padrão: todas)
+            contagem: Modo de contagem do total (ver ``BaseRepository.listar``)
+            **filters: Filtros adicionais (nome, codigo, order_by, order_direction)
             
         Returns:
             Tuple[List[Produto], int]: Lista de produtos e contagem total
         """
-        # Consulta para a lista de produtos
-        query = select(Produto)
-        
-        # Consulta para contagem total
-        count_query = select(func.count()).select_from(Produto)
-        
-        # Aplicar filtros comuns a ambas consultas
-        if id_empresa:
-            query = query.where(Produto.id_empresa == id_empresa)
-            count_query = count_query.where(Produto.id_empresa == id_empresa)
-        
-        if id_categoria:
-            query = query.where(Produto.id_categoria == id_categoria)
-            count_query = count_query.where(Produto.id_categoria == id_categoria)
-        
-        if ativo is not None:
-            query = query.where(Produto.ativo == ativo)
-            count_query = count_query.where(Produto.ativo == ativo)
-        
-        if estoque_baixo:
-            query = query.where(Produto.estoque_atual <= Produto.estoque_minimo)
-            count_query = count_query.where(Produto.estoque_atual <= Produto.estoque_minimo)
-        
-        # Filtros para busca por nome ou código
-        if "nome" in filters and filters["nome"]:
-            termo_busca = f"%{filters['nome']}%"
-            query = query.where(Produto.nome.ilike(termo_busca))
-            count_query = count_query.where(Produto.nome.ilike(termo_busca))
-        
-        if "codigo" in filters and filters["codigo"]:
-            termo_busca = f"%{filters['codigo']}%"
-            query = query.where(or_(
-                Produto.codigo.ilike(termo_busca),
-                Produto.codigo_barras.ilike(termo_busca)
-            ))
-            count_query = count_query.where(or_(
-                Produto.codigo.ilike(termo_busca),
-                Produto.codigo_barras.ilike(termo_busca)
-            ))
-        
-        # Aplicar ordenação - o padrão é por nome
-        order_by = filters.get("order_by", "nome")
-        order_direction = filters.get("order_direction", "asc")
-        
-        if hasattr(Produto, order_by):
-            column = getattr(Produto, order_by)
-            if order_direction.lower() == "desc":
-                query = query.order_by(desc(column))
-            else:
-                query = query.order_by(asc(column))
-        else:
-            # Ordenação padrão por nome ascendente
-            query = query.order_by(Produto.nome)
-        
-        # Executar consulta de contagem
-        count_result = await self.session.execute(count_query)
-        total = count_result.scalar_one() or 0
-        
-        # Aplicar paginação e executar consulta principal
-        query = query.offset(skip).limit(limit)
-        result = await self.session.execute(query)
-        produtos = result.scalars().all()
-        
-        return list(produtos), total
+        condicoes = self.compilar_filtros(
+            id_empresa,
+            id_categoria=id_categoria,
+            ativo=ativo,
+            estoque_baixo=estoque_baixo,
+            nome=filters.get("nome"),
+            codigo=filters.get("codigo")
+        )
+        return await self.listar(
+            condicoes,
+            skip=skip,
+            limit=limit,
+            order_by=filters.get("order_by"),
+            order_direction=filters.get("order_direction"),
+            campos=campos,
+            contagem=contagem
+        )
     
     async def create(self, data: Dict[str, Any]) -> Produto:
         """
@@ -232,7 +273,9 @@ class ProdutoRepository(BaseRepository[Produto, ProdutoCreate, ProdutoUpdate]):
                 )
                 
         # Aproveitar a implementação do BaseRepository
-        return await super().create(data, data.get("id_empresa"))
+        produto = await super().create(data, data.get("id_empresa"))
+        produto_lookup_cache.armazenar(ProdutoResumo.model_validate(produto))
+        return produto
     
     async def update(self, id_produto: UUID, data: Dict[str, Any], id_empresa: UUID) -> Optional[Produto]:
         """
@@ -299,6 +342,8 @@ class ProdutoRepository(BaseRepository[Produto, ProdutoCreate, ProdutoUpdate]):
         await self.session.commit()
         await self.session.refresh(produto)
         
+        produto_lookup_cache.armazenar(ProdutoResumo.model_validate(produto))
+        
         return produto
     
     async def update_estoque(self, id_produto: UUID, id_empresa: UUID, quantidade: Decimal, is_entrada: bool = True) -> Optional[Produto]:
@@ -317,30 +362,33 @@ class ProdutoRepository(BaseRepository[Produto, ProdutoCreate, ProdutoUpdate]):
         Raises:
             HTTPException: Se houver erro na atualização
         """
-        # Verificar se o produto existe e pertence à empresa
-        produto = await self.get_by_id(id_produto, id_empresa)
-        if not produto:
-            return None
-        
-        # Calcular novo estoque
-        novo_estoque = produto.estoque_atual
-        if is_entrada:
-            novo_estoque += float(quantidade)
-        else:
-            novo_estoque -= float(quantidade)
-            if novo_estoque < 0:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Estoque não pode ficar negativo"
-                )
+        # Verificação de saldo e escrita no mesmo UPDATE condicional
+        delta = float(quantidade) if is_entrada else -float(quantidade)
+        query = (
+            update(Produto)
+            .where(Produto.id_produto == id_produto, Produto.id_empresa == id_empresa)
+            .values(estoque_atual=Produto.estoque_atual + delta)
+            .returning(Produto)
+            .execution_options(synchronize_session="fetch")
+        )
+        if not is_entrada:
+            query = query.where(Produto.estoque_atual >= float(quantidade))
         
-        # Atualizar o estoque
-        produto.estoque_atual = novo_estoque
+        result = await self.session.execute(query)
+        produto = result.scalar_one_or_none()
         
-        # Salvar as alterações
-        self.session.add(produto)
+        if not produto:
+            if is_entrada or not await self.get_by_id(id_produto, id_empresa):
+                return None
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Estoque não pode ficar negativo"
+            )
+        
+        estoque_atual = produto.estoque_atual
         await self.session.commit()
-        await self.session.refresh(produto)
+        
+        produto_lookup_cache.atualizar_estoque(id_empresa, id_produto, estoque_atual)
         
         return produto
     
@@ -367,4 +415,6 @@ class ProdutoRepository(BaseRepository[Produto, ProdutoCreate, ProdutoUpdate]):
         await self.session.delete(produto)
         await self.session.commit()
         
+        produto_lookup_cache.remover(id_empresa, id_produto)
+        
         return True 
\ No newline at end of file
@@ -1,14 +1,49 @@
 """Repositório para operações com usuários."""
 from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
-from sqlalchemy import select, func
+from sqlalchemy import select, func, text, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException, status
 
 from app.models.usuario import Usuario
 from app.schemas.usuario import UsuarioCreate, UsuarioUpdate
-from app.utils.security import get_password_hash
+from app.config.settings import settings
+from app.core.cache import LRUCache
+from app.core.password_hasher import gerar_hash_senha_async
+
+
+# Emails sem usuário cadastrado, para absorver rajadas de login com
+# credenciais inexistentes sem ir ao banco a cada tentativa
+emails_desconhecidos = LRUCache(
+    maxsize=settings.LOGIN_NEGATIVE_CACHE_SIZE,
+    ttl=settings.LOGIN_NEGATIVE_CACHE_TTL
+)
+
+# Usuário e permissões (recurso -> ações) em uma única ida ao banco.
+# lower(email) usa o índice ix_usuarios_email_lower.
+SQL_USUARIO_LOGIN = text("""
+    SELECT
+        u.id_usuario,
+        u.id_empresa,
+        u.nome,
+        u.email,
+        u.senha_hash,
+        u.tipo_usuario,
+        u.telas_permitidas,
+        coalesce(
+            jsonb_object_agg(p.recurso, p.acoes::jsonb) FILTER (WHERE p.recurso IS NOT NULL),
+            '{}'::jsonb
+        ) AS permissoes
+    FROM usuarios u
+    LEFT JOIN permissoes p
+           ON p.id_usuario = u.id_usuario
+          AND p.id_empresa = u.id_empresa
+    WHERE lower(u.email) = lower(:email)
+    GROUP BY u.id_usuario
+    LIMIT 1
+""").columns(permissoes=JSONB)
 
 
 class UsuarioRepository:
@@ -47,9 +82,49 @@ class UsuarioRepository:
         Returns:
             Usuario: Usuário encontrado ou None
         """
-        query = select(Usuario).where(Usuario.email == email)
+        query = select(Usuario).where(func.lower(Usuario.email) == email.lower())
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
+
+    async def get_para_login(self, email: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtém os dados de autenticação de um usuário pelo email.
+
+        A comparação ignora maiúsculas/minúsculas. Emails inexistentes ficam
+        em cache negativo por ``LOGIN_NEGATIVE_CACHE_TTL`` segundos.
+
+        Args:
+            email: Email informado no login
+
+        Returns:
+            Dicionário com os dados do usuário e ``permissoes`` (recurso -> ações)
+            ou None se o email não estiver cadastrado
+        """
+        chave = email.strip().lower()
+        if emails_desconhecidos.get(chave):
+            return None
+
+        result = await self.session.execute(SQL_USUARIO_LOGIN, {"email": chave})
+        linha = result.mappings().first()
+        if linha is None:
+            emails_desconhecidos.set(chave, True)
+            return None
+        return dict(linha)
+
+    async def atualizar_senha_hash(self, id_usuario: UUID, senha_hash: str) -> None:
+        """
+        Grava um novo hash de senha (rehash no login).
+
+        Args:
+            id_usuario: ID do usuário
+            senha_hash: Novo hash
+        """
+        await self.session.execute(
+            update(Usuario.__table__)
+            .where(Usuario.__table__.c.id_usuario == id_usuario)
+            .values(senha_hash=senha_hash)
+        )
+        await self.session.commit()
     
     async def get_by_field(self, field_name: str, value: Any) -> Optional[Usuario]:
         """
@@ -161,7 +236,7 @@ class UsuarioRepository:
                 id_empresa=usuario.id_empresa,
                 nome=usuario.nome,
                 email=usuario.email,
-                senha_hash=get_password_hash(usuario.senha),
+                senha_hash=await gerar_hash_senha_async(usuario.senha),
                 tipo_usuario=usuario.tipo_usuario,
                 telas_permitidas=usuario.telas_permitidas
             )
@@ -169,6 +244,7 @@ class UsuarioRepository:
             self.session.add(db_obj)
             await self.session.commit()
             await self.session.refresh(db_obj)
+            emails_desconhecidos.pop(db_obj.email.lower())
             
             return db_obj
         except SQLAlchemyError as e:
@@ -218,7 +294,7 @@ class UsuarioRepository:
             if "senha" in update_data:
                 senha = update_data.pop("senha")
                 if senha:
-                    db_obj.senha_hash = get_password_hash(senha)
+                    db_obj.senha_hash = await gerar_hash_senha_async(senha)
             
             # Atualizar os demais campos
             for field, value in update_data.items():
@@ -227,6 +303,7 @@ class UsuarioRepository:
             
             await self.session.commit()
             await self.session.refresh(db_obj)
+            emails_desconhecidos.pop(db_obj.email.lower())
             
             return db_obj
         except HTTPException:
@@ -1,14 +1,15 @@
 """Repositório para operações de banco de dados relacionadas a vendas."""
 from typing import Optional, List, Dict, Any, Tuple
-from uuid import UUID
+from uuid import UUID, uuid4
 from datetime import datetime
-from sqlalchemy import or_, select, func, and_
+from sqlalchemy import or_, select, func, and_, update, insert, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models.venda import Venda, ItemVenda
 from app.models.cliente import Cliente
 from app.models.produto import Produto
+from app.utils.periodos import condicoes_periodo, periodo_entre
 
 class VendaRepository:
     """Repositório para operações com vendas."""
@@ -70,13 +71,9 @@ class VendaRepository:
         count_query = select(func.count()).select_from(Venda).where(Venda.id_empresa == id_empresa)
         
         # Aplicar filtros
-        if data_inicio:
-            query = query.where(Venda.data_venda >= data_inicio)
-            count_query = count_query.where(Venda.data_venda >= data_inicio)
-            
-        if data_fim:
-            query = query.where(Venda.data_venda <= data_fim)
-            count_query = count_query.where(Venda.data_venda <= data_fim)
+        for condicao in condicoes_periodo(Venda.data_venda, periodo_entre(data_inicio, data_fim)):
+            query = query.where(condicao)
+            count_query = count_query.where(condicao)
             
         if id_cliente:
             query = query.where(Venda.id_cliente == id_cliente)
@@ -200,39 +197,120 @@ class VendaRepository:
         
         return True
     
-    async def create_item_venda(self, id_venda: UUID, id_empresa: UUID, item_data: Dict[str, Any]) -> ItemVenda:
+    @staticmethod
+    def _subtotal_item(quantidade: float, valor_unitario: float) -> float:
+        """Subtotal de um item, mesma regra usada no recálculo completo da venda."""
+        return float(quantidade or 0) * float(valor_unitario or 0)
+
+    async def _aplicar_delta_valor_venda(
+        self,
+        id_venda: UUID,
+        id_empresa: Optional[UUID],
+        delta: float
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Somar um delta aos totais da venda em um único UPDATE … RETURNING.
+        
+        O UPDATE também valida que a venda pertence à empresa e bloqueia a
+        linha até o fim da transação, serializando alterações concorrentes
+        de itens da mesma venda.
+        
+        Args:
+            id_venda: ID da venda
+            id_empresa: ID da empresa para validação (opcional)
+            delta: Valor a somar em valor_total e valor_liquido
+            
+        Returns:
+            Tupla (valor_total, valor_liquido) atualizada ou None se a venda não existir
+        """
+        query = (
+            update(Venda)
+            .where(Venda.id_venda == id_venda)
+            .values(
+                valor_total=Venda.valor_total + delta,
+                valor_liquido=Venda.valor_liquido + delta
+            )
+            .returning(Venda.valor_total, Venda.valor_liquido)
+        )
+        
+        if id_empresa:
+            query = query.where(Venda.id_empresa == id_empresa)
+        
+        result = await self.session.execute(query)
+        row = result.one_or_none()
+        return (row.valor_total, row.valor_liquido) if row else None
+    
+    async def create_item_venda(self, id_venda: UUID, id_empresa: UUID, item_data: Dict[str, Any]) -> Optional[ItemVenda]:
         """
         Criar item para uma venda.
         
+        Os totais da venda são ajustados pelo subtotal do item, sem recarregar
+        os demais itens.
+        
         Args:
             id_venda: ID da venda
             id_empresa: ID da empresa para validação
             item_data: Dados do item
             
         Returns:
-            Item criado
+            Item criado ou None se a venda não existir
         """
-        # Verificar se a venda existe e pertence à empresa
-        venda = await self.get_by_id(id_venda, id_empresa)
+        subtotal = self._subtotal_item(item_data.get("quantidade"), item_data.get("valor_unitario"))
         
-        if not venda:
+        # Ajustar totais (e validar a venda) antes de inserir o item
+        if await self._aplicar_delta_valor_venda(id_venda, id_empresa, subtotal) is None:
             return None
-            
-        # Adicionar ID da venda ao item
-        item_data["id_venda"] = id_venda
         
-        # Criar item
-        item = ItemVenda(**item_data)
+        item_data = {**item_data, "id_venda": id_venda}
+        item_data.setdefault("valor_total", subtotal)
         
-        # Salvar o item
+        item = ItemVenda(**item_data)
         self.session.add(item)
         await self.session.flush()
         
-        # Recalcular valor total da venda
-        await self.recalcular_valor_venda(id_venda)
-        
         return item
 
+    async def create_itens_venda(
+        self,
+        id_venda: UUID,
+        id_empresa: UUID,
+        itens_data: List[Dict[str, Any]]
+    ) -> Optional[List[ItemVenda]]:
+        """
+        Criar vários itens de uma venda de uma só vez.
+        
+        Todos os itens são inseridos em um único INSERT … RETURNING e os totais
+        da venda são ajustados uma única vez pela soma dos subtotais.
+        
+        Args:
+            id_venda: ID da venda
+            id_empresa: ID da empresa para validação
+            itens_data: Lista com os dados de cada item
+            
+        Returns:
+            Itens criados, na ordem recebida, ou None se a venda não existir
+        """
+        linhas = []
+        delta = 0.0
+        for item_data in itens_data:
+            subtotal = self._subtotal_item(item_data.get("quantidade"), item_data.get("valor_unitario"))
+            linha = {**item_data, "id_venda": id_venda}
+            linha.setdefault("id_item_venda", uuid4())
+            linha.setdefault("valor_total", subtotal)
+            linhas.append(linha)
+            delta += subtotal
+        
+        if await self._aplicar_delta_valor_venda(id_venda, id_empresa, delta) is None:
+            return None
+        
+        if not linhas:
+            return []
+        
+        result = await self.session.scalars(insert(ItemVenda).returning(ItemVenda), linhas)
+        itens = {item.id_item_venda: item for item in result.all()}
+        
+        return [itens[linha["id_item_venda"]] for linha in linhas]
+
     async def update_item_venda(
         self, 
         id_venda: UUID, 
@@ -243,6 +321,9 @@ class VendaRepository:
         """
         Atualizar item da venda.
         
+        Os totais da venda são ajustados pela diferença entre o subtotal novo
+        e o anterior do item.
+        
         Args:
             id_venda: ID da venda
             id_item: ID do item
@@ -252,17 +333,13 @@ class VendaRepository:
         Returns:
             Item atualizado ou None se não encontrado
         """
-        # Verificar se a venda existe e pertence à empresa
-        venda = await self.get_by_id(id_venda, id_empresa)
-        
-        if not venda:
-            return None
-                
-        # Verificar se o item existe
+        # Buscar o item já validando a venda e a empresa
         query_item = (
             select(ItemVenda)
+            .join(Venda, Venda.id_venda == ItemVenda.id_venda)
             .where(ItemVenda.id_item_venda == id_item)
             .where(ItemVenda.id_venda == id_venda)
+            .where(Venda.id_empresa == id_empresa)
         )
         
         result_item = await self.session.execute(query_item)
@@ -270,18 +347,25 @@ class VendaRepository:
         
         if not item:
             return None
-                
+        
+        subtotal_anterior = self._subtotal_item(item.quantidade, item.valor_unitario)
+        
         # Atualizar atributos do item
         for key, value in item_data.items():
             if hasattr(item, key):
                 setattr(item, key, value)
         
+        subtotal_novo = self._subtotal_item(item.quantidade, item.valor_unitario)
+        if "valor_total" not in item_data:
+            item.valor_total = subtotal_novo
+        
         # Salvar alterações
         self.session.add(item)
         await self.session.flush()
         
-        # Recalcular valor total da venda
-        await self.recalcular_valor_venda(id_venda)
+        delta = subtotal_novo - subtotal_anterior
+        if delta:
+            await self._aplicar_delta_valor_venda(id_venda, id_empresa, delta)
         
         return item
 
@@ -289,6 +373,9 @@ class VendaRepository:
         """
         Remover item da venda.
         
+        O item é removido com DELETE … RETURNING e seu subtotal é subtraído
+        dos totais da venda.
+        
         Args:
             id_venda: ID da venda
             id_item: ID do item
@@ -297,63 +384,60 @@ class VendaRepository:
         Returns:
             True se removido com sucesso
         """
-        # Verificar se a venda existe e pertence à empresa
-        venda = await self.get_by_id(id_venda, id_empresa)
-        
-        if not venda:
-            return False
-                
-        # Verificar se o item existe
-        query_item = (
-            select(ItemVenda)
+        vendas_empresa = select(Venda.id_venda).where(Venda.id_empresa == id_empresa)
+        query = (
+            delete(ItemVenda)
             .where(ItemVenda.id_item_venda == id_item)
             .where(ItemVenda.id_venda == id_venda)
+            .where(ItemVenda.id_venda.in_(vendas_empresa))
+            .returning(ItemVenda.quantidade, ItemVenda.valor_unitario)
         )
         
-        result_item = await self.session.execute(query_item)
-        item = result_item.scalar_one_or_none()
+        result = await self.session.execute(query)
+        removido = result.one_or_none()
         
-        if not item:
+        if not removido:
             return False
-                
-        # Excluir o item
-        await self.session.delete(item)
-        await self.session.flush()
         
-        # Recalcular valor total da venda
-        await self.recalcular_valor_venda(id_venda)
+        subtotal = self._subtotal_item(removido.quantidade, removido.valor_unitario)
+        if subtotal:
+            await self._aplicar_delta_valor_venda(id_venda, id_empresa, -subtotal)
         
         return True
 
-    async def recalcular_valor_venda(self, id_venda: UUID) -> None:
+    async def recalcular_valor_venda(self, id_venda: UUID) -> Optional[Tuple[float, float]]:
         """
-        Recalcular o valor total da venda com base em seus itens.
+        Recalcular do zero os totais da venda com base em seus itens.
+        
+        As alterações de itens já mantêm os totais por delta; este método
+        serve para reconciliar vendas cujos totais tenham divergido. A soma é
+        feita no banco em um único UPDATE … RETURNING.
         
         Args:
             id_venda: ID da venda
+            
+        Returns:
+            Tupla (valor_total, valor_liquido) recalculada ou None se a venda não existir
         """
-        # Buscar todos os itens da venda
-        query_itens = (
-            select(ItemVenda)
-            .where(ItemVenda.id_venda == id_venda)
+        soma_itens = (
+            select(func.coalesce(func.sum(ItemVenda.valor_unitario * ItemVenda.quantidade), 0.0))
+            .where(ItemVenda.id_venda == Venda.id_venda)
+            .scalar_subquery()
+        )
+        query = (
+            update(Venda)
+            .where(Venda.id_venda == id_venda)
+            .values(
+                valor_total=soma_itens,
+                valor_liquido=soma_itens - func.coalesce(Venda.valor_desconto, 0.0)
+            )
+            .returning(Venda.valor_total, Venda.valor_liquido)
+            .execution_options(synchronize_session="fetch")
         )
         
-        result_itens = await self.session.execute(query_itens)
-        itens = result_itens.scalars().all()
-        
-        # Calcular valor total
-        valor_total = sum(item.valor_unitario * item.quantidade for item in itens)
-        
-        # Buscar a venda
-        query_venda = select(Venda).where(Venda.id_venda == id_venda)
-        result_venda = await self.session.execute(query_venda)
-        venda = result_venda.scalar_one_or_none()
-        
-        if venda:
-            # Atualizar valor total
-            venda.valor_total = valor_total
-            self.session.add(venda)
-            await self.session.flush()
+        result = await self.session.execute(query)
+        row = result.one_or_none()
+        return (row.valor_total, row.valor_liquido) if row else None
 
     async def cancelar_venda(self, id_venda: UUID, id_empresa: UUID) -> Optional[Venda]:
         """
@@ -21,6 +21,8 @@ from app.routers import (
     auditoria,
     dashboard,
     relatorios,
+    busca,
+    diagnostico,
 )
 
 from app.routers.auth import router as auth_router
@@ -44,6 +46,8 @@ from app.routers.permissoes import router as permissoes_router
 from app.routers.auditoria import router as auditoria_router
 from app.routers.dashboard import router as dashboard_router
 from app.routers.relatorios import router as relatorios_router
+from app.routers.busca import router as busca_router
+from app.routers.diagnostico import router as diagnostico_router
 
 # Router principal que agrega todas as rotas da API
 api_router = APIRouter()
@@ -70,5 +74,7 @@ api_router.include_router(permissoes_router, tags=["Permissões"])
 api_router.include_router(auditoria_router, tags=["Auditoria"])
 api_router.include_router(dashboard_router, tags=["Dashboard"])
 api_router.include_router(relatorios_router, tags=["Relatórios"])
+api_router.include_router(busca_router, tags=["Busca"])
+api_router.include_router(diagnostico_router, tags=["Diagnóstico"])
 
 # Exportar o router para uso em main.py 
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+Router para a busca unificada do sistema CCONTROL-M.
+
+Este módulo expõe o endpoint de type-ahead que consulta produtos,
+clientes e fornecedores com busca full-text e aproximada (trigram).
+"""
+
+import logging
+from fastapi import APIRouter, Depends, Query
+from uuid import UUID
+from typing import Optional, List
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.busca import BuscaResponse
+from app.services.busca_service import BuscaService
+from app.schemas.token import TokenPayload
+from app.dependencies import get_current_user
+from app.database import get_async_session
+from app.utils.permissions import require_permission
+
+# Configuração de logger
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/busca",
+    tags=["Busca"],
+)
+
+
+@router.get("", response_model=BuscaResponse)
+@require_permission("busca", "listar")
+async def buscar(
+    id_empresa: UUID,
+    q: str = Query(..., min_length=1, max_length=100, description="Texto a buscar"),
+    tipos: Optional[List[str]] = Query(None, description="Entidades: produto, cliente, fornecedor"),
+    apenas_ativos: bool = Query(False, description="Retornar apenas registros ativos"),
+    limit: int = Query(20, ge=1, le=50, description="Quantidade máxima de resultados"),
+    current_user: TokenPayload = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Busca unificada para type-ahead.
+
+    - **id_empresa**: ID da empresa (obrigatório)
+    - **q**: Texto digitado; aceita nome, descrição, código, código de barras, CPF/CNPJ
+    - **tipos**: Restringe as entidades consultadas
+    - **apenas_ativos**: Ignora registros inativos
+    - **limit**: Quantidade máxima de resultados
+
+    Os resultados são ordenados por relevância, combinando a pontuação
+    full-text (sem acentos, dicionário português) e a similaridade trigram.
+    """
+    busca_service = BuscaService(session)
+    return await busca_service.buscar(
+        termo=q,
+        id_empresa=id_empresa,
+        tipos=tipos,
+        apenas_ativos=apenas_ativos,
+        limit=limit
+    )
@@ -6,7 +6,9 @@ gerenciar contas bancárias, com suporte a multi-tenancy e controle de permissõ
 """
 
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body, File, UploadFile
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from uuid import UUID
 from typing import Optional, Dict, Any, List
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -17,6 +19,8 @@ from app.schemas.conta_bancaria import (
     ContaBancariaList, ContaBancariaAtualizacaoSaldo
 )
 from app.services.conta_bancaria_service import ContaBancariaService
+from app.services.previsao_fluxo_caixa_service import PrevisaoFluxoCaixaService
+from app.services.conciliacao_service import ConciliacaoService
 from app.services.log_sistema_service import LogSistemaService
 from app.schemas.token import TokenPayload
 from app.models.usuario import Usuario
@@ -25,6 +29,8 @@ from app.database import get_async_session
 from app.utils.permissions import verify_permission
 from app.schemas.log_sistema import LogSistemaCreate
 from app.schemas.pagination import PaginatedResponse
+from app.repositories.base_repository import campos_da_requisicao, selecionar_campos
+from app.utils.extrato import FORMATO_OFX, FORMATOS_EXTRATO
 
 # Configuração de logger
 logger = logging.getLogger(__name__)
@@ -45,6 +51,7 @@ async def listar_contas_bancarias(
     tipo: Optional[str] = Query(None, description="Filtrar por tipo da conta"),
     banco: Optional[str] = Query(None, description="Filtrar por banco"),
     ativa: Optional[bool] = Query(None, description="Filtrar por status (ativa/inativa)"),
+    fields: Optional[str] = Query(None, description="Campos a retornar, separados por vírgula"),
     current_user: TokenPayload = Depends(get_current_user),
     service: ContaBancariaService = Depends(),
 ):
@@ -58,40 +65,62 @@ async def listar_contas_bancarias(
     - **tipo**: Filtro opcional por tipo de conta
     - **banco**: Filtro opcional por banco
     - **ativa**: Filtro opcional por status (ativa/inativa)
+    - **fields**: Campos da listagem a retornar (ex.: `id_conta,nome,saldo_atual`)
     
     Retorna lista paginada de contas bancárias que correspondem aos filtros aplicados.
     """
     # Verificar permissão
     verify_permission(current_user, "contas_bancarias:listar", id_empresa)
     
-    # Construir filtros
-    filtros = {}
-    if nome:
-        filtros["nome"] = nome
-    if tipo:
-        filtros["tipo"] = tipo
-    if banco:
-        filtros["banco"] = banco
-    if ativa is not None:
-        filtros["ativa"] = ativa
+    # Só as colunas da listagem são lidas; ?fields= restringe ainda mais
+    campos = campos_da_requisicao(fields)
+    if campos:
+        try:
+            campos = service.repository.validar_campos(campos, ContaBancariaList.model_fields)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
     contas, total = await service.listar_contas_bancarias(
         id_empresa=id_empresa,
         skip=skip,
         limit=limit,
-        filtros=filtros
+        filtros={"nome": nome, "tipo": tipo, "banco": banco, "ativa": ativa},
+        campos=campos or list(ContaBancariaList.model_fields)
     )
     
     # Calcular página atual
     page = (skip // limit) + 1 if limit > 0 else 1
     
+    if campos:
+        # Itens parciais não validam contra ContaBancariaList
+        resposta = PaginatedResponse.create(selecionar_campos(contas, campos), total, page, limit)
+        return JSONResponse(jsonable_encoder(resposta))
+    
     # Retornar resposta paginada
-    return PaginatedResponse(
-        items=contas,
-        total=total,
-        page=page,
-        size=limit
-    )
+    return PaginatedResponse.create(contas, total, page, limit)
+
+
+@router.get("/previsao")
+async def prever_fluxo_caixa(
+    id_empresa: UUID = Query(..., description="ID da empresa"),
+    dias: int = Query(90, ge=1, le=366, description="Horizonte da projeção em dias"),
+    current_user: TokenPayload = Depends(get_current_user),
+    service: PrevisaoFluxoCaixaService = Depends(),
+):
+    """
+    Projeta o saldo diário de cada conta bancária ativa.
+    
+    - **id_empresa**: ID da empresa
+    - **dias**: Quantidade de dias projetados a partir de hoje
+    
+    Considera lançamentos, parcelas, contas a pagar e contas a receber em
+    aberto, com os dias de compensação e as taxas da forma de pagamento.
+    Itens sem conta bancária aparecem em ``nao_alocado`` e entram no total.
+    """
+    # Verificar permissão
+    verify_permission(current_user, "contas_bancarias:visualizar", id_empresa)
+    
+    return await service.projetar(id_empresa, dias)
 
 
 @router.get("/{id_conta}", response_model=ContaBancaria)
@@ -365,4 +394,53 @@ async def atualizar_saldo_manual(
         )
     )
     
-    return conta_atualizada 
\ No newline at end of file
+    return conta_atualizada
+
+
+@router.post("/{id_conta}/conciliacao")
+async def conciliar_extrato(
+    id_conta: UUID = Path(..., description="ID da conta bancária"),
+    id_empresa: UUID = Query(..., description="ID da empresa"),
+    arquivo: UploadFile = File(..., description="Extrato bancário"),
+    formato: str = Query(FORMATO_OFX, description="Formato do extrato: ofx, cnab240 ou csv"),
+    janela_dias: int = Query(5, ge=0, le=30, description="Diferença máxima de dias entre extrato e lançamento"),
+    tolerancia_centavos: int = Query(0, ge=0, le=100, description="Diferença máxima de valor em centavos"),
+    pontuacao_minima: float = Query(0.5, ge=0, le=1, description="Pontuação mínima para aceitar um par"),
+    aplicar: bool = Query(False, description="Marcar os lançamentos encontrados como conciliados"),
+    separador_csv: Optional[str] = Query(None, max_length=1, description="Separador do CSV (padrão: detectado)"),
+    current_user: TokenPayload = Depends(get_current_user),
+    service: ConciliacaoService = Depends(),
+):
+    """
+    Concilia um extrato bancário com os lançamentos pendentes da conta.
+    
+    - **id_conta**: ID da conta bancária do extrato
+    - **arquivo**: Extrato em OFX, CNAB 240 (segmento E) ou CSV (data; descrição; valor)
+    - **aplicar**: Sem este parâmetro, apenas retorna a prévia dos pares
+    
+    Cada movimento é comparado com os lançamentos do mesmo valor dentro da
+    janela de dias, pontuados pela proximidade da data e pela semelhança da
+    descrição. Ao aplicar, os lançamentos escolhidos são marcados como
+    conciliados em uma única atualização.
+    """
+    # Verificar permissão
+    verify_permission(current_user, "contas_bancarias:editar" if aplicar else "contas_bancarias:visualizar", id_empresa)
+    
+    if formato not in FORMATOS_EXTRATO:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Formato inválido. Use um de: {', '.join(FORMATOS_EXTRATO)}"
+        )
+    
+    opcoes_csv = {"separador": separador_csv} if formato == "csv" else {}
+    return await service.conciliar_extrato(
+        id_conta,
+        id_empresa,
+        await arquivo.read(),
+        formato,
+        janela_dias=janela_dias,
+        tolerancia_centavos=tolerancia_centavos,
+        pontuacao_minima=pontuacao_minima,
+        aplicar=aplicar,
+        **opcoes_csv
+    )
@@ -12,7 +12,6 @@ from typing import Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from datetime import date, datetime
-from sqlalchemy import func, and_, extract, select
 
 from app.database import get_async_session
 from app.schemas.token import TokenPayload
@@ -23,11 +22,9 @@ from app.services.conta_pagar.conta_pagar_query_service import ContaPagarQuerySe
 from app.services.parcela_service import ParcelaService
 from app.models.usuario import Usuario
 from app.models.empresa import Empresa
-from app.models.cliente import Cliente
-from app.models.fornecedor import Fornecedor
-from app.models.lancamento import Lancamento
 from app.schemas.relatorio import ResumoDashboard
 from app.utils.verificacoes import verificar_permissao_empresa
+from app.services.kpi_mensal_service import KpiMensalService
 
 # Configuração de logger
 logger = logging.getLogger(__name__)
@@ -50,6 +47,9 @@ class ResumoDashboardApi(BaseModel):
     quantidade_clientes: int = 0
     quantidade_fornecedores: int = 0
     quantidade_lancamentos_mes: int = 0
+    quantidade_vendas_mes: int = 0
+    ticket_medio_vendas_mes: float = 0
+    atualizado_em: Optional[datetime] = None
 
 # Router
 router = APIRouter(
@@ -151,89 +151,20 @@ async def get_dashboard_resumo_api_v1(
         # Verificar permissão de acesso à empresa
         await verificar_permissao_empresa(id_empresa, current_user, session)
         
-        # Inicializar resposta
-        response = ResumoDashboardApi()
-        
-        # Obter data atual com timezone
-        hoje = datetime.now()
-        mes_atual = hoje.month
-        ano_atual = hoje.year
-        
-        # Consultar receitas do mês atual (lancamentos de tipo 'entrada')
-        query_receitas = (
-            select(func.sum(Lancamento.valor))
-            .where(
-                and_(
-                    Lancamento.id_empresa == id_empresa,
-                    Lancamento.tipo == "entrada",
-                    extract('month', Lancamento.data_lancamento) == mes_atual,
-                    extract('year', Lancamento.data_lancamento) == ano_atual
-                )
-            )
-        )
-        result_receitas = await session.execute(query_receitas)
-        total_receitas = result_receitas.scalar_one_or_none() or 0.0
-        
-        # Consultar despesas do mês atual (lancamentos de tipo 'saida')
-        query_despesas = (
-            select(func.sum(Lancamento.valor))
-            .where(
-                and_(
-                    Lancamento.id_empresa == id_empresa,
-                    Lancamento.tipo == "saida",
-                    extract('month', Lancamento.data_lancamento) == mes_atual,
-                    extract('year', Lancamento.data_lancamento) == ano_atual
-                )
-            )
-        )
-        result_despesas = await session.execute(query_despesas)
-        total_despesas = result_despesas.scalar_one_or_none() or 0.0
-        
-        # Calcular saldo mensal
-        saldo_mensal = total_receitas - total_despesas
-        
-        # Consultar quantidade de clientes
-        query_clientes = (
-            select(func.count())
-            .select_from(Cliente)
-            .where(Cliente.id_empresa == id_empresa)
+        # Uma linha de kpi_mensal (mantida pelo refresh incremental)
+        kpi = await KpiMensalService(session).get_mes(id_empresa)
+        
+        return ResumoDashboardApi(
+            total_receitas_mes_atual=float(kpi["receitas"]),
+            total_despesas_mes_atual=float(kpi["despesas"]),
+            saldo_mensal_atual=float(kpi["saldo"]),
+            quantidade_clientes=kpi["quantidade_clientes"],
+            quantidade_fornecedores=kpi["quantidade_fornecedores"],
+            quantidade_lancamentos_mes=kpi["quantidade_lancamentos"],
+            quantidade_vendas_mes=kpi["quantidade_vendas"],
+            ticket_medio_vendas_mes=float(kpi["ticket_medio_vendas"]),
+            atualizado_em=kpi["atualizado_em"]
         )
-        result_clientes = await session.execute(query_clientes)
-        qtd_clientes = result_clientes.scalar_one_or_none() or 0
-        
-        # Consultar quantidade de fornecedores
-        query_fornecedores = (
-            select(func.count())
-            .select_from(Fornecedor)
-            .where(Fornecedor.id_empresa == id_empresa)
-        )
-        result_fornecedores = await session.execute(query_fornecedores)
-        qtd_fornecedores = result_fornecedores.scalar_one_or_none() or 0
-        
-        # Consultar quantidade de lançamentos do mês
-        query_lancamentos = (
-            select(func.count())
-            .select_from(Lancamento)
-            .where(
-                and_(
-                    Lancamento.id_empresa == id_empresa,
-                    extract('month', Lancamento.data_lancamento) == mes_atual,
-                    extract('year', Lancamento.data_lancamento) == ano_atual
-                )
-            )
-        )
-        result_lancamentos = await session.execute(query_lancamentos)
-        qtd_lancamentos = result_lancamentos.scalar_one_or_none() or 0
-        
-        # Montar o resumo
-        response.total_receitas_mes_atual = float(total_receitas)
-        response.total_despesas_mes_atual = float(total_despesas)
-        response.saldo_mensal_atual = float(saldo_mensal)
-        response.quantidade_clientes = qtd_clientes
-        response.quantidade_fornecedores = qtd_fornecedores
-        response.quantidade_lancamentos_mes = qtd_lancamentos
-        
-        return response
     
     except Exception as e:
         logging.error(f"Erro ao obter resumo do dashboard API v1: {str(e)}")
@@ -0,0 +1,49 @@
+"""Router de diagnóstico de desempenho (restrito a administradores)."""
+import logging
+
+from fastapi import APIRouter, Depends, Query, HTTPException
+
+from app.core.bloqueio_loop import detector_bloqueio
+from app.dependencies import get_current_user
+
+
+logger = logging.getLogger(__name__)
+router = APIRouter(
+    prefix="/diagnostico",
+    tags=["Diagnóstico"],
+)
+
+
+def _exigir_admin(usuario_atual: dict) -> None:
+    if usuario_atual.get("tipo_usuario") != "ADMIN":
+        raise HTTPException(
+            status_code=403,
+            detail="Apenas administradores podem acessar o diagnóstico"
+        )
+
+
+@router.get("/bloqueios-loop")
+async def relatorio_bloqueios_loop(
+    limite: int = Query(20, ge=1, le=200),
+    ordenar_por: str = Query("total_segundos", regex=r"^(total_segundos|max_segundos|ocorrencias)$"),
+    usuario_atual: dict = Depends(get_current_user)
+):
+    """
+    Retorna os trechos que mais bloquearam o event loop, por rota e origem.
+    
+    Requer ``LOOP_BLOCK_DETECTOR_ENABLED=true``; com o detector desligado o
+    relatório vem vazio e com ``ativo = false``.
+    """
+    _exigir_admin(usuario_atual)
+    return detector_bloqueio.relatorio(limite=limite, ordenar_por=ordenar_por)
+
+
+@router.delete("/bloqueios-loop")
+async def limpar_bloqueios_loop(
+    usuario_atual: dict = Depends(get_current_user)
+):
+    """Descarta as ocorrências acumuladas pelo detector."""
+    _exigir_admin(usuario_atual)
+    logger.info(f"Limpando relatório de bloqueios do event loop. Usuário: {usuario_atual['id_usuario']}")
+    detector_bloqueio.limpar()
+    return {"mensagem": "Ocorrências de bloqueio descartadas"}
@@ -1,5 +1,6 @@
 """Router para logs do sistema."""
 import logging
+from datetime import datetime
 from uuid import UUID
 from typing import Optional
 
@@ -29,12 +30,16 @@ async def listar_logs(
     limit: int = Query(100, ge=1, le=1000),
     ordenar_por: str = Query("created_at", regex=r"^[a-zA-Z_]+$"),
     ordem: str = Query("desc", regex=r"^(asc|desc)$"),
+    data_inicio: Optional[datetime] = Query(None, description="Início do período (inclusivo)"),
+    data_fim: Optional[datetime] = Query(None, description="Fim do período (exclusivo)"),
     usuario_atual: dict = Depends(get_current_user),
     service: LogSistemaService = Depends()
 ):
     """
     Retorna uma lista paginada de logs do sistema com filtros opcionais.
     
+    Informar o período limita a consulta às partições mensais envolvidas.
+    
     Apenas administradores podem visualizar logs de todas as empresas.
     Usuários comuns só podem ver logs da própria empresa.
     """
@@ -60,7 +65,9 @@ async def listar_logs(
         skip=skip,
         limit=limit,
         ordenar_por=ordenar_por,
-        ordem=ordem
+        ordem=ordem,
+        data_inicio=data_inicio,
+        data_fim=data_fim
     )
 
 
@@ -4,8 +4,11 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status, Path
 from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas.produto import Produto as ProdutoSchema, ProdutoCreate, ProdutoUpdate, ProdutoList, EstoqueUpdate
-from app.services.produto import ProdutoService
+from app.schemas.produto import (
+    Produto as ProdutoSchema, ProdutoCreate, ProdutoUpdate, ProdutoList, EstoqueUpdate, ProdutoResumo,
+    MovimentacaoLoteRequest, MovimentacaoLoteResultado
+)
+from app.services.produto import ProdutoService, ProdutoLookupService, ProdutoEstoqueService
 from app.dependencies import get_current_user
 from app.database import get_async_session
 from app.utils.logging_config import get_logger
@@ -84,6 +87,35 @@ async def listar_produtos(
         order_direction=order_direction
     )
 
+@router.get("/codigo/{codigo}", response_model=ProdutoResumo, summary="Consultar produto por código")
+@require_permission("produtos", "visualizar")
+async def consultar_produto_por_codigo(
+    codigo: str = Path(..., min_length=1, max_length=64, description="Código ou código de barras"),
+    current_user: TokenPayload = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Consulta rápida de produto por código ou código de barras (PDV).
+    
+    Retorna o resumo do produto (preço, estoque e situação) a partir do
+    índice em memória da empresa, consultando o banco apenas na ausência.
+    
+    Parâmetros:
+    - codigo: Código interno ou código de barras lido
+    """
+    produto = await ProdutoLookupService(session).buscar_por_codigo(
+        codigo=codigo,
+        id_empresa=current_user.empresa_id
+    )
+    
+    if not produto:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Produto não encontrado"
+        )
+    
+    return produto
+
 @router.get("/{id_produto}", response_model=ProdutoSchema, summary="Obter produto por ID")
 @require_permission("produtos", "visualizar")
 async def obter_produto(
@@ -226,4 +258,37 @@ async def atualizar_estoque(
         id_produto=id_produto,
         id_empresa=current_user.empresa_id,
         estoque_data=estoque
-    ) 
\ No newline at end of file
+    ) 
+@router.post("/estoque/lote", response_model=MovimentacaoLoteResultado, summary="Movimentar estoque em lote")
+@require_permission("produtos", "editar")
+async def movimentar_estoque_lote(
+    lote: MovimentacaoLoteRequest,
+    current_user: TokenPayload = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Aplica várias movimentações de estoque em uma única operação.
+    
+    Parâmetros:
+    - movimentacoes: Lista de (id_produto, quantidade, tipo)
+    - observacao: Observação registrada nas movimentações
+    - permitir_parcial: Se verdadeiro, aplica os produtos com saldo mesmo que outros faltem;
+      caso contrário, nada é aplicado quando houver faltas
+    
+    Retorna os produtos aplicados e as faltas por produto.
+    """
+    logger.info(
+        f"Movimentando estoque em lote ({len(lote.movimentacoes)} itens)",
+        extra={
+            "user_id": current_user.sub,
+            "empresa_id": str(current_user.empresa_id)
+        }
+    )
+    
+    estoque_service = ProdutoEstoqueService(session)
+    return await estoque_service.movimentar_lote(
+        id_empresa=current_user.empresa_id,
+        movimentacoes=lote.movimentacoes,
+        observacao=lote.observacao,
+        permitir_parcial=lote.permitir_parcial
+    )
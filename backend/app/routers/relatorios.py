@@ -4,10 +4,13 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from datetime import datetime, date, timedelta
 from uuid import UUID
 from pydantic import BaseModel
-from sqlalchemy import select, func, and_, or_, desc, extract, case, literal_column, text
+from sqlalchemy import select, func, and_, or_, desc, case, literal_column, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import expression
 from collections import defaultdict
+from decimal import Decimal
+
+import numpy as np
 
 # Importação de modelos e utilitários
 from app.models.lancamento import Lancamento
@@ -21,6 +24,10 @@ from app.models.empresa import Empresa
 from app.database import get_async_session
 from app.dependencies import get_current_user
 from app.utils.verificacoes import verificar_permissao_empresa
+from app.utils.encargos import calcular_encargos_lote, criar_regra
+from app.utils.calendario import CalendarioDiasUteis, calendario_local
+from app.utils.periodos import no_periodo, periodo_entre, periodo_mes
+from app.services.aging_service import AgingService
 
 # Definição simples dos schemas de relatórios
 class CategoriaValor(BaseModel):
@@ -34,6 +41,9 @@ class RelatorioInadimplencia(BaseModel):
     valor_total: float
     dias_atraso: int
     parcelas_atrasadas: int
+    multa: float = 0.0
+    juros: float = 0.0
+    valor_atualizado: float = 0.0
 
 class RelatorioFluxoCaixa(BaseModel):
     data: str
@@ -55,6 +65,8 @@ class RelatorioCicloOperacional(BaseModel):
     pmp: int
     ciclo_operacional: int
     ciclo_financeiro: int
+    pmr_dias_uteis: int = 0
+    pmp_dias_uteis: int = 0
 
 router = APIRouter(
     prefix="/relatorios",
@@ -62,6 +74,16 @@ router = APIRouter(
     responses={404: {"description": "Relatório não encontrado"}}
 )
 
+def _prazos_medios(pares, calendario: CalendarioDiasUteis):
+    """Prazo médio em dias corridos e em dias úteis entre pares (início, fim)."""
+    if not pares:
+        return 0, 0
+    inicio = np.array([par[0] for par in pares], dtype="datetime64[D]")
+    fim = np.array([par[1] for par in pares], dtype="datetime64[D]")
+    corridos = (fim - inicio).astype(np.int64).mean()
+    uteis = calendario.contar_dias_uteis(inicio, fim).mean()
+    return int(corridos), int(uteis)
+
 @router.get(
     "/inadimplencia",
     response_model=List[RelatorioInadimplencia],
@@ -72,10 +94,19 @@ async def obter_relatorio_inadimplencia(
     id_empresa: UUID = Query(..., description="ID da empresa"),
     data_inicio: Optional[date] = Query(None, description="Data inicial do período"),
     data_fim: Optional[date] = Query(None, description="Data final do período"),
+    multa_percentual: Optional[Decimal] = Query(None, ge=0, description="Multa por atraso em % (padrão: configuração)"),
+    juros_mensal_percentual: Optional[Decimal] = Query(None, ge=0, description="Juros ao mês em % (padrão: configuração)"),
+    regime: Optional[str] = Query(None, description="Regime dos juros: simples ou composto"),
+    dias_carencia: Optional[int] = Query(None, ge=0, description="Dias de carência sem encargos"),
     current_user: Usuario = Depends(get_current_user),
     session: AsyncSession = Depends(get_async_session)
 ):
-    """Relatório de Inadimplência."""
+    """Relatório de Inadimplência, com multa e juros calculados em lote por parcela."""
+    try:
+        regra = criar_regra(multa_percentual, juros_mensal_percentual, regime, dias_carencia)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
     try:
         # Verificar permissão de acesso à empresa
         await verificar_permissao_empresa(id_empresa, current_user, session)
@@ -86,47 +117,80 @@ async def obter_relatorio_inadimplencia(
         if not data_fim:
             data_fim = date.today()
             
-        # Consultar parcelas vencidas e não pagas
+        # Consultar parcelas vencidas e não pagas (uma linha por parcela,
+        # para que os encargos considerem o atraso de cada uma)
         hoje = date.today()
         
         query = (
             select(
+                Cliente.id_cliente,
                 Cliente.nome.label("cliente"),
                 Cliente.cpf_cnpj.label("documento"),
                 Cliente.telefone.label("contato"),
-                func.sum(Parcela.valor).label("valor_total"),
-                func.count(Parcela.id_parcela).label("parcelas_atrasadas"),
-                func.max(func.date_part('day', hoje - Parcela.data_vencimento)).label("dias_atraso")
+                Parcela.valor,
+                Parcela.data_vencimento
             )
             .join(Lancamento, Parcela.id_lancamento == Lancamento.id_lancamento)
             .join(Cliente, Lancamento.id_cliente == Cliente.id_cliente)
             .where(
                 and_(
                     Lancamento.id_empresa == id_empresa,
-                    Parcela.data_vencimento >= data_inicio,
-                    Parcela.data_vencimento <= data_fim,
+                    no_periodo(Parcela.data_vencimento, periodo_entre(data_inicio, data_fim)),
                     Parcela.data_vencimento < hoje,
                     Parcela.status == "pendente"
                 )
             )
-            .group_by(Cliente.nome, Cliente.cpf_cnpj, Cliente.telefone)
-            .order_by(desc("dias_atraso"))
         )
         
         result = await session.execute(query)
-        dados_inadimplencia = []
-        
-        for row in result.mappings():
-            dados_inadimplencia.append(
-                RelatorioInadimplencia(
-                    cliente=row["cliente"],
-                    documento=row["documento"] or "Não informado",
-                    contato=row["contato"] or "Não informado",
-                    valor_total=float(row["valor_total"]),
-                    dias_atraso=int(row["dias_atraso"]),
-                    parcelas_atrasadas=int(row["parcelas_atrasadas"])
-                )
+        linhas = result.all()
+        if not linhas:
+            return []
+        
+        encargos = calcular_encargos_lote(
+            np.array([float(linha.valor) for linha in linhas], dtype=np.float64),
+            np.array([linha.data_vencimento for linha in linhas], dtype="datetime64[D]"),
+            hoje,
+            regra
+        )
+        
+        # Consolidar por cliente
+        grupo_do_cliente: Dict[UUID, int] = {}
+        clientes = []
+        for linha in linhas:
+            if linha.id_cliente not in grupo_do_cliente:
+                grupo_do_cliente[linha.id_cliente] = len(clientes)
+                clientes.append(linha)
+        grupos = np.fromiter(
+            (grupo_do_cliente[linha.id_cliente] for linha in linhas),
+            dtype=np.int64,
+            count=len(linhas)
+        )
+        total_clientes = len(clientes)
+        valor_total = np.bincount(
+            grupos, weights=encargos.valor_atualizado - encargos.multa - encargos.juros, minlength=total_clientes
+        )
+        multa = np.bincount(grupos, weights=encargos.multa, minlength=total_clientes)
+        juros = np.bincount(grupos, weights=encargos.juros, minlength=total_clientes)
+        quantidade = np.bincount(grupos, minlength=total_clientes)
+        dias_atraso = np.zeros(total_clientes, dtype=np.int64)
+        np.maximum.at(dias_atraso, grupos, encargos.dias_atraso)
+        
+        dados_inadimplencia = [
+            RelatorioInadimplencia(
+                cliente=cliente.cliente,
+                documento=cliente.documento or "Não informado",
+                contato=cliente.contato or "Não informado",
+                valor_total=round(float(valor_total[i]), 2),
+                dias_atraso=int(dias_atraso[i]),
+                parcelas_atrasadas=int(quantidade[i]),
+                multa=round(float(multa[i]), 2),
+                juros=round(float(juros[i]), 2),
+                valor_atualizado=round(float(valor_total[i] + multa[i] + juros[i]), 2)
             )
+            for i, cliente in enumerate(clientes)
+        ]
+        dados_inadimplencia.sort(key=lambda item: item.dias_atraso, reverse=True)
         
         return dados_inadimplencia
         
@@ -136,6 +200,52 @@ async def obter_relatorio_inadimplencia(
             detail=f"Erro ao gerar relatório de inadimplência: {str(e)}"
         )
 
+@router.get(
+    "/aging",
+    summary="Aging de títulos em aberto",
+    description="Distribuição de parcelas, contas a receber e contas a pagar em aberto por faixa de atraso."
+)
+async def obter_relatorio_aging(
+    id_empresa: UUID = Query(..., description="ID da empresa"),
+    fonte: Optional[List[str]] = Query(None, description="parcelas, contas_receber e/ou contas_pagar (padrão: todas)"),
+    current_user: Usuario = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+    service: AgingService = Depends()
+):
+    """
+    Aging de títulos em aberto.
+    
+    Faixas: a vencer, 0-30, 31-60, 61-90 e mais de 90 dias de atraso, com
+    quantidade e valor de cada uma. Resultado mantido em cache por empresa
+    e por dia.
+    """
+    await verificar_permissao_empresa(id_empresa, current_user, session)
+    return await service.resumo(id_empresa, fonte)
+
+
+@router.get(
+    "/aging/{fonte}/contrapartes",
+    summary="Aging por cliente ou fornecedor",
+    description="Faixas de atraso por cliente (ou fornecedor), paginadas por cursor."
+)
+async def obter_aging_por_contraparte(
+    fonte: str,
+    id_empresa: UUID = Query(..., description="ID da empresa"),
+    cursor: Optional[str] = Query(None, description="proximo_cursor da página anterior"),
+    limite: int = Query(50, ge=1, le=200, description="Contrapartes por página"),
+    current_user: Usuario = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+    service: AgingService = Depends()
+):
+    """
+    Detalhamento do aging por contraparte, do maior saldo em aberto ao menor.
+    
+    A paginação é por chave: envie o ``proximo_cursor`` retornado para obter
+    a página seguinte; ele é nulo na última página.
+    """
+    await verificar_permissao_empresa(id_empresa, current_user, session)
+    return await service.por_contraparte(id_empresa, fonte, cursor, limite)
+
 @router.get(
     "/fluxo-caixa",
     response_model=List[RelatorioFluxoCaixa],
@@ -165,8 +275,7 @@ async def obter_relatorio_fluxo_caixa(
         # Consulta base
         query_condicoes = [
             Lancamento.id_empresa == id_empresa,
-            Lancamento.data_lancamento >= dataInicio,
-            Lancamento.data_lancamento <= dataFim
+            no_periodo(Lancamento.data_lancamento, periodo_entre(dataInicio, dataFim))
         ]
         
         # Adicionar filtro por conta bancária se especificado
@@ -269,10 +378,8 @@ async def obter_relatorio_dre(
         if not dataInicio:
             dataInicio = date(hoje.year, hoje.month, 1)
         if not dataFim:
-            if hoje.month == 12:
-                dataFim = date(hoje.year, 12, 31)
-            else:
-                dataFim = date(hoje.year, hoje.month + 1, 1) - timedelta(days=1)
+            dataFim = periodo_mes(hoje.year, hoje.month).fim - timedelta(days=1)
+        periodo = periodo_entre(dataInicio, dataFim)
                 
         # Consulta para receitas por categoria
         query_receitas = (
@@ -284,8 +391,7 @@ async def obter_relatorio_dre(
             .where(
                 and_(
                     Lancamento.id_empresa == id_empresa,
-                    Lancamento.data_lancamento >= dataInicio,
-                    Lancamento.data_lancamento <= dataFim,
+                    no_periodo(Lancamento.data_lancamento, periodo),
                     Lancamento.tipo == "entrada"
                 )
             )
@@ -303,8 +409,7 @@ async def obter_relatorio_dre(
             .where(
                 and_(
                     Lancamento.id_empresa == id_empresa,
-                    Lancamento.data_lancamento >= dataInicio,
-                    Lancamento.data_lancamento <= dataFim,
+                    no_periodo(Lancamento.data_lancamento, periodo),
                     Lancamento.tipo == "saida"
                 )
             )
@@ -382,6 +487,17 @@ async def obter_relatorio_ciclo_operacional(
         meses_analise = periodo or 3
         data_inicio = date(hoje.year, hoje.month, 1) - timedelta(days=1)
         
+        # Calendário da empresa para os prazos em dias úteis
+        local = (await session.execute(
+            select(Empresa.estado, Empresa.cidade).where(Empresa.id_empresa == id_empresa)
+        )).first()
+        calendario = calendario_local(
+            local.estado if local else None,
+            local.cidade if local else None,
+            hoje.year - meses_analise // 12 - 1,
+            hoje.year
+        )
+        
         # Variáveis para armazenar os resultados
         resultados = []
         
@@ -394,6 +510,7 @@ async def obter_relatorio_ciclo_operacional(
                 ultimo_dia_mes = date(data_inicio.year, data_inicio.month, 1) - timedelta(days=1)
                 
             primeiro_dia_mes = date(ultimo_dia_mes.year, ultimo_dia_mes.month, 1)
+            periodo = periodo_entre(primeiro_dia_mes, ultimo_dia_mes)
             mes_str = primeiro_dia_mes.strftime("%B")
             ano = primeiro_dia_mes.year
             
@@ -403,17 +520,12 @@ async def obter_relatorio_ciclo_operacional(
             
             # 2. PMR - Prazo Médio de Recebimento (dias entre venda e recebimento)
             query_pmr = (
-                select(
-                    func.avg(
-                        func.date_part('day', ParcelaVenda.data_recebimento - Venda.data_venda)
-                    ).label("pmr")
-                )
+                select(Venda.data_venda, ParcelaVenda.data_recebimento)
                 .join(Venda, ParcelaVenda.id_venda == Venda.id_venda)
                 .where(
                     and_(
                         Venda.id_empresa == id_empresa,
-                        Venda.data_venda >= primeiro_dia_mes,
-                        Venda.data_venda <= ultimo_dia_mes,
+                        no_periodo(Venda.data_venda, periodo),
                         ParcelaVenda.data_recebimento.isnot(None),
                         ParcelaVenda.status == "recebido"
                     )
@@ -422,16 +534,11 @@ async def obter_relatorio_ciclo_operacional(
             
             # 3. PMP - Prazo Médio de Pagamento (dias entre compra e pagamento)
             query_pmp = (
-                select(
-                    func.avg(
-                        func.date_part('day', Lancamento.data_pagamento - Lancamento.data_lancamento)
-                    ).label("pmp")
-                )
+                select(Lancamento.data_lancamento, Lancamento.data_pagamento)
                 .where(
                     and_(
                         Lancamento.id_empresa == id_empresa,
-                        Lancamento.data_lancamento >= primeiro_dia_mes,
-                        Lancamento.data_lancamento <= ultimo_dia_mes,
+                        no_periodo(Lancamento.data_lancamento, periodo),
                         Lancamento.tipo == "saida",
                         Lancamento.data_pagamento.isnot(None),
                         Lancamento.status == "pago"
@@ -443,17 +550,12 @@ async def obter_relatorio_ciclo_operacional(
             result_pmr = await session.execute(query_pmr)
             result_pmp = await session.execute(query_pmp)
             
-            # Obter resultados
-            pmr_valor = result_pmr.scalar() or 0
-            pmp_valor = result_pmp.scalar() or 0
+            # Prazos médios em dias corridos e em dias úteis
+            pmr, pmr_dias_uteis = _prazos_medios(result_pmr.all(), calendario)
+            pmp, pmp_dias_uteis = _prazos_medios(result_pmp.all(), calendario)
             
             # Estimar PME (na ausência de dados reais)
-            pme_valor = 20  # Valor padrão em dias (ajustar conforme necessário)
-            
-            # Converter para inteiros
-            pmr = int(pmr_valor)
-            pmp = int(pmp_valor)
-            pme = pme_valor
+            pme = 20  # Valor padrão em dias (ajustar conforme necessário)
             
             # Calcular ciclo operacional e ciclo financeiro
             ciclo_operacional = pme + pmr
@@ -468,7 +570,9 @@ async def obter_relatorio_ciclo_operacional(
                     pmr=pmr,
                     pmp=pmp,
                     ciclo_operacional=ciclo_operacional,
-                    ciclo_financeiro=ciclo_financeiro
+                    ciclo_financeiro=ciclo_financeiro,
+                    pmr_dias_uteis=pmr_dias_uteis,
+                    pmp_dias_uteis=pmp_dias_uteis
                 )
             )
             
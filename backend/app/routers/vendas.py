@@ -1,11 +1,11 @@
 """Router de vendas para o sistema CCONTROL-M."""
 from uuid import UUID
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_async_session
-from app.schemas.venda import Venda, VendaCreate, VendaUpdate, VendaDetalhes
+from app.schemas.venda import Venda, VendaCreate, VendaUpdate, VendaDetalhes, ItemVenda
 from app.schemas.usuario import Usuario
 from app.services.venda import VendaService
 from app.services.log_sistema_service import LogSistemaService
@@ -156,6 +156,34 @@ async def atualizar_venda(
     return venda_atualizada
 
 
+@router.post("/{id_venda}/itens/lote", status_code=status.HTTP_201_CREATED)
+@require_permission("vendas", "editar")
+async def adicionar_itens_venda(
+    id_venda: UUID,
+    id_empresa: UUID,
+    itens: List[ItemVenda] = Body(..., min_length=1),
+    current_user: Usuario = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Adicionar vários itens a uma venda de uma só vez.
+    
+    Os itens são inseridos em lote e os totais da venda são atualizados
+    uma única vez, independentemente da quantidade de itens.
+    
+    - **id_venda**: ID da venda
+    - **id_empresa**: ID da empresa para verificação de acesso
+    """
+    venda_service = VendaService(session)
+    
+    return await venda_service.adicionar_itens_venda(
+        id_venda=id_venda,
+        id_empresa=id_empresa,
+        itens=itens,
+        id_usuario=current_user.id
+    )
+
+
 @router.post("/{id_venda}/confirmar", response_model=VendaDetalhes)
 @require_permission("vendas", "confirmar")
 async def confirmar_venda(
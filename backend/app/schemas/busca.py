@@ -0,0 +1,29 @@
+"""
+Schemas para a busca unificada de produtos, clientes e fornecedores.
+"""
+from typing import List, Literal, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+
+TipoResultadoBusca = Literal["produto", "cliente", "fornecedor"]
+
+
+class ResultadoBusca(BaseModel):
+    """Item retornado pela busca unificada."""
+    tipo: TipoResultadoBusca = Field(..., description="Entidade de origem do resultado")
+    id: UUID = Field(..., description="ID do registro na entidade de origem")
+    nome: str
+    codigo: Optional[str] = Field(None, description="Código, código de barras, CPF/CNPJ conforme o tipo")
+    ativo: bool = True
+    relevancia: float = Field(..., description="Pontuação combinada de full-text e similaridade")
+
+    class Config:
+        from_attributes = True
+
+
+class BuscaResponse(BaseModel):
+    """Resposta da busca unificada."""
+    termo: str
+    total: int
+    items: List[ResultadoBusca]
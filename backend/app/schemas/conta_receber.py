@@ -2,6 +2,7 @@
 import uuid
 from enum import Enum
 from datetime import date
+from decimal import Decimal
 from typing import Optional, List
 from pydantic import BaseModel, Field, validator, condecimal
 
@@ -70,6 +71,11 @@ class ContaReceber(ContaReceberBase, BaseSchema):
     id_venda: Optional[uuid.UUID] = None
     data_recebimento: Optional[date] = None
     status: StatusContaReceber
+    # Encargos por atraso calculados na listagem (apenas contas em aberto)
+    dias_atraso: int = 0
+    multa: Optional[Decimal] = None
+    juros: Optional[Decimal] = None
+    valor_atualizado: Optional[Decimal] = None
     
     class Config:
         from_attributes = True
@@ -26,6 +26,21 @@ class ProdutoBasico(BaseModel):
     class Config:
         from_attributes = True
 
+# Esquema resumido para consulta rápida por código (PDV)
+class ProdutoResumo(BaseModel):
+    id_produto: UUID
+    id_empresa: UUID
+    nome: str
+    codigo: Optional[str] = None
+    codigo_barras: Optional[str] = None
+    valor_venda: Decimal
+    estoque_atual: Decimal
+    ativo: bool = True
+
+    class Config:
+        from_attributes = True
+        frozen = True
+
 # Esquema para criação
 class ProdutoCreate(ProdutoBase):
     id_empresa: UUID
@@ -103,4 +118,38 @@ class MovimentacaoEstoque(BaseModel):
         return v.lower()
     
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+# Esquemas para movimentação de estoque em lote
+class MovimentacaoLoteItem(BaseModel):
+    id_produto: UUID
+    quantidade: Decimal = Field(..., description="Quantidade movimentada; em 'ajuste' o sinal indica entrada ou saída")
+    tipo: str = Field("saida", description="Tipo de movimentação: 'entrada', 'saida' ou 'ajuste'")
+
+    @validator('tipo')
+    def validar_tipo(cls, v):
+        tipos_validos = ["entrada", "saida", "ajuste"]
+        if v.lower() not in tipos_validos:
+            raise ValueError(f"Tipo de movimentação deve ser um dos seguintes: {', '.join(tipos_validos)}")
+        return v.lower()
+
+    @validator('quantidade')
+    def quantidade_nao_pode_ser_zero(cls, v):
+        if v == 0:
+            raise ValueError('Quantidade não pode ser zero')
+        return v
+
+class MovimentacaoLoteRequest(BaseModel):
+    movimentacoes: List[MovimentacaoLoteItem] = Field(..., min_length=1, max_length=1000)
+    observacao: Optional[str] = None
+    permitir_parcial: bool = Field(False, description="Aplicar os itens com saldo mesmo se outros faltarem")
+
+class ResultadoMovimentacaoItem(BaseModel):
+    id_produto: UUID
+    quantidade: Decimal = Field(..., description="Variação líquida solicitada para o produto")
+    estoque_atual: Optional[Decimal] = Field(None, description="Estoque após a movimentação, se aplicada")
+    estoque_disponivel: Optional[Decimal] = Field(None, description="Estoque antes da movimentação (None se o produto não existir)")
+    aplicado: bool
+
+class MovimentacaoLoteResultado(BaseModel):
+    aplicados: List[ResultadoMovimentacaoItem] = Field(default_factory=list)
+    faltas: List[ResultadoMovimentacaoItem] = Field(default_factory=list)
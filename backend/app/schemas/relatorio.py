@@ -26,6 +26,7 @@ class RelatorioContasPagar(BaseModel):
     data_geracao: datetime = Field(..., description="Data e hora de geração do relatório")
     periodo_inicial: Optional[date] = Field(None, description="Data inicial do período")
     periodo_final: Optional[date] = Field(None, description="Data final do período")
+    contas: Optional[List[Dict[str, Any]]] = Field(None, description="Contas do período (apenas quando solicitadas)")
 
 
 class RelatorioContasReceber(BaseModel):
@@ -107,6 +108,9 @@ class RelatorioInadimplencia(BaseModel):
     valor_total: float
     dias_atraso: int
     parcelas_atrasadas: int
+    multa: float = 0.0
+    juros: float = 0.0
+    valor_atualizado: float = 0.0
 
 
 class RelatorioFluxoCaixa(BaseModel):
@@ -1,5 +1,5 @@
 """Schemas para autenticação e tokens."""
-from typing import Optional, List
+from typing import Optional, List, Dict
 from uuid import UUID
 from pydantic import BaseModel, Field, field_validator, EmailStr
 
@@ -35,6 +35,9 @@ class TokenPayload(BaseModel):
     tipo_usuario: str
     exp: int = Field(..., description="Expiration timestamp")
     jti: str = Field(..., description="JWT ID")
+    permissoes: Optional[Dict[str, List[str]]] = Field(
+        None, description="Permissões na empresa (recurso -> ações)"
+    )
 
 
 class TokenRefresh(BaseModel):
@@ -1,106 +1,33 @@
 """
-Script para agendamento de tarefas de monitoramento da aplicação CCONTROL-M.
-Este módulo implementa um mecanismo de agendamento de tarefas periódicas
-para monitoramento do sistema, incluindo:
+Tarefas periódicas de monitoramento e manutenção da aplicação CCONTROL-M.
+Este módulo declara as tarefas executadas pelo agendador assíncrono
+(``app.core.agendador``), incluindo:
 - Coleta de métricas de desempenho
 - Verificação de uso de recursos
 - Limpeza de dados temporários
+- Retenção de logs e auditoria (remoção em lotes)
+- Criação antecipada das partições mensais de logs e auditoria
+- Backup completo agendado (expressão cron)
+- Recálculo incremental dos indicadores mensais (kpi_mensal)
 """
 
-import threading
-import time
-import logging
-import asyncio
 import os
 import psutil
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Callable, Optional
+from typing import List, Dict, Any, Optional
 
 # Importar utilitários
 from app.utils.logging_config import get_logger
 from app.config.settings import settings
+from app.core.agendador import Agendador, agendador
+from app.core.retencao import MotorRetencao
+from app.core.particionamento import garantir_particoes_futuras
 
 # Configuração de logger
 logger = get_logger(__name__)
 
-# Variável para controlar se o agendador está ativo
-scheduler_running = False
-scheduler_thread = None
-
-# Lista de tarefas agendadas
-scheduled_tasks = []
-
-
-class ScheduledTask:
-    """Classe para representar uma tarefa agendada"""
-    
-    def __init__(
-        self,
-        name: str,
-        interval_seconds: int,
-        task_func: Callable,
-        is_async: bool = False,
-        enabled: bool = True,
-        description: str = ""
-    ):
-        """
-        Inicializa uma tarefa agendada
-        
-        Args:
-            name: Nome da tarefa
-            interval_seconds: Intervalo de execução em segundos
-            task_func: Função a ser executada
-            is_async: Se a função é assíncrona
-            enabled: Se a tarefa está habilitada
-            description: Descrição da tarefa
-        """
-        self.name = name
-        self.interval_seconds = interval_seconds
-        self.task_func = task_func
-        self.is_async = is_async
-        self.enabled = enabled
-        self.description = description
-        self.last_run = None
-        self.next_run = datetime.now() + timedelta(seconds=interval_seconds)
-        self.running = False
-        self.error_count = 0
-        self.success_count = 0
-
-
-def register_task(
-    name: str,
-    interval_seconds: int,
-    task_func: Callable,
-    is_async: bool = False,
-    enabled: bool = True,
-    description: str = ""
-) -> ScheduledTask:
-    """
-    Registra uma nova tarefa no agendador
-    
-    Args:
-        name: Nome da tarefa
-        interval_seconds: Intervalo de execução em segundos
-        task_func: Função a ser executada
-        is_async: Se a função é assíncrona
-        enabled: Se a tarefa está habilitada
-        description: Descrição da tarefa
-    
-    Returns:
-        ScheduledTask: A tarefa registrada
-    """
-    task = ScheduledTask(
-        name=name,
-        interval_seconds=interval_seconds,
-        task_func=task_func,
-        is_async=is_async,
-        enabled=enabled,
-        description=description
-    )
-    
-    scheduled_tasks.append(task)
-    logger.info(f"Tarefa '{name}' registrada com intervalo de {interval_seconds} segundos")
-    return task
+# Motor de retenção (mantém o progresso da última execução por tabela)
+retention_engine = MotorRetencao()
 
 
 async def collect_system_metrics():
@@ -109,8 +36,8 @@ async def collect_system_metrics():
         # Coletar informações de memória
         memory = psutil.virtual_memory()
         
-        # Coletar informações de CPU
-        cpu_percent = psutil.cpu_percent(interval=1)
+        # Coletar informações de CPU (desde a coleta anterior, sem bloquear o event loop)
+        cpu_percent = psutil.cpu_percent(interval=None)
         
         # Coletar informações de disco
         disk = psutil.disk_usage('/')
@@ -175,116 +102,116 @@ async def clean_temp_files():
         logger.error(f"Erro ao limpar arquivos temporários: {str(e)}")
 
 
-def scheduler_loop():
-    """Loop principal do agendador de tarefas"""
-    global scheduler_running
-    
-    # Criar event loop assíncrono para a thread
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    
-    logger.info("Iniciando loop do agendador de tarefas")
-    
-    try:
-        while scheduler_running:
-            now = datetime.now()
-            
-            # Verificar todas as tarefas registradas
-            for task in scheduled_tasks:
-                if task.enabled and not task.running and now >= task.next_run:
-                    # Marcar como em execução
-                    task.running = True
-                    task.last_run = now
-                    task.next_run = now + timedelta(seconds=task.interval_seconds)
-                    
-                    try:
-                        if task.is_async:
-                            # Executar tarefa assíncrona
-                            loop.run_until_complete(task.task_func())
-                        else:
-                            # Executar tarefa síncrona
-                            task.task_func()
-                            
-                        task.success_count += 1
-                        logger.debug(f"Tarefa '{task.name}' executada com sucesso")
-                    except Exception as e:
-                        task.error_count += 1
-                        logger.error(f"Erro ao executar tarefa '{task.name}': {str(e)}")
-                    finally:
-                        # Marcar como concluída
-                        task.running = False
-            
-            # Aguardar um intervalo curto
-            time.sleep(1)
-    except Exception as e:
-        logger.error(f"Erro no loop do agendador: {str(e)}")
-    finally:
-        # Fechar o loop assíncrono
-        loop.close()
-        logger.info("Loop do agendador de tarefas encerrado")
+def apply_data_retention():
+    """Aplica as políticas de retenção de logs e auditoria em lotes"""
+    resultados = retention_engine.executar()
+    total = sum(r["linhas_removidas"] for r in resultados)
+    logger.info(f"Retenção de dados concluída: {total} linhas removidas em {len(resultados)} tabelas")
+
+
+async def run_scheduled_backup():
+    """Executa o backup completo e a limpeza de backups antigos"""
+    from app.core.backup import perform_scheduled_backup
+    if not await perform_scheduled_backup():
+        raise RuntimeError("Backup agendado concluído com falhas")
+
+
+def ensure_future_partitions():
+    """Cria as partições mensais futuras de logs e auditoria"""
+    from app.database import SessionLocal
+    with SessionLocal() as session:
+        criadas = garantir_particoes_futuras(session)
+    logger.info(f"Manutenção de partições concluída: {criadas}")
+
 
+async def refresh_kpi_mensal():
+    """Recalcula os indicadores mensais dos meses marcados desde a última execução"""
+    from app.database import AsyncSessionLocal
+    from app.services.kpi_mensal_service import KpiMensalService
+    async with AsyncSessionLocal() as session:
+        total = await KpiMensalService(session).recalcular_pendentes(settings.KPI_MENSAL_BATCH_SIZE)
+    if total:
+        logger.info(f"Indicadores mensais recalculados: {total} meses")
 
-def start_scheduler_thread() -> threading.Thread:
+
+def get_retention_status() -> Dict[str, Dict[str, Any]]:
     """
-    Inicia a thread do agendador de tarefas
+    Obtém o progresso da retenção por tabela (execução atual ou última)
     
     Returns:
-        Thread do agendador
+        Dicionário tabela -> progresso
     """
-    global scheduler_running, scheduler_thread
+    return dict(retention_engine.progresso)
+
+
+def register_default_tasks(scheduler: Optional[Agendador] = None) -> Agendador:
+    """
+    Registra as tarefas padrão no agendador
     
-    # Verificar se já está rodando
-    if scheduler_running:
-        logger.warning("O agendador de tarefas já está em execução")
-        return scheduler_thread
+    Args:
+        scheduler: Agendador de destino (padrão: instância compartilhada)
     
-    # Configurar tarefas padrão
-    if settings.ENABLE_MONITORING and not scheduled_tasks:
-        # Registrar tarefas de monitoramento
-        register_task(
-            name="system_metrics",
-            interval_seconds=settings.COLLECT_METRICS_INTERVAL,
-            task_func=collect_system_metrics,
-            is_async=True,
-            description="Coleta métricas do sistema (CPU, memória, disco)"
+    Returns:
+        Agendador com as tarefas registradas
+    """
+    scheduler = scheduler or agendador
+    
+    if settings.ENABLE_MONITORING:
+        # Métricas do próprio processo: rodam em todos os workers
+        scheduler.registrar(
+            "system_metrics",
+            collect_system_metrics,
+            intervalo_segundos=settings.COLLECT_METRICS_INTERVAL,
+            distribuida=False,
+            timeout_segundos=30,
+            descricao="Coleta métricas do sistema (CPU, memória, disco)"
         )
         
-        # Limpeza de arquivos temporários (a cada 6 horas)
-        register_task(
-            name="clean_temp_files",
-            interval_seconds=6 * 60 * 60,
-            task_func=clean_temp_files,
-            is_async=True,
-            description="Limpa arquivos temporários antigos"
+        scheduler.registrar(
+            "clean_temp_files",
+            clean_temp_files,
+            cron="15 */6 * * *",
+            jitter_segundos=60,
+            descricao="Limpa arquivos temporários antigos"
         )
     
-    # Marcar como em execução
-    scheduler_running = True
+    # Retenção de logs (síncrona: roda em thread, com pausas entre lotes)
+    if settings.RETENTION_ENABLED:
+        scheduler.registrar(
+            "data_retention",
+            apply_data_retention,
+            intervalo_segundos=settings.RETENTION_INTERVAL_SECONDS,
+            jitter_segundos=300,
+            descricao="Remove logs e auditoria expirados em lotes limitados"
+        )
     
-    # Iniciar thread
-    scheduler_thread = threading.Thread(
-        target=scheduler_loop,
-        name="scheduler-thread",
-        daemon=True
+    # Partições futuras (roda também na inicialização, antes da virada do mês)
+    scheduler.registrar(
+        "partition_maintenance",
+        ensure_future_partitions,
+        intervalo_segundos=settings.PARTITION_INTERVAL_SECONDS,
+        executar_ao_iniciar=True,
+        descricao="Cria as partições mensais futuras de logs e auditoria"
     )
     
-    scheduler_thread.start()
-    logger.info("Thread do agendador de tarefas iniciada")
-    
-    return scheduler_thread
-
-
-def stop_scheduler_thread():
-    """Para a thread do agendador de tarefas"""
-    global scheduler_running
+    scheduler.registrar(
+        "kpi_mensal_refresh",
+        refresh_kpi_mensal,
+        intervalo_segundos=settings.KPI_MENSAL_REFRESH_INTERVAL,
+        jitter_segundos=5,
+        descricao="Recalcula os indicadores mensais dos meses alterados"
+    )
     
-    if not scheduler_running:
-        logger.warning("O agendador de tarefas não está em execução")
-        return
+    if settings.BACKUP_SCHEDULE_ENABLED:
+        scheduler.registrar(
+            "database_backup",
+            run_scheduled_backup,
+            cron=settings.BACKUP_CRON,
+            jitter_segundos=120,
+            descricao="Backup completo do banco, arquivos e logs"
+        )
     
-    # Marcar para parar
-    scheduler_running = False
-    logger.info("Thread do agendador de tarefas marcada para encerramento")
+    return scheduler
 
 
 def get_tasks_status() -> List[Dict[str, Any]]:
@@ -292,21 +219,6 @@ def get_tasks_status() -> List[Dict[str, Any]]:
     Obtém o status de todas as tarefas registradas
     
     Returns:
-        Lista com o status de cada tarefa
+        Lista com o status e o histórico recente de cada tarefa
     """
-    result = []
-    
-    for task in scheduled_tasks:
-        result.append({
-            "name": task.name,
-            "description": task.description,
-            "enabled": task.enabled,
-            "interval_seconds": task.interval_seconds,
-            "last_run": task.last_run.isoformat() if task.last_run else None,
-            "next_run": task.next_run.isoformat() if task.next_run else None,
-            "running": task.running,
-            "success_count": task.success_count,
-            "error_count": task.error_count
-        })
-    
-    return result 
\ No newline at end of file
+    return agendador.status()
@@ -0,0 +1,139 @@
+"""Serviço de aging (faixas de vencimento) de parcelas, contas a receber e a pagar."""
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, Optional
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+from app.core.cache import LRUCache
+from app.database import get_async_session
+from app.repositories.aging_repository import FAIXAS_AGING, FONTES_AGING, AgingRepository
+from app.utils.pagination import codificar_cursor, decodificar_cursor
+
+
+# Por (empresa, fonte, dia[, página]): as faixas só mudam à meia-noite, e a
+# data na chave descarta o cache do dia anterior; o TTL limita a defasagem
+# em relação a títulos criados ou baixados durante o dia
+_cache_aging = LRUCache(maxsize=settings.AGING_CACHE_SIZE, ttl=settings.AGING_CACHE_TTL)
+
+
+def invalidar_aging(id_empresa: UUID) -> int:
+    """Descarta o aging em cache de uma empresa (neste worker)."""
+    return _cache_aging.pop_where(lambda chave: chave[0] == id_empresa)
+
+
+def _validar_fonte(fonte: str) -> None:
+    if fonte not in FONTES_AGING:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Fonte inválida. Use uma de: {', '.join(FONTES_AGING)}"
+        )
+
+
+class AgingService:
+    """Distribuição dos títulos em aberto por faixa de atraso."""
+
+    def __init__(self, session: AsyncSession = Depends(get_async_session)):
+        """Inicializar serviço com a sessão do banco."""
+        self.repository = AgingRepository(session)
+
+    async def resumo(
+        self,
+        id_empresa: UUID,
+        fontes: Optional[Iterable[str]] = None,
+        hoje: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """
+        Aging por fonte, com uma consulta agrupada por fonte.
+
+        Args:
+            id_empresa: ID da empresa
+            fontes: Fontes desejadas (padrão: todas)
+            hoje: Data de referência (padrão: hoje)
+
+        Returns:
+            Dict com a data de referência e, por fonte, as faixas e o total
+        """
+        hoje = hoje or date.today()
+        fontes = list(fontes or FONTES_AGING)
+        resposta: Dict[str, Any] = {"data_referencia": hoje, "faixas": list(FAIXAS_AGING), "fontes": {}}
+        for fonte in fontes:
+            _validar_fonte(fonte)
+            chave = (id_empresa, fonte, hoje)
+            dados = _cache_aging.get(chave)
+            if dados is None:
+                faixas = await self.repository.get_resumo(fonte, id_empresa, hoje)
+                dados = {
+                    "faixas": faixas,
+                    "quantidade": sum(f["quantidade"] for f in faixas.values()),
+                    "total": round(sum(f["total"] for f in faixas.values()), 2),
+                }
+                _cache_aging.set(chave, dados)
+            resposta["fontes"][fonte] = dados
+        return resposta
+
+    async def por_contraparte(
+        self,
+        id_empresa: UUID,
+        fonte: str,
+        cursor: Optional[str] = None,
+        limite: int = 50,
+        hoje: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """
+        Aging por cliente (ou fornecedor), do maior saldo em aberto ao menor.
+
+        Args:
+            id_empresa: ID da empresa
+            fonte: ``parcelas``, ``contas_receber`` ou ``contas_pagar``
+            cursor: ``proximo_cursor`` da página anterior
+            limite: Contrapartes por página
+            hoje: Data de referência (padrão: hoje)
+
+        Returns:
+            Dict com os itens da página e o cursor da próxima (None na última)
+        """
+        _validar_fonte(fonte)
+        hoje = hoje or date.today()
+
+        apos = None
+        if cursor:
+            try:
+                total, id_contraparte = decodificar_cursor(cursor, 2)
+                apos = (Decimal(total), UUID(id_contraparte))
+            except (ValueError, InvalidOperation):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+
+        chave = (id_empresa, fonte, hoje, cursor, limite)
+        pagina = _cache_aging.get(chave)
+        if pagina is not None:
+            return pagina
+
+        # Uma linha a mais indica se existe próxima página
+        linhas = await self.repository.get_por_contraparte(fonte, id_empresa, hoje, limite + 1, apos)
+        proximo_cursor = None
+        if len(linhas) > limite:
+            linhas = linhas[:limite]
+            ultima = linhas[-1]
+            proximo_cursor = codificar_cursor(ultima["total"], ultima["chave_contraparte"])
+
+        pagina = {
+            "data_referencia": hoje,
+            "fonte": fonte,
+            "itens": [
+                {
+                    "id_contraparte": linha["id_contraparte"],
+                    "nome": linha["nome_contraparte"] or "Não informado",
+                    "quantidade": linha["quantidade"],
+                    "total": float(linha["total"] or 0),
+                    "faixas": linha["faixas"],
+                }
+                for linha in linhas
+            ],
+            "proximo_cursor": proximo_cursor,
+        }
+        _cache_aging.set(chave, pagina)
+        return pagina
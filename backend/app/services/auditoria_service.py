@@ -3,6 +3,7 @@ Serviço para gerenciamento de registros de auditoria
 """
 from datetime import datetime
 from typing import List, Optional, Dict, Any
+from uuid import UUID
 import logging
 
 from app.repositories.auditoria_repository import AuditoriaRepository
@@ -73,7 +74,8 @@ class AuditoriaService:
                              entity_type: Optional[str] = None,
                              action_type: Optional[str] = None,
                              date_from: Optional[datetime] = None,
-                             date_to: Optional[datetime] = None) -> AuditoriaList:
+                             date_to: Optional[datetime] = None,
+                             empresa_id: Optional[UUID] = None) -> AuditoriaList:
         """
         Lista registros de auditoria com filtros e paginação.
         
@@ -83,6 +85,7 @@ class AuditoriaService:
             action_type: Filtro por tipo de ação
             date_from: Data inicial
             date_to: Data final
+            empresa_id: Filtro por empresa
             
         Returns:
             AuditoriaList: Lista paginada de registros de auditoria
@@ -95,6 +98,9 @@ class AuditoriaService:
         if action_type:
             filters["action_type"] = action_type
         
+        if empresa_id:
+            filters["empresa_id"] = empresa_id
+        
         if date_from and date_to:
             filters["timestamp_range"] = (date_from, date_to)
         elif date_from:
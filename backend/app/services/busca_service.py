@@ -0,0 +1,79 @@
+"""Serviço para a busca unificada de produtos, clientes e fornecedores."""
+from uuid import UUID
+from typing import List, Optional
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from app.database import get_async_session
+from app.repositories.busca_repository import BuscaRepository, TIPOS_BUSCA
+from app.schemas.busca import BuscaResponse, ResultadoBusca
+
+# Configuração de logger
+logger = logging.getLogger(__name__)
+
+# Abaixo deste tamanho o type-ahead não consulta o banco
+TAMANHO_MINIMO_TERMO = 2
+
+
+class BuscaService:
+    """Serviço para busca ranqueada (full-text + trigram) nos cadastros."""
+
+    def __init__(self, session: AsyncSession = Depends(get_async_session)):
+        """Inicializar serviço com repositório."""
+        self.repository = BuscaRepository(session)
+
+    async def buscar(
+        self,
+        termo: str,
+        id_empresa: UUID,
+        tipos: Optional[List[str]] = None,
+        apenas_ativos: bool = False,
+        limit: int = 20
+    ) -> BuscaResponse:
+        """
+        Buscar cadastros por nome, descrição ou código.
+
+        Args:
+            termo: Texto digitado pelo usuário
+            id_empresa: ID da empresa
+            tipos: Entidades a consultar ("produto", "cliente", "fornecedor")
+            apenas_ativos: Se True, retorna apenas registros ativos
+            limit: Quantidade máxima de resultados
+
+        Returns:
+            BuscaResponse: Resultados ordenados por relevância
+
+        Raises:
+            HTTPException: Se algum tipo informado for inválido
+        """
+        termo = (termo or "").strip()
+
+        if tipos:
+            invalidos = [t for t in tipos if t not in TIPOS_BUSCA]
+            if invalidos:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Tipos de busca inválidos: {', '.join(invalidos)}"
+                )
+
+        if len(termo) < TAMANHO_MINIMO_TERMO:
+            return BuscaResponse(termo=termo, total=0, items=[])
+
+        try:
+            linhas = await self.repository.buscar(
+                termo=termo,
+                id_empresa=id_empresa,
+                tipos=tipos,
+                apenas_ativos=apenas_ativos,
+                limit=limit
+            )
+        except Exception as e:
+            logger.error(f"Erro na busca unificada: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro interno ao executar busca"
+            )
+
+        items = [ResultadoBusca(**linha) for linha in linhas]
+        return BuscaResponse(termo=termo, total=len(items), items=items)
@@ -0,0 +1,129 @@
+"""Serviço de conciliação bancária a partir de extratos importados."""
+from datetime import timedelta
+from typing import Any, Dict
+from uuid import UUID
+import logging
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_session
+from app.models.conta_bancaria import ContaBancaria
+from app.repositories.lancamento_repository import LancamentoRepository
+from app.utils.conciliacao import CandidatoConciliacao, conciliar
+from app.utils.extrato import ErroExtrato, ler_extrato
+
+
+logger = logging.getLogger(__name__)
+
+
+class ConciliacaoService:
+    """Conciliação de extratos (OFX, CNAB 240, CSV) com os lançamentos da conta."""
+
+    def __init__(self, session: AsyncSession = Depends(get_async_session)):
+        """Inicializar serviço com a sessão do banco."""
+        self.session = session
+        self.lancamento_repository = LancamentoRepository(session)
+
+    async def conciliar_extrato(
+        self,
+        id_conta: UUID,
+        id_empresa: UUID,
+        conteudo: bytes,
+        formato: str,
+        janela_dias: int = 5,
+        tolerancia_centavos: int = 0,
+        pontuacao_minima: float = 0.5,
+        aplicar: bool = False,
+        **opcoes_csv
+    ) -> Dict[str, Any]:
+        """
+        Concilia um extrato com os lançamentos pendentes da conta.
+
+        Args:
+            id_conta: ID da conta bancária do extrato
+            id_empresa: ID da empresa
+            conteudo: Bytes do arquivo de extrato
+            formato: ``ofx``, ``cnab240`` ou ``csv``
+            janela_dias: Diferença máxima de dias entre extrato e lançamento
+            tolerancia_centavos: Diferença máxima de valor aceita
+            pontuacao_minima: Pontuação mínima (0-1) para aceitar um par
+            aplicar: Se True, marca os lançamentos encontrados como conciliados;
+                     caso contrário apenas retorna a prévia
+            **opcoes_csv: Opções do leitor CSV
+
+        Returns:
+            Dict com os pares encontrados, as linhas sem par e, ao aplicar,
+            a quantidade de lançamentos marcados
+
+        Raises:
+            HTTPException: Se a conta não existir ou o extrato for inválido
+        """
+        result = await self.session.execute(
+            select(ContaBancaria.id_conta).where(
+                ContaBancaria.id_conta == id_conta,
+                ContaBancaria.id_empresa == id_empresa
+            )
+        )
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Conta bancária não encontrada"
+            )
+
+        try:
+            linhas = ler_extrato(conteudo, formato, **opcoes_csv)
+        except ErroExtrato as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        resposta: Dict[str, Any] = {
+            "total_linhas": len(linhas),
+            "candidatos": 0,
+            "correspondencias": [],
+            "sem_correspondencia": [],
+            "aplicado": aplicar,
+            "conciliados": 0,
+        }
+        if not linhas:
+            return resposta
+
+        # Um único SELECT cobre o período do extrato mais a janela
+        pendentes = await self.lancamento_repository.get_pendentes_conciliacao(
+            id_conta,
+            id_empresa,
+            min(linha.data for linha in linhas) - timedelta(days=janela_dias),
+            max(linha.data for linha in linhas) + timedelta(days=janela_dias)
+        )
+        resultado = conciliar(
+            linhas,
+            (CandidatoConciliacao(**p) for p in pendentes),
+            janela_dias=janela_dias,
+            tolerancia_centavos=tolerancia_centavos,
+            pontuacao_minima=pontuacao_minima
+        )
+
+        resposta["candidatos"] = len(pendentes)
+        resposta["correspondencias"] = [
+            {
+                **linhas[c.indice_linha]._asdict(),
+                "id_lancamento": c.id_lancamento,
+                "pontuacao": c.pontuacao,
+                "diferenca_dias": c.diferenca_dias,
+            }
+            for c in resultado.correspondencias
+        ]
+        resposta["sem_correspondencia"] = [linhas[i]._asdict() for i in resultado.linhas_sem_correspondencia]
+
+        if aplicar and resultado.correspondencias:
+            atualizados = await self.lancamento_repository.marcar_conciliados(
+                [c.id_lancamento for c in resultado.correspondencias],
+                id_empresa
+            )
+            resposta["conciliados"] = len(atualizados)
+            logger.info(
+                f"Conciliação da conta {id_conta}: {len(atualizados)} de {len(linhas)} "
+                f"movimentos do extrato conciliados"
+            )
+
+        return resposta
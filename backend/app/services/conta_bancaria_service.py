@@ -65,7 +65,8 @@ class ContaBancariaService:
         id_empresa: UUID,
         skip: int = 0,
         limit: int = 100,
-        filtros: Optional[Dict[str, Any]] = None
+        filtros: Optional[Dict[str, Any]] = None,
+        campos: Optional[List[str]] = None
     ) -> Tuple[List[ContaBancaria], int]:
         """
         Listar contas bancárias com paginação e filtros.
@@ -74,33 +75,16 @@ class ContaBancariaService:
             id_empresa: ID da empresa
             skip: Número de registros a pular
             limit: Número máximo de registros a retornar
-            filtros: Dicionário de filtros (nome, banco, tipo, ativo)
+            filtros: Dicionário de filtros (nome, banco, tipo, ativa)
+            campos: Colunas a carregar (padrão: todas)
             
         Returns:
             Lista de contas bancárias e contagem total
         """
         self.logger.info(f"Buscando contas bancárias com filtros: empresa={id_empresa}, filtros={filtros}")
         
-        # Garantir que filtros seja um dicionário
-        if not filtros:
-            filtros = {}
-            
-        # Adicionar id_empresa aos filtros
-        filtros_lista = [{"id_empresa": id_empresa}]
-        
-        # Adicionar demais filtros
-        for campo, valor in filtros.items():
-            if valor is not None:
-                if campo in ["nome", "banco"]:
-                    filtros_lista.append({f"{campo}__ilike": f"%{valor}%"})
-                else:
-                    filtros_lista.append({campo: valor})
-            
-        return await self.repository.list_with_filters(
-            skip=skip,
-            limit=limit,
-            filters=filtros_lista
-        )
+        condicoes = self.repository.compilar_filtros(id_empresa, **(filtros or {}))
+        return await self.repository.listar(condicoes, skip=skip, limit=limit, campos=campos)
         
     async def criar_conta_bancaria(self, conta_bancaria: ContaBancariaCreate, id_usuario: UUID) -> ContaBancaria:
         """
@@ -215,13 +199,8 @@ class ContaBancariaService:
         # Atualizar conta bancária
         try:
             # Remover campos None do modelo de atualização
+            # (mudanças no saldo inicial são refletidas no saldo atual pelo repositório)
             update_data = {k: v for k, v in conta_bancaria.model_dump().items() if v is not None}
-            
-            # Se estiver atualizando o saldo inicial, atualizar o saldo atual também
-            if "saldo_inicial" in update_data:
-                # Calcular diferença para atualizar o saldo atual proporcionalmente
-                diferenca = update_data["saldo_inicial"] - conta_atual.saldo_inicial
-                update_data["saldo_atual"] = conta_atual.saldo_atual + diferenca
                 
             conta_atualizada = await self.repository.update(id_conta, update_data, id_empresa)
             
@@ -388,10 +367,15 @@ class ContaBancariaService:
             self.logger.warning(f"O novo saldo é igual ao saldo atual: {novo_saldo}")
             return conta_bancaria
             
-        # Ajustar saldo
-        update_data = {"saldo_atual": novo_saldo}
-        
-        conta_atualizada = await self.repository.update(id_conta_bancaria, update_data, id_empresa)
+        # Ajustar saldo (atômico e registrado no diário de movimentações)
+        await self.repository.atualizar_saldo(
+            id_conta_bancaria,
+            "ajuste",
+            float(novo_saldo),
+            id_empresa=id_empresa,
+            observacao=motivo
+        )
+        conta_atualizada = await self.get_conta_bancaria(id_conta_bancaria, id_empresa)
         
         # Registrar log
         await self.log_service.registrar_log(
@@ -1,7 +1,7 @@
 """Serviço de consultas especializadas para contas a pagar."""
 from uuid import UUID
 from typing import Dict, Any, List, Optional
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends, HTTPException, status
 import logging
@@ -9,8 +9,9 @@ import logging
 from app.database import get_async_session
 from app.repositories.conta_pagar_repository import ContaPagarRepository
 from app.schemas.pagination import PaginatedResponse
-from app.schemas.conta_pagar import ContaPagar
+from app.schemas.conta_pagar import ContaPagar, StatusContaPagar
 from app.schemas.relatorio import RelatorioContasPagar, ResumoPagamentos
+from app.utils.periodos import periodo_ano, periodo_dia, periodo_mes
 
 
 class ContaPagarQueryService:
@@ -33,11 +34,17 @@ class ContaPagarQueryService:
         data_final: Optional[date] = None,
         status: Optional[str] = None,
         fornecedor_id: Optional[UUID] = None,
-        categoria_id: Optional[UUID] = None
+        categoria_id: Optional[UUID] = None,
+        incluir_contas: bool = False,
+        skip: int = 0,
+        limit: int = 1000
     ) -> RelatorioContasPagar:
         """
         Gera um relatório analítico de contas a pagar com filtros especificados.
         
+        Os totais vêm agregados do banco; as contas individuais só são
+        buscadas com ``incluir_contas``, paginadas por ``skip``/``limit``.
+        
         Parameters:
             empresa_id: ID da empresa
             data_inicial: Data inicial para filtro
@@ -45,12 +52,15 @@ class ContaPagarQueryService:
             status: Status das contas a filtrar
             fornecedor_id: ID do fornecedor para filtro
             categoria_id: ID da categoria para filtro
+            incluir_contas: Se deve incluir as linhas de detalhe
+            skip: Contas de detalhe a pular
+            limit: Máximo de contas de detalhe
             
         Returns:
             Relatório analítico de contas a pagar
         """
-        # Obter dados para o relatório
-        contas = await self.repository.get_contas_para_relatorio(
+        hoje = datetime.now().date()
+        filtros = dict(
             empresa_id=empresa_id,
             data_inicial=data_inicial,
             data_final=data_final,
@@ -59,61 +69,70 @@ class ContaPagarQueryService:
             categoria_id=categoria_id
         )
         
-        # Calcular totais
-        total_geral = sum(float(conta.valor) for conta in contas)
-        total_pago = sum(
-            float(conta.valor_pago or 0) 
-            for conta in contas 
-            if conta.status in ["pago", "parcial"]
-        )
-        total_pendente = sum(
-            float(conta.valor) - float(conta.valor_pago or 0)
-            for conta in contas
-            if conta.status in ["pendente", "parcial"]
-        )
+        # Todos os agregados em uma única consulta (GROUPING SETS)
+        linhas = await self.repository.get_resumo_relatorio(hoje=hoje, **filtros)
+        relatorio = self.montar_relatorio(linhas, data_inicial, data_final)
         
-        # Agrupar por vencimento
-        vencidas = []
-        a_vencer = []
-        hoje = datetime.now().date()
+        # Linhas de detalhe apenas quando solicitadas
+        if incluir_contas:
+            relatorio.contas = await self.repository.get_contas_para_relatorio(
+                skip=skip,
+                limit=limit,
+                **filtros
+            )
+        
+        return relatorio
+    
+    @staticmethod
+    def montar_relatorio(
+        linhas: List[Dict[str, Any]],
+        data_inicial: Optional[date] = None,
+        data_final: Optional[date] = None
+    ) -> RelatorioContasPagar:
+        """
+        Monta o relatório a partir das linhas agrupadas pelo repositório.
+        
+        Parameters:
+            linhas: Resultado de ``ContaPagarRepository.get_resumo_relatorio``
+            data_inicial: Data inicial do período
+            data_final: Data final do período
+            
+        Returns:
+            Relatório analítico de contas a pagar
+        """
+        por_status = {s.value: 0.0 for s in StatusContaPagar}
+        quantidade_status = {s.value: 0 for s in StatusContaPagar}
+        por_categoria: Dict[str, float] = {}
+        faixas = {"vencida": (0, 0.0), "a_vencer": (0, 0.0)}
+        total_geral, total_contas = 0.0, 0
+        
+        for linha in linhas:
+            agrupamento, chave = linha["agrupamento"], linha["chave"]
+            valor = float(linha["valor"])
+            if agrupamento == "total":
+                total_geral, total_contas = valor, linha["quantidade"]
+            elif agrupamento == "status":
+                por_status[chave] = valor
+                quantidade_status[chave] = linha["quantidade"]
+            elif agrupamento == "categoria" and chave is not None:
+                por_categoria[chave] = valor
+            elif agrupamento == "faixa" and chave is not None:
+                faixas[chave] = (linha["quantidade"], valor)
+        
+        contas_vencidas, valor_vencido = faixas["vencida"]
+        contas_a_vencer, valor_a_vencer = faixas["a_vencer"]
         
-        for conta in contas:
-            if conta.status in ["pendente", "parcial"]:
-                if conta.data_vencimento < hoje:
-                    vencidas.append(conta)
-                else:
-                    a_vencer.append(conta)
-        
-        # Resumo por status
-        por_status = {
-            "pendente": sum(float(conta.valor) for conta in contas if conta.status == "pendente"),
-            "parcial": sum(float(conta.valor) for conta in contas if conta.status == "parcial"),
-            "pago": sum(float(conta.valor) for conta in contas if conta.status == "pago"),
-            "cancelado": sum(float(conta.valor) for conta in contas if conta.status == "cancelado"),
-            "atrasado": sum(float(conta.valor) for conta in contas if conta.status == "atrasado")
-        }
-        
-        # Resumo por categorias
-        categorias = {}
-        for conta in contas:
-            if conta.categoria_id and conta.categoria:
-                categoria_nome = conta.categoria.nome
-                if categoria_nome not in categorias:
-                    categorias[categoria_nome] = 0
-                categorias[categoria_nome] += float(conta.valor)
-        
-        # Criar relatório
         return RelatorioContasPagar(
             total_geral=total_geral,
-            total_pago=total_pago,
-            total_pendente=total_pendente,
-            total_contas=len(contas),
-            contas_vencidas=len(vencidas),
-            contas_a_vencer=len(a_vencer),
-            valor_vencido=sum(float(conta.valor) - float(conta.valor_pago or 0) for conta in vencidas),
-            valor_a_vencer=sum(float(conta.valor) - float(conta.valor_pago or 0) for conta in a_vencer),
+            total_pago=por_status[StatusContaPagar.PAGO.value],
+            total_pendente=por_status[StatusContaPagar.PENDENTE.value] + por_status[StatusContaPagar.VENCIDO.value],
+            total_contas=total_contas,
+            contas_vencidas=contas_vencidas,
+            contas_a_vencer=contas_a_vencer,
+            valor_vencido=valor_vencido,
+            valor_a_vencer=valor_a_vencer,
             por_status=por_status,
-            por_categoria=categorias,
+            por_categoria=por_categoria,
             data_geracao=datetime.now(),
             periodo_inicial=data_inicial,
             periodo_final=data_final
@@ -131,39 +150,34 @@ class ContaPagarQueryService:
         
         Parameters:
             empresa_id: ID da empresa
-            periodo: Tipo de agrupamento ("diario", "mensal", "anual")
+            periodo: Abrangência ("diario", "mensal", "anual")
             ano: Ano para filtro
             mes: Mês para filtro
             
         Returns:
             Resumo de pagamentos no período
         """
-        # Definir ano e mês padrão se não especificados
-        if not ano:
-            ano = datetime.now().year
-        if not mes and periodo == "mensal":
-            mes = datetime.now().month
+        # Definir ano e mês padrão se não especificados ("diario" é o dia atual)
+        hoje = datetime.now().date()
+        ano = ano or hoje.year
+        if periodo == "diario":
+            intervalo = periodo_dia(hoje)
+        elif periodo == "anual":
+            intervalo = periodo_ano(ano)
+        else:
+            intervalo = periodo_mes(ano, mes or hoje.month)
             
-        # Obter dados de pagamentos no período
-        pagamentos = await self.repository.get_pagamentos_por_periodo(
-            empresa_id=empresa_id,
-            periodo=periodo,
-            ano=ano,
-            mes=mes
+        # Totais do período (intervalo semiaberto sobre a data de pagamento)
+        totais = await self.repository.get_totais_pagos(empresa_id, intervalo)
+        
+        return ResumoPagamentos(
+            periodo_inicio=intervalo.inicio,
+            periodo_fim=intervalo.fim - timedelta(days=1),
+            total_pago=totais["total"],
+            quantidade=totais["quantidade"],
+            por_categoria=totais["por_categoria"]
         )
         
-        # Transformar em estrutura de resumo
-        resumo = ResumoPagamentos(
-            periodo=periodo,
-            ano=ano,
-            mes=mes,
-            total_valor=sum(pagamento["valor"] for pagamento in pagamentos),
-            quantidade=len(pagamentos),
-            dados=pagamentos
-        )
-        
-        return resumo
-        
     async def get_pagamentos_dia(
         self,
         empresa_id: UUID,
@@ -180,19 +194,8 @@ class ContaPagarQueryService:
             Total de pagamentos no dia
         """
         try:
-            # Buscar contas pagas na data especificada
-            contas_pagas = await self.repository.get_by_filters(
-                filters={
-                    "empresa_id": empresa_id,
-                    "status": "pago",
-                    "data_pagamento": data
-                }
-            )
-            
-            # Calcular total pago
-            total_pago = sum(float(conta.valor_pago or 0) for conta in contas_pagas)
-            
-            return total_pago
+            totais = await self.repository.get_totais_pagos(empresa_id, periodo_dia(data))
+            return totais["total"]
         except Exception as e:
             logging.error(f"Erro ao calcular pagamentos do dia: {str(e)}")
             return 0.0
@@ -240,7 +243,6 @@ class ContaPagarQueryService:
         
         if dias_atraso:
             # Calcular data limite baseada nos dias de atraso
-            from datetime import timedelta
             data_limite = hoje - timedelta(days=dias_atraso)
         
         return await self.repository.get_contas_vencidas(
@@ -1,14 +1,62 @@
 """Serviço principal para gerenciamento de contas a receber no sistema CCONTROL-M."""
 from uuid import UUID
-from typing import Dict, Any, Optional, List
+from datetime import date
+from typing import Dict, Any, Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status, Depends
 import logging
+from decimal import Decimal
+
+import numpy as np
 
 from app.database import get_async_session
-from app.schemas.conta_receber import ContaReceberCreate, ContaReceberUpdate, ContaReceber
+from app.schemas.conta_receber import ContaReceberCreate, ContaReceberUpdate, ContaReceber, StatusContaReceber
 from app.repositories.conta_receber_repository import ContaReceberRepository
 from app.services.auditoria_service import AuditoriaService
+from app.utils.encargos import CENTAVO, RegraEncargos, calcular_encargos_lote
+
+
+# Status sobre os quais incidem multa e juros
+STATUS_EM_ABERTO = (StatusContaReceber.pendente, StatusContaReceber.atrasado, StatusContaReceber.parcial)
+
+
+def aplicar_encargos(
+    contas: List[Any],
+    data_referencia: date,
+    regra: Optional[RegraEncargos] = None
+) -> List[ContaReceber]:
+    """
+    Converte as contas para o schema com os encargos por atraso calculados.
+
+    O cálculo é feito em lote para todas as contas em aberto da página.
+
+    Args:
+        contas: Contas a receber (modelos ou schemas)
+        data_referencia: Data do cálculo
+        regra: Regra de cobrança (padrão: configurações)
+
+    Returns:
+        Lista de ContaReceber com dias_atraso, multa, juros e valor_atualizado
+    """
+    itens = [ContaReceber.model_validate(conta) for conta in contas]
+    abertos = [i for i, item in enumerate(itens) if item.status in STATUS_EM_ABERTO]
+    if not abertos:
+        return itens
+
+    encargos = calcular_encargos_lote(
+        np.array([float(itens[i].valor) for i in abertos], dtype=np.float64),
+        np.array([itens[i].data_vencimento for i in abertos], dtype="datetime64[D]"),
+        data_referencia,
+        regra
+    )
+    for posicao, i in enumerate(abertos):
+        itens[i] = itens[i].model_copy(update={
+            "dias_atraso": int(encargos.dias_atraso[posicao]),
+            "multa": Decimal(str(encargos.multa[posicao])).quantize(CENTAVO),
+            "juros": Decimal(str(encargos.juros[posicao])).quantize(CENTAVO),
+            "valor_atualizado": Decimal(str(encargos.valor_atualizado[posicao])).quantize(CENTAVO),
+        })
+    return itens
 
 
 class ContaReceberService:
@@ -164,6 +212,49 @@ class ContaReceberService:
                 detail="Erro interno ao listar contas a receber"
             )
     
+    async def list(
+        self,
+        empresa_id: UUID,
+        status: Optional[StatusContaReceber] = None,
+        cliente_id: Optional[UUID] = None,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        search: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        data_referencia: Optional[date] = None,
+        regra: Optional[RegraEncargos] = None
+    ) -> Tuple[List[ContaReceber], int]:
+        """
+        Listar contas a receber com os valores atualizados por atraso.
+        
+        Args:
+            empresa_id: ID da empresa
+            status: Filtro por status
+            cliente_id: Filtro por cliente
+            data_inicio: Vencimento inicial
+            data_fim: Vencimento final
+            search: Termo buscado na descrição
+            skip: Registros para pular
+            limit: Limite de registros
+            data_referencia: Data do cálculo dos encargos (padrão: hoje)
+            regra: Regra de multa e juros (padrão: configurações)
+            
+        Returns:
+            Tupla com a página de contas e o total de registros
+        """
+        contas, total = await self.repository.list(
+            id_empresa=empresa_id,
+            skip=skip,
+            limit=limit,
+            status=status,
+            cliente_id=cliente_id,
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            search=search
+        )
+        return aplicar_encargos(contas, data_referencia or date.today(), regra), total
+    
     async def atualizar_conta(
         self,
         id_conta: UUID,
@@ -0,0 +1,60 @@
+"""Serviço dos indicadores mensais consolidados (kpi_mensal)."""
+from datetime import date
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_session
+from app.repositories.kpi_mensal_repository import KpiMensalRepository, inicio_mes
+
+
+class KpiMensalService:
+    """Leitura dos indicadores do mês, calculando sob demanda o que faltar."""
+
+    def __init__(self, session: AsyncSession = Depends(get_async_session)):
+        """Inicializar serviço com a sessão do banco."""
+        self.session = session
+        self.repository = KpiMensalRepository(session)
+
+    async def get_mes(self, id_empresa: UUID, mes: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Indicadores de um mês da empresa, lidos de uma única linha.
+
+        Meses ainda não calculados (por exemplo, o primeiro acesso depois da
+        virada do mês, antes da tarefa agendada) são calculados e gravados
+        na hora.
+
+        Args:
+            id_empresa: ID da empresa
+            mes: Qualquer data do mês (padrão: mês atual)
+
+        Returns:
+            Dict com os indicadores do mês
+        """
+        mes = inicio_mes(mes or date.today())
+        kpi = await self.repository.get_mes(id_empresa, mes)
+        if kpi is None:
+            gravados = await self.repository.recalcular_meses([(id_empresa, mes)])
+            await self.session.commit()
+            kpi = gravados[0]
+        return kpi
+
+    async def recalcular_pendentes(self, lote: int = 500) -> int:
+        """
+        Esvazia a fila de meses pendentes, um lote por transação.
+
+        Args:
+            lote: Meses recalculados por transação
+
+        Returns:
+            Total de meses recalculados
+        """
+        total = 0
+        while True:
+            quantidade = await self.repository.recalcular_pendentes(lote)
+            await self.session.commit()
+            total += quantidade
+            if quantidade < lote:
+                return total
@@ -1,11 +1,12 @@
 """Serviço para gerenciamento de logs do sistema CCONTROL-M."""
+from datetime import datetime
 from uuid import UUID
 from typing import Dict, Any, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends, HTTPException, status
 import logging
 
-from app.schemas.log_sistema import LogSistemaCreate, LogSistema
+from app.schemas.log_sistema import LogSistemaCreate, LogSistema, LogSistemaList
 from app.repositories.log_sistema_repository import LogSistemaRepository
 from app.database import get_async_session
 
@@ -50,6 +51,8 @@ class LogSistemaService:
         acao: Optional[str] = None,
         skip: int = 0,
         limit: int = 100,
+        data_inicio: Optional[datetime] = None,
+        data_fim: Optional[datetime] = None
     ) -> Tuple[List[LogSistema], int]:
         """
         Listar logs com paginação e filtros.
@@ -60,27 +63,47 @@ class LogSistemaService:
             acao: Filtrar por tipo de ação
             skip: Número de registros a pular
             limit: Número máximo de registros a retornar
+            data_inicio: Início do período (inclusivo)
+            data_fim: Fim do período (exclusivo)
             
         Returns:
             Lista de logs e contagem total
         """
         self.logger.info(f"Buscando logs com filtros: empresa={id_empresa}, usuario={id_usuario}, acao={acao}")
         
-        filters = []
-        
-        if id_empresa:
-            filters.append({"id_empresa": id_empresa})
-            
-        if id_usuario:
-            filters.append({"id_usuario": id_usuario})
-            
-        if acao:
-            filters.append({"acao": acao})
-            
-        return await self.repository.list_with_filters(
+        return await self.repository.get_multi(
+            id_empresa=id_empresa,
+            id_usuario=id_usuario,
+            acao=acao,
             skip=skip,
             limit=limit,
-            filters=filters
+            data_inicio=data_inicio,
+            data_fim=data_fim
+        )
+    
+    async def get_logs(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        **filtros: Any
+    ) -> LogSistemaList:
+        """
+        Listar logs no formato paginado usado pela API.
+        
+        Args:
+            skip: Número de registros a pular
+            limit: Número máximo de registros a retornar
+            **filtros: Filtros aceitos por ``LogSistemaRepository.get_multi``
+            
+        Returns:
+            Página de logs com metadados
+        """
+        logs, total = await self.repository.get_multi(skip=skip, limit=limit, **filtros)
+        return LogSistemaList.create(
+            items=[LogSistema.model_validate(log) for log in logs],
+            total=total,
+            page=skip // limit + 1 if limit else 1,
+            page_size=limit
         )
         
     async def get_log(self, id_log: UUID) -> LogSistema:
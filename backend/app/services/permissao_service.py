@@ -13,6 +13,7 @@ from app.repositories.permissao_repository import PermissaoRepository
 from app.schemas.permissao import PermissaoCreate, PermissaoUpdate, Permissao
 from app.schemas.pagination import PaginatedResponse
 from app.database import get_async_session, db_async_session
+from app.core.permissoes_cache import permissoes_cache, SnapshotPermissoes
 
 logger = logging.getLogger(__name__)
 
@@ -91,6 +92,7 @@ class PermissaoService:
                     empresa_id=id_empresa
                 )
                 
+                await permissoes_cache.invalidar(nova_permissao.id_usuario, id_empresa)
                 return nova_permissao
             except Exception as e:
                 self.logger.error(f"Erro ao criar permissão: {str(e)}")
@@ -161,6 +163,7 @@ class PermissaoService:
                     empresa_id=id_empresa
                 )
                 
+                await permissoes_cache.invalidar(permissao_atualizada.id_usuario, id_empresa)
                 return permissao_atualizada
             except Exception as e:
                 self.logger.error(f"Erro ao atualizar permissão: {str(e)}")
@@ -227,6 +230,7 @@ class PermissaoService:
                     tenant_id=id_empresa
                 )
                 
+                await permissoes_cache.invalidar(existing.id_usuario, id_empresa)
                 return {"detail": "Permissão removida com sucesso"}
             except Exception as e:
                 self.logger.error(f"Erro ao remover permissão: {str(e)}")
@@ -358,20 +362,30 @@ class PermissaoService:
         Returns:
             True se o usuário tem permissão, False caso contrário
         """
-        self.logger.info(
-            f"Verificando permissão para usuário {id_usuario} "
-            f"no recurso {recurso}, ação {acao}"
-        )
-        
-        async with get_async_session() as session:
-            permissao_repo = PermissaoUsuarioRepository(session)
-            
-            # Verificar permissão
-            tem_permissao = await permissao_repo.check_user_permission(
-                user_id=id_usuario,
-                recurso=recurso,
-                acao=acao,
-                tenant_id=id_empresa
-            )
-            
-            return tem_permissao 
\ No newline at end of file
+        snapshot = await self.obter_snapshot(id_usuario, id_empresa)
+        return snapshot.permite(recurso, acao)
+
+    async def obter_snapshot(self, id_usuario: UUID, id_empresa: UUID) -> SnapshotPermissoes:
+        """
+        Obter as permissões compiladas do usuário na empresa.
+
+        O snapshot é servido da memória e só é recompilado (uma consulta)
+        quando o carimbo de versão muda.
+
+        Args:
+            id_usuario: ID do usuário
+            id_empresa: ID da empresa
+
+        Returns:
+            SnapshotPermissoes do usuário
+        """
+        async def carregar():
+            self.logger.debug(f"Compilando permissões do usuário {id_usuario} na empresa {id_empresa}")
+            async with db_async_session() as session:
+                tipo_usuario, pares = await PermissaoRepository(session).get_acoes_usuario(
+                    user_id=id_usuario,
+                    tenant_id=id_empresa
+                )
+            return tipo_usuario == "ADMIN", pares
+
+        return await permissoes_cache.obter(id_usuario, id_empresa, carregar) 
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""Serviço de previsão de fluxo de caixa por conta bancária."""
+from datetime import date, timedelta
+from typing import Any, Dict, Optional
+from uuid import UUID
+import logging
+
+import numpy as np
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+from app.core.cache import LRUCache
+from app.database import get_async_session
+from app.models.conta_bancaria import ContaBancaria
+from app.models.empresa import Empresa
+from app.repositories.conta_bancaria_repository import get_itens_previsao
+from app.utils.calendario import calendario_local, para_dates
+from app.utils.fluxo_caixa import projetar_saldos
+
+
+logger = logging.getLogger(__name__)
+
+# Projeções por (empresa, dias, data de referência); TTL curto porque os
+# lançamentos mudam a todo momento e cada worker mantém sua própria cópia
+_cache_previsoes = LRUCache(
+    maxsize=settings.CASHFLOW_FORECAST_CACHE_SIZE,
+    ttl=settings.CASHFLOW_FORECAST_CACHE_TTL
+)
+
+CONTA_NAO_ALOCADA = "nao_alocado"
+
+
+def invalidar_previsao(id_empresa: UUID) -> int:
+    """Descarta as projeções em cache de uma empresa (neste worker)."""
+    return _cache_previsoes.pop_where(lambda chave: chave[0] == id_empresa)
+
+
+def _serie(datas: np.ndarray, saldos: np.ndarray) -> Dict[str, Any]:
+    minimo = int(np.argmin(saldos))
+    return {
+        "saldos": np.round(saldos, 2).tolist(),
+        "saldo_final": round(float(saldos[-1]), 2),
+        "saldo_minimo": round(float(saldos[minimo]), 2),
+        "data_saldo_minimo": para_dates(datas[minimo:minimo + 1])[0],
+    }
+
+
+async def projetar_fluxo_caixa(
+    session: AsyncSession,
+    id_empresa: UUID,
+    dias: int = 90,
+    hoje: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    Projeta o saldo diário de cada conta ativa da empresa.
+
+    Lançamentos e parcelas entram na conta do lançamento, com a compensação
+    e as taxas da forma de pagamento, contada em dias úteis do calendário da
+    empresa (feriados nacionais, do estado e do município). Contas a pagar e a receber não têm
+    conta bancária e formam a linha ``nao_alocado``, que entra no total.
+
+    Args:
+        session: Sessão do banco de dados
+        id_empresa: ID da empresa
+        dias: Horizonte da projeção em dias
+        hoje: Data de referência (padrão: hoje)
+
+    Returns:
+        Dict com as datas, a série de cada conta, a linha não alocada e o total
+    """
+    hoje = hoje or date.today()
+    chave = (id_empresa, dias, hoje)
+    previsao = _cache_previsoes.get(chave)
+    if previsao is not None:
+        return previsao
+
+    result = await session.execute(
+        select(ContaBancaria.id_conta, ContaBancaria.nome, ContaBancaria.saldo_atual)
+        .where(ContaBancaria.id_empresa == id_empresa, ContaBancaria.ativa == True)
+        .order_by(ContaBancaria.nome)
+    )
+    contas = result.all()
+    itens = await get_itens_previsao(session, id_empresa, hoje + timedelta(days=dias))
+    local = (await session.execute(
+        select(Empresa.estado, Empresa.cidade).where(Empresa.id_empresa == id_empresa)
+    )).first()
+    calendario = calendario_local(
+        local.estado if local else None,
+        local.cidade if local else None,
+        hoje.year,
+        (hoje + timedelta(days=dias)).year + 1
+    )
+
+    # Última linha recebe os itens sem conta (ou de contas inativas)
+    linha_da_conta = {conta.id_conta: i for i, conta in enumerate(contas)}
+    nao_alocado = len(contas)
+    indice = np.fromiter(
+        (linha_da_conta.get(id_conta, nao_alocado) for id_conta in itens["id_conta"]),
+        dtype=np.int64,
+        count=len(itens["id_conta"])
+    )
+    saldos_iniciais = np.array([float(conta.saldo_atual or 0) for conta in contas] + [0.0])
+
+    projecao = projetar_saldos(
+        hoje=hoje,
+        dias=dias,
+        saldos_iniciais=saldos_iniciais,
+        indice_conta=indice,
+        vencimentos=np.array(itens["vencimento"], dtype="datetime64[D]"),
+        valores=np.array(itens["valor"], dtype=np.float64),
+        dias_compensacao=np.array(itens["dias_compensacao"], dtype=np.int64),
+        taxa_percentual=np.array(itens["taxa_percentual"], dtype=np.float64),
+        taxa_fixa=np.array(itens["taxa_fixa"], dtype=np.float64),
+        calendario=calendario,
+    )
+
+    previsao = {
+        "data_inicial": hoje,
+        "dias": dias,
+        "datas": para_dates(projecao.datas),
+        "contas": [
+            {
+                "id_conta": conta.id_conta,
+                "nome": conta.nome,
+                "saldo_atual": float(conta.saldo_atual or 0),
+                **_serie(projecao.datas, projecao.saldos[i]),
+            }
+            for i, conta in enumerate(contas)
+        ],
+        CONTA_NAO_ALOCADA: _serie(projecao.datas, projecao.saldos[nao_alocado]),
+        "total": _serie(projecao.datas, projecao.saldos.sum(axis=0)),
+        "itens_considerados": len(indice),
+    }
+    _cache_previsoes.set(chave, previsao)
+    return previsao
+
+
+class PrevisaoFluxoCaixaService:
+    """Serviço de projeção de saldos bancários."""
+
+    def __init__(self, session: AsyncSession = Depends(get_async_session)):
+        """Inicializar serviço com a sessão do banco."""
+        self.session = session
+
+    async def projetar(self, id_empresa: UUID, dias: int = 90) -> Dict[str, Any]:
+        """
+        Projeta o saldo diário das contas bancárias da empresa.
+
+        Args:
+            id_empresa: ID da empresa
+            dias: Horizonte da projeção em dias
+
+        Returns:
+            Projeção por conta e total
+        """
+        return await projetar_fluxo_caixa(self.session, id_empresa, dias)
@@ -9,9 +9,11 @@ do gerenciamento de produtos, organizados de forma modular.
 from app.services.produto.produto_service import ProdutoService
 from app.services.produto.produto_query_service import ProdutoQueryService
 from app.services.produto.produto_estoque_service import ProdutoEstoqueService
+from app.services.produto.produto_lookup_service import ProdutoLookupService
 
 __all__ = [
     "ProdutoService",
     "ProdutoQueryService",
-    "ProdutoEstoqueService"
+    "ProdutoEstoqueService",
+    "ProdutoLookupService"
 ] 
\ No newline at end of file
@@ -1,13 +1,21 @@
 """Serviço especializado para gestão de estoque de produtos no sistema CCONTROL-M."""
 from uuid import UUID
-from typing import Optional
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 import logging
 from decimal import Decimal
 
+from app.core.produto_lookup_cache import produto_lookup_cache
 from app.repositories.produto_repository import ProdutoRepository
-from app.schemas.produto import Produto as ProdutoSchema, EstoqueUpdate, MovimentacaoEstoque
+from app.repositories.estoque_repository import EstoqueRepository, SINAL_TIPO_MOVIMENTACAO
+from app.schemas.produto import (
+    Produto as ProdutoSchema,
+    EstoqueUpdate,
+    MovimentacaoLoteItem,
+    MovimentacaoLoteResultado,
+    ResultadoMovimentacaoItem,
+)
 
 
 class ProdutoEstoqueService:
@@ -20,7 +28,9 @@ class ProdutoEstoqueService:
     
     def __init__(self, session: AsyncSession):
         """Inicializar serviço com repositório."""
+        self.session = session
         self.repository = ProdutoRepository(session)
+        self.estoque_repository = EstoqueRepository(session)
         self.logger = logging.getLogger(__name__)
     
     async def atualizar_estoque(
@@ -32,6 +42,9 @@ class ProdutoEstoqueService:
         """
         Atualizar o estoque de um produto.
         
+        A verificação de saldo e a atualização acontecem no mesmo UPDATE
+        condicional, junto com o registro da movimentação.
+        
         Args:
             id_produto: ID do produto
             id_empresa: ID da empresa
@@ -41,42 +54,30 @@ class ProdutoEstoqueService:
             Produto com estoque atualizado
         """
         try:
-            # Verificar se o produto existe
-            produto = await self.repository.get_by_id(id_produto, id_empresa)
-            if not produto:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Produto não encontrado"
-                )
-            
-            # Verificar tipo de operação
-            tipo = estoque_data.tipo.lower() if estoque_data.tipo else "entrada"
-            is_entrada = tipo == "entrada"
-            
-            # Se for saída, verificar se há estoque suficiente
-            if not is_entrada and produto.estoque_atual < estoque_data.quantidade:
-                raise ValueError(
-                    f"Estoque insuficiente. Disponível: {produto.estoque_atual}, Solicitado: {estoque_data.quantidade}"
-                )
-            
-            # Atualizar estoque
-            produto_atualizado = await self.repository.update_estoque(
-                id_produto=id_produto,
-                id_empresa=id_empresa,
-                quantidade=estoque_data.quantidade,
-                is_entrada=is_entrada
-            )
-            
-            # Registrar movimentação de estoque
-            await self._registrar_movimentacao(
-                id_produto=id_produto,
+            resultado = await self.movimentar_lote(
                 id_empresa=id_empresa,
-                quantidade=estoque_data.quantidade,
-                tipo=estoque_data.tipo or "entrada",
+                movimentacoes=[
+                    MovimentacaoLoteItem(
+                        id_produto=id_produto,
+                        quantidade=estoque_data.quantidade,
+                        tipo=estoque_data.tipo or "entrada"
+                    )
+                ],
                 observacao=estoque_data.observacao
             )
             
-            return produto_atualizado
+            if resultado.faltas:
+                falta = resultado.faltas[0]
+                if falta.estoque_disponivel is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="Produto não encontrado"
+                    )
+                raise ValueError(
+                    f"Estoque insuficiente. Disponível: {falta.estoque_disponivel}, Solicitado: {abs(estoque_data.quantidade)}"
+                )
+            
+            return await self.repository.get_by_id(id_produto, id_empresa)
             
         except ValueError as e:
             self.logger.warning(f"Erro de validação ao atualizar estoque: {str(e)}")
@@ -93,6 +94,110 @@ class ProdutoEstoqueService:
                 detail="Erro ao atualizar estoque"
             )
     
+    async def movimentar_lote(
+        self,
+        id_empresa: UUID,
+        movimentacoes: List[MovimentacaoLoteItem],
+        observacao: Optional[str] = None,
+        permitir_parcial: bool = False
+    ) -> MovimentacaoLoteResultado:
+        """
+        Aplicar várias movimentações de estoque em uma única instrução.
+        
+        Movimentações do mesmo produto são somadas antes da verificação de
+        saldo. Por padrão o lote é tudo-ou-nada: se algum produto não tiver
+        saldo suficiente, nada é aplicado e as faltas são informadas.
+        
+        Args:
+            id_empresa: ID da empresa
+            movimentacoes: Movimentações (produto, quantidade, tipo)
+            observacao: Observação registrada em todas as movimentações
+            permitir_parcial: Aplicar os produtos com saldo mesmo se outros faltarem
+            
+        Returns:
+            Produtos aplicados e faltas por produto
+        """
+        deltas = [
+            (m.id_produto, self._delta_movimentacao(m.quantidade, m.tipo), m.tipo)
+            for m in movimentacoes
+        ]
+        
+        linhas = await self.estoque_repository.aplicar_movimentacoes(
+            id_empresa=id_empresa,
+            movimentacoes=deltas,
+            observacao=observacao,
+            tudo_ou_nada=not permitir_parcial
+        )
+        
+        resultado = self._montar_resultado(id_empresa, linhas)
+        if resultado.aplicados:
+            await self.session.commit()
+        
+        return resultado
+    
+    async def baixar_estoque_venda(self, id_venda: UUID, id_empresa: UUID) -> MovimentacaoLoteResultado:
+        """
+        Baixar do estoque todos os itens de uma venda de uma só vez.
+        
+        A baixa é feita na transação do chamador (sem commit), para que seja
+        confirmada junto com a mudança de status da venda.
+        
+        Args:
+            id_venda: ID da venda
+            id_empresa: ID da empresa
+            
+        Returns:
+            Produtos baixados
+            
+        Raises:
+            HTTPException: Se algum produto não tiver estoque suficiente
+        """
+        linhas = await self.estoque_repository.baixar_itens_venda(id_venda, id_empresa)
+        resultado = self._montar_resultado(id_empresa, linhas)
+        
+        if resultado.faltas:
+            faltas = ", ".join(
+                f"{falta.id_produto} (disponível: {falta.estoque_disponivel}, solicitado: {abs(falta.quantidade)})"
+                for falta in resultado.faltas
+            )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Estoque insuficiente para: {faltas}"
+            )
+        
+        return resultado
+    
+    @staticmethod
+    def _delta_movimentacao(quantidade: Decimal, tipo: str) -> Decimal:
+        """Converte quantidade e tipo na variação assinada do estoque."""
+        sinal = SINAL_TIPO_MOVIMENTACAO[tipo]
+        return quantidade if tipo == "ajuste" else sinal * abs(quantidade)
+    
+    def _montar_resultado(self, id_empresa: UUID, linhas: List[dict]) -> MovimentacaoLoteResultado:
+        """
+        Separa aplicados e faltas e atualiza o índice de produtos em memória.
+        
+        Produtos com saldo, mas desfeitos porque o lote era tudo-ou-nada, não
+        aparecem em nenhuma das listas.
+        """
+        resultado = MovimentacaoLoteResultado()
+        
+        for linha in linhas:
+            item = ResultadoMovimentacaoItem(
+                id_produto=linha["id_produto"],
+                quantidade=Decimal(str(linha["delta"])),
+                estoque_atual=None if linha["estoque_atual"] is None else Decimal(str(linha["estoque_atual"])),
+                estoque_disponivel=None if linha["estoque_disponivel"] is None else Decimal(str(linha["estoque_disponivel"])),
+                aplicado=linha["aplicado"]
+            )
+            if item.aplicado:
+                resultado.aplicados.append(item)
+                produto_lookup_cache.atualizar_estoque(id_empresa, item.id_produto, item.estoque_atual)
+            elif linha["falta"]:
+                resultado.faltas.append(item)
+        
+        return resultado
+    
     async def verificar_estoque_disponivel(
         self,
         id_produto: UUID,
@@ -121,41 +226,6 @@ class ProdutoEstoqueService:
             self.logger.error(f"Erro ao verificar estoque disponível: {str(e)}")
             return False
     
-    async def _registrar_movimentacao(
-        self,
-        id_produto: UUID,
-        id_empresa: UUID,
-        quantidade: Decimal,
-        tipo: str,
-        observacao: Optional[str] = None
-    ) -> None:
-        """
-        Registrar movimentação de estoque.
-        
-        Args:
-            id_produto: ID do produto
-            id_empresa: ID da empresa
-            quantidade: Quantidade movimentada
-            tipo: Tipo de movimentação (entrada/saída)
-            observacao: Observação opcional
-        """
-        try:
-            # Criar objeto de movimentação
-            movimentacao = MovimentacaoEstoque(
-                id_produto=id_produto,
-                id_empresa=id_empresa,
-                quantidade=quantidade,
-                tipo=tipo,
-                observacao=observacao or ""
-            )
-            
-            # Registrar no repositório
-            await self.repository.registrar_movimentacao_estoque(movimentacao)
-            
-        except Exception as e:
-            # Apenas logamos erro, não interrompemos o fluxo
-            self.logger.error(f"Erro ao registrar movimentação de estoque: {str(e)}")
-    
     async def ajustar_estoque(
         self,
         id_produto: UUID,
@@ -185,29 +255,27 @@ class ProdutoEstoqueService:
                 )
             
             # Calcular a diferença para ajustar
-            diferenca = quantidade_atual - produto.estoque_atual
-            
-            # Determinar se é entrada ou saída com base na diferença
-            is_entrada = diferenca >= 0
-            quantidade_ajuste = abs(diferenca)
-            
-            # Aplicar o ajuste
-            produto_atualizado = await self.repository.update_estoque(
-                id_produto=id_produto,
-                id_empresa=id_empresa,
-                quantidade=quantidade_ajuste,
-                is_entrada=is_entrada
-            )
+            diferenca = quantidade_atual - Decimal(str(produto.estoque_atual))
+            if diferenca == 0:
+                return produto
             
-            # Registrar movimentação
-            await self._registrar_movimentacao(
-                id_produto=id_produto,
+            # Aplicar o ajuste como movimentação assinada
+            resultado = await self.movimentar_lote(
                 id_empresa=id_empresa,
-                quantidade=quantidade_ajuste,
-                tipo="ajuste",
+                movimentacoes=[
+                    MovimentacaoLoteItem(id_produto=id_produto, quantidade=diferenca, tipo="ajuste")
+                ],
                 observacao=observacao or "Ajuste manual de estoque"
             )
             
+            if resultado.faltas:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Estoque alterado durante o ajuste; tente novamente"
+                )
+            
+            produto_atualizado = await self.repository.get_by_id(id_produto, id_empresa)
+            
             return produto_atualizado
             
         except HTTPException:
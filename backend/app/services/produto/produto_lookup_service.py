@@ -0,0 +1,97 @@
+"""Serviço especializado para consulta rápida de produtos por código (PDV)."""
+from uuid import UUID
+from typing import Optional, Set
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from app.core.produto_lookup_cache import produto_lookup_cache, ProdutoLookupCache
+from app.repositories.produto_repository import ProdutoRepository
+from app.schemas.produto import ProdutoResumo
+
+
+class ProdutoLookupService:
+    """
+    Serviço para resolver produtos por código, código de barras ou ID.
+
+    As consultas são atendidas pelo índice em memória da empresa; na primeira
+    consulta o índice é aquecido com os produtos ativos e, em caso de ausência,
+    o produto é buscado pontualmente no banco e incluído no índice.
+    """
+
+    # Empresas com aquecimento em andamento neste processo
+    _aquecendo: Set[UUID] = set()
+
+    def __init__(self, session: AsyncSession, cache: ProdutoLookupCache = produto_lookup_cache):
+        """Inicializar serviço com repositório e índice."""
+        self.repository = ProdutoRepository(session)
+        self.cache = cache
+        self.logger = logging.getLogger(__name__)
+
+    async def _garantir_aquecido(self, id_empresa: UUID) -> None:
+        """
+        Carrega o índice da empresa na primeira consulta.
+
+        Consultas concorrentes durante o aquecimento seguem pelo caminho
+        pontual em vez de disparar cargas duplicadas.
+
+        Args:
+            id_empresa: ID da empresa
+        """
+        if self.cache.aquecido(id_empresa) or id_empresa in self._aquecendo:
+            return
+
+        self._aquecendo.add(id_empresa)
+        try:
+            resumos = await self.repository.list_resumos(id_empresa, limit=self.cache.max_itens)
+            total = self.cache.aquecer(id_empresa, resumos)
+            self.logger.info(f"Índice de produtos aquecido para empresa {id_empresa}: {total} itens")
+        finally:
+            self._aquecendo.discard(id_empresa)
+
+    async def buscar_por_codigo(self, codigo: str, id_empresa: UUID) -> Optional[ProdutoResumo]:
+        """
+        Resolver um produto pelo código ou código de barras.
+
+        Args:
+            codigo: Código ou código de barras lido
+            id_empresa: ID da empresa
+
+        Returns:
+            Resumo do produto ou None se não existir
+        """
+        codigo = (codigo or "").strip()
+        if not codigo:
+            return None
+
+        await self._garantir_aquecido(id_empresa)
+
+        resumo = self.cache.obter_por_codigo(id_empresa, codigo)
+        if resumo is not None:
+            return resumo
+
+        resumo = await self.repository.get_resumo_by_codigo(codigo, id_empresa)
+        if resumo is not None:
+            self.cache.armazenar(resumo)
+        return resumo
+
+    async def obter_resumo(self, id_produto: UUID, id_empresa: UUID) -> Optional[ProdutoResumo]:
+        """
+        Obter o resumo de um produto pelo ID.
+
+        Args:
+            id_produto: ID do produto
+            id_empresa: ID da empresa
+
+        Returns:
+            Resumo do produto ou None se não existir na empresa
+        """
+        await self._garantir_aquecido(id_empresa)
+
+        resumo = self.cache.obter_por_id(id_empresa, id_produto)
+        if resumo is not None:
+            return resumo
+
+        resumo = await self.repository.get_resumo_by_id(id_produto, id_empresa)
+        if resumo is not None:
+            self.cache.armazenar(resumo)
+        return resumo
@@ -5,6 +5,7 @@ Este pacote contém os serviços relacionados ao gerenciamento de usuários
 no sistema CCONTROL-M, seguindo o padrão de modularização.
 """
 
-from app.services.usuario.usuario_service import UsuarioService
+from app.services.usuario_service import UsuarioService
+from app.services.usuario.usuario_auth_service import UsuarioAuthService
 
-__all__ = ["UsuarioService"] 
\ No newline at end of file
+__all__ = ["UsuarioService", "UsuarioAuthService"]
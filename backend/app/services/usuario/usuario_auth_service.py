@@ -0,0 +1,106 @@
+"""Serviço especializado para autenticação de usuários (login)."""
+from datetime import timedelta
+from typing import Any, Dict
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+import logging
+
+from app.config.settings import settings
+from app.core.password_hasher import PoolSenhasSobrecarregado, verificar_senha_async
+from app.dependencies import create_access_token
+from app.repositories.usuario_repository import UsuarioRepository
+
+
+class UsuarioAuthService:
+    """
+    Serviço de login totalmente assíncrono.
+
+    O usuário e suas permissões são lidos em uma única consulta na
+    ``AsyncSession``; a senha é verificada no pool de hash e as permissões
+    vão no token como claims, dispensando consultas nas requisições seguintes.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """Inicializar serviço com repositório."""
+        self.repository = UsuarioRepository(session)
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _credenciais_invalidas() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Email ou senha incorretos",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    async def autenticar(self, email: str, senha: str) -> Dict[str, Any]:
+        """
+        Autentica um usuário por email e senha.
+
+        Args:
+            email: Email (sem diferenciar maiúsculas/minúsculas)
+            senha: Senha em texto plano
+
+        Returns:
+            Dados do usuário, incluindo ``permissoes``
+
+        Raises:
+            HTTPException: 401 se as credenciais forem inválidas
+            HTTPException: 503 se o pool de hash de senhas estiver sobrecarregado
+        """
+        usuario = await self.repository.get_para_login(email)
+        if not usuario:
+            raise self._credenciais_invalidas()
+
+        try:
+            senha_valida, novo_hash = await verificar_senha_async(senha, usuario["senha_hash"])
+        except PoolSenhasSobrecarregado:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Serviço de autenticação sobrecarregado. Tente novamente em instantes.",
+                headers={"Retry-After": "1"},
+            )
+
+        if not senha_valida:
+            raise self._credenciais_invalidas()
+
+        if novo_hash:
+            # Rehash transparente: hash em esquema ou custo antigo
+            await self.repository.atualizar_senha_hash(usuario["id_usuario"], novo_hash)
+            self.logger.info(f"Hash de senha atualizado para usuário: {usuario['id_usuario']}")
+
+        return usuario
+
+    def gerar_token(self, usuario: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Gera o token de acesso com as permissões do usuário como claims.
+
+        Args:
+            usuario: Dados retornados por ``autenticar``
+
+        Returns:
+            Dados no formato do schema ``Token``
+        """
+        access_token = create_access_token(
+            subject=usuario["id_usuario"],
+            empresa_id=usuario["id_empresa"],
+            tipo_usuario=usuario["tipo_usuario"],
+            expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+            permissoes=usuario.get("permissoes") or {}
+        )
+
+        return {
+            "access_token": access_token,
+            "token_type": "bearer",
+            "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            "user_id": usuario["id_usuario"],
+            "empresa_id": usuario["id_empresa"],
+            "nome": usuario["nome"],
+            "email": usuario["email"],
+            "tipo_usuario": usuario["tipo_usuario"],
+            "telas_permitidas": usuario["telas_permitidas"]
+        }
+
+    async def login(self, email: str, senha: str) -> Dict[str, Any]:
+        """Autentica e gera o token de acesso."""
+        return self.gerar_token(await self.autenticar(email, senha))
@@ -4,7 +4,6 @@ from typing import Dict, Any, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends, HTTPException, status
 import logging
-from passlib.hash import bcrypt
 from datetime import datetime
 
 from app.schemas.usuario import UsuarioCreate, UsuarioUpdate, Usuario
@@ -13,7 +12,7 @@ from app.database import get_async_session
 from app.utils.validators import validar_email
 from app.schemas.pagination import PaginatedResponse
 from app.services.auditoria_service import AuditoriaService
-from app.utils.security import get_password_hash
+from app.core.password_hasher import gerar_hash_senha_async, verificar_senha_async
 
 
 # Configurar logger
@@ -167,7 +166,7 @@ class UsuarioService:
         usuario_data = usuario.model_dump()
         
         # Criptografar senha
-        usuario_data["senha_hash"] = bcrypt.hash(usuario_data.pop("senha"))
+        usuario_data["senha_hash"] = await gerar_hash_senha_async(usuario_data.pop("senha"))
         
         # Criar usuário no repositório
         try:
@@ -231,7 +230,7 @@ class UsuarioService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Senha deve ter no mínimo 8 caracteres"
                 )
-            update_data["senha_hash"] = bcrypt.hash(update_data.pop("senha"))
+            update_data["senha_hash"] = await gerar_hash_senha_async(update_data.pop("senha"))
         
         # Atualizar usuário
         try:
@@ -346,9 +345,16 @@ class UsuarioService:
             self.logger.warning(f"Usuário não encontrado para email: {email}")
             return None
             
-        if not bcrypt.verify(senha, usuario.senha_hash):
+        senha_valida, novo_hash = await verificar_senha_async(senha, usuario.senha_hash)
+        if not senha_valida:
             self.logger.warning(f"Senha incorreta para usuário: {email}")
             return None
+
+        if novo_hash:
+            # Hash em esquema ou custo antigo: regravar com a configuração atual
+            usuario.senha_hash = novo_hash
+            await self.repository.session.commit()
+            self.logger.info(f"Hash de senha atualizado para usuário: {email}")
             
         return usuario
 
@@ -381,7 +387,7 @@ class UsuarioService:
                 )
             
             # Hash da senha
-            usuario.senha = get_password_hash(usuario.senha)
+            usuario.senha = await gerar_hash_senha_async(usuario.senha)
             
             # Criar usuário
             novo_usuario = await self.repository.create(usuario, empresa_id)
@@ -451,7 +457,7 @@ class UsuarioService:
             
             # Hash da senha se alterada
             if usuario.senha:
-                usuario.senha = get_password_hash(usuario.senha)
+                usuario.senha = await gerar_hash_senha_async(usuario.senha)
             
             # Atualizar usuário
             usuario_atualizado = await self.repository.update(id_usuario, usuario)
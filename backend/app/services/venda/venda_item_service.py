@@ -8,6 +8,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.venda_repository import VendaRepository
 from app.repositories.produto_repository import ProdutoRepository
 from app.schemas.venda import ItemVenda
+from app.schemas.produto import ProdutoResumo
+from app.services.produto.produto_lookup_service import ProdutoLookupService
 from app.services.auditoria_service import AuditoriaService
 
 
@@ -22,6 +24,7 @@ class VendaItemService:
         """Inicializa o serviço com a sessão do banco de dados."""
         self.repository = VendaRepository(session)
         self.produto_repository = ProdutoRepository(session)
+        self.produto_lookup = ProdutoLookupService(session)
         self.auditoria_service = auditoria_service
         
     async def _validar_acesso_venda(self, id_venda: UUID, id_empresa: UUID) -> None:
@@ -49,18 +52,24 @@ class VendaItemService:
                 detail="Acesso não autorizado a esta venda"
             )
     
-    async def _validar_produto(self, id_produto: UUID, id_empresa: UUID) -> None:
+    async def _validar_produto(self, id_produto: UUID, id_empresa: UUID) -> ProdutoResumo:
         """
         Valida se o produto existe e pertence à empresa.
         
+        A consulta é atendida pelo índice de produtos em memória da empresa,
+        evitando uma ida ao banco a cada item lançado na venda.
+        
         Args:
             id_produto: ID do produto
             id_empresa: ID da empresa
             
+        Returns:
+            Resumo do produto (preço, estoque e situação)
+            
         Raises:
-            HTTPException: Se o produto não existir ou não pertencer à empresa
+            HTTPException: Se o produto não existir na empresa ou estiver inativo
         """
-        produto = await self.produto_repository.get_by_id(id_produto)
+        produto = await self.produto_lookup.obter_resumo(id_produto, id_empresa)
         
         if not produto:
             raise HTTPException(
@@ -68,11 +77,13 @@ class VendaItemService:
                 detail="Produto não encontrado"
             )
             
-        if produto.id_empresa != id_empresa:
+        if not produto.ativo:
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Acesso não autorizado a este produto"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Produto inativo não pode ser vendido"
             )
+        
+        return produto
     
     async def adicionar_item_venda(
         self, 
@@ -128,6 +139,85 @@ class VendaItemService:
                 detail=f"Erro ao adicionar item à venda: {str(e)}"
             )
     
+    async def adicionar_itens_venda(
+        self,
+        id_venda: UUID,
+        id_empresa: UUID,
+        itens: List[ItemVenda],
+        id_usuario: Optional[UUID] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Adicionar vários itens a uma venda de uma só vez.
+        
+        Os produtos são validados pelo índice em memória, os itens são
+        inseridos em lote e os totais da venda são atualizados uma única vez.
+        
+        Args:
+            id_venda: ID da venda
+            id_empresa: ID da empresa para validação de acesso
+            itens: Itens a serem adicionados
+            id_usuario: ID do usuário responsável (para auditoria)
+            
+        Returns:
+            Itens adicionados
+            
+        Raises:
+            HTTPException: Se a venda ou algum produto for inválido
+        """
+        if not itens:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Nenhum item informado"
+            )
+        
+        # Validar cada produto distinto uma única vez
+        for id_produto in dict.fromkeys(item.id_produto for item in itens):
+            await self._validar_produto(id_produto, id_empresa)
+        
+        itens_data = [
+            {
+                "id_produto": item.id_produto,
+                "descricao": item.nome_produto,
+                "quantidade": item.quantidade,
+                "valor_unitario": item.valor_unitario,
+                "valor_total": item.valor_total,
+            }
+            for item in itens
+        ]
+        
+        criados = await self.repository.create_itens_venda(id_venda, id_empresa, itens_data)
+        
+        if criados is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Venda não encontrada"
+            )
+        
+        resultado = [
+            {
+                "id_item_venda": item.id_item_venda,
+                "id_produto": item.id_produto,
+                "descricao": item.descricao,
+                "quantidade": item.quantidade,
+                "valor_unitario": item.valor_unitario,
+                "valor_total": item.valor_total,
+            }
+            for item in criados
+        ]
+        
+        # Uma única entrada de auditoria para o lote
+        await self.auditoria_service.registrar_acao(
+            entity_type="venda",
+            entity_id=id_venda,
+            action_type="create_itens",
+            user_id=id_usuario,
+            empresa_id=id_empresa,
+            data_after={"itens": [{k: str(v) for k, v in item.items()} for item in resultado]},
+            details=f"{len(resultado)} itens adicionados em lote"
+        )
+        
+        return resultado
+    
     async def atualizar_item_venda(
         self, 
         id_venda: UUID, 
@@ -321,6 +321,32 @@ class VendaService:
             item=item
         )
     
+    async def adicionar_itens_venda(
+        self,
+        id_venda: UUID,
+        id_empresa: UUID,
+        itens: List[ItemVenda],
+        id_usuario: Optional[UUID] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Adicionar vários itens a uma venda em lote.
+        
+        Args:
+            id_venda: ID da venda
+            id_empresa: ID da empresa para validação de acesso
+            itens: Itens a serem adicionados
+            id_usuario: ID do usuário responsável
+            
+        Returns:
+            Itens adicionados
+        """
+        return await self.item_service.adicionar_itens_venda(
+            id_venda=id_venda,
+            id_empresa=id_empresa,
+            itens=itens,
+            id_usuario=id_usuario
+        )
+    
     async def atualizar_item_venda(
         self, 
         id_venda: UUID, 
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.venda_repository import VendaRepository
 from app.schemas.venda import Venda, StatusVenda
 from app.services.auditoria_service import AuditoriaService
+from app.services.produto.produto_estoque_service import ProdutoEstoqueService
 
 
 class VendaStatusService:
@@ -20,6 +21,7 @@ class VendaStatusService:
     ):
         """Inicializa o serviço com a sessão do banco de dados."""
         self.repository = VendaRepository(session)
+        self.estoque_service = ProdutoEstoqueService(session)
         self.auditoria_service = auditoria_service
     
     async def _validar_acesso_venda(self, id_venda: UUID, id_empresa: UUID) -> Venda:
@@ -161,6 +163,10 @@ class VendaStatusService:
                 detail="Não é possível concluir uma venda sem itens"
             )
         
+        # Baixar o estoque de todos os itens em uma única instrução;
+        # se faltar saldo em algum produto, nada é baixado
+        await self.estoque_service.baixar_estoque_venda(id_venda, id_empresa)
+        
         # Concluir venda
         try:
             venda_concluida = await self.repository.atualizar_status_venda(
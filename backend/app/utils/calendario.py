@@ -0,0 +1,384 @@
+"""
+Calendário de dias úteis para cálculos financeiros.
+
+Fornece os feriados nacionais, estaduais e municipais (fixos e móveis,
+calculados a partir da Páscoa) e um calendário de dias úteis pré-calculado:
+para cada dia do intervalo coberto guarda se é útil e quantos dias úteis o
+antecedem, de modo que "n dias úteis depois", "dias úteis entre" e ajustes
+de vencimento são consultas diretas em arrays, vetorizadas sobre lotes de
+datas.
+
+Calendários locais são reaproveitados por (UF, município) em cache LRU.
+"""
+import unicodedata
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+# Convenções de ajuste de datas que caem em dia não útil
+AJUSTE_SEGUINTE = "seguinte"
+AJUSTE_ANTERIOR = "anterior"
+AJUSTE_SEGUINTE_MODIFICADO = "seguinte_modificado"
+AJUSTE_NENHUM = "nenhum"
+
+_ROLL_NUMPY = {
+    AJUSTE_SEGUINTE: "forward",
+    AJUSTE_ANTERIOR: "backward",
+    AJUSTE_SEGUINTE_MODIFICADO: "modifiedfollowing",
+}
+
+# Feriados nacionais de data fixa (mês, dia)
+FERIADOS_NACIONAIS_FIXOS: Tuple[Tuple[int, int], ...] = (
+    (1, 1),    # Confraternização Universal
+    (4, 21),   # Tiradentes
+    (5, 1),    # Dia do Trabalho
+    (9, 7),    # Independência
+    (10, 12),  # Nossa Senhora Aparecida
+    (11, 2),   # Finados
+    (11, 15),  # Proclamação da República
+    (11, 20),  # Dia Nacional de Zumbi e da Consciência Negra (a partir de 2024)
+    (12, 25),  # Natal
+)
+
+
+# Feriados estaduais de data fixa (mês, dia) por UF
+FERIADOS_ESTADUAIS: Dict[str, Tuple[Tuple[int, int], ...]] = {
+    "AC": ((1, 23), (6, 15), (9, 5), (11, 17)),
+    "AL": ((6, 24), (6, 29), (9, 16)),
+    "AM": ((9, 5), (12, 8)),
+    "AP": ((3, 19), (9, 13)),
+    "BA": ((7, 2),),
+    "CE": ((3, 19), (3, 25)),
+    "DF": ((11, 30),),
+    "MA": ((7, 28),),
+    "MS": ((10, 11),),
+    "PA": ((8, 15),),
+    "PB": ((8, 5),),
+    "PE": ((3, 6),),
+    "PI": ((10, 19),),
+    "PR": ((12, 19),),
+    "RJ": ((4, 23),),
+    "RN": ((10, 3),),
+    "RO": ((1, 4), (6, 18)),
+    "RR": ((10, 5),),
+    "RS": ((9, 20),),
+    "SC": ((8, 11),),
+    "SE": ((7, 8),),
+    "SP": ((7, 9),),
+    "TO": ((3, 18), (9, 8), (10, 5)),
+}
+
+# Feriados estaduais móveis: dias após o domingo de Páscoa
+FERIADOS_ESTADUAIS_MOVEIS: Dict[str, Tuple[int, ...]] = {
+    "ES": (8,),  # Nossa Senhora da Penha
+}
+
+# Feriados municipais por (UF, município normalizado): datas fixas e
+# deslocamentos a partir da Páscoa. Outros municípios podem ser incluídos
+# com ``registrar_feriados_municipais``.
+FERIADOS_MUNICIPAIS: Dict[Tuple[str, str], Tuple[Tuple[Tuple[int, int], ...], Tuple[int, ...]]] = {
+    ("AM", "MANAUS"): (((10, 24),), ()),
+    ("BA", "SALVADOR"): (((12, 8),), ()),
+    ("CE", "FORTALEZA"): (((8, 15),), ()),
+    ("GO", "GOIANIA"): (((10, 24),), ()),
+    ("MG", "BELO HORIZONTE"): (((8, 15), (12, 8)), ()),
+    ("PA", "BELEM"): (((1, 12),), ()),
+    ("PE", "RECIFE"): (((7, 16), (12, 8)), ()),
+    ("PR", "CURITIBA"): (((9, 8),), ()),
+    ("RJ", "RIO DE JANEIRO"): (((1, 20),), ()),
+    ("RS", "PORTO ALEGRE"): (((2, 2),), ()),
+    ("SP", "SAO PAULO"): (((1, 25),), ()),
+}
+
+
+def calcular_pascoa(ano: int) -> date:
+    """
+    Calcula o domingo de Páscoa (algoritmo de Meeus/Jones/Butcher).
+
+    Args:
+        ano: Ano desejado
+
+    Returns:
+        date: Data do domingo de Páscoa
+    """
+    a = ano % 19
+    b, c = divmod(ano, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mes, dia = divmod(h + l - 7 * m + 114, 31)
+    return date(ano, mes, dia + 1)
+
+
+@lru_cache(maxsize=256)
+def feriados_nacionais(ano: int) -> Tuple[date, ...]:
+    """
+    Feriados nacionais com efeito bancário em um ano.
+
+    Inclui Carnaval (segunda e terça), Sexta-feira Santa e Corpus Christi,
+    datas em que não há expediente bancário.
+
+    Args:
+        ano: Ano desejado
+
+    Returns:
+        Tupla ordenada com as datas dos feriados
+    """
+    pascoa = calcular_pascoa(ano)
+    moveis = (
+        pascoa - timedelta(days=48),  # Segunda-feira de Carnaval
+        pascoa - timedelta(days=47),  # Terça-feira de Carnaval
+        pascoa - timedelta(days=2),   # Sexta-feira Santa
+        pascoa + timedelta(days=60),  # Corpus Christi
+    )
+    fixos = tuple(
+        date(ano, mes, dia)
+        for mes, dia in FERIADOS_NACIONAIS_FIXOS
+        if (mes, dia) != (11, 20) or ano >= 2024
+    )
+    return tuple(sorted(fixos + moveis))
+
+
+def normalizar_municipio(nome: Optional[str]) -> Optional[str]:
+    """Nome do município em maiúsculas, sem acentos e com espaços simples."""
+    if not nome:
+        return None
+    sem_acentos = unicodedata.normalize("NFKD", nome).encode("ascii", "ignore").decode("ascii")
+    return " ".join(sem_acentos.upper().split())
+
+
+def registrar_feriados_municipais(
+    uf: str,
+    municipio: str,
+    fixos: Iterable[Tuple[int, int]] = (),
+    moveis: Iterable[int] = ()
+) -> None:
+    """
+    Registra (ou substitui) os feriados de um município.
+
+    Args:
+        uf: Sigla do estado
+        municipio: Nome do município
+        fixos: Datas fixas (mês, dia)
+        moveis: Dias após o domingo de Páscoa
+    """
+    FERIADOS_MUNICIPAIS[(uf.upper(), normalizar_municipio(municipio))] = (tuple(fixos), tuple(moveis))
+    feriados_locais.cache_clear()
+    _calendario_local.cache_clear()
+
+
+@lru_cache(maxsize=1024)
+def feriados_locais(ano: int, uf: Optional[str] = None, municipio: Optional[str] = None) -> Tuple[date, ...]:
+    """
+    Feriados estaduais e municipais de um ano (sem os nacionais).
+
+    Args:
+        ano: Ano desejado
+        uf: Sigla do estado
+        municipio: Nome do município (normalizado com ``normalizar_municipio``)
+
+    Returns:
+        Tupla ordenada com as datas dos feriados
+    """
+    if not uf:
+        return ()
+    uf = uf.upper()
+    fixos = list(FERIADOS_ESTADUAIS.get(uf, ()))
+    moveis = list(FERIADOS_ESTADUAIS_MOVEIS.get(uf, ()))
+    fixos_municipio, moveis_municipio = FERIADOS_MUNICIPAIS.get((uf, municipio), ((), ()))
+    fixos.extend(fixos_municipio)
+    moveis.extend(moveis_municipio)
+
+    pascoa = calcular_pascoa(ano) if moveis else None
+    datas = {date(ano, mes, dia) for mes, dia in fixos}
+    datas.update(pascoa + timedelta(days=dias) for dias in moveis)
+    return tuple(sorted(datas))
+
+
+class CalendarioDiasUteis:
+    """
+    Calendário de dias úteis pré-calculado para um intervalo de anos.
+
+    Para cada dia do intervalo guarda se é útil (segunda a sexta, exceto
+    feriados) e o acumulado de dias úteis anteriores; com isso ajustes,
+    somas e contagens de dias úteis são indexações em arrays. Datas fora do
+    intervalo recorrem a ``numpy.busdaycalendar``, que considera apenas os
+    feriados carregados.
+    """
+
+    def __init__(
+        self,
+        ano_inicial: int,
+        ano_final: int,
+        feriados_adicionais: Iterable[date] = ()
+    ):
+        """
+        Inicializa o calendário.
+
+        Args:
+            ano_inicial: Primeiro ano coberto pelos feriados
+            ano_final: Último ano coberto pelos feriados
+            feriados_adicionais: Feriados locais ou datas sem expediente
+        """
+        feriados = set(feriados_adicionais)
+        for ano in range(ano_inicial, ano_final + 1):
+            feriados.update(feriados_nacionais(ano))
+
+        self.ano_inicial = ano_inicial
+        self.ano_final = ano_final
+        self.feriados = np.array(sorted(feriados), dtype="datetime64[D]")
+        self._calendario = np.busdaycalendar(weekmask="1111100", holidays=self.feriados)
+
+        self._inicio = np.datetime64(date(ano_inicial, 1, 1), "D")
+        dias = np.arange(self._inicio, np.datetime64(date(ano_final + 1, 1, 1), "D"))
+        # _uteis[i]: o dia inicio + i é útil
+        self._uteis = np.is_busday(dias, busdaycal=self._calendario)
+        # _acumulado[i]: dias úteis em [inicio, inicio + i)
+        self._acumulado = np.concatenate(([0], np.cumsum(self._uteis, dtype=np.int64)))
+        # _posicao_util[k]: deslocamento do k-ésimo dia útil do intervalo
+        self._posicao_util = np.flatnonzero(self._uteis)
+
+    def _deslocamentos(self, datas: np.ndarray, limite: int) -> Optional[np.ndarray]:
+        """Deslocamento de cada data desde o início, ou None se alguma sair de [0, limite)."""
+        deslocamentos = (datas - self._inicio).astype(np.int64)
+        if deslocamentos.size and (deslocamentos.min() < 0 or deslocamentos.max() >= limite):
+            return None
+        return deslocamentos
+
+    def _dia_util(self, ordem: np.ndarray) -> Optional[np.ndarray]:
+        """Data do dia útil de cada ordem, ou None se alguma sair do intervalo."""
+        if ordem.size and (ordem.min() < 0 or ordem.max() >= len(self._posicao_util)):
+            return None
+        return self._inicio + self._posicao_util[ordem]
+
+    def eh_dia_util(self, datas):
+        """Indica se cada data é dia útil (aceita data única ou array)."""
+        datas = np.asarray(datas, dtype="datetime64[D]")
+        deslocamentos = self._deslocamentos(datas, len(self._uteis))
+        if deslocamentos is None:
+            return np.is_busday(datas, busdaycal=self._calendario)
+        return self._uteis[deslocamentos]
+
+    def ajustar(self, datas, convencao: str = AJUSTE_SEGUINTE) -> np.ndarray:
+        """
+        Ajusta datas que caem em fim de semana ou feriado.
+
+        Args:
+            datas: Data única ou sequência de datas
+            convencao: ``seguinte``, ``anterior``, ``seguinte_modificado``
+                       (próximo dia útil sem mudar de mês) ou ``nenhum``
+
+        Returns:
+            Array ``datetime64[D]`` com as datas ajustadas
+        """
+        datas = np.asarray(datas, dtype="datetime64[D]")
+        if convencao == AJUSTE_NENHUM:
+            return datas
+        if convencao not in _ROLL_NUMPY:
+            raise ValueError(f"Convenção de ajuste inválida: {convencao}")
+
+        deslocamentos = self._deslocamentos(datas, len(self._uteis))
+        if deslocamentos is not None:
+            # Próximo dia útil: o de ordem igual à quantidade de úteis antes da data;
+            # anterior: o último útil até a data (inclusive)
+            if convencao == AJUSTE_ANTERIOR:
+                resultado = self._dia_util(self._acumulado[deslocamentos + 1] - 1)
+            else:
+                resultado = self._dia_util(self._acumulado[deslocamentos])
+                if resultado is not None and convencao == AJUSTE_SEGUINTE_MODIFICADO:
+                    mudou_mes = resultado.astype("datetime64[M]") != datas.astype("datetime64[M]")
+                    if mudou_mes.any():
+                        anterior = self._dia_util(self._acumulado[deslocamentos + 1] - 1)
+                        resultado = None if anterior is None else np.where(mudou_mes, anterior, resultado)
+            if resultado is not None:
+                return resultado
+        return np.busday_offset(datas, 0, roll=_ROLL_NUMPY[convencao], busdaycal=self._calendario)
+
+    def adicionar_dias_uteis(self, datas, dias) -> np.ndarray:
+        """Soma dias úteis às datas (a partir do próximo dia útil se necessário)."""
+        datas = np.asarray(datas, dtype="datetime64[D]")
+        deslocamentos = self._deslocamentos(datas, len(self._uteis))
+        if deslocamentos is not None:
+            resultado = self._dia_util(self._acumulado[deslocamentos] + np.asarray(dias, dtype=np.int64))
+            if resultado is not None:
+                return resultado
+        return np.busday_offset(datas, dias, roll="forward", busdaycal=self._calendario)
+
+    def contar_dias_uteis(self, inicio, fim) -> np.ndarray:
+        """Conta os dias úteis no intervalo semiaberto [inicio, fim)."""
+        inicio = np.asarray(inicio, dtype="datetime64[D]")
+        fim = np.asarray(fim, dtype="datetime64[D]")
+        # O acumulado tem uma posição a mais: o fim pode ser o dia seguinte ao último
+        limite = len(self._acumulado)
+        deslocamentos_inicio = self._deslocamentos(inicio, limite)
+        deslocamentos_fim = self._deslocamentos(fim, limite)
+        if deslocamentos_inicio is not None and deslocamentos_fim is not None:
+            return self._acumulado[deslocamentos_fim] - self._acumulado[deslocamentos_inicio]
+        return np.busday_count(inicio, fim, busdaycal=self._calendario)
+
+
+@lru_cache(maxsize=32)
+def _calendario_nacional(ano_inicial: int, ano_final: int) -> CalendarioDiasUteis:
+    return CalendarioDiasUteis(ano_inicial, ano_final)
+
+
+def calendario_nacional(ano_inicial: int, ano_final: Optional[int] = None) -> CalendarioDiasUteis:
+    """
+    Obtém um calendário com os feriados nacionais, reaproveitado entre chamadas.
+
+    O intervalo é arredondado para blocos de 10 anos para que chamadas
+    próximas compartilhem o mesmo calendário pré-calculado.
+    """
+    ano_final = ano_final or ano_inicial
+    inicio = ano_inicial - ano_inicial % 10
+    fim = ano_final - ano_final % 10 + 9
+    return _calendario_nacional(inicio, fim)
+
+
+@lru_cache(maxsize=256)
+def _calendario_local(uf: str, municipio: Optional[str], ano_inicial: int, ano_final: int) -> CalendarioDiasUteis:
+    feriados = [
+        feriado
+        for ano in range(ano_inicial, ano_final + 1)
+        for feriado in feriados_locais(ano, uf, municipio)
+    ]
+    return CalendarioDiasUteis(ano_inicial, ano_final, feriados)
+
+
+def calendario_local(
+    uf: Optional[str],
+    municipio: Optional[str] = None,
+    ano_inicial: Optional[int] = None,
+    ano_final: Optional[int] = None
+) -> CalendarioDiasUteis:
+    """
+    Obtém o calendário com os feriados nacionais, do estado e do município.
+
+    Os calendários ficam em cache LRU por (UF, município, bloco de 10 anos).
+    Sem UF, retorna o calendário nacional.
+
+    Args:
+        uf: Sigla do estado
+        municipio: Nome do município (acentos e caixa são ignorados)
+        ano_inicial: Primeiro ano necessário (padrão: ano atual)
+        ano_final: Último ano necessário (padrão: ``ano_inicial``)
+    """
+    ano_inicial = ano_inicial or date.today().year
+    ano_final = ano_final or ano_inicial
+    if not uf:
+        return calendario_nacional(ano_inicial, ano_final)
+    inicio = ano_inicial - ano_inicial % 10
+    fim = ano_final - ano_final % 10 + 9
+    return _calendario_local(uf.strip().upper(), normalizar_municipio(municipio), inicio, fim)
+
+
+def para_dates(datas: np.ndarray) -> List[date]:
+    """Converte um array ``datetime64[D]`` em lista de ``date``."""
+    return np.asarray(datas, dtype="datetime64[D]").astype(object).tolist()
@@ -0,0 +1,201 @@
+"""
+Motor de conciliação bancária.
+
+Cada linha do extrato é comparada apenas com os lançamentos do mesmo valor
+(em centavos, com tolerância opcional) cuja data cai na janela da linha:
+os candidatos ficam em buckets por valor, ordenados por data, e a janela é
+localizada por busca binária. Os pares candidatos recebem uma pontuação
+(proximidade da data e semelhança da descrição) e a atribuição é gulosa e
+um-para-um, da maior pontuação para a menor.
+"""
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from difflib import SequenceMatcher
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from app.utils.extrato import LinhaExtrato
+
+
+PESO_DATA = 0.5
+PESO_DESCRICAO = 0.5
+
+_RE_NAO_ALFANUMERICO = re.compile(r"[^A-Z0-9]+")
+# Termos que os bancos repetem em quase todo histórico e não ajudam a distinguir
+_TERMOS_IGNORADOS = frozenset({
+    "PAG", "PAGTO", "PGTO", "PAGAMENTO", "REC", "RECEB", "RECEBIMENTO", "TED", "DOC",
+    "PIX", "TRANSF", "TRANSFERENCIA", "ENVIADO", "RECEBIDO", "DE", "DA", "DO", "PARA",
+    "COMPRA", "DEB", "CRED", "CREDITO", "DEBITO", "AUT", "TIT", "TITULO", "BOLETO",
+})
+
+
+class CandidatoConciliacao(NamedTuple):
+    """Lançamento pendente de conciliação."""
+    id_lancamento: object
+    valor: Union[Decimal, float]   # com sinal: entrada positiva, saída negativa
+    data: date
+    descricao: str
+
+
+class Correspondencia(NamedTuple):
+    """Par linha do extrato / lançamento escolhido pelo motor."""
+    indice_linha: int
+    id_lancamento: object
+    pontuacao: float
+    diferenca_dias: int
+
+
+class ResultadoConciliacao(NamedTuple):
+    correspondencias: List[Correspondencia]
+    linhas_sem_correspondencia: List[int]
+
+
+def centavos(valor: Union[Decimal, float]) -> int:
+    """Valor em centavos inteiros (chave dos buckets)."""
+    return int((Decimal(str(valor)) * 100).to_integral_value())
+
+
+def normalizar_descricao(texto: Optional[str]) -> str:
+    """Maiúsculas, sem acentos e com um espaço entre termos."""
+    if not texto:
+        return ""
+    sem_acentos = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+    return _RE_NAO_ALFANUMERICO.sub(" ", sem_acentos.upper()).strip()
+
+
+def termos(texto_normalizado: str) -> FrozenSet[str]:
+    """Termos relevantes de uma descrição normalizada."""
+    return frozenset(
+        t for t in texto_normalizado.split()
+        if t not in _TERMOS_IGNORADOS and (len(t) > 2 or t.isdigit())
+    )
+
+
+def similaridade(a: str, termos_a: FrozenSet[str], b: str, termos_b: FrozenSet[str]) -> float:
+    """
+    Semelhança (0-1) entre duas descrições normalizadas.
+
+    O maior entre o índice de Jaccard dos termos, que tolera ordem diferente,
+    e a razão do ``SequenceMatcher``, que tolera abreviações e truncamentos
+    (históricos de CNAB têm 25 caracteres).
+    """
+    if not a or not b:
+        return 0.0
+    jaccard = len(termos_a & termos_b) / len(termos_a | termos_b) if termos_a or termos_b else 0.0
+    if jaccard == 1.0:
+        return 1.0
+    comparador = SequenceMatcher(None, a, b, autojunk=False)
+    if comparador.quick_ratio() <= jaccard:
+        return jaccard
+    return max(jaccard, comparador.ratio())
+
+
+class IndiceCandidatos:
+    """Candidatos agrupados por valor em centavos e ordenados por data."""
+
+    def __init__(self, candidatos: Iterable[CandidatoConciliacao]):
+        buckets: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        self.candidatos: List[CandidatoConciliacao] = []
+        self._descricoes: List[Tuple[str, FrozenSet[str]]] = []
+        for candidato in candidatos:
+            posicao = len(self.candidatos)
+            self.candidatos.append(candidato)
+            normalizada = normalizar_descricao(candidato.descricao)
+            self._descricoes.append((normalizada, termos(normalizada)))
+            buckets[centavos(candidato.valor)].append((candidato.data.toordinal(), posicao))
+
+        # Por bucket: ordinais das datas (para o bisect) e posições correspondentes
+        self._buckets: Dict[int, Tuple[List[int], List[int]]] = {}
+        for chave, itens in buckets.items():
+            itens.sort()
+            self._buckets[chave] = ([d for d, _ in itens], [p for _, p in itens])
+
+    def __len__(self) -> int:
+        return len(self.candidatos)
+
+    def descricao(self, posicao: int) -> Tuple[str, FrozenSet[str]]:
+        return self._descricoes[posicao]
+
+    def buscar(self, valor_centavos: int, data: date, janela_dias: int, tolerancia_centavos: int = 0) -> List[int]:
+        """Posições dos candidatos com valor e data dentro dos limites."""
+        dia = data.toordinal()
+        encontrados = []
+        for chave in range(valor_centavos - tolerancia_centavos, valor_centavos + tolerancia_centavos + 1):
+            bucket = self._buckets.get(chave)
+            if bucket is None:
+                continue
+            datas, posicoes = bucket
+            inicio = bisect_left(datas, dia - janela_dias)
+            fim = bisect_right(datas, dia + janela_dias)
+            encontrados.extend(posicoes[inicio:fim])
+        return encontrados
+
+
+def conciliar(
+    linhas: Sequence[LinhaExtrato],
+    candidatos: Iterable[CandidatoConciliacao],
+    janela_dias: int = 5,
+    tolerancia_centavos: int = 0,
+    pontuacao_minima: float = 0.5
+) -> ResultadoConciliacao:
+    """
+    Encontra, para cada linha do extrato, o lançamento correspondente.
+
+    A pontuação de um par é ``PESO_DATA * proximidade + PESO_DESCRICAO *
+    semelhança``, onde a proximidade cai linearmente de 1 (mesmo dia) até
+    perto de 0 no limite da janela. Cada linha e cada lançamento participam
+    de no máximo uma correspondência.
+
+    Args:
+        linhas: Movimentos do extrato
+        candidatos: Lançamentos pendentes da conta
+        janela_dias: Diferença máxima de dias entre extrato e lançamento
+        tolerancia_centavos: Diferença máxima de valor aceita
+        pontuacao_minima: Pontuação mínima para aceitar um par
+
+    Returns:
+        ResultadoConciliacao com os pares (na ordem do extrato) e as linhas sem par
+    """
+    indice = candidatos if isinstance(candidatos, IndiceCandidatos) else IndiceCandidatos(candidatos)
+
+    pares: List[Tuple[float, int, int, int]] = []
+    for i, linha in enumerate(linhas):
+        posicoes = indice.buscar(centavos(linha.valor), linha.data, janela_dias, tolerancia_centavos)
+        if not posicoes:
+            continue
+        texto = normalizar_descricao(linha.descricao)
+        termos_linha = termos(texto)
+        for posicao in posicoes:
+            candidato = indice.candidatos[posicao]
+            diferenca = abs((candidato.data - linha.data).days)
+            proximidade = 1 - diferenca / (janela_dias + 1)
+            texto_candidato, termos_candidato = indice.descricao(posicao)
+            pontuacao = (
+                PESO_DATA * proximidade
+                + PESO_DESCRICAO * similaridade(texto, termos_linha, texto_candidato, termos_candidato)
+            )
+            if pontuacao >= pontuacao_minima:
+                pares.append((pontuacao, i, posicao, diferenca))
+
+    # Maior pontuação primeiro; empates resolvidos pela ordem do extrato e dos candidatos
+    pares.sort(key=lambda p: (-p[0], p[1], p[2]))
+    linhas_usadas, candidatos_usados = set(), set()
+    correspondencias = []
+    for pontuacao, i, posicao, diferenca in pares:
+        if i in linhas_usadas or posicao in candidatos_usados:
+            continue
+        linhas_usadas.add(i)
+        candidatos_usados.add(posicao)
+        correspondencias.append(Correspondencia(
+            indice_linha=i,
+            id_lancamento=indice.candidatos[posicao].id_lancamento,
+            pontuacao=round(pontuacao, 4),
+            diferenca_dias=diferenca,
+        ))
+
+    correspondencias.sort(key=lambda c: c.indice_linha)
+    sem_par = [i for i in range(len(linhas)) if i not in linhas_usadas]
+    return ResultadoConciliacao(correspondencias, sem_par)
@@ -0,0 +1,169 @@
+"""
+Encargos por atraso: multa, juros simples ou compostos e carência.
+
+Convenções:
+
+- A taxa de juros é mensal e aplicada pro rata die (mês de 30 dias).
+- Dentro da carência nada é cobrado; passada a carência, multa e juros
+  contam desde o vencimento.
+- Cada componente é arredondado para o centavo (meio para cima) e o valor
+  atualizado é a soma dos componentes já arredondados.
+
+``calcular_encargos`` calcula um título com ``Decimal``. ``calcular_encargos_lote``
+faz o mesmo cálculo para uma carteira inteira com arrays NumPy, em centavos,
+e produz os mesmos centavos que o cálculo unitário.
+"""
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+from typing import NamedTuple, Optional, Union
+
+import numpy as np
+
+from app.config.settings import settings
+
+
+REGIME_SIMPLES = "simples"
+REGIME_COMPOSTO = "composto"
+REGIMES_JUROS = (REGIME_SIMPLES, REGIME_COMPOSTO)
+
+DIAS_MES = 30
+CENTAVO = Decimal("0.01")
+
+Numero = Union[Decimal, float, int, str]
+
+
+class RegraEncargos(NamedTuple):
+    """Parâmetros de cobrança por atraso."""
+    multa_percentual: Decimal = Decimal("2")
+    juros_mensal_percentual: Decimal = Decimal("1")
+    regime: str = REGIME_SIMPLES
+    dias_carencia: int = 0
+
+
+class Encargos(NamedTuple):
+    """Encargos de um título em uma data de referência."""
+    dias_atraso: int
+    multa: Decimal
+    juros: Decimal
+    valor_atualizado: Decimal
+
+
+class EncargosLote(NamedTuple):
+    """Encargos de uma carteira (arrays alinhados com a entrada, em reais)."""
+    dias_atraso: np.ndarray
+    multa: np.ndarray
+    juros: np.ndarray
+    valor_atualizado: np.ndarray
+
+
+def criar_regra(
+    multa_percentual: Optional[Numero] = None,
+    juros_mensal_percentual: Optional[Numero] = None,
+    regime: Optional[str] = None,
+    dias_carencia: Optional[int] = None
+) -> RegraEncargos:
+    """
+    Monta uma regra validada; parâmetros omitidos vêm das configurações.
+
+    Raises:
+        ValueError: Se algum parâmetro for negativo ou o regime for desconhecido
+    """
+    regra = RegraEncargos(
+        multa_percentual=Decimal(str(
+            settings.ENCARGOS_MULTA_PERCENTUAL if multa_percentual is None else multa_percentual
+        )),
+        juros_mensal_percentual=Decimal(str(
+            settings.ENCARGOS_JUROS_MENSAL_PERCENTUAL if juros_mensal_percentual is None else juros_mensal_percentual
+        )),
+        regime=settings.ENCARGOS_REGIME if regime is None else regime,
+        dias_carencia=settings.ENCARGOS_DIAS_CARENCIA if dias_carencia is None else int(dias_carencia),
+    )
+    if regra.regime not in REGIMES_JUROS:
+        raise ValueError(f"Regime de juros inválido: {regra.regime}. Use um de: {', '.join(REGIMES_JUROS)}")
+    if regra.multa_percentual < 0 or regra.juros_mensal_percentual < 0 or regra.dias_carencia < 0:
+        raise ValueError("Multa, juros e carência não podem ser negativos")
+    return regra
+
+
+def calcular_encargos(
+    valor: Numero,
+    vencimento: date,
+    data_referencia: date,
+    regra: Optional[RegraEncargos] = None
+) -> Encargos:
+    """
+    Calcula multa, juros e valor atualizado de um título.
+
+    Args:
+        valor: Valor original do título
+        vencimento: Data de vencimento
+        data_referencia: Data do cálculo (pagamento ou hoje)
+        regra: Regra de cobrança (padrão: configurações)
+
+    Returns:
+        Encargos com os dias de atraso e os valores em centavos
+    """
+    regra = regra or criar_regra()
+    valor = Decimal(str(valor)).quantize(CENTAVO, rounding=ROUND_HALF_UP)
+    dias = max(0, (data_referencia - vencimento).days)
+    if dias == 0 or dias <= regra.dias_carencia:
+        return Encargos(dias, Decimal("0.00"), Decimal("0.00"), valor)
+
+    multa = (valor * regra.multa_percentual / 100).quantize(CENTAVO, rounding=ROUND_HALF_UP)
+    taxa = regra.juros_mensal_percentual / 100
+    if regra.regime == REGIME_COMPOSTO:
+        juros = valor * ((1 + taxa) ** (Decimal(dias) / DIAS_MES) - 1)
+    else:
+        juros = valor * taxa * dias / DIAS_MES
+    juros = juros.quantize(CENTAVO, rounding=ROUND_HALF_UP)
+    return Encargos(dias, multa, juros, valor + multa + juros)
+
+
+def _arredondar_centavos(valores: np.ndarray) -> np.ndarray:
+    """Arredonda meio para cima valores já em centavos, como ``ROUND_HALF_UP``."""
+    # O arredondamento em 6 casas elimina o erro de representação do float
+    # (ex.: 12.4999999 que deveria ser 12.5) antes de decidir o meio centavo
+    ajustados = np.round(np.abs(valores), 6)
+    return (np.sign(valores) * np.floor(ajustados + 0.5)).astype(np.int64)
+
+
+def calcular_encargos_lote(
+    valores: np.ndarray,
+    vencimentos: np.ndarray,
+    data_referencia: date,
+    regra: Optional[RegraEncargos] = None
+) -> EncargosLote:
+    """
+    Calcula os encargos de uma carteira inteira de uma vez.
+
+    Args:
+        valores: Valores originais
+        vencimentos: Vencimentos (qualquer entrada aceita por ``datetime64[D]``)
+        data_referencia: Data do cálculo
+        regra: Regra de cobrança (padrão: configurações)
+
+    Returns:
+        EncargosLote com dias de atraso, multa, juros e valor atualizado
+    """
+    regra = regra or criar_regra()
+    centavos = _arredondar_centavos(np.asarray(valores, dtype=np.float64) * 100)
+    dias = (np.datetime64(data_referencia, "D") - np.asarray(vencimentos, dtype="datetime64[D]")).astype(np.int64)
+    dias = np.maximum(dias, 0)
+    cobra = (dias > 0) & (dias > regra.dias_carencia)
+
+    multa = _arredondar_centavos(centavos * float(regra.multa_percentual) / 100)
+    taxa = float(regra.juros_mensal_percentual) / 100
+    if regra.regime == REGIME_COMPOSTO:
+        juros = centavos * np.expm1(np.log1p(taxa) * dias / DIAS_MES)
+    else:
+        juros = centavos * taxa * dias / DIAS_MES
+    juros = _arredondar_centavos(juros)
+
+    multa = np.where(cobra, multa, 0)
+    juros = np.where(cobra, juros, 0)
+    return EncargosLote(
+        dias_atraso=dias,
+        multa=multa / 100,
+        juros=juros / 100,
+        valor_atualizado=(centavos + multa + juros) / 100,
+    )
@@ -0,0 +1,183 @@
+"""
+Leitura de extratos bancários para conciliação.
+
+Formatos suportados:
+
+- OFX (1.x SGML e 2.x XML): blocos ``<STMTTRN>``
+- CNAB 240 (FEBRABAN): registros de detalhe do segmento E
+- CSV: colunas de data, descrição e valor (separador e posições configuráveis)
+
+Todos produzem ``LinhaExtrato`` com o valor assinado (crédito positivo,
+débito negativo), na ordem em que aparecem no arquivo.
+"""
+import csv
+import io
+import re
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import List, NamedTuple, Optional
+
+
+FORMATO_OFX = "ofx"
+FORMATO_CNAB240 = "cnab240"
+FORMATO_CSV = "csv"
+FORMATOS_EXTRATO = (FORMATO_OFX, FORMATO_CNAB240, FORMATO_CSV)
+
+
+class LinhaExtrato(NamedTuple):
+    """Movimento lido do extrato."""
+    data: date
+    valor: Decimal
+    descricao: str
+    documento: Optional[str] = None
+
+
+class ErroExtrato(ValueError):
+    """Arquivo de extrato inválido ou em formato não reconhecido."""
+
+
+def _decodificar(conteudo: bytes) -> str:
+    for codificacao in ("utf-8", "cp1252"):
+        try:
+            return conteudo.decode(codificacao)
+        except UnicodeDecodeError:
+            continue
+    return conteudo.decode("latin-1")
+
+
+def _valor_decimal(texto: str) -> Decimal:
+    """Converte ``1.234,56``, ``1234.56`` ou ``-1234,56`` em Decimal."""
+    texto = texto.strip().replace(" ", "").replace("R$", "")
+    if "," in texto:
+        texto = texto.replace(".", "").replace(",", ".")
+    try:
+        return Decimal(texto)
+    except InvalidOperation:
+        raise ErroExtrato(f"Valor inválido no extrato: {texto!r}")
+
+
+# -- OFX --------------------------------------------------------------------
+
+_RE_TRANSACAO_OFX = re.compile(r"<STMTTRN>(.*?)(?:</STMTTRN>|(?=<STMTTRN>)|(?=</BANKTRANLIST>))", re.S | re.I)
+_RE_CAMPO_OFX = re.compile(r"<(\w+)>([^<\r\n]*)")
+
+
+def ler_ofx(conteudo: bytes) -> List[LinhaExtrato]:
+    """
+    Lê as transações de um OFX.
+
+    Os campos são extraídos por tag, o que cobre tanto o SGML do OFX 1.x
+    (tags sem fechamento) quanto o XML do OFX 2.x.
+    """
+    texto = _decodificar(conteudo)
+    linhas = []
+    for bloco in _RE_TRANSACAO_OFX.findall(texto):
+        campos = {tag.upper(): valor.strip() for tag, valor in _RE_CAMPO_OFX.findall(bloco)}
+        if "TRNAMT" not in campos or "DTPOSTED" not in campos:
+            continue
+        try:
+            data = datetime.strptime(campos["DTPOSTED"][:8], "%Y%m%d").date()
+        except ValueError:
+            raise ErroExtrato(f"Data inválida no OFX: {campos['DTPOSTED']!r}")
+        descricao = " ".join(v for v in (campos.get("NAME"), campos.get("MEMO")) if v)
+        linhas.append(LinhaExtrato(
+            data=data,
+            valor=_valor_decimal(campos["TRNAMT"]),
+            descricao=descricao,
+            documento=campos.get("FITID") or campos.get("CHECKNUM"),
+        ))
+    if not linhas and "<OFX>" not in texto.upper():
+        raise ErroExtrato("Arquivo não parece ser um OFX")
+    return linhas
+
+
+# -- CNAB 240 -----------------------------------------------------------------
+
+def ler_cnab240(conteudo: bytes) -> List[LinhaExtrato]:
+    """
+    Lê os lançamentos (segmento E) de um extrato CNAB 240.
+
+    Posições do segmento E (1-based): 8 tipo de registro ``3``, 14 segmento,
+    143-150 data (DDMMAAAA), 151-168 valor (2 decimais), 169 ``D``/``C``,
+    177-201 histórico e 202-240 documento.
+    """
+    linhas = []
+    for numero, registro in enumerate(_decodificar(conteudo).splitlines(), start=1):
+        if len(registro) < 240 or registro[7] != "3" or registro[13].upper() != "E":
+            continue
+        try:
+            data = datetime.strptime(registro[142:150], "%d%m%Y").date()
+            valor = Decimal(int(registro[150:168])) / 100
+        except ValueError:
+            raise ErroExtrato(f"Registro CNAB inválido na linha {numero}")
+        if registro[168].upper() == "D":
+            valor = -valor
+        linhas.append(LinhaExtrato(
+            data=data,
+            valor=valor,
+            descricao=registro[176:201].strip(),
+            documento=registro[201:240].strip() or None,
+        ))
+    return linhas
+
+
+# -- CSV ----------------------------------------------------------------------
+
+def ler_csv(
+    conteudo: bytes,
+    coluna_data: int = 0,
+    coluna_descricao: int = 1,
+    coluna_valor: int = 2,
+    formato_data: str = "%d/%m/%Y",
+    separador: Optional[str] = None
+) -> List[LinhaExtrato]:
+    """
+    Lê um extrato CSV.
+
+    Linhas cuja data não pode ser interpretada (cabeçalho, saldos, rodapé)
+    são ignoradas. Sem ``separador``, ``;`` ou ``,`` é detectado pela
+    primeira linha.
+    """
+    texto = _decodificar(conteudo)
+    if separador is None:
+        primeira = texto.split("\n", 1)[0]
+        separador = ";" if primeira.count(";") >= primeira.count(",") else ","
+
+    linhas = []
+    for campos in csv.reader(io.StringIO(texto), delimiter=separador):
+        if len(campos) <= max(coluna_data, coluna_descricao, coluna_valor):
+            continue
+        try:
+            data = datetime.strptime(campos[coluna_data].strip(), formato_data).date()
+        except ValueError:
+            continue
+        linhas.append(LinhaExtrato(
+            data=data,
+            valor=_valor_decimal(campos[coluna_valor]),
+            descricao=campos[coluna_descricao].strip(),
+        ))
+    return linhas
+
+
+def ler_extrato(conteudo: bytes, formato: str, **opcoes) -> List[LinhaExtrato]:
+    """
+    Lê um extrato no formato indicado.
+
+    Args:
+        conteudo: Bytes do arquivo
+        formato: ``ofx``, ``cnab240`` ou ``csv``
+        **opcoes: Opções do leitor CSV
+
+    Returns:
+        Movimentos do extrato
+
+    Raises:
+        ErroExtrato: Se o formato não for suportado ou o arquivo for inválido
+    """
+    if formato == FORMATO_OFX:
+        return ler_ofx(conteudo)
+    if formato == FORMATO_CNAB240:
+        return ler_cnab240(conteudo)
+    if formato == FORMATO_CSV:
+        return ler_csv(conteudo, **opcoes)
+    raise ErroExtrato(f"Formato de extrato não suportado: {formato}")
@@ -0,0 +1,128 @@
+"""
+Projeção diária de saldos bancários.
+
+Recebe os itens em aberto como colunas (conta, vencimento, valor com sinal,
+condições da forma de pagamento) e calcula, sem laços em Python, a data em
+que cada item movimenta o caixa, o valor líquido de taxas e a curva de saldo
+de cada conta no horizonte pedido.
+"""
+from datetime import date
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from app.utils.calendario import CalendarioDiasUteis, calendario_nacional
+
+
+class ProjecaoSaldos(NamedTuple):
+    """Resultado da projeção (matrizes com uma linha por conta)."""
+    datas: np.ndarray        # datetime64[D], uma por dia do horizonte
+    movimentos: np.ndarray   # (contas, dias) entradas - saídas líquidas de cada dia
+    saldos: np.ndarray       # (contas, dias) saldo ao final de cada dia
+
+
+def datas_de_compensacao(
+    vencimentos: np.ndarray,
+    dias_compensacao: np.ndarray,
+    hoje: date,
+    calendario: CalendarioDiasUteis
+) -> np.ndarray:
+    """
+    Data em que cada item efetivamente movimenta a conta.
+
+    Itens vencidos contam a partir de hoje. A movimentação acontece em dia
+    útil: o vencimento é levado ao próximo dia útil e somado aos dias úteis
+    de compensação da forma de pagamento.
+
+    Args:
+        vencimentos: Array ``datetime64[D]`` de vencimentos
+        dias_compensacao: Dias úteis de compensação de cada item
+        hoje: Data de referência
+        calendario: Calendário de dias úteis
+
+    Returns:
+        Array ``datetime64[D]`` com as datas de movimentação
+    """
+    inicio = np.maximum(np.asarray(vencimentos, dtype="datetime64[D]"), np.datetime64(hoje, "D"))
+    return calendario.adicionar_dias_uteis(inicio, np.asarray(dias_compensacao, dtype=np.int64))
+
+
+def valores_liquidos(
+    valores: np.ndarray,
+    taxa_percentual: np.ndarray,
+    taxa_fixa: np.ndarray
+) -> np.ndarray:
+    """
+    Desconta as taxas da forma de pagamento dos recebimentos.
+
+    Saídas (valores negativos) não sofrem desconto.
+
+    Args:
+        valores: Valores com sinal (entrada positiva, saída negativa)
+        taxa_percentual: Taxa percentual de cada item (0-100)
+        taxa_fixa: Taxa fixa de cada item
+
+    Returns:
+        Array com os valores líquidos
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    taxas = valores * np.asarray(taxa_percentual, dtype=np.float64) / 100 + np.asarray(taxa_fixa, dtype=np.float64)
+    return valores - np.where(valores > 0, taxas, 0.0)
+
+
+def projetar_saldos(
+    hoje: date,
+    dias: int,
+    saldos_iniciais: np.ndarray,
+    indice_conta: np.ndarray,
+    vencimentos: np.ndarray,
+    valores: np.ndarray,
+    dias_compensacao: np.ndarray,
+    taxa_percentual: np.ndarray,
+    taxa_fixa: np.ndarray,
+    calendario: Optional[CalendarioDiasUteis] = None
+) -> ProjecaoSaldos:
+    """
+    Projeta o saldo diário de cada conta nos próximos ``dias`` dias.
+
+    Os movimentos de cada (conta, dia) são somados com ``np.bincount`` sobre
+    o índice achatado e a curva de saldo é a soma acumulada por linha.
+    Itens que compensam após o horizonte são ignorados.
+
+    Args:
+        hoje: Primeiro dia da projeção
+        dias: Tamanho do horizonte em dias
+        saldos_iniciais: Saldo atual de cada conta (define a quantidade de linhas)
+        indice_conta: Linha da conta de cada item
+        vencimentos: Vencimento de cada item
+        valores: Valor com sinal de cada item
+        dias_compensacao: Dias úteis de compensação de cada item
+        taxa_percentual: Taxa percentual de cada item
+        taxa_fixa: Taxa fixa de cada item
+        calendario: Calendário de dias úteis (padrão: feriados nacionais)
+
+    Returns:
+        ProjecaoSaldos com datas, movimentos e saldos
+    """
+    if dias <= 0:
+        raise ValueError("O horizonte da projeção deve ter ao menos um dia")
+
+    saldos_iniciais = np.asarray(saldos_iniciais, dtype=np.float64)
+    contas = len(saldos_iniciais)
+    inicio = np.datetime64(hoje, "D")
+    datas = inicio + np.arange(dias)
+
+    movimentos = np.zeros(contas * dias, dtype=np.float64)
+    if len(valores):
+        calendario = calendario or calendario_nacional(hoje.year, hoje.year + dias // 365 + 1)
+        efetivas = datas_de_compensacao(vencimentos, dias_compensacao, hoje, calendario)
+        deslocamento = (efetivas - inicio).astype(np.int64)
+        no_horizonte = deslocamento < dias
+
+        posicoes = np.asarray(indice_conta, dtype=np.int64)[no_horizonte] * dias + deslocamento[no_horizonte]
+        liquidos = valores_liquidos(valores, taxa_percentual, taxa_fixa)[no_horizonte]
+        movimentos = np.bincount(posicoes, weights=liquidos, minlength=contas * dias)
+
+    movimentos = movimentos.reshape(contas, dias)
+    saldos = saldos_iniciais[:, None] + np.cumsum(movimentos, axis=1)
+    return ProjecaoSaldos(datas=datas, movimentos=movimentos, saldos=saldos)
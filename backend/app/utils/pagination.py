@@ -1,4 +1,6 @@
 """Utilitários para paginação na API."""
+import base64
+import json
 from typing import Generic, TypeVar, List, Dict, Any, Sequence, Optional
 from pydantic import BaseModel, Field
 from fastapi import Query
@@ -150,4 +152,32 @@ def paginate(items: List[Any], total: int, page: int, page_size: int) -> dict:
         "page": page,
         "page_size": page_size,
         "pages": pages
-    } 
\ No newline at end of file
+    }
+
+
+def codificar_cursor(*valores: Any) -> str:
+    """
+    Codifica a chave da última linha de uma página em um cursor opaco.
+    
+    Usado na paginação por chave (keyset): a próxima página começa depois
+    desta chave, sem OFFSET.
+    """
+    conteudo = json.dumps([str(v) for v in valores], separators=(",", ":"))
+    return base64.urlsafe_b64encode(conteudo.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str, quantidade: int) -> List[str]:
+    """
+    Decodifica um cursor gerado por ``codificar_cursor``.
+    
+    Raises:
+        ValueError: Se o cursor for inválido ou não tiver ``quantidade`` valores
+    """
+    try:
+        preenchido = cursor + "=" * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(preenchido.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Cursor inválido")
+    if not isinstance(valores, list) or len(valores) != quantidade:
+        raise ValueError("Cursor inválido")
+    return valores
@@ -0,0 +1,115 @@
+"""
+Cálculo de cronogramas de parcelamento.
+
+Gera, em uma única passada vetorizada, os vencimentos mensais (com ajuste
+para dia útil) e os valores das parcelas, com o resíduo de arredondamento
+concentrado na última parcela para que a soma feche exatamente o total.
+"""
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+from typing import List, NamedTuple, Optional, Union
+
+import numpy as np
+
+from app.utils.calendario import (
+    AJUSTE_SEGUINTE,
+    CalendarioDiasUteis,
+    calendario_nacional,
+    para_dates,
+)
+
+
+class ParcelaCalculada(NamedTuple):
+    """Parcela calculada pelo cronograma."""
+    numero: int
+    valor: Decimal
+    data_vencimento: date
+
+
+def vencimentos_mensais(
+    primeiro_vencimento: date,
+    total_parcelas: int,
+    intervalo_meses: int = 1
+) -> np.ndarray:
+    """
+    Calcula vencimentos mensais preservando o dia do primeiro vencimento.
+
+    Meses mais curtos usam o último dia do mês (ex.: 31/01 → 28/02 → 31/03),
+    sem o desvio acumulado de somar 30 dias por parcela.
+
+    Args:
+        primeiro_vencimento: Vencimento da primeira parcela
+        total_parcelas: Quantidade de parcelas
+        intervalo_meses: Meses entre parcelas
+
+    Returns:
+        Array ``datetime64[D]`` com os vencimentos (sem ajuste de dia útil)
+    """
+    meses = np.datetime64(primeiro_vencimento, "M") + np.arange(total_parcelas) * intervalo_meses
+    inicio_mes = meses.astype("datetime64[D]")
+    dias_no_mes = ((meses + 1).astype("datetime64[D]") - inicio_mes).astype(np.int64)
+    dia = np.minimum(primeiro_vencimento.day, dias_no_mes)
+    return inicio_mes + (dia - 1)
+
+
+def dividir_valor(valor_total: Union[Decimal, float, str], total_parcelas: int) -> List[Decimal]:
+    """
+    Divide um valor em parcelas de centavos inteiros.
+
+    Args:
+        valor_total: Valor a dividir
+        total_parcelas: Quantidade de parcelas
+
+    Returns:
+        Valores das parcelas; a última absorve o resíduo do arredondamento
+    """
+    centavos = int((Decimal(str(valor_total)) * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+    base, residuo = divmod(centavos, total_parcelas)
+    valores = np.full(total_parcelas, base, dtype=np.int64)
+    valores[-1] += residuo
+    return [Decimal(int(v)).scaleb(-2) for v in valores]
+
+
+def gerar_cronograma(
+    valor_total: Union[Decimal, float, str],
+    total_parcelas: int,
+    primeiro_vencimento: date,
+    intervalo_meses: int = 1,
+    convencao: str = AJUSTE_SEGUINTE,
+    calendario: Optional[CalendarioDiasUteis] = None
+) -> List[ParcelaCalculada]:
+    """
+    Gera o cronograma completo de parcelas.
+
+    Args:
+        valor_total: Valor total a parcelar
+        total_parcelas: Quantidade de parcelas
+        primeiro_vencimento: Vencimento da primeira parcela
+        intervalo_meses: Meses entre parcelas
+        convencao: Ajuste de vencimentos em dia não útil (ver ``app.utils.calendario``)
+        calendario: Calendário de dias úteis; por padrão, o nacional
+
+    Returns:
+        Lista de parcelas (número, valor, vencimento)
+
+    Raises:
+        ValueError: Se a quantidade de parcelas ou o intervalo forem inválidos
+    """
+    if total_parcelas <= 0:
+        raise ValueError("O número de parcelas deve ser maior que zero")
+    if intervalo_meses <= 0:
+        raise ValueError("O intervalo entre parcelas deve ser maior que zero")
+
+    datas = vencimentos_mensais(primeiro_vencimento, total_parcelas, intervalo_meses)
+
+    if calendario is None:
+        ultimo_ano = int(datas[-1].astype("datetime64[Y]").astype(int)) + 1970
+        calendario = calendario_nacional(primeiro_vencimento.year, ultimo_ano + 1)
+    datas = calendario.ajustar(datas, convencao)
+
+    valores = dividir_valor(valor_total, total_parcelas)
+
+    return [
+        ParcelaCalculada(numero=i, valor=valor, data_vencimento=vencimento)
+        for i, (valor, vencimento) in enumerate(zip(valores, para_dates(datas)), start=1)
+    ]
@@ -0,0 +1,80 @@
+"""
+Filtros de período como intervalos semiabertos ``[inicio, fim)``.
+
+Predicados como ``extract('month', coluna) == m`` ou ``coluna::date = d``
+aplicam uma função à coluna e impedem o uso do índice B-tree. Aqui todo
+período vira ``coluna >= inicio AND coluna < fim``, com a coluna intacta.
+
+O fim exclusivo também serve a colunas ``DateTime``: ``created_at < 2026-10-19``
+inclui o dia 18 inteiro, o que ``created_at <= 2026-10-18`` não faz.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import List, NamedTuple, Optional, Union
+
+from sqlalchemy import and_, true
+from sqlalchemy.sql.elements import ColumnElement
+
+
+Data = Union[date, datetime]
+
+
+class Periodo(NamedTuple):
+    """Intervalo semiaberto: ``inicio`` incluído, ``fim`` excluído (None = aberto)."""
+    inicio: Optional[Data]
+    fim: Optional[Data]
+
+
+def somar_meses(data: date, meses: int) -> date:
+    """Primeiro dia do mês ``meses`` meses após o mês de ``data``."""
+    indice = data.year * 12 + data.month - 1 + meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def periodo_dia(dia: date) -> Periodo:
+    """O dia inteiro."""
+    return Periodo(dia, dia + timedelta(days=1))
+
+
+def periodo_mes(ano: int, mes: int) -> Periodo:
+    """O mês inteiro."""
+    inicio = date(ano, mes, 1)
+    return Periodo(inicio, somar_meses(inicio, 1))
+
+
+def periodo_ano(ano: int) -> Periodo:
+    """O ano inteiro."""
+    return Periodo(date(ano, 1, 1), date(ano + 1, 1, 1))
+
+
+def periodo_entre(data_inicio: Optional[Data] = None, data_fim: Optional[Data] = None) -> Periodo:
+    """
+    Período a partir de limites inclusivos, como chegam dos filtros da API.
+
+    Um ``data_fim`` do tipo ``date`` (ou ``datetime`` à meia-noite) inclui o
+    dia todo: o fim passa a ser o dia seguinte. Um ``datetime`` com horário
+    vira ``fim + 1 µs``, a resolução do ``timestamp`` do PostgreSQL.
+    """
+    if isinstance(data_fim, datetime):
+        if data_fim.time() == time.min:
+            data_fim = data_fim.date()
+        else:
+            return Periodo(data_inicio, data_fim + timedelta(microseconds=1))
+    if data_fim is not None:
+        data_fim = data_fim + timedelta(days=1)
+    return Periodo(data_inicio, data_fim)
+
+
+def condicoes_periodo(coluna: ColumnElement, periodo: Periodo) -> List[ColumnElement]:
+    """Condições ``coluna >= inicio`` e ``coluna < fim`` (só as dos limites informados)."""
+    condicoes = []
+    if periodo.inicio is not None:
+        condicoes.append(coluna >= periodo.inicio)
+    if periodo.fim is not None:
+        condicoes.append(coluna < periodo.fim)
+    return condicoes
+
+
+def no_periodo(coluna: ColumnElement, periodo: Periodo) -> ColumnElement:
+    """Filtro único para ``where()``; sem limites, não restringe nada."""
+    condicoes = condicoes_periodo(coluna, periodo)
+    return and_(*condicoes) if condicoes else true()
@@ -4,7 +4,7 @@ Módulo para verificação de permissões no sistema CCONTROL-M.
 Este módulo contém funções para verificar se um usuário tem permissão para acessar
 determinados recursos ou realizar determinadas ações no sistema.
 """
-from typing import Any, Dict, Callable, Optional, List
+from typing import Any, Dict, Callable, Mapping, Optional, List
 from uuid import UUID
 from fastapi import HTTPException, status, Depends
 from functools import wraps
@@ -15,6 +15,12 @@ import logging
 # Remover importações que causam dependências circulares
 from app.database import get_async_session
 from app.schemas.usuario import Usuario
+from app.core.permissoes_cache import (
+    VERSAO_CLAIMS,
+    compilar_permissoes,
+    pares_de_permissoes,
+    permissoes_cache,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +28,13 @@ logger = logging.getLogger(__name__)
 DISABLE_PERMISSION_CHECK = True
 
 
+def _campo(user: Any, nome: str, padrao: Any = None) -> Any:
+    """Lê um campo do usuário, seja objeto ou dicionário (claims do token)."""
+    if isinstance(user, Mapping):
+        return user.get(nome, padrao)
+    return getattr(user, nome, padrao)
+
+
 def verify_permission(
     user: Any, 
     permission: str, 
@@ -30,6 +43,10 @@ def verify_permission(
     """
     Verifica se o usuário tem a permissão especificada.
     
+    A verificação usa o snapshot compilado do usuário na empresa (teste de
+    bit, sem ida ao banco). Sem snapshot em memória, ele é compilado uma vez
+    a partir de ``user.permissoes`` (claims do token ou lista de permissões).
+    
     Args:
         user: Usuário a ser verificado
         permission: Permissão requerida no formato "module:action"
@@ -39,41 +56,36 @@ def verify_permission(
         True se tem permissão, False caso contrário
     """
     # Admins sempre têm acesso a tudo
-    if hasattr(user, 'is_admin') and user.is_admin:
+    if _campo(user, 'is_admin') or _campo(user, 'tipo_usuario') == 'ADMIN':
         return True
         
     # Verificar acesso à empresa
-    if id_empresa and not hasattr(user, 'empresas'):
-        return False
-        
-    if id_empresa and hasattr(user, 'empresas') and user.empresas and id_empresa not in [getattr(emp, 'id_empresa', None) for emp in user.empresas]:
-        return False
+    empresa_usuario = _campo(user, 'id_empresa')
+    empresas = _campo(user, 'empresas')
+    if id_empresa:
+        if empresas:
+            if str(id_empresa) not in [str(_campo(emp, 'id_empresa')) for emp in empresas]:
+                return False
+        elif empresa_usuario is None or str(empresa_usuario) != str(id_empresa):
+            return False
     
     # Validar permissão específica
     module, action = permission.split(":") if ":" in permission else (permission, None)
     
-    # Se o usuário não tem permissões definidas, retorna False
-    if not hasattr(user, 'permissoes') or not user.permissoes:
-        return False
-        
-    # Verificar permissões do usuário
-    for perm in user.permissoes:
-        # Verificar permissão para o módulo e ação específica
-        if hasattr(perm, 'modulo') and perm.modulo == module:
-            if action is None:  # Se apenas o módulo foi especificado
-                return True
-            
-            # Verificar ação específica
-            if action == "visualizar" and hasattr(perm, 'pode_visualizar') and perm.pode_visualizar:
-                return True
-            if action == "criar" and hasattr(perm, 'pode_criar') and perm.pode_criar:
-                return True
-            if action == "editar" and hasattr(perm, 'pode_editar') and perm.pode_editar:
-                return True
-            if action == "excluir" and hasattr(perm, 'pode_excluir') and perm.pode_excluir:
-                return True
+    id_usuario = _campo(user, 'id_usuario') or _campo(user, 'id')
+    empresa = id_empresa or empresa_usuario
+    snapshot = permissoes_cache.snapshot_local(id_usuario, empresa) if id_usuario else None
     
-    return False
+    if snapshot is None:
+        # Se o usuário não tem permissões definidas, retorna False
+        permissoes = _campo(user, 'permissoes')
+        if not permissoes:
+            return False
+        snapshot = compilar_permissoes(pares_de_permissoes(permissoes), versao=VERSAO_CLAIMS)
+        if id_usuario:
+            permissoes_cache.armazenar(id_usuario, empresa, snapshot)
+    
+    return snapshot.permite(module, action)
 
 
 def require_permission(resource: str, action: str):
@@ -114,20 +126,9 @@ def require_permission(resource: str, action: str):
                 logger.debug(f"Verificação de permissão desabilitada: {resource}:{action}")
                 return await func(*args, **kwargs)
             
-            # Obter as permissões do usuário
-            permissoes = getattr(current_user, "permissoes", [])
-            
-            # Verificar se o usuário é admin (tem todas as permissões)
-            if current_user.is_admin:
-                return await func(*args, **kwargs)
-            
-            # Verificar se o usuário tem a permissão específica
+            # Verificar se o usuário tem a permissão (admin, específica ou curinga)
             permission_key = f"{resource}:{action}"
-            if permission_key in permissoes:
-                return await func(*args, **kwargs)
-            
-            # Verificar se o usuário tem permissão wildcard para o recurso
-            if f"{resource}:*" in permissoes:
+            if verify_permission(current_user, permission_key):
                 return await func(*args, **kwargs)
             
             # Se chegou aqui, não tem permissão
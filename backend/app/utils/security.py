@@ -1,15 +1,17 @@
 """Utilitários para segurança e criptografia."""
 import secrets
-from passlib.context import CryptContext
 
-# Configuração do contexto de criptografia para senhas
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Contexto de senhas compartilhado (esquema e custos vêm das configurações)
+from app.core.password_hasher import pwd_context
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verifica se uma senha em texto simples corresponde ao hash armazenado.
     
+    Operação bloqueante; em rotas assíncronas use
+    ``app.core.password_hasher.verificar_senha_async``.
+    
     Args:
         plain_password: Senha em texto simples a verificar
         hashed_password: Hash da senha armazenada
@@ -22,13 +24,16 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """
-    Gera um hash bcrypt para a senha fornecida.
+    Gera um hash para a senha fornecida no esquema configurado.
+    
+    Operação bloqueante; em rotas assíncronas use
+    ``app.core.password_hasher.gerar_hash_senha_async``.
     
     Args:
         password: Senha em texto simples
         
     Returns:
-        str: Hash bcrypt da senha
+        str: Hash da senha
     """
     return pwd_context.hash(password)
 
@@ -14,16 +14,21 @@ async def verificar_permissao_empresa(
     id_empresa: UUID,
     current_user: Any,
     session: AsyncSession,
-    admin_only: bool = False
+    admin_only: bool = False,
+    permissao: Optional[str] = None
 ) -> dict:
     """
     Verifica se o usuário atual tem permissão para acessar dados da empresa especificada.
     
+    Todas as verificações são feitas em memória; ``permissao`` é conferida
+    no snapshot compilado do usuário, sem consulta ao banco.
+    
     Args:
         id_empresa: ID da empresa a ser verificada
         current_user: Usuário atual
         session: Sessão de banco de dados
         admin_only: Se True, apenas admins podem acessar
+        permissao: Permissão adicional exigida, no formato "recurso:acao"
         
     Returns:
         dict com o ID da empresa se o usuário tiver permissão
@@ -58,5 +63,15 @@ async def verificar_permissao_empresa(
             detail="Esta operação requer privilégios de administrador"
         )
     
+    # Importação local: app.utils.permissions depende de app.database
+    from app.utils.permissions import verify_permission
+    
+    if permissao and not is_admin and not verify_permission(current_user, permissao, id_empresa):
+        logger.warning(f"Usuário sem a permissão {permissao} na empresa {id_empresa}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Você não tem permissão para realizar esta operação"
+        )
+    
     # Sucesso - retorna ID da empresa como string para compatibilidade
     return {"id_empresa": str(id_empresa)} 
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""Adicionar busca full-text e trigram para produtos, clientes e fornecedores
+
+Revision ID: busca_fulltext_trigram
+Revises: add_missing_tables_migration
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import text
+
+
+# revision identifiers, used by Alembic.
+revision = 'busca_fulltext_trigram'
+down_revision = 'add_missing_tables_migration'
+branch_labels = None
+depends_on = None
+
+
+# Expressões que alimentam a coluna busca_vector de cada tabela.
+# Os pesos seguem a relevância para type-ahead: nome/códigos (A),
+# descrição (B) e contatos (C).
+VETORES_BUSCA = {
+    'produtos': (
+        "setweight(to_tsvector('portuguese_unaccent', coalesce(nome, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(codigo, '') || ' ' || coalesce(codigo_barras, '')), 'A') || "
+        "setweight(to_tsvector('portuguese_unaccent', coalesce(descricao, '')), 'B')"
+    ),
+    'clientes': (
+        "setweight(to_tsvector('portuguese_unaccent', coalesce(nome, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(documento, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(email, '') || ' ' || coalesce(telefone, '')), 'C')"
+    ),
+    'fornecedores': (
+        "setweight(to_tsvector('portuguese_unaccent', coalesce(nome, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(cnpj, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(email, '') || ' ' || coalesce(telefone, '')), 'C')"
+    ),
+}
+
+# Colunas de código que recebem índice trigram para buscas parciais
+COLUNAS_CODIGO = {
+    'produtos': ['codigo', 'codigo_barras'],
+    'clientes': ['documento'],
+    'fornecedores': ['cnpj'],
+}
+
+
+def upgrade() -> None:
+    # ### Extensões e configuração de busca sem acentos ###
+    op.execute(text("CREATE EXTENSION IF NOT EXISTS unaccent"))
+    op.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+    # unaccent() é STABLE; o wrapper IMMUTABLE permite usá-lo em índices
+    op.execute(text("""
+        CREATE OR REPLACE FUNCTION f_unaccent(text)
+        RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    """))
+
+    op.execute(text("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'portuguese_unaccent') THEN
+                CREATE TEXT SEARCH CONFIGURATION portuguese_unaccent (COPY = portuguese);
+                ALTER TEXT SEARCH CONFIGURATION portuguese_unaccent
+                    ALTER MAPPING FOR hword, hword_part, word
+                    WITH unaccent, portuguese_stem;
+            END IF;
+        END
+        $$
+    """))
+
+    # ### Colunas tsvector mantidas pelo banco a cada escrita ###
+    for tabela, expressao in VETORES_BUSCA.items():
+        op.execute(text(
+            f"ALTER TABLE {tabela} ADD COLUMN IF NOT EXISTS busca_vector tsvector "
+            f"GENERATED ALWAYS AS ({expressao}) STORED"
+        ))
+        op.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{tabela}_busca_vector "
+            f"ON {tabela} USING gin (busca_vector)"
+        ))
+        # Trigram sobre o nome sem acentos: busca aproximada e ILIKE '%termo%'
+        op.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{tabela}_nome_trgm "
+            f"ON {tabela} USING gin (f_unaccent(lower(nome)) gin_trgm_ops)"
+        ))
+        op.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{tabela}_nome_ilike_trgm "
+            f"ON {tabela} USING gin (nome gin_trgm_ops)"
+        ))
+        for coluna in COLUNAS_CODIGO[tabela]:
+            op.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{tabela}_{coluna}_trgm "
+                f"ON {tabela} USING gin ({coluna} gin_trgm_ops)"
+            ))
+
+
+def downgrade() -> None:
+    for tabela in VETORES_BUSCA:
+        for coluna in COLUNAS_CODIGO[tabela]:
+            op.execute(text(f"DROP INDEX IF EXISTS ix_{tabela}_{coluna}_trgm"))
+        op.execute(text(f"DROP INDEX IF EXISTS ix_{tabela}_nome_ilike_trgm"))
+        op.execute(text(f"DROP INDEX IF EXISTS ix_{tabela}_nome_trgm"))
+        op.execute(text(f"DROP INDEX IF EXISTS ix_{tabela}_busca_vector"))
+        op.execute(text(f"ALTER TABLE {tabela} DROP COLUMN IF EXISTS busca_vector"))
+
+    op.execute(text("DROP TEXT SEARCH CONFIGURATION IF EXISTS portuguese_unaccent"))
+    op.execute(text("DROP FUNCTION IF EXISTS f_unaccent(text)"))
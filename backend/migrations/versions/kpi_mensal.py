@@ -0,0 +1,130 @@
+"""Criar indicadores mensais consolidados e a fila de meses pendentes
+
+Revision ID: kpi_mensal
+Revises: lancamentos_conciliacao
+Create Date: 2026-10-19 00:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import text
+
+
+# revision identifiers, used by Alembic.
+revision = 'kpi_mensal'
+down_revision = 'lancamentos_conciliacao'
+branch_labels = None
+depends_on = None
+
+
+# Tabela -> coluna de data que define o mês afetado (None: mês corrente)
+TABELAS_MONITORADAS = {
+    'lancamentos': 'data_lancamento',
+    'vendas': 'data_venda',
+    'clientes': None,
+    'fornecedores': None,
+}
+
+
+def upgrade():
+    """Criar kpi_mensal, kpi_mensal_pendente e os gatilhos de marcação."""
+    bind = op.get_bind()
+
+    if not bind.dialect.has_table(bind, 'kpi_mensal'):
+        op.create_table(
+            'kpi_mensal',
+            sa.Column('id_empresa', UUID(as_uuid=True), nullable=False),
+            sa.Column('mes', sa.Date(), nullable=False),
+            sa.Column('receitas', sa.Numeric(18, 2), server_default='0', nullable=False),
+            sa.Column('despesas', sa.Numeric(18, 2), server_default='0', nullable=False),
+            sa.Column('saldo', sa.Numeric(18, 2), server_default='0', nullable=False),
+            sa.Column('quantidade_lancamentos', sa.Integer(), server_default='0', nullable=False),
+            sa.Column('quantidade_vendas', sa.Integer(), server_default='0', nullable=False),
+            sa.Column('total_vendas', sa.Numeric(18, 2), server_default='0', nullable=False),
+            sa.Column('ticket_medio_vendas', sa.Numeric(18, 2), server_default='0', nullable=False),
+            sa.Column('quantidade_clientes', sa.Integer(), server_default='0', nullable=False),
+            sa.Column('quantidade_fornecedores', sa.Integer(), server_default='0', nullable=False),
+            sa.Column('atualizado_em', sa.DateTime(), server_default=sa.text('NOW()'), nullable=False),
+            sa.PrimaryKeyConstraint('id_empresa', 'mes', name='pk_kpi_mensal'),
+            sa.ForeignKeyConstraint(['id_empresa'], ['empresas.id_empresa'], name='fk_kpi_mensal_empresa', ondelete='CASCADE')
+        )
+
+    if not bind.dialect.has_table(bind, 'kpi_mensal_pendente'):
+        op.create_table(
+            'kpi_mensal_pendente',
+            sa.Column('id_empresa', UUID(as_uuid=True), nullable=False),
+            sa.Column('mes', sa.Date(), nullable=False),
+            sa.Column('marcado_em', sa.DateTime(timezone=True), server_default=sa.text('clock_timestamp()'), nullable=False),
+            sa.PrimaryKeyConstraint('id_empresa', 'mes', name='pk_kpi_mensal_pendente')
+        )
+        op.create_index('ix_kpi_mensal_pendente_marcado_em', 'kpi_mensal_pendente', ['marcado_em'], unique=False)
+
+    # O recálculo de um mês filtra por intervalo de datas da empresa
+    op.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_lancamentos_empresa_data "
+        "ON lancamentos (id_empresa, data_lancamento)"
+    ))
+    op.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_vendas_empresa_data "
+        "ON vendas (id_empresa, data_venda)"
+    ))
+
+    # Marca o mês da linha antiga e o da nova: uma alteração de data ou
+    # uma exclusão também invalidam o mês de origem
+    op.execute(text("""
+        CREATE OR REPLACE FUNCTION marcar_kpi_mensal() RETURNS trigger AS $$
+        DECLARE
+            coluna text := TG_ARGV[0];
+            linha jsonb;
+        BEGIN
+            FOREACH linha IN ARRAY ARRAY[
+                CASE WHEN TG_OP <> 'INSERT' THEN to_jsonb(OLD) END,
+                CASE WHEN TG_OP <> 'DELETE' THEN to_jsonb(NEW) END
+            ] LOOP
+                CONTINUE WHEN linha IS NULL;
+                INSERT INTO kpi_mensal_pendente (id_empresa, mes, marcado_em)
+                VALUES (
+                    CAST(linha->>'id_empresa' AS uuid),
+                    CAST(date_trunc('month', COALESCE(CAST(linha->>coluna AS date), current_date)) AS date),
+                    clock_timestamp()
+                )
+                ON CONFLICT (id_empresa, mes) DO UPDATE SET marcado_em = EXCLUDED.marcado_em;
+            END LOOP;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """))
+
+    for tabela, coluna in TABELAS_MONITORADAS.items():
+        eventos = 'INSERT OR UPDATE OR DELETE' if coluna else 'INSERT OR DELETE'
+        argumento = f"'{coluna}'" if coluna else ''
+        op.execute(text(f"DROP TRIGGER IF EXISTS trg_kpi_mensal_{tabela} ON {tabela}"))
+        op.execute(text(
+            f"CREATE TRIGGER trg_kpi_mensal_{tabela} AFTER {eventos} ON {tabela} "
+            f"FOR EACH ROW EXECUTE FUNCTION marcar_kpi_mensal({argumento})"
+        ))
+
+    # Carga inicial: todos os meses com movimento ficam pendentes e a
+    # tarefa agendada os calcula em lotes
+    op.execute(text("""
+        INSERT INTO kpi_mensal_pendente (id_empresa, mes)
+        SELECT id_empresa, CAST(date_trunc('month', data_lancamento) AS date) FROM lancamentos
+        UNION
+        SELECT id_empresa, CAST(date_trunc('month', data_venda) AS date) FROM vendas
+        UNION
+        SELECT id_empresa, CAST(date_trunc('month', current_date) AS date) FROM empresas
+        ON CONFLICT DO NOTHING
+    """))
+
+
+def downgrade():
+    """Remover gatilhos, kpi_mensal_pendente e kpi_mensal."""
+    for tabela in TABELAS_MONITORADAS:
+        op.execute(text(f"DROP TRIGGER IF EXISTS trg_kpi_mensal_{tabela} ON {tabela}"))
+    op.execute(text("DROP FUNCTION IF EXISTS marcar_kpi_mensal()"))
+    op.execute(text("DROP INDEX IF EXISTS ix_vendas_empresa_data"))
+    op.execute(text("DROP INDEX IF EXISTS ix_lancamentos_empresa_data"))
+    op.drop_index('ix_kpi_mensal_pendente_marcado_em', table_name='kpi_mensal_pendente')
+    op.drop_table('kpi_mensal_pendente')
+    op.drop_table('kpi_mensal')
@@ -0,0 +1,30 @@
+"""Índice parcial dos lançamentos pendentes de conciliação
+
+Revision ID: lancamentos_conciliacao
+Revises: movimentacoes_conta
+Create Date: 2026-10-18 23:30:00.000000
+
+"""
+from alembic import op
+from sqlalchemy.sql import text
+
+
+# revision identifiers, used by Alembic.
+revision = 'lancamentos_conciliacao'
+down_revision = 'movimentacoes_conta'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Conciliação busca os pendentes da conta por período; os conciliados,
+    # que são a maioria, ficam fora do índice
+    op.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_lancamentos_pendentes_conciliacao "
+        "ON lancamentos (id_conta, (COALESCE(data_pagamento, data_vencimento))) "
+        "WHERE conciliado = false AND status <> 'cancelado'"
+    ))
+
+
+def downgrade() -> None:
+    op.execute(text("DROP INDEX IF EXISTS ix_lancamentos_pendentes_conciliacao"))
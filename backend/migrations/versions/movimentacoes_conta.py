@@ -0,0 +1,58 @@
+"""Criar diário de movimentações de contas bancárias
+
+Revision ID: movimentacoes_conta
+Revises: particionar_logs_auditoria
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision = 'movimentacoes_conta'
+down_revision = 'particionar_logs_auditoria'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Criar tabela movimentacoes_conta com o saldo de abertura de cada conta."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"')
+
+    if not op.get_bind().dialect.has_table(op.get_bind(), 'movimentacoes_conta'):
+        op.create_table(
+            'movimentacoes_conta',
+            sa.Column('id_movimentacao', UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+            sa.Column('id_empresa', UUID(as_uuid=True), nullable=False),
+            sa.Column('id_conta', UUID(as_uuid=True), nullable=False),
+            sa.Column('id_lancamento', UUID(as_uuid=True), nullable=True),
+            sa.Column('tipo', sa.String(20), nullable=False),
+            sa.Column('valor', sa.Float(), nullable=False),
+            sa.Column('saldo_resultante', sa.Float(), nullable=False),
+            sa.Column('observacao', sa.String(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=False),
+            sa.ForeignKeyConstraint(['id_empresa'], ['empresas.id_empresa'], name='fk_movimentacao_conta_empresa', ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['id_conta'], ['contas_bancarias.id_conta'], name='fk_movimentacao_conta_conta', ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['id_lancamento'], ['lancamentos.id_lancamento'], name='fk_movimentacao_conta_lancamento', ondelete='SET NULL')
+        )
+
+        op.create_index('ix_movimentacoes_conta_conta_data', 'movimentacoes_conta', ['id_conta', 'created_at'], unique=False)
+        op.create_index('ix_movimentacoes_conta_empresa_data', 'movimentacoes_conta', ['id_empresa', 'created_at'], unique=False)
+
+    # Saldo de abertura: a diferença acumulada antes do diário existir, para
+    # que saldo_atual = saldo_inicial + soma(valor) valha desde já
+    op.execute("""
+        INSERT INTO movimentacoes_conta (id_empresa, id_conta, tipo, valor, saldo_resultante, observacao)
+        SELECT id_empresa, id_conta, 'ajuste', saldo_atual - saldo_inicial, saldo_atual, 'Saldo de abertura do diário'
+        FROM contas_bancarias
+        WHERE saldo_atual <> saldo_inicial
+    """)
+
+
+def downgrade():
+    """Remover tabela movimentacoes_conta."""
+    op.drop_index('ix_movimentacoes_conta_empresa_data', table_name='movimentacoes_conta')
+    op.drop_index('ix_movimentacoes_conta_conta_data', table_name='movimentacoes_conta')
+    op.drop_table('movimentacoes_conta')
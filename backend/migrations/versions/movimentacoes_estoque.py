@@ -0,0 +1,56 @@
+"""Criar tabela de movimentações de estoque
+
+Revision ID: movimentacoes_estoque
+Revises: busca_fulltext_trigram
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision = 'movimentacoes_estoque'
+down_revision = 'busca_fulltext_trigram'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Criar tabela movimentacoes_estoque e restrição de estoque não negativo."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"')
+
+    if not op.get_bind().dialect.has_table(op.get_bind(), 'movimentacoes_estoque'):
+        op.create_table(
+            'movimentacoes_estoque',
+            sa.Column('id_movimentacao', UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+            sa.Column('id_empresa', UUID(as_uuid=True), nullable=False),
+            sa.Column('id_produto', UUID(as_uuid=True), nullable=False),
+            sa.Column('id_venda', UUID(as_uuid=True), nullable=True),
+            sa.Column('tipo', sa.String(20), nullable=False),
+            sa.Column('quantidade', sa.Float(), nullable=False),
+            sa.Column('estoque_resultante', sa.Float(), nullable=False),
+            sa.Column('observacao', sa.String(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=False),
+            sa.ForeignKeyConstraint(['id_empresa'], ['empresas.id_empresa'], name='fk_movimentacao_estoque_empresa', ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['id_produto'], ['produtos.id_produto'], name='fk_movimentacao_estoque_produto', ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['id_venda'], ['vendas.id_venda'], name='fk_movimentacao_estoque_venda', ondelete='SET NULL')
+        )
+
+        op.create_index('ix_movimentacoes_estoque_produto_data', 'movimentacoes_estoque', ['id_produto', 'created_at'], unique=False)
+        op.create_index('ix_movimentacoes_estoque_empresa_data', 'movimentacoes_estoque', ['id_empresa', 'created_at'], unique=False)
+
+    # Garantia final no banco: nenhuma baixa concorrente deixa o estoque negativo
+    op.execute("""
+        ALTER TABLE produtos
+        ADD CONSTRAINT ck_produtos_estoque_nao_negativo CHECK (estoque_atual >= 0) NOT VALID
+    """)
+
+
+def downgrade():
+    """Remover tabela movimentacoes_estoque e a restrição de estoque."""
+    op.execute("ALTER TABLE produtos DROP CONSTRAINT IF EXISTS ck_produtos_estoque_nao_negativo")
+    op.drop_index('ix_movimentacoes_estoque_empresa_data', table_name='movimentacoes_estoque')
+    op.drop_index('ix_movimentacoes_estoque_produto_data', table_name='movimentacoes_estoque')
+    op.drop_table('movimentacoes_estoque')
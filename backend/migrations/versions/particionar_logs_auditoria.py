@@ -0,0 +1,144 @@
+"""Particionar logs_sistema e auditoria por mês
+
+Revision ID: particionar_logs_auditoria
+Revises: usuarios_email_lower
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from datetime import date
+
+from alembic import op
+from sqlalchemy.sql import text
+
+
+# revision identifiers, used by Alembic.
+revision = 'particionar_logs_auditoria'
+down_revision = 'usuarios_email_lower'
+branch_labels = None
+depends_on = None
+
+
+# tabela -> (coluna de partição, coluna da chave primária, índices)
+TABELAS = {
+    'logs_sistema': ('created_at', 'id_log', {
+        'ix_logs_sistema_created_at': '(created_at)',
+        'ix_logs_sistema_empresa_created_at': '(id_empresa, created_at)',
+        'ix_logs_sistema_id_usuario': '(id_usuario)',
+    }),
+    'auditoria': ('timestamp', 'id', {
+        'ix_auditoria_timestamp': '("timestamp")',
+        'ix_auditoria_empresa_timestamp': '(empresa_id, "timestamp")',
+        'ix_auditoria_entidade': '(entity_type, entity_id)',
+    }),
+}
+
+# Meses futuros criados já na migração
+MESES_A_FRENTE = 3
+
+FUNCAO_CRIAR_PARTICOES = """
+    CREATE OR REPLACE FUNCTION criar_particoes_mensais(p_tabela text, p_inicio date, p_meses int)
+    RETURNS int
+    LANGUAGE plpgsql
+    AS $$
+    DECLARE
+        v_mes date;
+        v_nome text;
+        v_criadas int := 0;
+    BEGIN
+        FOR i IN 0 .. p_meses - 1 LOOP
+            v_mes := (date_trunc('month', p_inicio) + make_interval(months => i))::date;
+            v_nome := format('%s_p%s', p_tabela, to_char(v_mes, 'YYYYMM'));
+            IF to_regclass(v_nome) IS NULL THEN
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                    v_nome, p_tabela, v_mes, (v_mes + interval '1 month')::date
+                );
+                v_criadas := v_criadas + 1;
+            END IF;
+        END LOOP;
+        RETURN v_criadas;
+    END
+    $$
+"""
+
+
+def _particionada(conn, tabela: str) -> bool:
+    return conn.execute(
+        text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:tabela)"),
+        {"tabela": tabela}
+    ).scalar() is True
+
+
+def _chaves_estrangeiras(conn, tabela: str) -> list:
+    return conn.execute(text("""
+        SELECT conname, pg_get_constraintdef(oid) AS definicao
+        FROM pg_constraint
+        WHERE conrelid = to_regclass(:tabela) AND contype = 'f'
+    """), {"tabela": tabela}).all()
+
+
+def _particionar(conn, tabela: str, coluna: str, pk: str, indices: dict) -> None:
+    legado = f"{tabela}_legado"
+    op.execute(text(f'ALTER TABLE {tabela} RENAME TO {legado}'))
+
+    op.execute(text(f"""
+        CREATE TABLE {tabela} (LIKE {legado} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+        PARTITION BY RANGE ("{coluna}")
+    """))
+    # A chave primária de uma tabela particionada precisa conter a coluna de partição
+    op.execute(text(f'ALTER TABLE {tabela} ADD CONSTRAINT {tabela}_part_pkey PRIMARY KEY ({pk}, "{coluna}")'))
+
+    # Chaves estrangeiras da tabela original
+    fks = _chaves_estrangeiras(conn, legado)
+
+    # Partições do mês mais antigo com dados até alguns meses à frente
+    inicio = conn.execute(text(
+        f'SELECT date_trunc(\'month\', coalesce(min("{coluna}"), now()))::date FROM {legado}'
+    )).scalar()
+    hoje = date.today()
+    meses = (hoje.year - inicio.year) * 12 + hoje.month - inicio.month + MESES_A_FRENTE + 1
+    op.execute(text("SELECT criar_particoes_mensais(:tabela, :inicio, :meses)").bindparams(
+        tabela=tabela, inicio=inicio, meses=meses
+    ))
+    op.execute(text(f'CREATE TABLE IF NOT EXISTS {tabela}_default PARTITION OF {tabela} DEFAULT'))
+
+    op.execute(text(f'INSERT INTO {tabela} SELECT * FROM {legado}'))
+    op.execute(text(f'DROP TABLE {legado}'))
+
+    for fk in fks:
+        op.execute(text(f'ALTER TABLE {tabela} ADD CONSTRAINT {fk.conname} {fk.definicao}'))
+    for nome, colunas in indices.items():
+        op.execute(text(f'CREATE INDEX IF NOT EXISTS {nome} ON {tabela} {colunas}'))
+
+
+def _desparticionar(conn, tabela: str, pk: str, indices: dict) -> None:
+    particionada = f"{tabela}_particionada"
+    op.execute(text(f'ALTER TABLE {tabela} RENAME TO {particionada}'))
+    fks = _chaves_estrangeiras(conn, particionada)
+    op.execute(text(f'CREATE TABLE {tabela} (LIKE {particionada} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+    op.execute(text(f'INSERT INTO {tabela} SELECT * FROM {particionada}'))
+    op.execute(text(f'DROP TABLE {particionada} CASCADE'))
+    op.execute(text(f'ALTER TABLE {tabela} ADD PRIMARY KEY ({pk})'))
+    for fk in fks:
+        op.execute(text(f'ALTER TABLE {tabela} ADD CONSTRAINT {fk.conname} {fk.definicao}'))
+    for nome, colunas in indices.items():
+        op.execute(text(f'CREATE INDEX IF NOT EXISTS {nome} ON {tabela} {colunas}'))
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    op.execute(text(FUNCAO_CRIAR_PARTICOES))
+
+    for tabela, (coluna, pk, indices) in TABELAS.items():
+        if not conn.dialect.has_table(conn, tabela) or _particionada(conn, tabela):
+            continue
+        _particionar(conn, tabela, coluna, pk, indices)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for tabela, (coluna, pk, indices) in TABELAS.items():
+        if conn.dialect.has_table(conn, tabela) and _particionada(conn, tabela):
+            _desparticionar(conn, tabela, pk, indices)
+
+    op.execute(text("DROP FUNCTION IF EXISTS criar_particoes_mensais(text, date, int)"))
@@ -0,0 +1,34 @@
+"""Índice case-insensitive para o email de login
+
+Revision ID: usuarios_email_lower
+Revises: movimentacoes_estoque
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy.sql import text
+
+
+# revision identifiers, used by Alembic.
+revision = 'usuarios_email_lower'
+down_revision = 'movimentacoes_estoque'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Login busca por lower(email)
+    op.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_usuarios_email_lower ON usuarios (lower(email))"
+    ))
+
+    # Claims de permissão do token: permissões do usuário na empresa
+    op.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_permissoes_usuario_empresa "
+        "ON permissoes (id_usuario, id_empresa)"
+    ))
+
+
+def downgrade() -> None:
+    op.execute(text("DROP INDEX IF EXISTS ix_permissoes_usuario_empresa"))
+    op.execute(text("DROP INDEX IF EXISTS ix_usuarios_email_lower"))
@@ -0,0 +1,80 @@
+"""
+Ida e volta de backup/restauração contra um PostgreSQL local.
+
+Requer ``pg_dump``/``pg_restore`` no PATH, as credenciais ``POSTGRES_*`` de
+um servidor local e ``BACKUP_RESTORE_TEST=1`` (os bancos de teste são
+criados e removidos pelo próprio teste).
+"""
+import os
+import shutil
+import pytest
+
+pytest.importorskip("aioboto3")
+psycopg2 = pytest.importorskip("psycopg2")
+
+from app.core.backup import BackupManager
+from app.core.config import settings
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(
+        os.getenv("BACKUP_RESTORE_TEST") != "1" or not shutil.which("pg_dump") or not shutil.which("pg_restore"),
+        reason="Requer BACKUP_RESTORE_TEST=1, pg_dump e pg_restore"
+    ),
+]
+
+ORIGEM = "ccontrol_backup_origem"
+DESTINO = "ccontrol_backup_destino"
+
+
+def _conectar(banco: str):
+    conexao = psycopg2.connect(
+        host=settings.POSTGRES_SERVER,
+        port=settings.POSTGRES_PORT,
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        dbname=banco
+    )
+    conexao.autocommit = True
+    return conexao
+
+
+@pytest.fixture
+def bancos():
+    with _conectar("postgres") as admin, admin.cursor() as cursor:
+        for banco in (ORIGEM, DESTINO):
+            cursor.execute(f"DROP DATABASE IF EXISTS {banco}")
+            cursor.execute(f"CREATE DATABASE {banco}")
+
+    with _conectar(ORIGEM) as conexao, conexao.cursor() as cursor:
+        cursor.execute("CREATE TABLE lancamentos_teste (id serial PRIMARY KEY, valor numeric(12, 2), descricao text)")
+        cursor.execute("""
+            INSERT INTO lancamentos_teste (valor, descricao)
+            SELECT g * 1.5, md5(g::text) FROM generate_series(1, 20000) g
+        """)
+
+    yield
+
+    with _conectar("postgres") as admin, admin.cursor() as cursor:
+        for banco in (ORIGEM, DESTINO):
+            cursor.execute(f"DROP DATABASE IF EXISTS {banco}")
+
+
+def _resumo(banco: str):
+    with _conectar(banco) as conexao, conexao.cursor() as cursor:
+        cursor.execute("SELECT count(*), sum(valor), md5(string_agg(descricao, '' ORDER BY id)) FROM lancamentos_teste")
+        return cursor.fetchone()
+
+
+async def test_backup_e_restauracao_do_banco(bancos, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "POSTGRES_DB", ORIGEM)
+    manager = BackupManager(backup_dir=str(tmp_path), alert_on_failure=False)
+
+    assert await manager.backup_database("backup_teste")
+    manifesto = manager.select_backup("database")
+    assert manifesto["backup_id"] == "backup_teste"
+
+    aplicado = await manager.restore(target_database=DESTINO, jobs=2)
+
+    assert aplicado == {"database": "backup_teste"}
+    assert _resumo(DESTINO) == _resumo(ORIGEM)
@@ -0,0 +1,139 @@
+"""
+Benchmark de regressão: filtros de período com ``[inicio, fim)`` usam o índice.
+
+Cria em um PostgreSQL local uma tabela no formato de ``lancamentos`` com
+5 milhões de linhas (``PERIODOS_BENCHMARK_LINHAS``) e compara, com
+``EXPLAIN (ANALYZE, BUFFERS)``, o total de um mês de uma empresa filtrado
+por ``extract()`` e pelo filtro de ``app.utils.periodos``.
+
+Requer as credenciais ``POSTGRES_*`` de um servidor local e
+``PERIODOS_BENCHMARK=1`` (o banco de teste é criado e removido pelo teste).
+"""
+import json
+import os
+import uuid
+import pytest
+
+if os.getenv("PERIODOS_BENCHMARK") != "1":
+    pytest.skip("Requer PERIODOS_BENCHMARK=1", allow_module_level=True)
+psycopg2 = pytest.importorskip("psycopg2")
+
+from sqlalchemy import Column, Date, MetaData, Numeric, String, Table, and_, extract, func, select
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql.psycopg2 import PGDialect_psycopg2
+
+from app.core.config import settings
+from app.utils.periodos import no_periodo, periodo_mes
+
+pytestmark = [pytest.mark.integration, pytest.mark.slow]
+
+BANCO = "ccontrol_benchmark_periodos"
+LINHAS = int(os.getenv("PERIODOS_BENCHMARK_LINHAS", "5000000"))
+EMPRESAS = 20
+
+lancamentos = Table(
+    "lancamentos", MetaData(),
+    Column("id_empresa", UUID(as_uuid=True)),
+    Column("tipo", String),
+    Column("valor", Numeric(12, 2)),
+    Column("data_lancamento", Date),
+)
+
+
+def _conectar(banco: str):
+    conexao = psycopg2.connect(
+        host=settings.POSTGRES_SERVER,
+        port=settings.POSTGRES_PORT,
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        dbname=banco
+    )
+    conexao.autocommit = True
+    return conexao
+
+
+@pytest.fixture(scope="module")
+def banco():
+    with _conectar("postgres") as admin, admin.cursor() as cursor:
+        cursor.execute(f"DROP DATABASE IF EXISTS {BANCO}")
+        cursor.execute(f"CREATE DATABASE {BANCO}")
+
+    with _conectar(BANCO) as conexao, conexao.cursor() as cursor:
+        cursor.execute("""
+            CREATE TABLE lancamentos (
+                id bigserial PRIMARY KEY,
+                id_empresa uuid NOT NULL,
+                tipo text NOT NULL,
+                valor numeric(12, 2) NOT NULL,
+                data_lancamento date NOT NULL
+            )
+        """)
+        # Empresas com UUIDs determinísticos e dez anos de lançamentos
+        cursor.execute("""
+            INSERT INTO lancamentos (id_empresa, tipo, valor, data_lancamento)
+            SELECT CAST(md5(CAST(g %% %(empresas)s AS text)) AS uuid),
+                   CASE WHEN g %% 3 = 0 THEN 'saida' ELSE 'entrada' END,
+                   (g %% 10000) / 100.0,
+                   DATE '2017-01-01' + (g * 7919 %% 3652)
+            FROM generate_series(1, %(linhas)s) AS g
+        """, {"empresas": EMPRESAS, "linhas": LINHAS})
+        cursor.execute("CREATE INDEX ix_lancamentos_empresa_data ON lancamentos (id_empresa, data_lancamento)")
+        cursor.execute("ANALYZE lancamentos")
+        cursor.execute("SELECT CAST(md5('1') AS uuid)")
+        id_empresa = uuid.UUID(cursor.fetchone()[0])
+
+    yield id_empresa
+
+    with _conectar("postgres") as admin, admin.cursor() as cursor:
+        cursor.execute(f"DROP DATABASE IF EXISTS {BANCO}")
+
+
+def _explicar(query) -> dict:
+    compilada = query.compile(dialect=PGDialect_psycopg2())
+    with _conectar(BANCO) as conexao, conexao.cursor() as cursor:
+        cursor.execute("SET max_parallel_workers_per_gather = 0")
+        # Uma execução para aquecer o cache e outra para medir
+        for _ in range(2):
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {compilada}", compilada.params)
+            plano = cursor.fetchone()[0]
+    return plano[0] if isinstance(plano, list) else json.loads(plano)[0]
+
+
+def _nos(plano: dict):
+    yield plano
+    for filho in plano.get("Plans", []):
+        yield from _nos(filho)
+
+
+def _total_mes(condicao_periodo, id_empresa):
+    return select(func.sum(lancamentos.c.valor)).where(
+        and_(lancamentos.c.id_empresa == id_empresa, lancamentos.c.tipo == "entrada", condicao_periodo)
+    )
+
+
+def test_filtro_de_periodo_usa_o_indice_por_data(banco):
+    id_empresa = banco
+    com_extract = _explicar(_total_mes(
+        and_(
+            extract("month", lancamentos.c.data_lancamento) == 10,
+            extract("year", lancamentos.c.data_lancamento) == 2024,
+        ),
+        id_empresa
+    ))
+    com_intervalo = _explicar(_total_mes(
+        no_periodo(lancamentos.c.data_lancamento, periodo_mes(2024, 10)),
+        id_empresa
+    ))
+
+    condicoes_indice = [no.get("Index Cond", "") for no in _nos(com_intervalo["Plan"])]
+    assert any("data_lancamento >=" in c and "data_lancamento <" in c for c in condicoes_indice)
+    # Com extract() a data só pode ser conferida linha a linha, depois do índice
+    assert not any("data_lancamento" in no.get("Index Cond", "") for no in _nos(com_extract["Plan"]))
+
+    blocos = lambda plano: plano["Plan"]["Shared Hit Blocks"] + plano["Plan"]["Shared Read Blocks"]
+    print(
+        f"\n{LINHAS} linhas: extract {com_extract['Execution Time']:.1f} ms / {blocos(com_extract)} blocos; "
+        f"intervalo {com_intervalo['Execution Time']:.1f} ms / {blocos(com_intervalo)} blocos"
+    )
+    assert blocos(com_intervalo) * 5 < blocos(com_extract)
+    assert com_intervalo["Execution Time"] < com_extract["Execution Time"]
@@ -0,0 +1,102 @@
+"""Testes para o agendador assíncrono de tarefas."""
+import asyncio
+import pytest
+from datetime import datetime
+
+from app.core.agendador import Agendador, EleicaoLider, ExpressaoCron
+
+
+class RedisFalso:
+    """Subconjunto de SET NX PX / EVAL suficiente para a eleição."""
+
+    def __init__(self):
+        self.dados = {}
+
+    async def set(self, chave, valor, nx=False, px=None):
+        if nx and chave in self.dados:
+            return None
+        self.dados[chave] = valor
+        return True
+
+    async def eval(self, script, _numkeys, chave, token, *args):
+        if self.dados.get(chave) != token:
+            return 0
+        if "del" in script:
+            del self.dados[chave]
+        return 1
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("expressao, apos, esperado", [
+    ("*/15 * * * *", datetime(2026, 10, 18, 10, 7, 30), datetime(2026, 10, 18, 10, 15)),
+    ("0 3 * * *", datetime(2026, 10, 18, 3, 0), datetime(2026, 10, 19, 3, 0)),
+    ("30 8 * * 1-5", datetime(2026, 10, 17, 9, 0), datetime(2026, 10, 19, 8, 30)),  # sábado -> segunda
+    ("@monthly", datetime(2026, 12, 15), datetime(2027, 1, 1)),
+    ("0 0 31 * *", datetime(2026, 11, 1), datetime(2026, 12, 31)),
+])
+def test_expressao_cron_proxima(expressao, apos, esperado):
+    assert ExpressaoCron(expressao).proxima(apos) == esperado
+
+
+@pytest.mark.unit
+def test_expressao_cron_invalida():
+    with pytest.raises(ValueError):
+        ExpressaoCron("61 * * * *")
+
+
+@pytest.mark.unit
+async def test_somente_o_lider_executa_tarefas_distribuidas():
+    redis = RedisFalso()
+
+    async def obter_redis():
+        return redis
+
+    lider = Agendador(EleicaoLider(obter_redis=obter_redis))
+    seguidor = Agendador(EleicaoLider(obter_redis=obter_redis))
+    assert await lider.eleicao.renovar() is True
+    assert await seguidor.eleicao.renovar() is False
+
+    execucoes = []
+
+    async def tarefa():
+        execucoes.append(1)
+
+    for agendador in (lider, seguidor):
+        agendador.registrar("backup", tarefa, cron="@daily")
+        agendador.registrar("metricas", tarefa, intervalo_segundos=60, distribuida=False)
+
+    disparos = [a.disparar(a.tarefas[nome]) for a in (lider, seguidor) for nome in ("backup", "metricas")]
+    await asyncio.gather(*(d for d in disparos if d is not None))
+
+    assert disparos[2] is None  # backup no seguidor
+    assert len(execucoes) == 3
+
+    await lider.eleicao.liberar()
+    assert await seguidor.eleicao.renovar() is True
+
+
+@pytest.mark.unit
+async def test_limite_de_concorrencia_e_historico():
+    agendador = Agendador(EleicaoLider(obter_redis=lambda: asyncio.sleep(0, result=object())))
+    await agendador.eleicao.renovar()
+    liberar = asyncio.Event()
+
+    async def lenta():
+        await liberar.wait()
+
+    def falha():
+        raise RuntimeError("sem conexão")
+
+    tarefa = agendador.registrar("lenta", lenta, intervalo_segundos=10)
+    primeira = agendador.disparar(tarefa)
+    assert agendador.disparar(tarefa) is None
+    liberar.set()
+    await primeira
+
+    com_erro = agendador.registrar("falha", falha, intervalo_segundos=10)
+    await agendador.disparar(com_erro)
+
+    assert tarefa.ignoradas == 1 and tarefa.sucessos == 1
+    assert com_erro.falhas == 1
+    assert com_erro.historico[-1]["resultado"] == "erro"
+    assert com_erro.historico[-1]["erro"] == "sem conexão"
@@ -0,0 +1,76 @@
+"""Testes para o aging de títulos em aberto."""
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+import pytest
+
+from app.services.aging_service import AgingService, _cache_aging
+
+
+class ResultadoFalso:
+    def __init__(self, linhas):
+        self.linhas = linhas
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.linhas
+
+
+class SessaoFalsa:
+    """Registra as instruções executadas e devolve linhas pré-definidas."""
+
+    def __init__(self, *respostas):
+        self.respostas = list(respostas)
+        self.execucoes = []
+
+    async def execute(self, instrucao, params=None):
+        self.execucoes.append((str(instrucao), params))
+        return ResultadoFalso(self.respostas.pop(0))
+
+
+def _contraparte(total, nome):
+    faixas = {f"faixa_{f}": 0 for f in ("a_vencer", "0_30", "31_60", "61_90", "90_mais")}
+    return {"id_contraparte": uuid4(), "nome_contraparte": nome, "quantidade": 1,
+            "total": Decimal(total), **faixas, "faixa_0_30": Decimal(total)}
+
+
+@pytest.mark.unit
+async def test_resumo_usa_uma_consulta_por_fonte_e_cache_do_dia():
+    _cache_aging.clear()
+    empresa, hoje = uuid4(), date(2026, 10, 18)
+    sessao = SessaoFalsa(
+        [{"faixa": "0_30", "quantidade": 2, "total": Decimal("150.00")},
+         {"faixa": "90_mais", "quantidade": 1, "total": Decimal("40.10")}],
+    )
+    service = AgingService(sessao)
+
+    resumo = await service.resumo(empresa, ["contas_receber"], hoje)
+    await service.resumo(empresa, ["contas_receber"], hoje)
+
+    dados = resumo["fontes"]["contas_receber"]
+    assert dados["faixas"]["0_30"] == {"quantidade": 2, "total": 150.0}
+    assert dados["faixas"]["a_vencer"] == {"quantidade": 0, "total": 0.0}
+    assert (dados["quantidade"], dados["total"]) == (3, 190.1)
+    assert len(sessao.execucoes) == 1
+    sql, params = sessao.execucoes[0]
+    assert "GROUP BY t.faixa" in sql and params == {"id_empresa": empresa, "hoje": hoje}
+
+
+@pytest.mark.unit
+async def test_contrapartes_paginadas_por_chave():
+    _cache_aging.clear()
+    primeira = [_contraparte("300.00", "A"), _contraparte("200.00", "B"), _contraparte("100.00", "C")]
+    sessao = SessaoFalsa(primeira, primeira[2:])
+    service = AgingService(sessao)
+
+    pagina = await service.por_contraparte(uuid4(), "contas_pagar", limite=2)
+    assert [item["nome"] for item in pagina["itens"]] == ["A", "B"]
+    assert sessao.execucoes[0][1]["limite"] == 3
+
+    seguinte = await service.por_contraparte(uuid4(), "contas_pagar", cursor=pagina["proximo_cursor"], limite=2)
+    params = sessao.execucoes[1][1]
+    assert (params["apos_total"], params["apos_id"]) == (Decimal("200.00"), str(primeira[1]["id_contraparte"]))
+    assert [item["nome"] for item in seguinte["itens"]] == ["C"]
+    assert seguinte["proximo_cursor"] is None
@@ -0,0 +1,22 @@
+"""Testes para o amostrador de recursos em segundo plano."""
+import asyncio
+import time
+import pytest
+
+from app.core.amostrador import PROCESSO_RSS, AmostradorSistema
+
+
+@pytest.mark.unit
+async def test_amostrador_preenche_gauges_e_mede_atraso_do_loop():
+    amostrador = AmostradorSistema(intervalo_segundos=60, intervalo_atraso=0.01)
+    amostrador.iniciar()
+    try:
+        await asyncio.sleep(0.05)
+        time.sleep(0.15)  # bloqueia o event loop de propósito
+        await asyncio.sleep(0.05)
+        atraso_maximo = amostrador._atraso_maximo
+    finally:
+        await amostrador.parar()
+
+    assert PROCESSO_RSS._value.get() > 0
+    assert atraso_maximo >= 0.1
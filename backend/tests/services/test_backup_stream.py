@@ -0,0 +1,115 @@
+"""Testes para o pipeline de backup em fluxo."""
+import hashlib
+import os
+import tarfile
+import pytest
+
+from app.core.backup_stream import (
+    SUFIXO_MANIFESTO,
+    BackupCorrompido,
+    abrir_leitura,
+    carregar_manifesto,
+    comparar_com_manifesto,
+    derivar_chave,
+    extrair_tar,
+    gravar_em_fluxo,
+    tar_em_fluxo,
+    verificar_integridade,
+)
+
+
+CHAVE = derivar_chave(b"Z" * 43 + b"=")
+
+
+@pytest.mark.unit
+def test_tar_comprimido_e_cifrado_ida_e_volta(tmp_path):
+    origem = tmp_path / "uploads"
+    origem.mkdir()
+    (origem / "a.txt").write_bytes(os.urandom(5000))
+
+    caminho = gravar_em_fluxo(
+        str(tmp_path / "backup.tar"),
+        tar_em_fluxo([(str(origem), "uploads")], extras={"MANIFESTO.json": b"{}"}),
+        chave=CHAVE,
+        tamanho_frame=1024
+    )
+
+    assert caminho.endswith(".enc") and not os.path.exists(caminho + ".part")
+    arquivo, conteudo = abrir_leitura(caminho, CHAVE)
+    with arquivo, tarfile.open(fileobj=conteudo, mode="r|") as tar:
+        lidos = {m.name: tar.extractfile(m).read() for m in tar if m.isfile()}
+    assert lidos["uploads/a.txt"] == (origem / "a.txt").read_bytes()
+    assert lidos["MANIFESTO.json"] == b"{}"
+
+
+@pytest.mark.unit
+def test_backup_truncado_e_detectado(tmp_path):
+    caminho = gravar_em_fluxo(
+        str(tmp_path / "dados"),
+        lambda saida: saida.write(b"x" * 4096),
+        comprimir=False,
+        chave=CHAVE,
+        tamanho_frame=1024
+    )
+    with open(caminho, "rb") as f:
+        dados = f.read()
+    truncado = tmp_path / "truncado.enc"
+    # Remove o último frame inteiro: os frames restantes são válidos, mas o fim não
+    truncado.write_bytes(dados[:-(4 + 16)])
+
+    arquivo, conteudo = abrir_leitura(str(truncado), CHAVE)
+    with arquivo, pytest.raises(BackupCorrompido):
+        conteudo.read()
+
+
+@pytest.mark.unit
+def test_manifesto_detecta_alterados_e_removidos(tmp_path):
+    raiz = tmp_path / "static"
+    raiz.mkdir()
+    (raiz / "igual.css").write_text("a")
+    (raiz / "muda.css").write_text("b")
+    (raiz / "some.css").write_text("c")
+    anterior, alterados, _ = comparar_com_manifesto({"static": str(raiz)}, {})
+    assert len(alterados) == 3
+
+    (raiz / "muda.css").write_text("bb")
+    (raiz / "some.css").unlink()
+    os.utime(raiz / "igual.css")  # mtime novo, mesmo conteúdo
+
+    _, alterados, removidos = comparar_com_manifesto({"static": str(raiz)}, anterior)
+
+    assert [nome for _, nome in alterados] == ["static/muda.css"]
+    assert removidos == ["static/some.css"]
+
+
+@pytest.mark.unit
+def test_manifesto_de_integridade_aponta_bloco_corrompido(tmp_path):
+    origem = tmp_path / "logs"
+    origem.mkdir()
+    (origem / "app.log").write_bytes(os.urandom(3 * 1024 * 1024))
+    caminho = gravar_em_fluxo(
+        str(tmp_path / "logs.tar"),
+        tar_em_fluxo([(str(origem), "logs")]),
+        chave=CHAVE,
+        metadados={"backup_id": "b1", "categoria": "logs"}
+    )
+    manifesto = carregar_manifesto(caminho + SUFIXO_MANIFESTO)
+    manifesto["tamanho_bloco"] = 1024 * 1024
+    manifesto["blocos"] = []
+    # Recalcula os blocos em 1 MiB para que o arquivo tenha vários
+    with open(caminho, "rb") as f:
+        while bloco := f.read(1024 * 1024):
+            manifesto["blocos"].append(hashlib.sha256(bloco).hexdigest())
+
+    verificar_integridade(caminho, manifesto)
+    destino = tmp_path / "restaurado"
+    extrair_tar(caminho, str(destino), CHAVE)
+    assert (destino / "logs" / "app.log").read_bytes() == (origem / "app.log").read_bytes()
+
+    with open(caminho, "r+b") as f:
+        f.seek(1024 * 1024 + 10)
+        byte = f.read(1)
+        f.seek(-1, 1)
+        f.write(bytes([byte[0] ^ 0xFF]))
+    with pytest.raises(BackupCorrompido, match="bloco 1"):
+        verificar_integridade(caminho, manifesto)
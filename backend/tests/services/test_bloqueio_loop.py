@@ -0,0 +1,37 @@
+"""Testes para o detector de bloqueios do event loop."""
+import asyncio
+import time
+import pytest
+from types import SimpleNamespace
+
+from app.core.bloqueio_loop import BloqueioLoopMiddleware, DetectorBloqueioLoop
+
+
+def _consulta_sincrona():
+    time.sleep(0.3)
+
+
+@pytest.mark.unit
+async def test_bloqueio_e_atribuido_a_rota_com_a_pilha_capturada():
+    detector = DetectorBloqueioLoop(limiar_segundos=0.08, profundidade_pilha=20, max_ocorrencias=10)
+
+    async def endpoint(scope, receive, send):
+        # O roteador preenche ``route`` no mesmo escopo antes de chamar o endpoint
+        scope["route"] = SimpleNamespace(path="/api/v1/relatorios/{id}")
+        _consulta_sincrona()
+
+    app = BloqueioLoopMiddleware(endpoint, detector=detector)
+    detector.iniciar()
+    try:
+        await app({"type": "http", "method": "GET", "path": "/api/v1/relatorios/42"}, None, None)
+        await asyncio.sleep(0.1)
+    finally:
+        detector.parar()
+
+    relatorio = detector.relatorio()
+    assert relatorio["total_ocorrencias"] == 1
+    item = relatorio["top"][0]
+    assert item["rota"] == "GET /api/v1/relatorios/{id}"
+    assert "_consulta_sincrona" in item["origem"]
+    assert item["max_segundos"] >= 0.2
+    assert not detector._requisicoes
@@ -0,0 +1,77 @@
+"""Testes para a busca unificada de produtos, clientes e fornecedores."""
+import pytest
+import uuid
+from fastapi import HTTPException
+from unittest.mock import AsyncMock
+
+from app.repositories.busca_repository import (
+    BuscaRepository,
+    montar_tsquery_prefixo,
+    MAX_TERMOS_BUSCA,
+)
+from app.services.busca_service import BuscaService
+
+
+@pytest.mark.unit
+def test_tsquery_prefixo_palavras():
+    """Cada palavra vira um lexema prefixado combinado por AND."""
+    assert montar_tsquery_prefixo("Cadeira Gamer") == "cadeira:* & gamer:*"
+    assert montar_tsquery_prefixo("  café ") == "café:*"
+
+
+@pytest.mark.unit
+def test_tsquery_prefixo_remove_operadores():
+    """Operadores de tsquery digitados pelo usuário são descartados."""
+    assert montar_tsquery_prefixo("a & b | !c:*") == "a:* & b:* & c:*"
+    assert montar_tsquery_prefixo("7891234'); DROP") == "7891234:* & drop:*"
+
+
+@pytest.mark.unit
+def test_tsquery_prefixo_vazio():
+    """Texto sem palavras não gera consulta."""
+    assert montar_tsquery_prefixo("") is None
+    assert montar_tsquery_prefixo(None) is None
+    assert montar_tsquery_prefixo("  -- ") is None
+
+
+@pytest.mark.unit
+def test_tsquery_prefixo_limita_termos():
+    """A quantidade de termos é limitada para manter a consulta barata."""
+    termo = " ".join(f"p{i}" for i in range(MAX_TERMOS_BUSCA + 5))
+    assert montar_tsquery_prefixo(termo).count(":*") == MAX_TERMOS_BUSCA
+
+
+@pytest.mark.unit
+async def test_buscar_sem_tipos_validos_nao_consulta_banco():
+    """Tipos desconhecidos não geram consulta."""
+    session = AsyncMock()
+    repo = BuscaRepository(session)
+
+    resultado = await repo.buscar("cadeira", uuid.uuid4(), tipos=["inexistente"])
+
+    assert resultado == []
+    session.execute.assert_not_called()
+
+
+@pytest.mark.unit
+async def test_servico_termo_curto_retorna_vazio():
+    """Termos abaixo do tamanho mínimo não consultam o banco."""
+    session = AsyncMock()
+    service = BuscaService(session)
+
+    resposta = await service.buscar("a", uuid.uuid4())
+
+    assert resposta.total == 0
+    assert resposta.items == []
+    session.execute.assert_not_called()
+
+
+@pytest.mark.unit
+async def test_servico_tipo_invalido():
+    """Tipos desconhecidos são rejeitados com 400."""
+    service = BuscaService(AsyncMock())
+
+    with pytest.raises(HTTPException) as exc:
+        await service.buscar("cadeira", uuid.uuid4(), tipos=["produto", "venda"])
+
+    assert exc.value.status_code == 400
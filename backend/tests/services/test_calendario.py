@@ -0,0 +1,61 @@
+"""Testes para o calendário de dias úteis com feriados locais."""
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app.utils.calendario import (
+    AJUSTE_ANTERIOR,
+    AJUSTE_SEGUINTE,
+    AJUSTE_SEGUINTE_MODIFICADO,
+    calendario_local,
+    calendario_nacional,
+    feriados_locais,
+    para_dates,
+    registrar_feriados_municipais,
+)
+
+
+@pytest.mark.unit
+def test_feriados_estaduais_municipais_e_cache_por_localidade():
+    # Revolução Constitucionalista (SP) e aniversário de São Paulo
+    assert feriados_locais(2026, "SP", "SAO PAULO") == (date(2026, 1, 25), date(2026, 7, 9))
+    # Nossa Senhora da Penha (ES): oito dias após a Páscoa (05/04/2026)
+    assert feriados_locais(2026, "ES") == (date(2026, 4, 13),)
+
+    sp = calendario_local("sp", "São  Paulo", 2026)
+    assert calendario_local("SP", "SAO PAULO", 2027) is sp
+    assert not sp.eh_dia_util(date(2026, 7, 9))
+    assert calendario_nacional(2026).eh_dia_util(date(2026, 7, 9))
+    assert sp.adicionar_dias_uteis(date(2026, 7, 8), 1) == np.datetime64("2026-07-10")
+
+    registrar_feriados_municipais("SP", "Campinas", fixos=[(12, 8)])
+    assert not calendario_local("SP", "Campinas", 2026).eh_dia_util(date(2026, 12, 8))
+
+
+@pytest.mark.unit
+def test_consultas_pre_calculadas_equivalem_ao_busday_do_numpy():
+    calendario = calendario_local("RJ", "Rio de Janeiro", 2024, 2028)
+    referencia = np.busdaycalendar(weekmask="1111100", holidays=calendario.feriados)
+    gerador = np.random.default_rng(7)
+    # Inclui datas fora do intervalo pré-calculado (2020-2029) para o caminho alternativo
+    datas = np.datetime64("2020-01-01") + gerador.integers(-30, 3700, 5000)
+    dias = gerador.integers(-60, 60, 5000)
+    fins = datas + gerador.integers(-200, 200, 5000)
+
+    dentro = (datas >= np.datetime64("2020-01-01")) & (datas < np.datetime64("2029-11-01"))
+    amostra = datas[dentro]
+    assert (calendario.adicionar_dias_uteis(amostra, dias[dentro])
+            == np.busday_offset(amostra, dias[dentro], roll="forward", busdaycal=referencia)).all()
+    assert (calendario.contar_dias_uteis(datas, fins) == np.busday_count(datas, fins, busdaycal=referencia)).all()
+    assert (calendario.eh_dia_util(datas) == np.is_busday(datas, busdaycal=referencia)).all()
+    for convencao, roll in (
+        (AJUSTE_SEGUINTE, "forward"),
+        (AJUSTE_ANTERIOR, "backward"),
+        (AJUSTE_SEGUINTE_MODIFICADO, "modifiedfollowing"),
+    ):
+        assert (calendario.ajustar(datas, convencao)
+                == np.busday_offset(datas, 0, roll=roll, busdaycal=referencia)).all()
+
+    # São Sebastião (20/01/2026, terça) desloca o vencimento para quarta
+    assert para_dates(calendario.ajustar([date(2026, 1, 20)])) == [date(2026, 1, 21)]
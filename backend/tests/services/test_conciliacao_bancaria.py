@@ -0,0 +1,71 @@
+"""Testes para a leitura de extratos e o motor de conciliação bancária."""
+from datetime import date
+from decimal import Decimal
+import pytest
+
+from app.utils.conciliacao import CandidatoConciliacao, conciliar
+from app.utils.extrato import LinhaExtrato, ler_cnab240, ler_csv, ler_ofx
+
+
+OFX = b"""OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20261005120000[-3:BRT]<TRNAMT>-1.250,00<FITID>A1<MEMO>PAGTO ENERGIA CEMIG
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20261006<TRNAMT>300.50<FITID>A2<NAME>PIX Joao Silva</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+def _segmento_e(data: str, valor_centavos: int, natureza: str, historico: str) -> str:
+    registro = list(" " * 240)
+    registro[7] = "3"
+    registro[13] = "E"
+    registro[142:150] = data
+    registro[150:168] = str(valor_centavos).zfill(18)
+    registro[168] = natureza
+    registro[176:201] = historico.ljust(25)[:25]
+    return "".join(registro)
+
+
+@pytest.mark.unit
+def test_leitores_produzem_valores_com_sinal():
+    ofx = ler_ofx(OFX)
+    assert ofx == [
+        LinhaExtrato(date(2026, 10, 5), Decimal("-1250.00"), "PAGTO ENERGIA CEMIG", "A1"),
+        LinhaExtrato(date(2026, 10, 6), Decimal("300.50"), "PIX Joao Silva", "A2"),
+    ]
+
+    cnab = ler_cnab240("\n".join([
+        "0" * 240,
+        _segmento_e("05102026", 125000, "D", "ENERGIA CEMIG"),
+        _segmento_e("06102026", 30050, "C", "PIX JOAO SILVA"),
+    ]).encode())
+    assert [(l.data, l.valor, l.descricao) for l in cnab] == [
+        (date(2026, 10, 5), Decimal("-1250.00"), "ENERGIA CEMIG"),
+        (date(2026, 10, 6), Decimal("300.50"), "PIX JOAO SILVA"),
+    ]
+
+    csv = ler_csv("Data;Histórico;Valor\n05/10/2026;Energia;-1.250,00\nSaldo do dia;;\n".encode("cp1252"))
+    assert csv == [LinhaExtrato(date(2026, 10, 5), Decimal("-1250.00"), "Energia")]
+
+
+@pytest.mark.unit
+def test_conciliacao_usa_valor_data_e_descricao_um_para_um():
+    candidatos = [
+        CandidatoConciliacao("aluguel", -1250.0, date(2026, 10, 5), "Aluguel sala"),
+        CandidatoConciliacao("energia", -1250.0, date(2026, 10, 3), "Conta de energia Cemig"),
+        CandidatoConciliacao("venda", 300.5, date(2026, 10, 6), "Recebimento João Silva"),
+        CandidatoConciliacao("longe", 300.5, date(2026, 9, 1), "João Silva"),
+    ]
+    linhas = [
+        LinhaExtrato(date(2026, 10, 5), Decimal("-1250.00"), "PAGTO ENERGIA CEMIG"),
+        LinhaExtrato(date(2026, 10, 6), Decimal("300.50"), "PIX JOAO SILVA"),
+        LinhaExtrato(date(2026, 10, 6), Decimal("300.50"), "PIX JOAO SILVA"),
+        LinhaExtrato(date(2026, 10, 7), Decimal("99.99"), "TARIFA"),
+    ]
+
+    resultado = conciliar(linhas, candidatos)
+
+    # A descrição desempata a energia (2 dias antes) do aluguel (mesmo dia)
+    assert [(c.indice_linha, c.id_lancamento) for c in resultado.correspondencias] == [(0, "energia"), (1, "venda")]
+    # Cada lançamento casa uma vez só; o de setembro está fora da janela
+    assert resultado.linhas_sem_correspondencia == [2, 3]
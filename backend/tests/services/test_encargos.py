@@ -0,0 +1,62 @@
+"""Testes para o cálculo de multa e juros por atraso."""
+from datetime import date, timedelta
+from decimal import Decimal
+import random
+
+import numpy as np
+import pytest
+
+from app.utils.encargos import (
+    REGIME_COMPOSTO,
+    REGIME_SIMPLES,
+    calcular_encargos,
+    calcular_encargos_lote,
+    criar_regra,
+)
+
+
+REFERENCIA = date(2026, 10, 18)
+
+
+@pytest.mark.unit
+def test_encargos_simples_compostos_e_carencia():
+    simples = criar_regra(2, 1, REGIME_SIMPLES, 0)
+    # 1000 * 2% de multa + 1000 * 1% * 45/30 de juros
+    assert calcular_encargos("1000.00", REFERENCIA - timedelta(days=45), REFERENCIA, simples) == (
+        45, Decimal("20.00"), Decimal("15.00"), Decimal("1035.00")
+    )
+
+    composto = criar_regra(2, 1, REGIME_COMPOSTO, 0)
+    # 1000 * (1.01 ** 1.5 - 1) = 15.0374...
+    assert calcular_encargos(1000, REFERENCIA - timedelta(days=45), REFERENCIA, composto).juros == Decimal("15.04")
+
+    carencia = criar_regra(2, 1, REGIME_SIMPLES, 5)
+    assert calcular_encargos(1000, REFERENCIA - timedelta(days=5), REFERENCIA, carencia).valor_atualizado == Decimal("1000.00")
+    # Passada a carência, os juros contam desde o vencimento
+    assert calcular_encargos(1000, REFERENCIA - timedelta(days=6), REFERENCIA, carencia).juros == Decimal("2.00")
+
+    with pytest.raises(ValueError):
+        criar_regra(regime="diario")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("regime", [REGIME_SIMPLES, REGIME_COMPOSTO])
+def test_lote_produz_os_mesmos_centavos_do_calculo_unitario(regime):
+    regra = criar_regra("2", "1.5", regime, 3)
+    gerador = random.Random(42)
+    valores = [Decimal(gerador.randint(1, 10 ** 7)) / 100 for _ in range(2000)]
+    vencimentos = [REFERENCIA - timedelta(days=gerador.randint(-30, 800)) for _ in valores]
+
+    lote = calcular_encargos_lote(
+        np.array([float(v) for v in valores]),
+        np.array(vencimentos, dtype="datetime64[D]"),
+        REFERENCIA,
+        regra
+    )
+
+    for i, (valor, vencimento) in enumerate(zip(valores, vencimentos)):
+        unitario = calcular_encargos(valor, vencimento, REFERENCIA, regra)
+        assert lote.dias_atraso[i] == unitario.dias_atraso
+        assert lote.multa[i] == float(unitario.multa)
+        assert lote.juros[i] == float(unitario.juros)
+        assert lote.valor_atualizado[i] == float(unitario.valor_atualizado)
@@ -0,0 +1,111 @@
+"""Testes para os filtros declarativos e a listagem do repositório base."""
+from datetime import date
+from uuid import uuid4
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.base_repository import CONTAGEM_NENHUMA, selecionar_campos
+from app.repositories.conta_bancaria_repository import ContaBancariaRepository
+from app.repositories.lancamento_repository import LancamentoRepository
+
+
+class ResultadoFalso:
+    def __init__(self, linhas):
+        self.linhas = linhas
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.linhas
+
+    def scalar_one(self):
+        return self.linhas[0]
+
+
+class SessaoFalsa:
+    """Registra as consultas executadas e devolve linhas pré-definidas."""
+
+    bind = None
+
+    def __init__(self, *respostas):
+        self.respostas = list(respostas)
+        self.consultas = []
+
+    async def execute(self, consulta, params=None):
+        self.consultas.append(consulta)
+        return ResultadoFalso(self.respostas.pop(0))
+
+
+def _sql(consulta) -> str:
+    return str(consulta.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.unit
+def test_filtros_ignoram_valores_vazios_e_nomes_desconhecidos():
+    repositorio = LancamentoRepository(SessaoFalsa())
+    condicoes = repositorio.compilar_filtros(
+        uuid4(), tipo="entrada", status="", id_cliente=None, data_fim=date(2026, 10, 18), busca="x"
+    )
+
+    assert [_sql(c) for c in condicoes] == [
+        "lancamentos.id_empresa = %(id_empresa_1)s::UUID",
+        "lancamentos.tipo = %(tipo_1)s",
+        "lancamentos.data_lancamento < %(data_lancamento_1)s",
+    ]
+    assert condicoes[2].right.value == date(2026, 10, 19)
+
+
+@pytest.mark.unit
+async def test_pagina_incompleta_dispensa_a_contagem():
+    sessao = SessaoFalsa(["a", "b"])
+    repositorio = ContaBancariaRepository(sessao)
+
+    itens, total = await repositorio.listar(repositorio.compilar_filtros(uuid4(), nome="caixa"), limit=10)
+
+    assert (itens, total) == (["a", "b"], 2)
+    assert len(sessao.consultas) == 1
+    assert "contas_bancarias.nome ILIKE" in _sql(sessao.consultas[0].whereclause)
+
+
+@pytest.mark.unit
+async def test_pagina_cheia_conta_com_as_mesmas_condicoes():
+    sessao = SessaoFalsa(["a", "b"], [7])
+    repositorio = ContaBancariaRepository(sessao)
+
+    itens, total = await repositorio.listar(repositorio.compilar_filtros(uuid4(), ativa=True), limit=2)
+
+    assert total == 7
+    pagina, contagem = sessao.consultas
+    assert _sql(contagem.whereclause) == _sql(pagina.whereclause)
+
+
+@pytest.mark.unit
+def test_ordenacao_restrita_as_colunas_com_desempate():
+    repositorio = ContaBancariaRepository(SessaoFalsa())
+
+    assert [_sql(c) for c in repositorio._ordenacao("saldo_atual", "desc")] == [
+        "contas_bancarias.saldo_atual DESC", "contas_bancarias.id_conta"
+    ]
+    assert [_sql(c) for c in repositorio._ordenacao("senha; drop", None)] == [
+        "contas_bancarias.nome ASC", "contas_bancarias.id_conta"
+    ]
+
+
+@pytest.mark.unit
+async def test_sem_contagem_e_campos_invalidos():
+    sessao = SessaoFalsa(["a", "b"])
+    repositorio = ContaBancariaRepository(sessao)
+
+    assert await repositorio.listar([], limit=2, contagem=CONTAGEM_NENHUMA) == (["a", "b"], None)
+    assert len(sessao.consultas) == 1
+    with pytest.raises(ValueError, match="saldo_inicial"):
+        repositorio.validar_campos(["nome", "saldo_inicial"], ["nome", "saldo_atual"])
+
+
+@pytest.mark.unit
+def test_selecionar_campos():
+    class Conta:
+        nome, banco, saldo_atual = "Caixa", "001", 10.0
+
+    assert selecionar_campos([Conta()], ["nome", "saldo_atual"]) == [{"nome": "Caixa", "saldo_atual": 10.0}]
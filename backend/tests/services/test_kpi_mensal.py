@@ -0,0 +1,85 @@
+"""Testes para os indicadores mensais consolidados (kpi_mensal)."""
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import uuid4
+import pytest
+
+from app.services.kpi_mensal_service import KpiMensalService
+
+
+class ResultadoFalso:
+    def __init__(self, linhas):
+        self.linhas = linhas
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.linhas
+
+    def first(self):
+        return self.linhas[0] if self.linhas else None
+
+
+class SessaoFalsa:
+    """Registra as instruções executadas e devolve linhas pré-definidas."""
+
+    def __init__(self, *respostas):
+        self.respostas = list(respostas)
+        self.execucoes = []
+        self.commits = 0
+
+    async def execute(self, instrucao, params=None):
+        self.execucoes.append((str(instrucao), params))
+        return ResultadoFalso(self.respostas.pop(0))
+
+    async def commit(self):
+        self.commits += 1
+
+
+def _kpi(empresa, mes):
+    return {"id_empresa": empresa, "mes": mes, "receitas": Decimal("100.00"), "despesas": Decimal("40.00"),
+            "saldo": Decimal("60.00"), "quantidade_lancamentos": 3, "quantidade_vendas": 2,
+            "total_vendas": Decimal("90.00"), "ticket_medio_vendas": Decimal("45.00"),
+            "quantidade_clientes": 5, "quantidade_fornecedores": 1, "atualizado_em": datetime(2026, 10, 18)}
+
+
+@pytest.mark.unit
+async def test_mes_calculado_le_uma_linha():
+    empresa = uuid4()
+    sessao = SessaoFalsa([_kpi(empresa, date(2026, 10, 1))])
+
+    kpi = await KpiMensalService(sessao).get_mes(empresa, date(2026, 10, 18))
+
+    assert kpi["saldo"] == Decimal("60.00")
+    assert len(sessao.execucoes) == 1 and sessao.commits == 0
+    assert sessao.execucoes[0][1] == {"id_empresa": empresa, "mes": date(2026, 10, 1)}
+
+
+@pytest.mark.unit
+async def test_mes_ausente_e_calculado_com_intervalo_de_datas():
+    empresa = uuid4()
+    sessao = SessaoFalsa([], [_kpi(empresa, date(2026, 10, 1))])
+
+    kpi = await KpiMensalService(sessao).get_mes(empresa, date(2026, 10, 18))
+
+    assert kpi["quantidade_vendas"] == 2 and sessao.commits == 1
+    sql, params = sessao.execucoes[1]
+    assert params == {"empresas": [str(empresa)], "meses": [date(2026, 10, 1)]}
+    assert "extract" not in sql.lower()
+    assert "x.data_lancamento >= a.mes" in sql
+    assert "ON CONFLICT (id_empresa, mes) DO UPDATE" in sql
+
+
+@pytest.mark.unit
+async def test_pendentes_processados_em_lotes_ate_esvaziar_a_fila():
+    empresa = uuid4()
+    lote_cheio = [{"id_empresa": empresa, "mes": date(2026, m, 1)} for m in (8, 9)]
+    sessao = SessaoFalsa(lote_cheio, [], [{"id_empresa": empresa, "mes": date(2026, 10, 1)}], [])
+
+    total = await KpiMensalService(sessao).recalcular_pendentes(lote=2)
+
+    assert total == 3 and sessao.commits == 2
+    assert "FOR UPDATE SKIP LOCKED" in sessao.execucoes[0][0]
+    assert sorted(sessao.execucoes[1][1]["meses"]) == [date(2026, 8, 1), date(2026, 9, 1)]
+    assert sessao.execucoes[3][1]["meses"] == [date(2026, 10, 1)]
@@ -0,0 +1,71 @@
+"""Testes para o calendário de dias úteis e o cronograma de parcelas."""
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from app.utils.calendario import (
+    AJUSTE_ANTERIOR,
+    AJUSTE_SEGUINTE_MODIFICADO,
+    CalendarioDiasUteis,
+    calcular_pascoa,
+    feriados_nacionais,
+    para_dates,
+)
+from app.utils.parcelamento import dividir_valor, gerar_cronograma, vencimentos_mensais
+
+
+@pytest.mark.unit
+def test_pascoa_e_feriados_moveis():
+    """Páscoa e feriados móveis derivados dela."""
+    assert calcular_pascoa(2024) == date(2024, 3, 31)
+    assert calcular_pascoa(2025) == date(2025, 4, 20)
+
+    feriados = feriados_nacionais(2025)
+    assert date(2025, 3, 3) in feriados    # Segunda de Carnaval
+    assert date(2025, 3, 4) in feriados    # Terça de Carnaval
+    assert date(2025, 4, 18) in feriados   # Sexta-feira Santa
+    assert date(2025, 6, 19) in feriados   # Corpus Christi
+    assert date(2025, 11, 20) in feriados
+    assert date(2023, 11, 20) not in feriados_nacionais(2023)
+
+
+@pytest.mark.unit
+def test_ajuste_de_dias_nao_uteis():
+    """Fins de semana e feriados são ajustados conforme a convenção."""
+    calendario = CalendarioDiasUteis(2023, 2023)
+
+    # Tiradentes (sexta) e fim de semana → segunda-feira
+    assert para_dates(calendario.ajustar([date(2023, 4, 21)])) == [date(2023, 4, 24)]
+    # Sábado → sexta-feira anterior
+    assert para_dates(calendario.ajustar([date(2023, 5, 6)], AJUSTE_ANTERIOR)) == [date(2023, 5, 5)]
+    # Sábado no fim do mês não passa para o mês seguinte
+    assert para_dates(calendario.ajustar([date(2023, 9, 30)], AJUSTE_SEGUINTE_MODIFICADO)) == [date(2023, 9, 29)]
+
+
+@pytest.mark.unit
+def test_vencimentos_preservam_dia_do_mes():
+    """Vencimentos são mensais de calendário, com fim de mês quando o dia não existe."""
+    datas = para_dates(vencimentos_mensais(date(2024, 1, 31), 4))
+    assert datas == [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30)]
+
+
+@pytest.mark.unit
+def test_residuo_na_ultima_parcela():
+    """A soma das parcelas fecha exatamente o total."""
+    valores = dividir_valor("100.00", 3)
+    assert valores == [Decimal("33.33"), Decimal("33.33"), Decimal("33.34")]
+    assert sum(valores) == Decimal("100.00")
+
+
+@pytest.mark.unit
+def test_cronograma_completo_em_dias_uteis():
+    """Todas as parcelas vencem em dia útil e somam o valor do lançamento."""
+    cronograma = gerar_cronograma(Decimal("1000.00"), 12, date(2026, 2, 14))
+
+    assert [p.numero for p in cronograma] == list(range(1, 13))
+    assert cronograma[0].data_vencimento == date(2026, 2, 18)  # sábado + Carnaval
+    assert all(p.data_vencimento.weekday() < 5 for p in cronograma)
+    assert sum(p.valor for p in cronograma) == Decimal("1000.00")
+
+    with pytest.raises(ValueError):
+        gerar_cronograma(Decimal("10"), 0, date(2026, 1, 1))
@@ -0,0 +1,56 @@
+"""Testes para a manutenção das partições mensais de logs e auditoria."""
+import gzip
+import pytest
+from datetime import date
+from unittest.mock import MagicMock
+
+from app.core.particionamento import arquivar_particao, garantir_particoes_futuras
+
+
+class SessaoFalsa:
+    """Sessão síncrona que registra os comandos e simula o cursor psycopg2."""
+
+    def __init__(self, particionadas=("logs_sistema", "auditoria")):
+        self.particionadas = particionadas
+        self.comandos = []
+        self.commits = 0
+        self.cursor = MagicMock()
+        self.cursor.copy_expert.side_effect = lambda sql, arquivo: arquivo.write(b"id_log,acao\n1,login\n")
+
+    def execute(self, sql, parametros=None):
+        self.comandos.append((str(sql), parametros))
+        if "relkind" in str(sql):
+            return MagicMock(scalar=MagicMock(return_value=parametros["tabela"] in self.particionadas))
+        return MagicMock(scalar=MagicMock(return_value=2))
+
+    def commit(self):
+        self.commits += 1
+
+    def connection(self):
+        return MagicMock(connection=MagicMock(cursor=MagicMock(return_value=self.cursor)))
+
+
+@pytest.mark.unit
+def test_garantir_particoes_futuras_ignora_tabelas_nao_particionadas():
+    sessao = SessaoFalsa(particionadas=("logs_sistema",))
+
+    criadas = garantir_particoes_futuras(sessao, meses_a_frente=3, hoje=date(2026, 10, 18))
+
+    assert criadas == {"logs_sistema": 2}
+    chamada = [p for sql, p in sessao.comandos if "criar_particoes_mensais" in sql]
+    assert chamada == [{"tabela": "logs_sistema", "inicio": date(2026, 10, 1), "meses": 4}]
+
+
+@pytest.mark.unit
+def test_arquivar_particao_desanexa_exporta_e_remove(tmp_path):
+    sessao = SessaoFalsa()
+
+    destino = arquivar_particao(sessao, "logs_sistema", "logs_sistema_p202601", str(tmp_path))
+
+    comandos = [sql for sql, _ in sessao.comandos]
+    assert comandos[0] == 'ALTER TABLE "logs_sistema" DETACH PARTITION "logs_sistema_p202601"'
+    assert comandos[-1] == 'DROP TABLE "logs_sistema_p202601"'
+    assert destino.endswith(".csv.gz")
+    with gzip.open(destino, "rb") as arquivo:
+        assert arquivo.read() == b"id_log,acao\n1,login\n"
+    sessao.cursor.close.assert_called_once()
@@ -0,0 +1,64 @@
+"""Testes para o pool de hash de senhas."""
+import asyncio
+
+import pytest
+from passlib.context import CryptContext
+
+from app.core import password_hasher
+from app.core.password_hasher import PoolHashSenhas, PoolSenhasSobrecarregado
+
+
+@pytest.fixture
+def contexto_rapido(monkeypatch):
+    """Contexto bcrypt com custo mínimo para manter os testes rápidos."""
+    contexto = CryptContext(
+        schemes=["bcrypt"], deprecated="auto",
+        bcrypt__default_rounds=4, bcrypt__min_rounds=4,
+    )
+    monkeypatch.setattr(password_hasher, "pwd_context", contexto)
+    return contexto
+
+
+@pytest.mark.unit
+async def test_hash_e_verificacao_no_pool(contexto_rapido):
+    """Hash gerado no pool é verificado sem pedir rehash."""
+    pool = PoolHashSenhas(workers=2, max_pendentes=4)
+    try:
+        senha_hash = await pool.hash("segredo123")
+        assert await pool.verificar("segredo123", senha_hash) == (True, None)
+        assert (await pool.verificar("errada", senha_hash))[0] is False
+        assert await pool.verificar("segredo123", "") == (False, None)
+        assert await pool.verificar("segredo123", "formato-desconhecido") == (False, None)
+        assert pool.stats()["pendentes"] == 0
+    finally:
+        pool.encerrar()
+
+
+@pytest.mark.unit
+async def test_rehash_quando_custo_aumenta(contexto_rapido, monkeypatch):
+    """Hash com custo abaixo do mínimo configurado é regravado no login."""
+    hash_antigo = contexto_rapido.hash("segredo123")
+    monkeypatch.setattr(password_hasher, "pwd_context", CryptContext(
+        schemes=["bcrypt"], deprecated="auto",
+        bcrypt__default_rounds=5, bcrypt__min_rounds=5,
+    ))
+
+    valida, novo_hash = password_hasher.verificar_senha("segredo123", hash_antigo)
+
+    assert valida is True
+    assert novo_hash and novo_hash.startswith("$2b$05$")
+
+
+@pytest.mark.unit
+async def test_pool_rejeita_acima_do_limite(contexto_rapido):
+    """Chamadas além do limite de pendentes são rejeitadas em vez de enfileiradas."""
+    pool = PoolHashSenhas(workers=1, max_pendentes=1)
+    try:
+        primeira = asyncio.ensure_future(pool.hash("a"))
+        await asyncio.sleep(0)
+        with pytest.raises(PoolSenhasSobrecarregado):
+            await pool.hash("b")
+        await primeira
+        assert pool.stats()["rejeitadas"] == 1
+    finally:
+        pool.encerrar()
@@ -0,0 +1,37 @@
+"""Testes para os filtros de período semiabertos."""
+from datetime import date, datetime
+import pytest
+from sqlalchemy import column
+from sqlalchemy.dialects import postgresql
+
+from app.utils.periodos import Periodo, no_periodo, periodo_ano, periodo_dia, periodo_entre, periodo_mes, somar_meses
+
+
+def _sql(clausula) -> str:
+    return str(clausula.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+@pytest.mark.unit
+def test_periodos_de_calendario():
+    assert periodo_dia(date(2026, 2, 28)) == (date(2026, 2, 28), date(2026, 3, 1))
+    assert periodo_mes(2026, 12) == (date(2026, 12, 1), date(2027, 1, 1))
+    assert periodo_ano(2026) == (date(2026, 1, 1), date(2027, 1, 1))
+    assert somar_meses(date(2026, 1, 31), -2) == date(2025, 11, 1)
+
+
+@pytest.mark.unit
+def test_limites_inclusivos_viram_fim_exclusivo():
+    assert periodo_entre(date(2026, 1, 1), date(2026, 1, 31)).fim == date(2026, 2, 1)
+    assert periodo_entre(None, datetime(2026, 1, 31)).fim == date(2026, 2, 1)
+    assert periodo_entre(None, datetime(2026, 1, 31, 18, 30)).fim == datetime(2026, 1, 31, 18, 30, 0, 1)
+    assert periodo_entre() == Periodo(None, None)
+
+
+@pytest.mark.unit
+def test_filtro_mantem_a_coluna_intacta():
+    sql = _sql(no_periodo(column("data_lancamento"), periodo_mes(2026, 10)))
+    assert sql == "data_lancamento >= '2026-10-01' AND data_lancamento < '2026-11-01'"
+    assert _sql(no_periodo(column("data_lancamento"), periodo_entre(None, date(2026, 10, 18)))) == (
+        "data_lancamento < '2026-10-19'"
+    )
+    assert _sql(no_periodo(column("data_lancamento"), Periodo(None, None))) == "true"
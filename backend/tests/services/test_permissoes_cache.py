@@ -0,0 +1,101 @@
+"""Testes para o snapshot compilado de permissões."""
+import pytest
+import uuid
+from unittest.mock import AsyncMock
+
+from app.core.permissoes_cache import (
+    PermissoesCache,
+    compilar_permissoes,
+    pares_de_permissoes,
+)
+from app.utils.permissions import verify_permission
+
+
+class RedisFalso:
+    """Subconjunto de comandos do Redis usados pelo carimbo de versão."""
+
+    def __init__(self):
+        self.dados = {}
+
+    async def get(self, chave):
+        return self.dados.get(chave)
+
+    async def incr(self, chave):
+        self.dados[chave] = int(self.dados.get(chave, 0)) + 1
+        return self.dados[chave]
+
+
+@pytest.mark.unit
+def test_snapshot_compilado_por_bits():
+    """Ações específicas, curinga e formatos antigos viram bits do snapshot."""
+    snapshot = compilar_permissoes(pares_de_permissoes({
+        "vendas": ["listar", "criar"],
+        "relatorios": ["*"],
+    }))
+
+    assert snapshot.permite("vendas", "listar")
+    assert not snapshot.permite("vendas", "excluir")
+    assert snapshot.permite("relatorios", "exportar")
+    assert snapshot.permite("vendas")
+    assert not snapshot.permite("clientes")
+    assert not snapshot.permite("recurso_inexistente", "acao_inexistente")
+
+    antigo = compilar_permissoes(pares_de_permissoes([
+        {"modulo": "clientes", "pode_visualizar": True, "pode_excluir": False},
+        "produtos:editar",
+    ]))
+    assert antigo.permite("clientes", "visualizar")
+    assert not antigo.permite("clientes", "excluir")
+    assert antigo.permite("produtos", "editar")
+
+
+@pytest.mark.unit
+async def test_carimbo_de_versao_invalida_outros_workers():
+    """Um worker recompila quando outro incrementa o carimbo no Redis."""
+    redis = RedisFalso()
+    obter_redis = AsyncMock(return_value=redis)
+    worker_a = PermissoesCache(intervalo_versao=0, obter_redis=obter_redis)
+    worker_b = PermissoesCache(intervalo_versao=0, obter_redis=obter_redis)
+    id_usuario, id_empresa = uuid.uuid4(), uuid.uuid4()
+
+    carregar = AsyncMock(return_value=(False, [("vendas", "listar")]))
+    assert (await worker_a.obter(id_usuario, id_empresa, carregar)).permite("vendas", "listar")
+    await worker_a.obter(id_usuario, id_empresa, carregar)
+    assert carregar.await_count == 1
+
+    await worker_b.invalidar(id_usuario, id_empresa)
+
+    carregar.return_value = (False, [])
+    snapshot = await worker_a.obter(id_usuario, id_empresa, carregar)
+    assert carregar.await_count == 2
+    assert not snapshot.permite("vendas", "listar")
+
+
+@pytest.mark.unit
+async def test_snapshot_reaproveitado_dentro_do_intervalo():
+    """Dentro do intervalo de conferência não há ida ao Redis nem ao banco."""
+    obter_redis = AsyncMock(return_value=RedisFalso())
+    cache = PermissoesCache(intervalo_versao=60, obter_redis=obter_redis)
+    carregar = AsyncMock(return_value=(True, []))
+
+    for _ in range(3):
+        assert (await cache.obter("u", "e", carregar)).permite("qualquer", "coisa")
+
+    assert carregar.await_count == 1
+    assert obter_redis.await_count == 1
+
+
+@pytest.mark.unit
+def test_verify_permission_com_claims_do_token():
+    """Usuário vindo do token é verificado pelas claims, respeitando a empresa."""
+    id_empresa = uuid.uuid4()
+    usuario = {
+        "id_usuario": str(uuid.uuid4()),
+        "id_empresa": str(id_empresa),
+        "tipo_usuario": "OPERADOR",
+        "permissoes": {"contas_bancarias": ["listar"]},
+    }
+
+    assert verify_permission(usuario, "contas_bancarias:listar", id_empresa)
+    assert not verify_permission(usuario, "contas_bancarias:criar", id_empresa)
+    assert not verify_permission(usuario, "contas_bancarias:listar", uuid.uuid4())
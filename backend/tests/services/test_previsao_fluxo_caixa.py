@@ -0,0 +1,68 @@
+"""Testes para a projeção vetorizada de saldos bancários."""
+from datetime import date
+import numpy as np
+import pytest
+
+from app.utils.calendario import calendario_nacional
+from app.utils.fluxo_caixa import projetar_saldos
+
+HOJE = date(2026, 10, 16)  # sexta-feira
+
+
+def _projetar(indice, vencimentos, valores, compensacao, taxa_pct, taxa_fixa, dias=10):
+    return projetar_saldos(
+        hoje=HOJE,
+        dias=dias,
+        saldos_iniciais=np.array([1000.0, 0.0]),
+        indice_conta=np.array(indice),
+        vencimentos=np.array(vencimentos, dtype="datetime64[D]"),
+        valores=np.array(valores, dtype=float),
+        dias_compensacao=np.array(compensacao),
+        taxa_percentual=np.array(taxa_pct, dtype=float),
+        taxa_fixa=np.array(taxa_fixa, dtype=float),
+        calendario=calendario_nacional(2026),
+    )
+
+
+@pytest.mark.unit
+def test_projecao_aplica_compensacao_taxas_e_dias_uteis():
+    projecao = _projetar(
+        indice=[0, 0, 0, 1],
+        vencimentos=["2026-10-10", "2026-10-17", "2026-10-16", "2026-12-01"],
+        valores=[-200, -100, 500, 50],
+        compensacao=[0, 0, 2, 0],
+        taxa_pct=[0, 0, 2, 0],
+        taxa_fixa=[0, 0, 1, 0],
+    )
+    saldos = dict(zip(projecao.datas.astype(str), projecao.saldos[0]))
+
+    # Vencido entra hoje; o de sábado vai para segunda (19/10)
+    assert saldos["2026-10-16"] == saldos["2026-10-18"] == 800.0
+    assert saldos["2026-10-19"] == 700.0
+    # Recebimento D+2 úteis a partir de sexta (20/10), líquido de 2% + 1,00
+    assert saldos["2026-10-20"] == pytest.approx(700 + 500 - 10 - 1)
+    # Fora do horizonte não entra
+    assert projecao.saldos[1].tolist() == [0.0] * 10
+
+
+@pytest.mark.unit
+def test_projecao_com_milhares_de_itens_bate_com_a_soma_direta():
+    rng = np.random.default_rng(42)
+    n = 5000
+    vencimentos = np.datetime64(HOJE, "D") + rng.integers(-30, 200, n)
+    valores = rng.normal(0, 500, n).round(2)
+    projecao = _projetar(
+        indice=rng.integers(0, 2, n),
+        vencimentos=vencimentos,
+        valores=valores,
+        compensacao=np.zeros(n, dtype=int),
+        taxa_pct=np.zeros(n),
+        taxa_fixa=np.zeros(n),
+        dias=180,
+    )
+
+    # Sem compensação/taxas, o total é o saldo inicial mais tudo que cai no horizonte
+    efetivas = np.busday_offset(np.maximum(vencimentos, np.datetime64(HOJE, "D")), 0, roll="forward",
+                                busdaycal=calendario_nacional(2026)._calendario)
+    no_horizonte = efetivas < np.datetime64(HOJE, "D") + 180
+    assert projecao.saldos[:, -1].sum() == pytest.approx(1000 + valores[no_horizonte].sum())
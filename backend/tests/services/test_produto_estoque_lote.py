@@ -0,0 +1,120 @@
+"""Testes para a movimentação de estoque em lote."""
+import pytest
+import uuid
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+from fastapi import HTTPException
+
+from app.core.produto_lookup_cache import ProdutoLookupCache
+from app.schemas.produto import EstoqueUpdate, MovimentacaoLoteItem, ProdutoResumo
+from app.services.produto import produto_estoque_service as modulo
+from app.services.produto.produto_estoque_service import ProdutoEstoqueService
+
+
+def _linha(id_produto, delta, estoque_atual, disponivel, aplicado=True):
+    return {
+        "id_produto": id_produto,
+        "delta": delta,
+        "estoque_atual": estoque_atual,
+        "estoque_disponivel": disponivel,
+        "aplicado": aplicado,
+        "falta": not aplicado,
+    }
+
+
+def _service():
+    service = ProdutoEstoqueService(AsyncMock())
+    service.estoque_repository = AsyncMock()
+    service.repository = AsyncMock()
+    return service
+
+
+@pytest.mark.unit
+async def test_lote_converte_tipos_em_deltas_e_atualiza_indice(monkeypatch):
+    """Entradas somam, saídas subtraem e o índice em memória recebe o novo saldo."""
+    id_empresa, produto_a, produto_b = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    cache = ProdutoLookupCache()
+    cache.aquecer(id_empresa, [
+        ProdutoResumo(
+            id_produto=produto_a, id_empresa=id_empresa, nome="A", codigo="A",
+            valor_venda=Decimal("1"), estoque_atual=Decimal("10"), ativo=True,
+        )
+    ])
+    monkeypatch.setattr(modulo, "produto_lookup_cache", cache)
+
+    service = _service()
+    service.estoque_repository.aplicar_movimentacoes.return_value = [
+        _linha(produto_a, -3.0, 7.0, 10.0),
+        _linha(produto_b, 5.0, 5.0, 0.0),
+    ]
+
+    resultado = await service.movimentar_lote(id_empresa, [
+        MovimentacaoLoteItem(id_produto=produto_a, quantidade=Decimal("3"), tipo="saida"),
+        MovimentacaoLoteItem(id_produto=produto_b, quantidade=Decimal("5"), tipo="entrada"),
+    ])
+
+    kwargs = service.estoque_repository.aplicar_movimentacoes.await_args.kwargs
+    assert [(m[0], m[1]) for m in kwargs["movimentacoes"]] == [
+        (produto_a, Decimal("-3")),
+        (produto_b, Decimal("5")),
+    ]
+    assert kwargs["tudo_ou_nada"] is True
+    assert len(resultado.aplicados) == 2 and not resultado.faltas
+    assert cache.obter_por_id(id_empresa, produto_a).estoque_atual == Decimal("7.0")
+    service.session.commit.assert_awaited_once()
+
+
+@pytest.mark.unit
+async def test_lote_com_falta_nao_confirma():
+    """Faltas são informadas por produto e nada é confirmado."""
+    id_empresa, id_produto = uuid.uuid4(), uuid.uuid4()
+    service = _service()
+    service.estoque_repository.aplicar_movimentacoes.return_value = [
+        _linha(id_produto, -8.0, None, 2.0, aplicado=False),
+    ]
+
+    resultado = await service.movimentar_lote(id_empresa, [
+        MovimentacaoLoteItem(id_produto=id_produto, quantidade=Decimal("8"), tipo="saida"),
+    ])
+
+    assert resultado.faltas[0].estoque_disponivel == Decimal("2.0")
+    service.session.commit.assert_not_awaited()
+
+
+@pytest.mark.unit
+async def test_atualizar_estoque_diferencia_inexistente_e_insuficiente():
+    """Produto inexistente gera 404; saldo insuficiente gera 400."""
+    service = _service()
+    id_produto = uuid.uuid4()
+
+    service.estoque_repository.aplicar_movimentacoes.return_value = [
+        _linha(id_produto, -1.0, None, None, aplicado=False),
+    ]
+    with pytest.raises(HTTPException) as exc:
+        await service.atualizar_estoque(id_produto, uuid.uuid4(), EstoqueUpdate(quantidade=Decimal("1"), tipo="saida"))
+    assert exc.value.status_code == 404
+
+    service.estoque_repository.aplicar_movimentacoes.return_value = [
+        _linha(id_produto, -5.0, None, 1.0, aplicado=False),
+    ]
+    with pytest.raises(HTTPException) as exc:
+        await service.atualizar_estoque(id_produto, uuid.uuid4(), EstoqueUpdate(quantidade=Decimal("5"), tipo="saida"))
+    assert exc.value.status_code == 400
+    assert "Disponível: 1.0" in exc.value.detail
+
+
+@pytest.mark.unit
+async def test_baixa_da_venda_falha_com_faltas():
+    """A conclusão da venda é barrada quando algum item não tem saldo."""
+    service = _service()
+    service.estoque_repository.baixar_itens_venda.return_value = [
+        _linha(uuid.uuid4(), -2.0, None, 5.0, aplicado=False),
+        _linha(uuid.uuid4(), -9.0, None, 1.0, aplicado=False),
+    ]
+
+    with pytest.raises(HTTPException) as exc:
+        await service.baixar_estoque_venda(uuid.uuid4(), uuid.uuid4())
+
+    assert exc.value.status_code == 400
+    service.session.commit.assert_not_awaited()
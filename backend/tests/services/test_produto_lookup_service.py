@@ -0,0 +1,100 @@
+"""Testes para o índice de consulta rápida de produtos por código."""
+import pytest
+import uuid
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+from app.core.cache import LRUCache
+from app.core.produto_lookup_cache import ProdutoLookupCache
+from app.schemas.produto import ProdutoResumo
+from app.services.produto.produto_lookup_service import ProdutoLookupService
+
+
+def _resumo(id_empresa, codigo="123", codigo_barras="7891000100103", estoque="10"):
+    return ProdutoResumo(
+        id_produto=uuid.uuid4(),
+        id_empresa=id_empresa,
+        nome="Produto teste",
+        codigo=codigo,
+        codigo_barras=codigo_barras,
+        valor_venda=Decimal("9.90"),
+        estoque_atual=Decimal(estoque),
+        ativo=True,
+    )
+
+
+@pytest.mark.unit
+def test_lru_remove_menos_usado():
+    """O item menos usado recentemente é descartado ao atingir o limite."""
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.unit
+def test_indice_resolve_codigo_e_codigo_barras():
+    """Código interno e código de barras apontam para o mesmo produto."""
+    id_empresa = uuid.uuid4()
+    cache = ProdutoLookupCache()
+    resumo = _resumo(id_empresa)
+    cache.aquecer(id_empresa, [resumo])
+
+    assert cache.obter_por_codigo(id_empresa, "123") == resumo
+    assert cache.obter_por_codigo(id_empresa, "7891000100103") == resumo
+    assert cache.obter_por_codigo(uuid.uuid4(), "123") is None
+
+
+@pytest.mark.unit
+def test_indice_atualizacao_troca_codigos():
+    """Ao alterar o código de um produto, o código antigo deixa de resolver."""
+    id_empresa = uuid.uuid4()
+    cache = ProdutoLookupCache()
+    resumo = _resumo(id_empresa)
+    cache.aquecer(id_empresa, [resumo])
+
+    cache.armazenar(resumo.model_copy(update={"codigo": "456"}))
+
+    assert cache.obter_por_codigo(id_empresa, "123") is None
+    assert cache.obter_por_codigo(id_empresa, "456").id_produto == resumo.id_produto
+
+
+@pytest.mark.unit
+def test_indice_estoque_e_remocao():
+    """Baixas de estoque atualizam o resumo e remoções o descartam."""
+    id_empresa = uuid.uuid4()
+    cache = ProdutoLookupCache()
+    resumo = _resumo(id_empresa)
+    cache.aquecer(id_empresa, [resumo])
+
+    cache.atualizar_estoque(id_empresa, resumo.id_produto, Decimal("7"))
+    assert cache.obter_por_id(id_empresa, resumo.id_produto).estoque_atual == Decimal("7")
+
+    cache.remover(id_empresa, resumo.id_produto)
+    assert cache.obter_por_codigo(id_empresa, "123") is None
+
+
+@pytest.mark.unit
+async def test_servico_aquece_uma_vez_e_consulta_pontual_na_ausencia():
+    """O índice é aquecido na primeira consulta; ausências vão ao banco uma vez."""
+    id_empresa = uuid.uuid4()
+    existente = _resumo(id_empresa)
+    novo = _resumo(id_empresa, codigo="999", codigo_barras=None)
+
+    service = ProdutoLookupService(AsyncMock(), cache=ProdutoLookupCache())
+    service.repository = AsyncMock()
+    service.repository.list_resumos.return_value = [existente]
+    service.repository.get_resumo_by_codigo.return_value = novo
+
+    assert await service.buscar_por_codigo("123", id_empresa) == existente
+    assert await service.buscar_por_codigo("999", id_empresa) == novo
+    assert await service.buscar_por_codigo("999", id_empresa) == novo
+
+    service.repository.list_resumos.assert_awaited_once()
+    service.repository.get_resumo_by_codigo.assert_awaited_once()
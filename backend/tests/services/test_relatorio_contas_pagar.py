@@ -0,0 +1,31 @@
+"""Testes para a montagem do relatório agregado de contas a pagar."""
+from decimal import Decimal
+import pytest
+
+from app.services.conta_pagar.conta_pagar_query_service import ContaPagarQueryService
+
+
+@pytest.mark.unit
+def test_montar_relatorio_a_partir_dos_grouping_sets():
+    linhas = [
+        {"agrupamento": "total", "chave": None, "quantidade": 6, "valor": Decimal("1000.00")},
+        {"agrupamento": "status", "chave": "PENDENTE", "quantidade": 3, "valor": Decimal("450.00")},
+        {"agrupamento": "status", "chave": "VENCIDO", "quantidade": 1, "valor": Decimal("150.00")},
+        {"agrupamento": "status", "chave": "PAGO", "quantidade": 2, "valor": Decimal("400.00")},
+        {"agrupamento": "categoria", "chave": "Aluguel", "quantidade": 2, "valor": Decimal("700.00")},
+        {"agrupamento": "categoria", "chave": None, "quantidade": 4, "valor": Decimal("300.00")},
+        {"agrupamento": "faixa", "chave": "vencida", "quantidade": 2, "valor": Decimal("250.00")},
+        {"agrupamento": "faixa", "chave": "a_vencer", "quantidade": 2, "valor": Decimal("350.00")},
+        {"agrupamento": "faixa", "chave": None, "quantidade": 2, "valor": Decimal("400.00")},
+    ]
+
+    relatorio = ContaPagarQueryService.montar_relatorio(linhas)
+
+    assert relatorio.total_geral == 1000.0 and relatorio.total_contas == 6
+    assert relatorio.total_pago == 400.0
+    assert relatorio.total_pendente == 600.0
+    assert relatorio.por_status["CANCELADO"] == 0.0
+    assert relatorio.por_categoria == {"Aluguel": 700.0}
+    assert (relatorio.contas_vencidas, relatorio.valor_vencido) == (2, 250.0)
+    assert (relatorio.contas_a_vencer, relatorio.valor_a_vencer) == (2, 350.0)
+    assert relatorio.contas is None
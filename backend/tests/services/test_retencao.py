@@ -0,0 +1,95 @@
+"""Testes para a retenção de logs em lotes."""
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.retencao import (
+    SQL_PARTICOES,
+    MotorRetencao,
+    PoliticaRetencao,
+    excluir_em_lotes,
+    limite_superior_particao,
+    sql_excluir_lote,
+)
+
+
+class SessaoFalsa:
+    """Sessão síncrona que devolve partições e contagens de lotes pré-definidas."""
+
+    def __init__(self, particoes, lotes):
+        self.particoes = particoes
+        self.lotes = list(lotes)
+        self.comandos = []
+        self.commits = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, sql, parametros=None):
+        self.comandos.append(str(sql))
+        if sql is SQL_PARTICOES:
+            return MagicMock(all=MagicMock(return_value=self.particoes))
+        if str(sql).startswith("DROP"):
+            return MagicMock(rowcount=0)
+        return MagicMock(rowcount=self.lotes.pop(0))
+
+    def commit(self):
+        self.commits += 1
+
+
+@pytest.mark.unit
+def test_sql_do_lote_usa_tableoid_ctid_e_limite():
+    """O DELETE é limitado e identifica linhas por partição + ctid."""
+    sql = " ".join(str(sql_excluir_lote("logs_sistema", "created_at", "id_empresa")).split())
+
+    assert "WHERE (tableoid, ctid) IN ( SELECT tableoid, ctid FROM logs_sistema" in sql
+    assert "created_at < :limite AND id_empresa = :id_empresa LIMIT :lote" in sql
+    assert "WHERE" not in str(sql_excluir_lote("logs_sistema")).split("FROM logs_sistema")[-1].split("LIMIT")[0]
+
+
+@pytest.mark.unit
+def test_limite_superior_da_particao():
+    """O limite superior é extraído da expressão de partição do PostgreSQL."""
+    limites = "FOR VALUES FROM ('2025-01-01 00:00:00') TO ('2025-02-01 00:00:00')"
+    assert limite_superior_particao(limites) == datetime(2025, 2, 1)
+    assert limite_superior_particao("DEFAULT") is None
+
+
+@pytest.mark.unit
+def test_motor_remove_particoes_expiradas_e_linhas_em_lotes():
+    """Partições inteiras abaixo do limite são descartadas; o resto sai em lotes."""
+    sessao = SessaoFalsa(
+        particoes=[
+            SimpleNamespace(particao="logs_sistema_p202401", limites="FOR VALUES FROM ('2024-01-01') TO ('2024-02-01')"),
+            SimpleNamespace(particao="logs_sistema_p202608", limites="FOR VALUES FROM ('2026-08-01') TO ('2026-09-01')"),
+        ],
+        lotes=[10, 10, 3],
+    )
+    motor = MotorRetencao(session_factory=lambda: sessao, tamanho_lote=10, pausa_segundos=0, duracao_maxima=60)
+
+    progresso = motor.executar_politica(
+        PoliticaRetencao("logs_sistema", "created_at", "id_empresa", 90),
+        agora=datetime(2026, 10, 18),
+    )
+
+    assert progresso["particoes_removidas"] == ["logs_sistema_p202401"]
+    assert progresso["linhas_removidas"] == 23
+    assert progresso["lotes"] == 3
+    assert progresso["em_execucao"] is False and progresso["interrompida"] is False
+    assert sessao.commits == 4
+
+
+@pytest.mark.unit
+async def test_exclusao_assincrona_para_no_lote_incompleto():
+    """A versão assíncrona confirma cada lote e para quando um lote vem incompleto."""
+    session = AsyncMock()
+    session.execute.side_effect = [MagicMock(rowcount=2), MagicMock(rowcount=1)]
+
+    total = await excluir_em_lotes(session, "logs_sistema", tamanho_lote=2)
+
+    assert total == 3
+    assert session.commit.await_count == 2
@@ -0,0 +1,55 @@
+"""Testes para a atualização atômica de saldos de contas bancárias."""
+from types import SimpleNamespace
+from uuid import uuid4
+import pytest
+
+from app.repositories.conta_bancaria_repository import ContaBancariaRepository
+
+
+class SessaoFalsa:
+    """Registra as instruções executadas e devolve linhas pré-definidas."""
+
+    def __init__(self, linhas):
+        self.linhas = linhas
+        self.execucoes = []
+        self.commits = 0
+
+    async def execute(self, instrucao, params=None):
+        self.execucoes.append((str(instrucao), params))
+        return self.linhas
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+@pytest.mark.unit
+async def test_lote_aplica_deltas_com_sinal_em_uma_instrucao():
+    pdv, caixa = uuid4(), uuid4()
+    sessao = SessaoFalsa([SimpleNamespace(id_conta=pdv, saldo_atual=130.0)])
+    repo = ContaBancariaRepository(sessao)
+
+    saldos = await repo.aplicar_movimentos_saldo(
+        [(pdv, "credito", 50), (pdv, "debito", 20), (caixa, "credito", 10)],
+        observacao="Fechamento do PDV"
+    )
+
+    assert saldos == {pdv: 130.0}
+    assert len(sessao.execucoes) == 1 and sessao.commits == 1
+    sql, params = sessao.execucoes[0]
+    assert "saldo_atual = c.saldo_atual + a.delta" in sql and "FOR UPDATE" in sql
+    assert params["valores"] == [50.0, -20.0, 10.0]
+    assert params["ids_lancamento"] == [None, None, None]
+
+
+@pytest.mark.unit
+async def test_operacao_invalida_e_ajuste():
+    repo = ContaBancariaRepository(SessaoFalsa(SimpleNamespace(first=lambda: None)))
+    with pytest.raises(ValueError):
+        await repo.aplicar_movimentos_saldo([(uuid4(), "estorno", 10)])
+
+    assert await repo.atualizar_saldo(uuid4(), "ajuste", 500) is None
+    sql, params = repo.session.execucoes[-1]
+    assert "saldo_atual - saldo_anterior" in sql and params["saldo"] == 500.0
@@ -0,0 +1,88 @@
+"""Testes para o login assíncrono com claims de permissão."""
+import pytest
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi import HTTPException
+from jose import jwt
+
+from app.config.settings import settings
+from app.dependencies import check_permission
+from app.repositories import usuario_repository
+from app.repositories.usuario_repository import UsuarioRepository
+from app.services.usuario import usuario_auth_service as modulo
+from app.services.usuario.usuario_auth_service import UsuarioAuthService
+
+
+def _usuario():
+    return {
+        "id_usuario": uuid.uuid4(),
+        "id_empresa": uuid.uuid4(),
+        "nome": "Maria",
+        "email": "maria@exemplo.com",
+        "senha_hash": "hash-antigo",
+        "tipo_usuario": "OPERADOR",
+        "telas_permitidas": None,
+        "permissoes": {"vendas": ["listar", "criar"]},
+    }
+
+
+@pytest.mark.unit
+async def test_email_desconhecido_fica_em_cache_negativo(monkeypatch):
+    """Emails inexistentes não voltam ao banco enquanto o TTL não expira."""
+    monkeypatch.setattr(usuario_repository, "emails_desconhecidos", usuario_repository.LRUCache(ttl=60))
+    session = AsyncMock()
+    result = MagicMock()
+    result.mappings.return_value.first.return_value = None
+    session.execute.return_value = result
+    repository = UsuarioRepository(session)
+
+    assert await repository.get_para_login("Ninguem@Exemplo.com") is None
+    assert await repository.get_para_login("ninguem@exemplo.com ") is None
+
+    assert session.execute.await_count == 1
+    assert session.execute.await_args.args[1] == {"email": "ninguem@exemplo.com"}
+
+
+@pytest.mark.unit
+async def test_login_regrava_hash_e_emite_claims(monkeypatch):
+    """Login válido regrava hash obsoleto e embute as permissões no token."""
+    usuario = _usuario()
+    service = UsuarioAuthService(AsyncMock())
+    service.repository = AsyncMock()
+    service.repository.get_para_login.return_value = usuario
+    monkeypatch.setattr(modulo, "verificar_senha_async", AsyncMock(return_value=(True, "hash-novo")))
+
+    token = await service.login("Maria@Exemplo.com", "segredo123")
+
+    service.repository.atualizar_senha_hash.assert_awaited_once_with(usuario["id_usuario"], "hash-novo")
+    payload = jwt.decode(token["access_token"], settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    assert payload["permissoes"] == {"vendas": ["listar", "criar"]}
+    assert payload["empresa_id"] == str(usuario["id_empresa"])
+
+
+@pytest.mark.unit
+async def test_senha_incorreta_retorna_401(monkeypatch):
+    """Senha inválida não regrava hash e responde 401."""
+    service = UsuarioAuthService(AsyncMock())
+    service.repository = AsyncMock()
+    service.repository.get_para_login.return_value = _usuario()
+    monkeypatch.setattr(modulo, "verificar_senha_async", AsyncMock(return_value=(False, None)))
+
+    with pytest.raises(HTTPException) as exc:
+        await service.login("maria@exemplo.com", "errada")
+
+    assert exc.value.status_code == 401
+    service.repository.atualizar_senha_hash.assert_not_awaited()
+
+
+@pytest.mark.unit
+async def test_check_permission_usa_claims(monkeypatch):
+    """A verificação de permissão usa as claims do token, sem consultar o banco."""
+    monkeypatch.setattr(type(settings), "is_development", property(lambda self: False))
+    usuario = {"tipo_usuario": "OPERADOR", "permissoes": {"vendas": ["listar"]}}
+
+    assert await check_permission("vendas:listar")(current_user=usuario) is True
+    with pytest.raises(HTTPException) as exc:
+        await check_permission("vendas:deletar")(current_user=usuario)
+    assert exc.value.status_code == 403
@@ -0,0 +1,83 @@
+"""Testes para a inclusão de itens de venda em lote."""
+import pytest
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from fastapi import HTTPException
+
+from app.schemas.venda import ItemVenda
+from app.services.venda.venda_item_service import VendaItemService
+
+
+def _item(id_produto, quantidade=2, valor_unitario=5.0):
+    total = quantidade * valor_unitario
+    return ItemVenda(
+        id_produto=id_produto,
+        nome_produto="Produto teste",
+        quantidade=quantidade,
+        valor_unitario=valor_unitario,
+        valor_total=total,
+        valor_liquido=total,
+    )
+
+
+def _service():
+    service = VendaItemService(AsyncMock(), AsyncMock())
+    service.repository = AsyncMock()
+    service._validar_produto = AsyncMock()
+    return service
+
+
+@pytest.mark.unit
+async def test_lote_insere_todos_os_itens_em_uma_chamada():
+    """Os itens vão ao repositório em uma única chamada e cada produto é validado uma vez."""
+    id_venda, id_empresa = uuid.uuid4(), uuid.uuid4()
+    produto_a, produto_b = uuid.uuid4(), uuid.uuid4()
+    itens = [_item(produto_a), _item(produto_b), _item(produto_a, quantidade=1)]
+
+    service = _service()
+    service.repository.create_itens_venda.return_value = [
+        SimpleNamespace(
+            id_item_venda=uuid.uuid4(),
+            id_produto=item.id_produto,
+            descricao=item.nome_produto,
+            quantidade=item.quantidade,
+            valor_unitario=item.valor_unitario,
+            valor_total=item.valor_total,
+        )
+        for item in itens
+    ]
+
+    resultado = await service.adicionar_itens_venda(id_venda, id_empresa, itens)
+
+    assert len(resultado) == 3
+    service.repository.create_itens_venda.assert_awaited_once()
+    _, _, itens_data = service.repository.create_itens_venda.await_args.args
+    assert [i["valor_total"] for i in itens_data] == [10.0, 10.0, 5.0]
+    assert service._validar_produto.await_count == 2
+    service.auditoria_service.registrar_acao.assert_awaited_once()
+
+
+@pytest.mark.unit
+async def test_lote_venda_inexistente():
+    """Venda de outra empresa ou inexistente resulta em 404."""
+    service = _service()
+    service.repository.create_itens_venda.return_value = None
+
+    with pytest.raises(HTTPException) as exc:
+        await service.adicionar_itens_venda(uuid.uuid4(), uuid.uuid4(), [_item(uuid.uuid4())])
+
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.unit
+async def test_lote_vazio():
+    """Um lote sem itens é rejeitado sem acessar o banco."""
+    service = _service()
+
+    with pytest.raises(HTTPException) as exc:
+        await service.adicionar_itens_venda(uuid.uuid4(), uuid.uuid4(), [])
+
+    assert exc.value.status_code == 400
+    service.repository.create_itens_venda.assert_not_awaited()